@@ -0,0 +1,157 @@
+"""Filter-based bulk changes of host status and type.
+
+A bulk change selects hosts with a HostFilter and sets one field on all of
+them. The hosts it changes and their previous values are recorded in SQL
+(INSERT ... SELECT) and then updated in a single UPDATE, so no host IDs
+pass through Python, and the change can later be undone.
+
+Functions flush but do not commit; the caller owns the transaction.
+"""
+
+import logging
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import ColumnElement, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from netbox_auto.models import BulkChange, BulkChangeHost, Host, HostStatus, HostType
+from netbox_auto.query import HostFilter
+
+logger = logging.getLogger(__name__)
+
+# Host fields that bulk changes and the API may set, with their allowed values
+EDITABLE_FIELDS: dict[str, list[str]] = {
+    "status": [s.value for s in HostStatus],
+    "host_type": [t.value for t in HostType],
+}
+
+
+class BulkChangeError(Exception):
+    """Raised when a bulk change cannot be made or undone."""
+
+    pass
+
+
+def _column(field: str, value: str) -> ColumnElement[Any]:
+    """Get the host column for an editable field, validating the value.
+
+    Raises:
+        BulkChangeError: If the field is not editable or the value invalid.
+    """
+    if field not in EDITABLE_FIELDS:
+        raise BulkChangeError(f"Field cannot be changed: {field}")
+    if value not in EDITABLE_FIELDS[field]:
+        raise BulkChangeError(f"Invalid {field}: {value}")
+    column: ColumnElement[Any] = getattr(Host, field)
+    return column
+
+
+def preview_bulk_change(session: Session, host_filter: HostFilter, field: str, value: str) -> int:
+    """Count the hosts a bulk change would modify.
+
+    Args:
+        session: DB session.
+        host_filter: Filter selecting the hosts.
+        field: Host field to set ('status' or 'host_type').
+        value: New value.
+
+    Returns:
+        Number of matching hosts whose field differs from value.
+
+    Raises:
+        BulkChangeError: If the field or value is invalid.
+    """
+    column = _column(field, value)
+    statement = select(func.count(Host.id)).where(*host_filter.clauses(), column != value)
+    return session.execute(statement).scalar_one()
+
+
+def apply_bulk_change(
+    session: Session, host_filter: HostFilter, field: str, value: str
+) -> BulkChange:
+    """Set a field on every host matching a filter, recording it for undo.
+
+    Args:
+        session: DB session.
+        host_filter: Filter selecting the hosts.
+        field: Host field to set ('status' or 'host_type').
+        value: New value.
+
+    Returns:
+        The recorded change, with host_count set.
+
+    Raises:
+        BulkChangeError: If the field or value is invalid.
+    """
+    column = _column(field, value)
+    change = BulkChange(field=field, value=value, filter=host_filter.to_args())
+    session.add(change)
+    session.flush()
+
+    session.execute(
+        insert(BulkChangeHost).from_select(
+            ["change_id", "host_id", "previous"],
+            select(literal(change.id), Host.id, column).where(
+                *host_filter.clauses(), column != value
+            ),
+        )
+    )
+    changed_ids = select(BulkChangeHost.host_id).where(BulkChangeHost.change_id == change.id)
+    session.execute(
+        update(Host)
+        .where(Host.id.in_(changed_ids))
+        .values({column: value})
+        .execution_options(synchronize_session=False)
+    )
+    change.host_count = session.execute(
+        select(func.count()).select_from(changed_ids.subquery())
+    ).scalar_one()
+    session.flush()
+    # Hosts loaded before the UPDATE hold stale values
+    session.expire_all()
+    logger.info(f"Bulk change {change.id}: set {field}={value} on {change.host_count} hosts")
+    return change
+
+
+def undo_bulk_change(session: Session, change_id: int) -> int:
+    """Restore the previous values of the hosts a bulk change modified.
+
+    Hosts whose field has been changed again since are left alone.
+
+    Args:
+        session: DB session.
+        change_id: ID of the bulk change.
+
+    Returns:
+        Number of hosts restored.
+
+    Raises:
+        BulkChangeError: If the change does not exist or was already undone.
+    """
+    change = session.get(BulkChange, change_id)
+    if change is None:
+        raise BulkChangeError(f"Bulk change {change_id} not found")
+    if change.undone_at is not None:
+        raise BulkChangeError(f"Bulk change {change_id} was already undone")
+
+    column = _column(change.field, change.value)
+    previous = (
+        select(BulkChangeHost.previous)
+        .where(BulkChangeHost.change_id == change.id, BulkChangeHost.host_id == Host.id)
+        .scalar_subquery()
+    )
+    changed_ids = select(BulkChangeHost.host_id).where(BulkChangeHost.change_id == change.id)
+    to_restore = [Host.id.in_(changed_ids), column == change.value]
+    restored = session.execute(select(func.count(Host.id)).where(*to_restore)).scalar_one()
+    session.execute(
+        update(Host)
+        .where(*to_restore)
+        .values({column: previous})
+        .execution_options(synchronize_session=False)
+    )
+    change.undone_at = datetime.now(UTC)
+    session.flush()
+    session.expire_all()
+    logger.info(f"Undid bulk change {change.id}: restored {restored} hosts")
+    return restored
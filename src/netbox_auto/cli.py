@@ -143,21 +143,86 @@ def serve(
             help="Run in debug mode with auto-reload.",
         ),
     ] = False,
+    server: Annotated[
+        str | None,
+        typer.Option(
+            "--server",
+            "-s",
+            help="WSGI server: werkzeug (development), waitress or gunicorn. "
+            "Defaults to web.server in config.",
+        ),
+    ] = None,
+    workers: Annotated[
+        int | None,
+        typer.Option(
+            "--workers",
+            "-w",
+            min=1,
+            help="Worker processes (gunicorn only). Defaults to web.workers in config.",
+        ),
+    ] = None,
+    threads: Annotated[
+        int | None,
+        typer.Option(
+            "--threads",
+            "-t",
+            min=1,
+            help="Request threads per worker. Defaults to web.threads in config.",
+        ),
+    ] = None,
 ) -> None:
     """Start the web UI for reviewing discovered hosts.
 
     Launches a local web server where you can review, classify,
-    and approve hosts before pushing to NetBox.
+    and approve hosts before pushing to NetBox. For shared use, serve
+    with waitress or gunicorn (pip install 'netbox-auto[serve]') so
+    concurrent requests do not wait on each other.
     """
     from netbox_auto.web.app import create_app
+    from netbox_auto.web.server import ServerError, run_gunicorn, run_waitress
+
+    web_config = get_config().web
+    updates: dict[str, object] = {"server": server, "workers": workers, "threads": threads}
+    web_config = web_config.model_copy(
+        update={name: value for name, value in updates.items() if value is not None}
+    )
+    if web_config.server not in ("werkzeug", "waitress", "gunicorn"):
+        typer.secho(
+            f"Error: Unknown server '{web_config.server}' (werkzeug, waitress or gunicorn)",
+            fg=typer.colors.RED,
+            err=True,
+        )
+        raise typer.Exit(1)
+    # The debugger and reloader only work with the development server
+    if debug:
+        web_config = web_config.model_copy(update={"server": "werkzeug"})
+    # The app (and forked workers) read the effective server settings
+    get_config().web = web_config
 
     console.print("\n[bold]Starting web server...[/bold]\n")
     console.print(f"  URL: [link]http://{host}:{port}[/link]")
     console.print(f"  Debug: {'on' if debug else 'off'}")
+    if web_config.server == "gunicorn":
+        console.print(
+            f"  Server: gunicorn ({web_config.workers} workers x {web_config.threads} threads)"
+        )
+    elif web_config.server == "waitress":
+        console.print(f"  Server: waitress ({web_config.threads} threads)")
+    else:
+        console.print("  Server: werkzeug (development only)")
     console.print("\n  Press [bold]Ctrl+C[/bold] to stop.\n")
 
-    flask_app = create_app()
-    flask_app.run(host=host, port=port, debug=debug)
+    try:
+        if web_config.server == "gunicorn":
+            run_gunicorn(create_app, host, port, web_config)
+        elif web_config.server == "waitress":
+            run_waitress(create_app(), host, port, web_config)
+        else:
+            flask_app = create_app()
+            flask_app.run(host=host, port=port, debug=debug)
+    except ServerError as e:
+        typer.secho(f"Error: {e}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(1) from None
 
 
 @app.command()
@@ -184,18 +249,74 @@ def push(
             help="Skip DNS push.",
         ),
     ] = False,
+    plan_out: Annotated[
+        Path | None,
+        typer.Option(
+            "--plan-out",
+            help="Write the computed NetBox changeset to this JSON file.",
+        ),
+    ] = None,
+    plan_file: Annotated[
+        Path | None,
+        typer.Option(
+            "--plan",
+            help="Apply a changeset saved with --plan-out instead of planning.",
+        ),
+    ] = None,
+    resume: Annotated[
+        bool,
+        typer.Option(
+            "--resume",
+            help="Continue the last interrupted push without repeating completed steps.",
+        ),
+    ] = False,
+    changed: Annotated[
+        bool,
+        typer.Option(
+            "--changed",
+            help="Send minimal updates for pushed hosts that changed since their last push.",
+        ),
+    ] = False,
 ) -> None:
     """Push approved hosts to NetBox and update DNS.
 
     Creates NetBox devices/VMs for approved hosts, creates cable
     records linking switches to devices, and updates Unbound DNS.
+    Review a changeset with '--dry-run --plan-out plan.json', then
+    apply exactly that changeset with '--plan plan.json'. Every applied
+    step is journaled, so '--resume' picks up an interrupted push.
+    '--changed' syncs only pushed hosts that discovery saw change.
     """
     from sqlalchemy import func
 
     from netbox_auto.database import get_session
     from netbox_auto.models import Host, HostStatus
+    from netbox_auto.plan import PlanError, PushPlan
     from netbox_auto.push import push_approved_hosts
 
+    if resume and (plan_file is not None or dry_run):
+        typer.secho(
+            "Error: --resume cannot be combined with --plan or --dry-run",
+            fg=typer.colors.RED,
+            err=True,
+        )
+        raise typer.Exit(1)
+    if changed and (resume or plan_file is not None or plan_out is not None):
+        typer.secho(
+            "Error: --changed cannot be combined with --resume, --plan or --plan-out",
+            fg=typer.colors.RED,
+            err=True,
+        )
+        raise typer.Exit(1)
+
+    plan = None
+    if plan_file is not None:
+        try:
+            plan = PushPlan.load(plan_file)
+        except PlanError as e:
+            typer.secho(f"Error: {e}", fg=typer.colors.RED, err=True)
+            raise typer.Exit(1) from None
+
     # Show banner
     console.print()
     if dry_run:
@@ -207,14 +328,27 @@ def push(
         session.query(func.count(Host.id)).filter(Host.status == HostStatus.APPROVED.value).scalar()
         or 0
     )
+    drifted_count = (
+        session.query(func.count(Host.id))
+        .filter(Host.status == HostStatus.PUSHED.value, Host.drifted.is_(True))
+        .scalar()
+        or 0
+    )
     session.close()
 
-    if approved_count == 0:
+    if changed:
+        if drifted_count == 0:
+            console.print("[yellow]No pushed hosts have changed since their last push.[/yellow]\n")
+            return
+        console.print(f"[bold]Syncing {drifted_count} changed hosts...[/bold]\n")
+    elif resume:
+        console.print("[bold]Resuming interrupted push...[/bold]\n")
+    elif approved_count == 0:
         console.print("[yellow]No approved hosts to push.[/yellow]")
         console.print("Use 'netbox-auto serve' to review and approve hosts first.\n")
         return
-
-    console.print(f"[bold]Pushing {approved_count} approved hosts...[/bold]\n")
+    else:
+        console.print(f"[bold]Pushing {approved_count} approved hosts...[/bold]\n")
 
     # Show what will be skipped
     if skip_netbox:
@@ -229,11 +363,26 @@ def push(
         dry_run=dry_run,
         skip_netbox=skip_netbox,
         skip_dns=skip_dns,
+        plan=plan,
+        plan_out=plan_out,
+        resume=resume,
+        changed=changed,
     )
 
+    if plan_out is not None and result.plan is not None:
+        console.print(f"Plan written to {plan_out}\n")
+    if result.plan is not None and result.plan.unsynced():
+        console.print(
+            f"[yellow]{len(result.plan.unsynced())} existing NetBox objects differ from "
+            "their hosts in fields push does not update (primary IP, switch port cable); "
+            "only renames are applied. See 'unsynced' in the plan.[/yellow]\n"
+        )
+
     # Display results
     console.print("[bold green]Push complete:[/bold green]")
     console.print(f"  NetBox created: {result.netbox_created}")
+    console.print(f"  NetBox updated: {result.netbox_updated}")
+    console.print(f"  Unchanged:      {result.netbox_unchanged}")
     console.print(f"  Cables created: {result.cables_created}")
     if result.dns_updated:
         console.print(f"  DNS servers:    {len(result.dns_updated)}")
@@ -241,6 +390,8 @@ def push(
             console.print(f"    - {server}")
     else:
         console.print("  DNS servers:    0")
+    if result.dns_skipped:
+        console.print(f"  DNS unchanged:  {len(result.dns_skipped)}")
 
     # Show errors if any
     if result.errors:
@@ -252,6 +403,104 @@ def push(
     console.print()
 
 
+@app.command()
+def export(
+    target: Annotated[
+        str,
+        typer.Argument(help="What to export: hosts or reconcile."),
+    ] = "hosts",
+    fmt: Annotated[
+        str,
+        typer.Option("--format", "-f", help="Output format: csv or jsonl."),
+    ] = "csv",
+    output: Annotated[
+        Path | None,
+        typer.Option("--output", "-o", help="File to write (default: stdout)."),
+    ] = None,
+    status: Annotated[str | None, typer.Option("--status", help="Host status.")] = None,
+    source: Annotated[str | None, typer.Option("--source", help="Discovery source.")] = None,
+    host_type: Annotated[str | None, typer.Option("--type", help="Host type.")] = None,
+    subnet: Annotated[
+        str | None, typer.Option("--subnet", help="Hosts with an IP in this CIDR.")
+    ] = None,
+    search: Annotated[
+        str | None,
+        typer.Option("--search", "-q", help="Substring of MAC, hostname, IP or switch port."),
+    ] = None,
+    hostname: Annotated[
+        str | None, typer.Option("--hostname", help="Hostname wildcard pattern (web-*).")
+    ] = None,
+    min_age: Annotated[
+        int | None, typer.Option("--min-age", min=0, help="Last seen at least N days ago.")
+    ] = None,
+    max_age: Annotated[
+        int | None, typer.Option("--max-age", min=0, help="Last seen within N days.")
+    ] = None,
+    section: Annotated[
+        str | None,
+        typer.Option("--section", help="Reconcile section: new, matched or stale (default: all)."),
+    ] = None,
+) -> None:
+    """Export hosts or the latest reconciliation as CSV or JSONL.
+
+    Host filters match those of the web hosts view. Rows are streamed from
+    the database, so large exports run in constant memory.
+    """
+    import sys
+
+    from netbox_auto.database import get_session
+    from netbox_auto.export import ExportError, export_hosts, export_reconcile
+    from netbox_auto.query import HostFilter, HostQueryError
+    from netbox_auto.reconcile import latest_snapshot
+
+    if target not in ("hosts", "reconcile"):
+        typer.secho(
+            f"Error: Unknown export '{target}' (hosts or reconcile)", fg=typer.colors.RED, err=True
+        )
+        raise typer.Exit(1)
+
+    filter_args = {
+        "status": status,
+        "source": source,
+        "type": host_type,
+        "subnet": subnet,
+        "q": search,
+        "hostname": hostname,
+        "min_age": None if min_age is None else str(min_age),
+        "max_age": None if max_age is None else str(max_age),
+    }
+    session = get_session()
+    try:
+        if target == "hosts":
+            host_filter = HostFilter.from_args(
+                {name: value for name, value in filter_args.items() if value is not None}
+            )
+            chunks = export_hosts(session, host_filter, fmt)
+        else:
+            snapshot = latest_snapshot(session)
+            if snapshot is None:
+                typer.secho(
+                    "Error: No reconciliation has completed yet; open the reconcile view first",
+                    fg=typer.colors.RED,
+                    err=True,
+                )
+                raise typer.Exit(1)
+            chunks = export_reconcile(session, snapshot, section, fmt)
+
+        if output is None:
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+        else:
+            with output.open("w", newline="") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+    except (ExportError, HostQueryError) as e:
+        typer.secho(f"Error: {e}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(1) from None
+    finally:
+        session.close()
+
+
 @app.command()
 def status() -> None:
     """Show discovery and push status summary.
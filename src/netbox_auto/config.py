@@ -9,7 +9,7 @@ Example: NETBOX_AUTO_MIKROTIK__PASSWORD overrides mikrotik.password
 
 import os
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import yaml
 from pydantic import BaseModel, Field
@@ -49,6 +49,50 @@ class NetBoxConfig(BaseModel):
 
     url: str = Field(description="NetBox API URL (e.g., https://netbox.example.com)")
     token: str = Field(description="API token")
+    page_size: int = Field(
+        default=1000, ge=1, description="Objects per page when listing devices and VMs"
+    )
+    threading: bool = Field(
+        default=True, description="Fetch result pages in parallel (pynetbox threading)"
+    )
+    inventory_backend: Literal["auto", "rest"] = Field(
+        default="auto",
+        description="Inventory fetch backend: 'auto' tries GraphQL first, 'rest' skips it",
+    )
+    batch_size: int = Field(
+        default=100, ge=1, description="Objects sent per bulk create/update request"
+    )
+    timeout: float = Field(default=30.0, gt=0, description="HTTP read timeout in seconds")
+    connect_timeout: float = Field(
+        default=5.0, gt=0, description="HTTP connection timeout in seconds"
+    )
+    pool_size: int = Field(default=10, ge=1, description="Maximum pooled HTTP connections")
+    max_retries: int = Field(
+        default=3, ge=0, description="Retries for idempotent requests on transient errors"
+    )
+    backoff_factor: float = Field(
+        default=0.5, ge=0, description="Base delay in seconds for jittered retry backoff"
+    )
+    cache_ttl: float = Field(
+        default=300.0, ge=0, description="Seconds reference object IDs stay cached"
+    )
+    push_workers: int = Field(
+        default=4, ge=1, description="Host batches pushed to NetBox concurrently"
+    )
+    write_rate: float = Field(
+        default=10.0, ge=0, description="Maximum NetBox write requests per second (0 = unlimited)"
+    )
+    site: str | None = Field(default=None, description="Site slug or name for new devices")
+    device_role: str | None = Field(
+        default=None, description="Device role slug or name for new devices"
+    )
+    device_type: str | None = Field(
+        default=None, description="Device type slug or model for new devices"
+    )
+    cluster: str | None = Field(default=None, description="Cluster name for new VMs")
+    interface_name: str = Field(
+        default="eth0", description="Interface created on new devices/VMs for IP assignment"
+    )
 
 
 class UnboundHostConfig(BaseModel):
@@ -68,6 +112,46 @@ class UnboundConfig(BaseModel):
     hosts: list[UnboundHostConfig] = Field(
         default_factory=list, description="List of Unbound servers to update"
     )
+    domain: str = Field(default="lan", description="Domain suffix for bare hostnames")
+    reverse_zones: list[str] = Field(
+        default_factory=list,
+        description="Networks to serve PTR records for (CIDR notation); each is declared "
+        "as a local-zone cut on octet (IPv4) or nibble (IPv6) boundaries",
+    )
+    reverse_zone_type: Literal["static", "transparent"] = Field(
+        default="static", description="Unbound local-zone type of the reverse zones"
+    )
+    split_zones: bool = Field(
+        default=False,
+        description="Write each reverse zone to its own file next to config_path, "
+        "so each is hashed and transferred independently",
+    )
+    verify_remote: bool = Field(
+        default=False,
+        description="Compare against the checksum of the config on each server "
+        "instead of the locally recorded digest before skipping an unchanged push",
+    )
+    update_mode: Literal["reload", "delta"] = Field(
+        default="reload",
+        description="'reload' restarts Unbound with the new config; 'delta' applies added "
+        "and removed records live with unbound-control, keeping the resolver cache",
+    )
+    check_config: bool = Field(
+        default=True, description="Validate uploaded configs with unbound-checkconf"
+    )
+    workers: int = Field(default=4, ge=1, description="Unbound servers updated concurrently")
+    connect_timeout: float = Field(
+        default=10.0, gt=0, description="SSH connection and authentication timeout in seconds"
+    )
+    command_timeout: float = Field(
+        default=30.0, gt=0, description="Timeout in seconds for each remote command or upload"
+    )
+    keepalive: int = Field(
+        default=30, ge=0, description="SSH keepalive interval in seconds (0 = disabled)"
+    )
+    compress: bool = Field(
+        default=False, description="Compress SSH traffic (helps large configs on slow links)"
+    )
 
 
 class ScannerConfig(BaseModel):
@@ -83,6 +167,22 @@ class DatabaseConfig(BaseModel):
     """Local database configuration."""
 
     path: str = Field(default="netbox-auto.db", description="Path to SQLite database file")
+    journal_mode: Literal["wal", "delete", "truncate", "persist"] = Field(
+        default="wal",
+        description="SQLite journal mode (wal lets readers run alongside a writer)",
+    )
+    synchronous: Literal["off", "normal", "full", "extra"] = Field(
+        default="normal",
+        description="When SQLite waits for writes to reach disk (normal is safe with wal)",
+    )
+    cache_size: int = Field(default=65536, ge=0, description="Page cache per connection, in KiB")
+    mmap_size: int = Field(
+        default=268435456, ge=0, description="Bytes of the database file read through mmap"
+    )
+    busy_timeout: float = Field(
+        default=30.0, ge=0, description="Seconds to wait for a lock held by another connection"
+    )
+    foreign_keys: bool = Field(default=True, description="Enforce foreign key constraints")
 
 
 class DiscoveryConfig(BaseModel):
@@ -91,6 +191,57 @@ class DiscoveryConfig(BaseModel):
     include_ipv6: bool = Field(default=False, description="Include IPv6 addresses in discovery")
 
 
+class WebConfig(BaseModel):
+    """Web interface configuration."""
+
+    reconcile_max_age: float = Field(
+        default=900.0,
+        gt=0,
+        description="Seconds a reconcile snapshot is shown before NetBox is fetched again",
+    )
+    server: Literal["werkzeug", "waitress", "gunicorn"] = Field(
+        default="werkzeug",
+        description="WSGI server for 'serve' (werkzeug is the single-threaded development server)",
+    )
+    workers: int = Field(default=2, ge=1, description="Worker processes (gunicorn only)")
+    threads: int = Field(default=8, ge=1, description="Request threads per worker process")
+    request_timeout: int = Field(
+        default=120,
+        ge=1,
+        description="Seconds before an idle connection or stuck worker is dropped",
+    )
+    graceful_timeout: int = Field(
+        default=30,
+        ge=1,
+        description="Seconds in-flight requests get to finish on shutdown (gunicorn only)",
+    )
+    event_bus: Literal["auto", "memory", "database"] = Field(
+        default="auto",
+        description="How web-made host changes reach live views: within the server "
+        "process (memory) or through the database for several workers; auto picks "
+        "database with gunicorn",
+    )
+    event_poll_interval: float = Field(
+        default=1.0, gt=0, description="Seconds between checks for discovery events"
+    )
+    event_stream_timeout: float = Field(
+        default=300.0,
+        gt=0,
+        description="Seconds an event stream stays open before the browser reconnects",
+    )
+    server_timing: bool = Field(
+        default=True,
+        description="Report per-request DB, template and external-call time in a "
+        "Server-Timing response header",
+    )
+    slow_request_ms: float | None = Field(
+        default=None,
+        gt=0,
+        description="Log requests slower than this many milliseconds with their SQL "
+        "statements (disabled if unset)",
+    )
+
+
 class Config(BaseSettings):
     """Main configuration for netbox-auto.
 
@@ -124,6 +275,7 @@ class Config(BaseSettings):
     discovery: DiscoveryConfig = Field(
         default_factory=DiscoveryConfig, description="Discovery behavior configuration"
     )
+    web: WebConfig = Field(default_factory=WebConfig, description="Web interface configuration")
 
 
 # Global cached config instance
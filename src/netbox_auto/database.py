@@ -2,16 +2,38 @@
 
 Provides SQLAlchemy engine, session factory, and database initialization.
 Database is created lazily when init_db() is called.
+
+Each connection is tuned with the PRAGMAs in DatabaseConfig. In the
+default WAL journal mode, discovery and push runs from cron write while
+`serve` keeps reading: readers see the last committed state instead of
+failing with "database is locked", and writers wait up to busy_timeout
+for each other.
 """
 
+import os
 from pathlib import Path
+from typing import Any
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
-from netbox_auto.config import get_config
+from netbox_auto.config import DatabaseConfig, get_config
 from netbox_auto.models import Base
+from netbox_auto.query import register_sql_functions
+
+# Columns added to existing tables after their first release, which
+# create_all() does not add to databases created by older versions
+_ADDED_COLUMNS: dict[str, dict[str, str]] = {
+    "host": {
+        "push_fingerprint": "VARCHAR(64)",
+        "netbox_objects": "JSON",
+        "drifted": "BOOLEAN NOT NULL DEFAULT 0",
+    },
+    "dns_push_state": {
+        "records": "JSON",
+    },
+}
 
 # Module-level cached engine and session factory
 _engine: Engine | None = None
@@ -39,10 +61,70 @@ def get_engine() -> Engine:
         # Use sqlite:/// URL format
         db_url = f"sqlite:///{db_path}"
         _engine = create_engine(db_url, echo=False)
+        _tune_connections(_engine, config.database)
+        event.listen(_engine, "connect", register_sql_functions)
 
     return _engine
 
 
+def _sqlite_pragmas(database_config: DatabaseConfig) -> list[tuple[str, str]]:
+    """Build the PRAGMAs applied to each new connection.
+
+    busy_timeout comes first, as switching to WAL needs a lock another
+    process may hold.
+
+    Args:
+        database_config: Database settings.
+
+    Returns:
+        (name, value) pairs in the order they are applied.
+    """
+    return [
+        ("busy_timeout", str(int(database_config.busy_timeout * 1000))),
+        ("journal_mode", database_config.journal_mode),
+        ("synchronous", database_config.synchronous),
+        # Negative sizes are in KiB rather than pages
+        ("cache_size", str(-database_config.cache_size)),
+        ("mmap_size", str(database_config.mmap_size)),
+        ("foreign_keys", "ON" if database_config.foreign_keys else "OFF"),
+    ]
+
+
+def _tune_connections(engine: Engine, database_config: DatabaseConfig) -> None:
+    """Apply the configured PRAGMAs to every connection the engine opens.
+
+    Args:
+        engine: SQLite engine.
+        database_config: Database settings.
+    """
+    pragmas = _sqlite_pragmas(database_config)
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+
+def _reset_engine_after_fork() -> None:
+    """Drop pooled connections inherited from the parent process.
+
+    SQLite connections must not be shared across processes. A forked
+    child (e.g. a gunicorn worker) discards the parent's pool without
+    closing its connections, which the parent still uses, and opens
+    its own on demand.
+    """
+    if _engine is not None:
+        _engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_engine_after_fork)
+
+
 def init_db() -> str:
     """Initialize the database, creating all tables if they don't exist.
 
@@ -50,12 +132,49 @@ def init_db() -> str:
         Path to the database file.
     """
     engine = get_engine()
+    _add_missing_columns(engine)
     Base.metadata.create_all(engine)
+    _add_missing_indexes(engine)
 
     config = get_config()
     return config.database.path
 
 
+def _add_missing_columns(engine: Engine) -> None:
+    """Add columns introduced since an existing database was created.
+
+    Args:
+        engine: Engine for the database to upgrade.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table, columns in _ADDED_COLUMNS.items():
+            if not inspector.has_table(table):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table)}
+            for name, ddl in columns.items():
+                if name not in existing:
+                    connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+
+def _add_missing_indexes(engine: Engine) -> None:
+    """Create indexes added to existing tables since the database was created.
+
+    Indexes over columns an older table does not have are skipped.
+
+    Args:
+        engine: Engine for the database to upgrade.
+    """
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for index in table.indexes:
+            if {column.name for column in index.columns} <= existing:
+                index.create(engine, checkfirst=True)
+
+
 def get_session() -> Session:
     """Get a new database session.
 
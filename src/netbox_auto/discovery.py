@@ -6,6 +6,7 @@ mappings, and persists results to the staging database.
 
 import logging
 from collections import defaultdict
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import UTC, datetime
 
@@ -20,10 +21,14 @@ from netbox_auto.collectors import (
 )
 from netbox_auto.config import Config, get_config
 from netbox_auto.database import get_session
+from netbox_auto.events import host_event, prune_events, record_event
 from netbox_auto.models import DiscoveryRun, DiscoveryStatus, Host, HostSource
 
 logger = logging.getLogger(__name__)
 
+# Hosts reloaded per query to build host events
+EVENT_LOAD_CHUNK = 500
+
 
 def _is_ipv6(ip: str) -> bool:
     """Check if an IP address is IPv6."""
@@ -54,7 +59,8 @@ def run_discovery() -> DiscoveryResult:
 
     Creates a DiscoveryRun record, runs all configured collectors, merges
     hosts by MAC address, applies switch port mappings, and persists
-    results to the Host table.
+    results to the Host table. Progress and host changes are recorded as
+    events for the web UI as the run goes.
 
     Returns:
         DiscoveryResult with counts and any errors encountered.
@@ -66,13 +72,29 @@ def run_discovery() -> DiscoveryResult:
     # Create discovery run record
     discovery_run = DiscoveryRun(status=DiscoveryStatus.RUNNING.value)
     session.add(discovery_run)
+    session.flush()
+    prune_events(session)
+    record_event(session, "discovery", {"run_id": discovery_run.id, "stage": "started"})
     session.commit()
 
+    def collector_done(name: str, count: int, error: str | None = None) -> None:
+        data = {
+            "run_id": discovery_run.id,
+            "stage": "collector",
+            "collector": name,
+            "count": count,
+            "error": error,
+        }
+        record_event(session, "discovery", data)
+        session.commit()
+
     all_hosts: list[DiscoveredHost] = []
     mac_to_port: dict[str, str] = {}
 
     # Run host collectors
-    collector_results = _run_host_collectors(config)
+    collector_results = _run_host_collectors(
+        config, lambda result: collector_done(result.name, len(result.hosts), result.error)
+    )
     for result in collector_results:
         if result.error:
             errors.append(f"{result.name}: {result.error}")
@@ -85,10 +107,12 @@ def run_discovery() -> DiscoveryResult:
             switch_collector = SwitchCollector(config.switches)
             mac_to_port = switch_collector.collect()
             logger.info(f"Collected {len(mac_to_port)} MAC-to-port mappings from switches")
+            collector_done("switches", len(mac_to_port))
         except Exception as e:
             error_msg = f"Switch MAC collection failed: {e}"
             logger.error(error_msg)
             errors.append(error_msg)
+            collector_done("switches", 0, str(e))
 
     # Merge hosts and persist
     try:
@@ -99,6 +123,7 @@ def run_discovery() -> DiscoveryResult:
         error_msg = f"Failed to persist discovery results: {e}"
         logger.error(error_msg)
         errors.append(error_msg)
+        session.rollback()
         new_count, updated_count = 0, 0
 
     # Update discovery run status
@@ -107,6 +132,18 @@ def run_discovery() -> DiscoveryResult:
     else:
         discovery_run.status = DiscoveryStatus.COMPLETED.value
     discovery_run.completed_at = datetime.now(UTC)
+    record_event(
+        session,
+        "discovery",
+        {
+            "run_id": discovery_run.id,
+            "stage": "completed",
+            "status": discovery_run.status,
+            "new_hosts": new_count,
+            "updated_hosts": updated_count,
+            "errors": errors,
+        },
+    )
     session.commit()
     session.close()
 
@@ -118,7 +155,9 @@ def run_discovery() -> DiscoveryResult:
     )
 
 
-def _run_host_collectors(config: Config) -> list[CollectorResult]:
+def _run_host_collectors(
+    config: Config, on_result: Callable[[CollectorResult], None] | None = None
+) -> list[CollectorResult]:
     """Run all configured host collectors.
 
     Instantiates and runs collectors based on what's configured:
@@ -128,6 +167,7 @@ def _run_host_collectors(config: Config) -> list[CollectorResult]:
 
     Args:
         config: Application configuration.
+        on_result: Called with each collector's result as it finishes.
 
     Returns:
         List of CollectorResult with hosts and any errors.
@@ -145,6 +185,7 @@ def _run_host_collectors(config: Config) -> list[CollectorResult]:
             error_msg = str(e)
             logger.error(f"DHCP collector failed: {error_msg}")
             results.append(CollectorResult(name="MikroTik DHCP", hosts=[], error=error_msg))
+        _report(results, on_result)
 
     # Proxmox collector
     if config.proxmox:
@@ -157,6 +198,7 @@ def _run_host_collectors(config: Config) -> list[CollectorResult]:
             error_msg = str(e)
             logger.error(f"Proxmox collector failed: {error_msg}")
             results.append(CollectorResult(name="Proxmox", hosts=[], error=error_msg))
+        _report(results, on_result)
 
     # Scanner collector
     if config.scanner and config.scanner.subnets:
@@ -169,10 +211,19 @@ def _run_host_collectors(config: Config) -> list[CollectorResult]:
             error_msg = str(e)
             logger.error(f"Scanner collector failed: {error_msg}")
             results.append(CollectorResult(name="network-scanner", hosts=[], error=error_msg))
+        _report(results, on_result)
 
     return results
 
 
+def _report(
+    results: list[CollectorResult], on_result: Callable[[CollectorResult], None] | None
+) -> None:
+    """Pass the latest collector result to the progress callback, if any."""
+    if on_result is not None:
+        on_result(results[-1])
+
+
 def _merge_and_persist(
     session: Session,
     all_hosts: list[DiscoveredHost],
@@ -183,7 +234,8 @@ def _merge_and_persist(
 
     Groups hosts by MAC address, merges IP addresses from all sources,
     picks hostname by priority (dhcp > proxmox > scan), applies switch
-    port mappings, and creates or updates Host records.
+    port mappings, and creates or updates Host records. A host event is
+    recorded for each, committed with the hosts.
 
     Args:
         session: Database session.
@@ -204,6 +256,7 @@ def _merge_and_persist(
 
     new_count = 0
     updated_count = 0
+    changed: list[tuple[Host, str]] = []
 
     # Get IPv6 preference from config
     include_ipv6 = get_config().discovery.include_ipv6
@@ -234,8 +287,12 @@ def _merge_and_persist(
             existing.ip_addresses = list(all_ips) if all_ips else existing.ip_addresses
             existing.switch_port = switch_port or existing.switch_port
             existing.discovery_run_id = discovery_run.id
+            # Pushed hosts whose pushed fields changed need a NetBox update
+            if existing.push_fingerprint is not None:
+                existing.drifted = existing.fingerprint() != existing.push_fingerprint
             # last_seen is auto-updated via onupdate
             updated_count += 1
+            changed.append((existing, "updated"))
             logger.debug(f"Updated host: {mac} ({hostname or 'no hostname'})")
         else:
             # Create new host
@@ -249,12 +306,32 @@ def _merge_and_persist(
             )
             session.add(new_host)
             new_count += 1
+            changed.append((new_host, "created"))
             logger.debug(f"New host: {mac} ({hostname or 'no hostname'})")
 
+    _record_host_events(session, changed)
     session.commit()
     return new_count, updated_count
 
 
+def _record_host_events(session: Session, changed: list[tuple[Host, str]]) -> None:
+    """Record a host event for each created or updated host.
+
+    Flushes the hosts first; their database-generated last_seen values are
+    then loaded in chunks rather than one query per host.
+
+    Args:
+        session: Database session holding the changed hosts.
+        changed: (host, 'created' or 'updated') pairs.
+    """
+    session.flush()
+    for start in range(0, len(changed), EVENT_LOAD_CHUNK):
+        chunk = changed[start : start + EVENT_LOAD_CHUNK]
+        session.query(Host).filter(Host.id.in_([host.id for host, _ in chunk])).all()
+        for host, action in chunk:
+            record_event(session, "host", host_event(host, action))
+
+
 def _pick_hostname(hosts: list[DiscoveredHost]) -> str | None:
     """Pick the best hostname from multiple discovered host records.
 
@@ -4,127 +4,1052 @@ Provides functions to generate Unbound local-data configuration and
 push it to Unbound servers via SSH.
 """
 
+import hashlib
+import ipaddress
 import logging
-from datetime import datetime
+import os
+import posixpath
+import re
+import shlex
+import tempfile
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import chain
+from threading import Lock
+from typing import Any
 
 import paramiko
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
-from netbox_auto.config import get_config
-from netbox_auto.models import Host
+from netbox_auto.config import UnboundConfig, UnboundHostConfig, get_config
+from netbox_auto.models import DnsPushState, Host, HostStatus
 
 logger = logging.getLogger(__name__)
 
+IPAddress = ipaddress.IPv4Address | ipaddress.IPv6Address
+IPNetwork = ipaddress.IPv4Network | ipaddress.IPv6Network
 
-def generate_unbound_config(hosts: list[Host], domain: str = "lan") -> str:
+# Zone key of the forward (A/AAAA) records, which go to the configured config_path
+FORWARD_ZONE = ""
+
+# Suffixes of the sibling files a config is uploaded to before replacing the
+# original, and the previous config is kept in for rollback
+TEMP_SUFFIX = ".netbox-auto.tmp"
+BACKUP_SUFFIX = ".netbox-auto.bak"
+
+# Characters read from the spooled config per SFTP write
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# Minimal config unbound-checkconf validates an uploaded fragment through
+_CHECK_WRAPPER = """server:
+    chroot: ""
+    username: ""
+    include: "{path}"
+"""
+
+_LOCAL_DATA = re.compile(r'^local-data: "(.*)"$')
+_LOCAL_DATA_PTR = re.compile(r'^local-data-ptr: "(\S+) (\S+)"$')
+
+# awk program for _apply_record_delta: the first n stdin lines are names to
+# remove, the rest records to add; exits non-zero if either command fails
+_DELTA_PROGRAM = """
+BEGIN { rm = "unbound-control local_datas_remove"; add = "unbound-control local_datas" }
+NR <= n { print | rm; next }
+!added { if (n && close(rm)) status = 1; added = 1 }
+{ print | add }
+END {
+    if (!added && n && close(rm)) status = 1
+    if (added && close(add)) status = 1
+    exit status
+}
+"""
+
+
+@dataclass(frozen=True)
+class ReverseZone:
+    """Reverse DNS zone and the configured networks it holds PTR records for."""
+
+    name: str  # e.g. "0.0.10.in-addr.arpa"
+    networks: tuple[IPNetwork, ...]
+    zone_type: str = "static"
+
+    def contains(self, address: IPAddress) -> bool:
+        """Check whether an address falls in one of the zone's networks."""
+        return any(address in network for network in self.networks)
+
+
+def reverse_zones(cidrs: Iterable[str], zone_type: str = "static") -> list[ReverseZone]:
+    """Group networks into reverse zones.
+
+    Zones are cut on label boundaries (octets for IPv4, nibbles for IPv6), so
+    e.g. 10.0.0.0/22 belongs to 0.10.in-addr.arpa; networks sharing a zone
+    are grouped into it.
+
+    Args:
+        cidrs: Networks in CIDR notation.
+        zone_type: Unbound local-zone type declared for each zone.
+
+    Returns:
+        Reverse zones in order of first appearance.
+
+    Raises:
+        ValueError: If a network is not valid CIDR notation.
+    """
+    networks: dict[str, list[IPNetwork]] = {}
+    for cidr in cidrs:
+        network = ipaddress.ip_network(cidr, strict=False)
+        networks.setdefault(_reverse_zone_name(network), []).append(network)
+    return [ReverseZone(name, tuple(nets), zone_type) for name, nets in networks.items()]
+
+
+def _reverse_zone_name(network: IPNetwork) -> str:
+    """Name of the reverse zone enclosing a network."""
+    bits_per_label = 8 if network.version == 4 else 4
+    labels = network.network_address.reverse_pointer.split(".")
+    address_labels = network.max_prefixlen // bits_per_label
+    kept = network.prefixlen // bits_per_label
+    return ".".join(labels[address_labels - kept :])
+
+
+def generate_unbound_config(
+    hosts: list[Host], domain: str = "lan", zones: Sequence[ReverseZone] = ()
+) -> str:
     """Generate Unbound local-data configuration from hosts.
 
+    Output is deterministic: records are deduplicated and sorted by hostname
+    and address, and the header carries no timestamp, so the same hosts
+    always produce the same bytes and digest. stream_unbound_config()
+    produces the same output straight from the database.
+
     Args:
         hosts: List of Host objects to generate DNS records for.
         domain: Domain suffix for hostnames (default: "lan").
+        zones: Reverse zones to declare and add PTR records to.
 
     Returns:
-        Unbound local-data configuration as a string.
+        Unbound configuration as a string: A/AAAA records, followed by each
+        reverse zone's declaration and PTR records.
     """
-    lines = [
-        "# Unbound local-data configuration",
-        f"# Generated by netbox-auto at {datetime.utcnow().isoformat()}Z",
-        f"# Total hosts: {len(hosts)}",
-        "",
-    ]
+    return "".join(generate_unbound_zones(hosts, domain, zones).values())
+
+
+def generate_unbound_zones(
+    hosts: list[Host], domain: str = "lan", zones: Sequence[ReverseZone] = ()
+) -> dict[str, str]:
+    """Generate the Unbound config split into one file per zone.
+
+    Args:
+        hosts: List of Host objects to generate DNS records for.
+        domain: Domain suffix for hostnames (default: "lan").
+        zones: Reverse zones to declare and add PTR records to.
 
-    for host in hosts:
-        if not host.hostname:
-            logger.debug(f"Skipping host {host.mac} - no hostname")
+    Returns:
+        Mapping of zone name to config; "" holds the A/AAAA records, and
+        reverse zones follow in order.
+    """
+    rows = sorted(
+        ((host.hostname, host.ip_addresses, host.mac) for host in hosts),
+        key=lambda row: (row[0] or "", row[2]),
+    )
+    config = {FORWARD_ZONE: "".join(_config_lines(rows, len(hosts), domain))}
+    for zone in zones:
+        config[zone.name] = "".join(_zone_lines(rows, zone, domain))
+    return config
+
+
+def stream_unbound_config(
+    session: Session,
+    domain: str = "lan",
+    chunk_size: int = 1000,
+    zones: Sequence[ReverseZone] = (),
+) -> Iterator[str]:
+    """Generate the Unbound config for all pushed hosts in chunks.
+
+    Only the hostname, IP and MAC columns are read, through a streaming
+    cursor, so memory use does not grow with the number of hosts.
+
+    Args:
+        session: DB session.
+        domain: Domain suffix for hostnames (default: "lan").
+        chunk_size: Rows fetched, and config lines yielded, at a time.
+        zones: Reverse zones to declare and add PTR records to.
+
+    Yields:
+        Consecutive pieces of the config, each ending in a newline.
+    """
+    for chunks in stream_unbound_zones(session, domain, chunk_size, zones).values():
+        yield from chunks
+
+
+def stream_unbound_zones(
+    session: Session,
+    domain: str = "lan",
+    chunk_size: int = 1000,
+    zones: Sequence[ReverseZone] = (),
+) -> dict[str, Iterator[str]]:
+    """Generate the Unbound config for all pushed hosts, one file per zone.
+
+    Each zone is generated lazily, by its own streaming pass over the hosts,
+    when its iterator is consumed.
+
+    Args:
+        session: DB session.
+        domain: Domain suffix for hostnames (default: "lan").
+        chunk_size: Rows fetched, and config lines yielded, at a time.
+        zones: Reverse zones to declare and add PTR records to.
+
+    Returns:
+        Mapping of zone name to config chunks, keyed like
+        generate_unbound_zones().
+    """
+
+    def _forward() -> Iterator[str]:
+        pushed = Host.status == HostStatus.PUSHED.value
+        host_count = session.scalar(select(func.count()).select_from(Host).where(pushed)) or 0
+        rows = _pushed_rows(session, chunk_size)
+        yield from _chunked(_config_lines(rows, host_count, domain), chunk_size)
+
+    def _reverse(zone: ReverseZone) -> Iterator[str]:
+        rows = _pushed_rows(session, chunk_size)
+        yield from _chunked(_zone_lines(rows, zone, domain), chunk_size)
+
+    config = {FORWARD_ZONE: _forward()}
+    for zone in zones:
+        config[zone.name] = _reverse(zone)
+    return config
+
+
+def _pushed_rows(session: Session, chunk_size: int) -> Iterator[tuple[str | None, Any, str]]:
+    """Stream (hostname, IP addresses, MAC) of pushed hosts, ordered by hostname."""
+    statement = (
+        select(Host.hostname, Host.ip_addresses, Host.mac)
+        .where(Host.status == HostStatus.PUSHED.value)
+        .order_by(Host.hostname, Host.mac)
+        .execution_options(yield_per=chunk_size)
+    )
+    for row in session.execute(statement):
+        yield row.hostname, row.ip_addresses, row.mac
+
+
+def _chunked(lines: Iterable[str], size: int) -> Iterator[str]:
+    """Join lines into chunks of up to `size` lines."""
+    chunk: list[str] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield "".join(chunk)
+            chunk.clear()
+    if chunk:
+        yield "".join(chunk)
+
+
+def _config_lines(
+    rows: Iterable[tuple[str | None, Any, str]], host_count: int, domain: str
+) -> Iterator[str]:
+    """Generate the forward config lines from (hostname, IP addresses, MAC) rows.
+
+    Args:
+        rows: Host rows ordered by hostname.
+        host_count: Number of hosts, for the header.
+        domain: Domain suffix for hostnames.
+
+    Yields:
+        Config lines, each ending in a newline.
+    """
+    yield "# Unbound local-data configuration\n"
+    yield "# Generated by netbox-auto\n"
+    yield f"# Total hosts: {host_count}\n"
+    yield "\n"
+
+    for records in _host_records(rows, domain):
+        for fqdn, address in records:
+            record_type = "A" if address.version == 4 else "AAAA"
+            yield f'local-data: "{fqdn}. {record_type} {address}"\n'
+
+
+def _zone_lines(
+    rows: Iterable[tuple[str | None, Any, str]], zone: ReverseZone, domain: str
+) -> Iterator[str]:
+    """Generate a reverse zone's declaration and PTR lines.
+
+    Args:
+        rows: Host rows ordered by hostname.
+        zone: Reverse zone to generate.
+        domain: Domain suffix for hostnames.
+
+    Yields:
+        Config lines, each ending in a newline.
+    """
+    yield f"# Unbound reverse zone {zone.name}\n"
+    yield "# Generated by netbox-auto\n"
+    yield "\n"
+    yield f'local-zone: "{zone.name}." {zone.zone_type}\n'
+
+    for records in _host_records(rows, domain):
+        for fqdn, address in records:
+            if zone.contains(address):
+                yield f'local-data-ptr: "{address} {fqdn}"\n'
+
+
+def _host_records(
+    rows: Iterable[tuple[str | None, Any, str]], domain: str
+) -> Iterator[list[tuple[str, IPAddress]]]:
+    """Group rows by hostname into sorted, deduplicated (FQDN, address) records.
+
+    Args:
+        rows: Host rows ordered by hostname.
+        domain: Domain suffix for hostnames.
+
+    Yields:
+        Each hostname's records, sorted by name and address.
+    """
+    current: str | None = None
+    records: set[tuple[str, IPAddress]] = set()
+    for hostname, ip_addresses, mac in rows:
+        if not hostname:
+            logger.debug(f"Skipping host {mac} - no hostname")
             continue
 
-        hostname = host.hostname
+        if hostname != current:
+            if records:
+                yield sorted(records, key=_record_sort_key)
+            records = set()
+            current = hostname
+
         # Add domain suffix if hostname doesn't already have one
         fqdn = f"{hostname}.{domain}" if "." not in hostname else hostname
 
         # Handle multiple IPs per host
-        ip_addresses = host.ip_addresses if isinstance(host.ip_addresses, list) else []
-        if not ip_addresses:
+        if not isinstance(ip_addresses, list) or not ip_addresses:
             logger.debug(f"Skipping host {hostname} - no IP addresses")
             continue
 
         for ip in ip_addresses:
             # Strip any prefix length (e.g., "192.168.1.1/24" -> "192.168.1.1")
             ip_clean = ip.split("/")[0] if "/" in ip else ip
-            lines.append(f'local-data: "{fqdn}. A {ip_clean}"')
+            try:
+                records.add((fqdn, ipaddress.ip_address(ip_clean)))
+            except ValueError:
+                logger.warning(f"Skipping invalid IP {ip!r} of host {hostname}")
+
+    if records:
+        yield sorted(records, key=_record_sort_key)
+
+
+def _record_sort_key(record: tuple[str, IPAddress]) -> tuple[str, int, int]:
+    """Sort key ordering records by name, then numerically by address."""
+    fqdn, address = record
+    return (fqdn, address.version, int(address))
+
+
+def config_digest(config: str) -> str:
+    """Compute the digest used to detect unchanged Unbound configs.
+
+    Args:
+        config: Unbound configuration string.
+
+    Returns:
+        sha256 hex digest of the UTF-8 encoded config.
+    """
+    return hashlib.sha256(config.encode()).hexdigest()
+
+
+@dataclass
+class DnsPushResult:
+    """Per-server outcome of a DNS push."""
+
+    updated: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)  # Already serving this config
+    failed: dict[str, str] = field(default_factory=dict)  # Server -> error message
+
+
+class SSHConnectionPool:
+    """SSH connections to Unbound servers, opened on demand and reused.
+
+    A pool passed to several push_dns_config() calls keeps its connections
+    open between pushes; dead connections are reopened transparently.
+    Thread-safe for concurrent use with distinct servers.
+    """
+
+    def __init__(self, connect_timeout: float = 10.0, keepalive: int = 30, compress: bool = False):
+        """Create an empty pool.
+
+        Args:
+            connect_timeout: TCP, banner and authentication timeout in seconds.
+            keepalive: SSH keepalive interval in seconds (0 = disabled).
+            compress: If True, negotiate SSH transport compression.
+        """
+        self.connect_timeout = connect_timeout
+        self.keepalive = keepalive
+        self.compress = compress
+        self._clients: dict[tuple[str, str], paramiko.SSHClient] = {}
+        self._lock = Lock()
+
+    def get(self, host: str, user: str) -> paramiko.SSHClient:
+        """Get a connected client for a server, connecting if needed.
+
+        Args:
+            host: SSH hostname or IP.
+            user: SSH username.
+
+        Returns:
+            Connected SSH client.
+        """
+        with self._lock:
+            client = self._clients.get((host, user))
+        if client is not None:
+            transport = client.get_transport()
+            if transport is not None and transport.is_active():
+                return client
+            client.close()
+
+        logger.info(f"Connecting to {user}@{host}...")
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        # Connect using key-based authentication (agent or default key)
+        client.connect(
+            hostname=host,
+            username=user,
+            timeout=self.connect_timeout,
+            banner_timeout=self.connect_timeout,
+            auth_timeout=self.connect_timeout,
+            compress=self.compress,
+        )
+        transport = client.get_transport()
+        if transport is not None and self.keepalive:
+            transport.set_keepalive(self.keepalive)
+        logger.info(f"Connected to {host}")
+
+        with self._lock:
+            self._clients[(host, user)] = client
+        return client
 
-    lines.append("")  # Trailing newline
-    return "\n".join(lines)
+    def discard(self, host: str, user: str) -> None:
+        """Close and forget a server's connection, e.g. after an error."""
+        with self._lock:
+            client = self._clients.pop((host, user), None)
+        if client is not None:
+            client.close()
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
 
 
-def push_dns_config(config: str, dry_run: bool = False) -> list[str]:
+def push_dns_config(
+    config: str | Iterable[str] | Mapping[str, str | Iterable[str]],
+    dry_run: bool = False,
+    session: Session | None = None,
+    pool: SSHConnectionPool | None = None,
+) -> DnsPushResult:
     """Push Unbound configuration to all configured servers via SSH.
 
+    Servers are updated concurrently (`unbound.workers`), and a failure on
+    one server does not stop the others. Config files a server already
+    serves are skipped, so Unbound is only reloaded (flushing its caches)
+    when records changed. A file counts as unchanged when the digest
+    recorded for its last push matches, or, with `unbound.verify_remote`,
+    when the checksum of the file on the server matches.
+
+    Per-zone configs (see stream_unbound_zones()) are concatenated into
+    config_path, or with `unbound.split_zones` written to one file per zone
+    so only changed zones are transferred. Zone files no longer generated
+    are removed.
+
+    Each config file is spooled to a local temporary file while its digest
+    is computed, then streamed from there to each server, so a config
+    generated in chunks is never held in memory whole.
+
     Args:
-        config: Unbound local-data configuration string.
+        config: Unbound configuration, as a string, in chunks, or as a
+            mapping of zone name to either.
         dry_run: If True, only log what would happen without connecting.
+        session: DB session holding the per-server push digests. Without one,
+            every server is updated. Recorded digests are flushed, not
+            committed.
+        pool: Connections to reuse. Without one, connections are opened for
+            this push and closed when it finishes.
 
     Returns:
-        List of hostnames that were successfully updated.
-
-    Raises:
-        Exception: If SSH connection or command execution fails.
+        DnsPushResult listing updated, skipped and failed servers.
     """
-    app_config = get_config()
-    unbound_config = app_config.unbound
-    updated_hosts: list[str] = []
+    unbound_config = get_config().unbound
+    result = DnsPushResult()
 
     if not unbound_config.hosts:
         logger.warning("No Unbound hosts configured - skipping DNS push")
-        return updated_hosts
+        return result
+
+    zones = config if isinstance(config, Mapping) else {FORWARD_ZONE: config}
+    if not unbound_config.split_zones:
+        zones = {FORWARD_ZONE: chain.from_iterable(_chunks(content) for content in zones.values())}
+
+    with_records = unbound_config.update_mode == "delta"
+    payloads: dict[str, _DnsPayload] = {}
+    try:
+        for zone, content in zones.items():
+            payloads[zone] = _spool_config(content, with_records)
+        return _push_payloads(unbound_config, payloads, dry_run, session, pool)
+    finally:
+        for payload in payloads.values():
+            os.unlink(payload.path)
+
+
+def zone_config_path(config_path: str, zone: str) -> str:
+    """Path of the file a zone is written to with split zones.
+
+    Args:
+        config_path: Configured path of the Unbound config.
+        zone: Zone name, or FORWARD_ZONE.
+
+    Returns:
+        config_path for the forward zone, else e.g.
+        /etc/unbound/local.d/local.0.0.10.in-addr.arpa.conf.
+    """
+    if zone == FORWARD_ZONE:
+        return config_path
+    root, ext = posixpath.splitext(config_path)
+    return f"{root}.{zone}{ext}"
+
+
+def _is_zone_file(config_path: str, path: str) -> bool:
+    """Check whether a path is a reverse zone file generated for config_path."""
+    root, ext = posixpath.splitext(config_path)
+    return path.startswith(f"{root}.") and path.endswith(f".arpa{ext}")
 
-    for host_config in unbound_config.hosts:
-        host = host_config.host
-        user = host_config.user
-        config_path = host_config.config_path
 
-        if dry_run:
-            logger.info(f"[DRY RUN] Would connect to {user}@{host}")
-            logger.info(f"[DRY RUN] Would write config to {config_path}")
+def _chunks(content: str | Iterable[str]) -> Iterable[str]:
+    """Treat a config string as a single chunk."""
+    return [content] if isinstance(content, str) else content
+
+
+@dataclass(frozen=True)
+class _DnsPayload:
+    """Config file being pushed, spooled to a local file, with its digest."""
+
+    path: str
+    digest: str
+    # local-data records, collected for delta updates only
+    records: list[str] | None
+
+
+@dataclass(frozen=True)
+class _FileUpdate:
+    """One config file to install on a server."""
+
+    path: str  # Path on the server
+    payload: _DnsPayload
+    previous: list[str] | None  # Records last pushed to this path, if recorded
+
+
+@dataclass(frozen=True)
+class _ServerUpdate:
+    """Changes to make on one server."""
+
+    host_config: UnboundHostConfig
+    files: list[_FileUpdate]
+    stale: list[str]  # Zone files to remove
+
+
+def _push_payloads(
+    unbound_config: UnboundConfig,
+    payloads: dict[str, _DnsPayload],
+    dry_run: bool,
+    session: Session | None,
+    pool: SSHConnectionPool | None,
+) -> DnsPushResult:
+    """Push spooled config files to the configured servers; see push_dns_config()."""
+    result = DnsPushResult()
+    states = _load_push_states(session) if session is not None else {}
+
+    targets: list[_ServerUpdate] = []
+    for host_config in unbound_config.hosts:
+        update = _plan_server_update(unbound_config, host_config, payloads, states)
+        if not update.files and not update.stale:
+            logger.info(f"DNS config on {host_config.host} unchanged - skipping")
+            result.skipped.append(host_config.host)
+        elif dry_run:
+            logger.info(f"[DRY RUN] Would connect to {host_config.user}@{host_config.host}")
+            for file in update.files:
+                logger.info(f"[DRY RUN] Would write config to {file.path}")
+            for path in update.stale:
+                logger.info(f"[DRY RUN] Would remove {path}")
             logger.info("[DRY RUN] Would run: sudo unbound-control reload")
-            updated_hosts.append(host)
-            continue
+            result.updated.append(host_config.host)
+        else:
+            targets.append(update)
 
-        logger.info(f"Connecting to {user}@{host}...")
+    if not targets:
+        return result
 
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    own_pool = pool is None
+    active_pool = pool or SSHConnectionPool(
+        connect_timeout=unbound_config.connect_timeout,
+        keepalive=unbound_config.keepalive,
+        compress=unbound_config.compress,
+    )
+    try:
+        with ThreadPoolExecutor(
+            max_workers=min(unbound_config.workers, len(targets)),
+            thread_name_prefix="dns-push",
+        ) as executor:
+            futures = [
+                executor.submit(_push_to_server, active_pool, unbound_config, update)
+                for update in targets
+            ]
+            # Results are collected in config order; the session stays on this thread
+            for update, future in zip(targets, futures, strict=True):
+                host = update.host_config.host
+                try:
+                    changed = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to update DNS on {host}: {e}")
+                    result.failed[host] = str(e)
+                    continue
+                (result.updated if changed else result.skipped).append(host)
+                if session is not None:
+                    for file in update.files:
+                        _record_push_state(session, states, host, file.path, file.payload)
+                    for path in update.stale:
+                        session.delete(states.pop((host, path)))
+                    session.flush()
+    finally:
+        if own_pool:
+            active_pool.close()
 
+    return result
+
+
+def _plan_server_update(
+    unbound_config: UnboundConfig,
+    host_config: UnboundHostConfig,
+    payloads: dict[str, _DnsPayload],
+    states: dict[tuple[str, str], DnsPushState],
+) -> _ServerUpdate:
+    """Work out which config files a server needs, based on recorded pushes.
+
+    Args:
+        unbound_config: Unbound push settings.
+        host_config: Server to update.
+        payloads: Spooled config files by zone.
+        states: Recorded pushes by (server, path).
+
+    Returns:
+        Files to install (all of them with verify_remote, which checks on the
+        server instead) and stale zone files to remove.
+    """
+    host = host_config.host
+    files = []
+    for zone, payload in payloads.items():
+        path = zone_config_path(host_config.config_path, zone)
+        state = states.get((host, path))
+        if unbound_config.verify_remote or state is None or state.digest != payload.digest:
+            # Delta updates need the records the server was last given
+            previous = state.records if state is not None else None
+            files.append(_FileUpdate(path, payload, previous))
+
+    paths = {zone_config_path(host_config.config_path, zone) for zone in payloads}
+    stale = [
+        path
+        for server, path in states
+        if server == host and path not in paths and _is_zone_file(host_config.config_path, path)
+    ]
+    return _ServerUpdate(host_config, files, stale)
+
+
+def _spool_config(config: str | Iterable[str], with_records: bool) -> _DnsPayload:
+    """Write a config to a local temporary file, computing its digest.
+
+    Args:
+        config: Config string or chunks.
+        with_records: If True, also collect the config's local-data records.
+
+    Returns:
+        Payload referring to the spooled file, which the caller must delete.
+    """
+    sha256 = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", prefix="netbox-auto-dns-", suffix=".conf", delete=False
+    ) as f:
         try:
-            # Connect using key-based authentication (agent or default key)
-            client.connect(hostname=host, username=user)
-            logger.info(f"Connected to {host}")
+            for chunk in _chunks(config):
+                sha256.update(chunk.encode())
+                f.write(chunk)
+        except BaseException:
+            os.unlink(f.name)
+            raise
 
-            # Write config file via SFTP
-            sftp = client.open_sftp()
-            try:
-                logger.info(f"Writing config to {config_path}")
-                with sftp.file(config_path, "w") as f:
-                    f.write(config)
-            finally:
-                sftp.close()
-
-            # Reload Unbound
-            logger.info("Reloading Unbound...")
-            _stdin, stdout, stderr = client.exec_command("sudo unbound-control reload")
-            exit_status = stdout.channel.recv_exit_status()
-
-            if exit_status != 0:
-                error_output = stderr.read().decode().strip()
-                raise RuntimeError(f"unbound-control reload failed: {error_output}")
-
-            logger.info(f"Successfully updated DNS on {host}")
-            updated_hosts.append(host)
-
-        except Exception as e:
-            logger.error(f"Failed to update DNS on {host}: {e}")
+    records = None
+    if with_records:
+        with open(f.name, encoding="utf-8") as spooled:
+            records = unbound_records(spooled)
+    return _DnsPayload(f.name, sha256.hexdigest(), records)
+
+
+def _push_to_server(
+    pool: SSHConnectionPool, unbound_config: UnboundConfig, update: _ServerUpdate
+) -> bool:
+    """Write config files to one server and make Unbound serve them.
+
+    Each file is replaced atomically and stale zone files are removed. In
+    delta mode, when the records last pushed to every changed file are
+    known, only the record changes are applied to the running Unbound;
+    otherwise Unbound is reloaded once.
+
+    Args:
+        pool: Connection pool to get the server's connection from.
+        unbound_config: Unbound push settings.
+        update: Files to install and remove.
+
+    Returns:
+        True if the server was updated, False if it already served the config.
+
+    Raises:
+        Exception: If connecting, uploading or updating Unbound fails.
+    """
+    host_config = update.host_config
+    host = host_config.host
+    timeout = unbound_config.command_timeout
+
+    try:
+        client = pool.get(host, host_config.user)
+
+        files = update.files
+        if unbound_config.verify_remote:
+            files = [
+                file
+                for file in files
+                if _remote_digest(client, file.path, timeout) != file.payload.digest
+            ]
+        if not files and not update.stale:
+            logger.info(f"DNS config on {host} unchanged - skipping")
+            return False
+
+        delta = (
+            unbound_config.update_mode == "delta"
+            and not update.stale
+            and all(file.previous is not None for file in files)
+        )
+        installed: list[str] = []
+        delta_attempted = False
+        try:
+            for file in files:
+                logger.info(f"Writing config to {host}:{file.path}")
+                _install_config(
+                    client, file.path, file.payload.path, unbound_config.check_config, timeout
+                )
+                installed.append(file.path)
+            if update.stale:
+                logger.info(f"Removing stale zone files on {host}: {', '.join(update.stale)}")
+                _remove_files(client, update.stale, timeout)
+
+            if delta:
+                names, records = _combined_delta(files)
+                logger.info(
+                    f"Applying DNS delta on {host}: {len(names)} names removed, "
+                    f"{len(records)} records added"
+                )
+                delta_attempted = True
+                _apply_record_delta(client, names, records, timeout)
+            else:
+                logger.info(f"Reloading Unbound on {host}...")
+                _reload_unbound(client, timeout)
+        except Exception:
+            for path in installed:
+                _rollback_config(client, path, timeout)
+            # A failed delta may have removed names without adding them back;
+            # reload so Unbound serves the restored files
+            if installed or delta_attempted:
+                try:
+                    _reload_unbound(client, timeout)
+                except Exception as e:
+                    logger.error(f"Reloading restored config on {host} failed: {e}")
             raise
 
-        finally:
-            client.close()
+    except Exception:
+        # Don't reuse a connection left in an unknown state
+        pool.discard(host, host_config.user)
+        raise
+
+    logger.info(f"Successfully updated DNS on {host}")
+    return True
+
+
+def _combined_delta(files: list[_FileUpdate]) -> tuple[list[str], list[str]]:
+    """Merge the record deltas of several config files.
+
+    Returns:
+        Tuple of (names to remove, records to add), both sorted.
+    """
+    names: set[str] = set()
+    records: set[str] = set()
+    for file in files:
+        file_names, file_records = record_delta(file.previous or [], file.payload.records or [])
+        names.update(file_names)
+        records.update(file_records)
+    return sorted(names), sorted(records)
+
+
+def _remove_files(client: paramiko.SSHClient, paths: list[str], timeout: float) -> None:
+    """Remove files on a server.
+
+    Raises:
+        RuntimeError: If the removal fails.
+    """
+    quoted = " ".join(shlex.quote(path) for path in paths)
+    exit_status, _output, error_output = _run_command(client, f"rm -f -- {quoted}", timeout)
+    if exit_status != 0:
+        raise RuntimeError(f"Removing {', '.join(paths)} failed: {error_output}")
+
+
+def _install_config(
+    client: paramiko.SSHClient, config_path: str, source: str, check: bool, timeout: float
+) -> None:
+    """Replace a remote config file atomically, keeping a backup of the old one.
+
+    The config is uploaded to a temporary sibling file, synced to disk and
+    optionally validated with unbound-checkconf. Only then is the previous
+    file hard-linked to a backup and the new one renamed over it, so the
+    live path never holds a partial or invalid config.
 
-    return updated_hosts
+    Args:
+        client: Connected SSH client.
+        config_path: Path of the config on the server.
+        source: Local file holding the config, copied in chunks.
+        check: If True, validate the config with unbound-checkconf first.
+        timeout: SFTP and command timeout in seconds.
+
+    Raises:
+        RuntimeError: If validation or installing the file fails.
+    """
+    temp_path = f"{config_path}{TEMP_SUFFIX}"
+    sftp = client.open_sftp()
+    try:
+        channel = sftp.get_channel()
+        if channel is not None:
+            channel.settimeout(timeout)
+        with open(source, encoding="utf-8") as local, sftp.file(temp_path, "w") as f:
+            while chunk := local.read(UPLOAD_CHUNK_SIZE):
+                f.write(chunk)
+    finally:
+        sftp.close()
+
+    path = shlex.quote(config_path)
+    temp = shlex.quote(temp_path)
+    backup = shlex.quote(f"{config_path}{BACKUP_SUFFIX}")
+    steps = [f"sync -- {temp}"]
+    stdin_data = None
+    if check:
+        # The file is a server-clause fragment: check it through a minimal wrapper
+        steps.append("unbound-checkconf /dev/stdin")
+        stdin_data = _CHECK_WRAPPER.format(path=temp_path)
+    steps += [
+        f"rm -f -- {backup}",
+        f"{{ [ ! -e {path} ] || ln -f -- {path} {backup}; }}",
+        f"mv -f -- {temp} {path}",
+    ]
+    exit_status, output, error_output = _run_command(
+        client, " && ".join(steps), timeout, stdin_data=stdin_data
+    )
+    if exit_status != 0:
+        _run_command(client, f"rm -f -- {temp}", timeout)
+        raise RuntimeError(f"Installing config failed: {error_output or output}")
+
+
+def _reload_unbound(client: paramiko.SSHClient, timeout: float) -> None:
+    """Reload Unbound so it serves the installed config.
+
+    Raises:
+        RuntimeError: If unbound-control reload fails.
+    """
+    exit_status, _output, error_output = _run_command(
+        client, "sudo unbound-control reload", timeout
+    )
+    if exit_status != 0:
+        raise RuntimeError(f"unbound-control reload failed: {error_output}")
+
+
+def _rollback_config(client: paramiko.SSHClient, config_path: str, timeout: float) -> None:
+    """Restore the config backed up by _install_config after a failed update.
+
+    Errors are logged rather than raised so the original failure is reported.
+
+    Args:
+        client: Connected SSH client.
+        config_path: Path of the config on the server.
+        timeout: Command timeout in seconds.
+    """
+    path = shlex.quote(config_path)
+    backup = shlex.quote(f"{config_path}{BACKUP_SUFFIX}")
+    try:
+        exit_status, _output, error_output = _run_command(
+            client,
+            f"if [ -e {backup} ]; then mv -f -- {backup} {path}; else rm -f -- {path}; fi",
+            timeout,
+        )
+        if exit_status != 0:
+            raise RuntimeError(error_output)
+        logger.warning(f"Restored previous config at {config_path}")
+    except Exception as e:
+        logger.error(f"Rolling back {config_path} failed: {e}")
+
+
+def unbound_records(config: str | Iterable[str]) -> list[str]:
+    """Extract the local-data records from an Unbound config.
+
+    Args:
+        config: Config produced by generate_unbound_config(), or its lines.
+
+    Returns:
+        Resource records (e.g. "host.lan. A 10.0.0.1"), in config order.
+        local-data-ptr lines are returned as the PTR records they define.
+    """
+    lines = config.splitlines() if isinstance(config, str) else config
+    records = []
+    for line in lines:
+        line = line.rstrip("\n")
+        match = _LOCAL_DATA.match(line)
+        if match:
+            records.append(match.group(1))
+            continue
+        match = _LOCAL_DATA_PTR.match(line)
+        if match:
+            address, name = match.groups()
+            pointer = ipaddress.ip_address(address).reverse_pointer
+            records.append(f"{pointer}. PTR {name.rstrip('.')}.")
+    return records
+
+
+def record_delta(previous: list[str], current: list[str]) -> tuple[list[str], list[str]]:
+    """Compute the unbound-control changes turning one record set into another.
+
+    `local_datas_remove` removes names, not single records, so every record
+    still wanted for a name that loses a record is added back.
+
+    Args:
+        previous: Records Unbound serves now.
+        current: Records it should serve.
+
+    Returns:
+        Tuple of (names to remove, records to add), both sorted.
+    """
+    previous_set = set(previous)
+    current_set = set(current)
+    names = {record.split()[0] for record in previous_set - current_set}
+    records = {
+        record for record in current_set if record not in previous_set or record.split()[0] in names
+    }
+    return sorted(names), sorted(records)
+
+
+def _apply_record_delta(
+    client: paramiko.SSHClient, names: list[str], records: list[str], timeout: float
+) -> None:
+    """Apply record changes to a running Unbound in a single remote command.
+
+    Names to remove and records to add are streamed through stdin: awk feeds
+    the first `len(names)` lines to `unbound-control local_datas_remove` and,
+    once that has finished, the rest to `unbound-control local_datas`.
+
+    Args:
+        client: Connected SSH client.
+        names: Names whose local data is removed.
+        records: Records added afterwards.
+        timeout: Command timeout in seconds.
+
+    Raises:
+        RuntimeError: If unbound-control fails.
+    """
+    if not names and not records:
+        return
+    command = f"sudo awk -v n={len(names)} {shlex.quote(_DELTA_PROGRAM)}"
+    exit_status, _output, error_output = _run_command(
+        client, command, timeout, stdin_data="".join(f"{line}\n" for line in names + records)
+    )
+    if exit_status != 0:
+        raise RuntimeError(f"unbound-control local_datas failed: {error_output}")
+
+
+def _run_command(
+    client: paramiko.SSHClient, command: str, timeout: float, stdin_data: str | None = None
+) -> tuple[int, str, str]:
+    """Run a remote command and wait for it to exit.
+
+    Args:
+        client: Connected SSH client.
+        command: Command line to run.
+        timeout: Seconds to wait for output and for the command to exit.
+        stdin_data: Text sent to the command's stdin, which is then closed.
+
+    Returns:
+        Tuple of (exit status, stdout, stderr), with output stripped.
+
+    Raises:
+        TimeoutError: If the command does not exit in time.
+    """
+    stdin, stdout, stderr = client.exec_command(command, timeout=timeout)
+    if stdin_data is not None:
+        stdin.write(stdin_data)
+        stdin.channel.shutdown_write()
+    channel = stdout.channel
+    if not channel.status_event.wait(timeout):
+        channel.close()
+        raise TimeoutError(f"'{command}' timed out after {timeout}s")
+    exit_status: int = channel.recv_exit_status()
+    return exit_status, stdout.read().decode().strip(), stderr.read().decode().strip()
+
+
+def _remote_digest(client: paramiko.SSHClient, config_path: str, timeout: float) -> str | None:
+    """Checksum the config file currently on a server.
+
+    Args:
+        client: Connected SSH client.
+        config_path: Path of the Unbound config on the server.
+        timeout: Command timeout in seconds.
+
+    Returns:
+        sha256 hex digest of the remote file, or None if it cannot be read.
+    """
+    exit_status, output, _error = _run_command(
+        client, f"sha256sum -- {shlex.quote(config_path)}", timeout
+    )
+    if exit_status != 0 or not output:
+        return None
+    return output.split()[0]
+
+
+def _load_push_states(session: Session) -> dict[tuple[str, str], DnsPushState]:
+    """Load the recorded push digests keyed by (server, config path)."""
+    return {(state.server, state.config_path): state for state in session.query(DnsPushState).all()}
+
+
+def _record_push_state(
+    session: Session,
+    states: dict[tuple[str, str], DnsPushState],
+    server: str,
+    config_path: str,
+    payload: _DnsPayload,
+) -> None:
+    """Record the digest and records of the config a server now serves.
+
+    Args:
+        session: DB session to write through.
+        states: Loaded push states, updated in place.
+        server: Unbound server hostname.
+        config_path: Path of the config on the server.
+        payload: Config it serves.
+    """
+    state = states.get((server, config_path))
+    if state is None:
+        state = DnsPushState(server=server, config_path=config_path)
+        session.add(state)
+        states[(server, config_path)] = state
+    state.digest = payload.digest
+    state.records = payload.records
+    session.flush()
@@ -0,0 +1,313 @@
+"""Live events for the web UI.
+
+Discovery runs in the CLI process, so it records its progress and the
+hosts it creates or updates in the event_log table. Each web server
+process tails that table with one background thread and fans new events
+out to its server-sent event (SSE) streams from an in-memory buffer, so
+open streams cost no queries.
+
+Host changes made through the web app are published to the buffer
+directly in single-server mode. With several worker processes they are
+written to event_log too, so every worker's streams see them; in that
+mode event IDs are event_log row IDs and a browser can resume from any
+worker.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session
+
+from netbox_auto.config import ConfigError, WebConfig, get_config
+from netbox_auto.database import get_session
+from netbox_auto.models import EventLog, Host
+
+logger = logging.getLogger(__name__)
+
+# Events kept in event_log, long enough for any browser to reconnect
+EVENT_RETENTION = timedelta(days=1)
+# Events kept in memory per server process for resuming streams
+BUFFER_SIZE = 1000
+# event_log rows read per poll
+TAIL_BATCH = 500
+# Hosts changed at once above which a single 'hosts' summary is published
+HOST_EVENT_LIMIT = 100
+
+
+@dataclass(frozen=True)
+class Event:
+    """An event delivered to SSE streams."""
+
+    id: int
+    # 'discovery', 'host', 'hosts' (summary of a bulk change), or 'reset'
+    # when a stream missed events
+    kind: str
+    data: dict[str, Any]
+
+    def to_sse(self) -> str:
+        """Format as a server-sent event message."""
+        data = json.dumps(self.data, separators=(",", ":"))
+        return f"id: {self.id}\nevent: {self.kind}\ndata: {data}\n\n"
+
+
+def host_event(host: Host, action: str) -> dict[str, Any]:
+    """Build the data of a host event.
+
+    Args:
+        host: Host that changed.
+        action: 'created' or 'updated'.
+
+    Returns:
+        Event data with the action and the host's fields.
+    """
+    return {"action": action, "host": host.to_dict()}
+
+
+def record_event(session: Session, kind: str, data: dict[str, Any]) -> None:
+    """Add an event to event_log in the caller's transaction.
+
+    Args:
+        session: DB session; the event is visible once it commits.
+        kind: Event kind.
+        data: JSON-serializable event data.
+    """
+    session.add(EventLog(kind=kind, data=data))
+
+
+def prune_events(session: Session, max_age: timedelta = EVENT_RETENTION) -> int:
+    """Delete events older than max_age from event_log.
+
+    Args:
+        session: DB session; the caller commits.
+        max_age: Age of the oldest event to keep.
+
+    Returns:
+        Number of events deleted.
+    """
+    cutoff = datetime.now(UTC) - max_age
+    return (
+        session.query(EventLog)
+        .filter(EventLog.created_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+
+
+class EventBus:
+    """Fans events out to the SSE streams of one server process."""
+
+    def __init__(self, shared: bool, poll_interval: float, buffer_size: int = BUFFER_SIZE):
+        """Initialize an empty bus; call start() to begin tailing event_log.
+
+        Args:
+            shared: Whether published events go through event_log, for
+                server setups with several worker processes.
+            poll_interval: Seconds between event_log polls.
+            buffer_size: Events kept for streams to catch up on.
+        """
+        self.shared = shared
+        self.poll_interval = poll_interval
+        self._events: deque[Event] = deque(maxlen=buffer_size)
+        self._last_id = 0
+        self._log_position = 0
+        self._condition = threading.Condition()
+        self._poll_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def last_id(self) -> int:
+        """ID of the newest event, where a new stream starts."""
+        with self._condition:
+            return self._last_id
+
+    def start(self) -> None:
+        """Start tailing event_log from its current end in a daemon thread."""
+        session = get_session()
+        try:
+            prune_events(session)
+            session.commit()
+            self._log_position = session.execute(select(func.max(EventLog.id))).scalar() or 0
+        finally:
+            session.close()
+        if self.shared:
+            self._last_id = self._log_position
+        self._thread = threading.Thread(target=self._tail, name="event-bus", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop tailing event_log."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def publish(self, kind: str, data: dict[str, Any]) -> None:
+        """Deliver an event to every stream served by the bus.
+
+        Args:
+            kind: Event kind.
+            data: JSON-serializable event data.
+        """
+        self.publish_many(kind, [data])
+
+    def publish_many(self, kind: str, items: Iterable[dict[str, Any]]) -> None:
+        """Deliver several events of one kind, in a single write when shared.
+
+        Args:
+            kind: Event kind.
+            items: Data of each event.
+        """
+        if not self.shared:
+            for data in items:
+                self._append(kind, data)
+            return
+        session = get_session()
+        try:
+            for data in items:
+                record_event(session, kind, data)
+            session.commit()
+        finally:
+            session.close()
+        # Deliver to this worker's streams without waiting for the next poll
+        self.poll()
+
+    def _append(self, kind: str, data: dict[str, Any], event_id: int | None = None) -> None:
+        with self._condition:
+            self._last_id = event_id if event_id is not None else self._last_id + 1
+            self._events.append(Event(self._last_id, kind, data))
+            self._condition.notify_all()
+
+    def poll(self) -> int:
+        """Deliver events recorded in event_log since the last poll.
+
+        Returns:
+            Number of events delivered.
+        """
+        with self._poll_lock:
+            session = get_session()
+            try:
+                rows = session.execute(
+                    select(EventLog.id, EventLog.kind, EventLog.data)
+                    .where(EventLog.id > self._log_position)
+                    .order_by(EventLog.id)
+                    .limit(TAIL_BATCH)
+                ).all()
+            finally:
+                session.close()
+            for row in rows:
+                self._append(row.kind, row.data, row.id if self.shared else None)
+                self._log_position = row.id
+            return len(rows)
+
+    def _tail(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                delivered = self.poll()
+            except Exception as e:
+                logger.warning(f"Reading events failed: {e}")
+                delivered = 0
+            # Keep reading without pause while a backlog remains
+            if delivered < TAIL_BATCH:
+                self._stopped.wait(self.poll_interval)
+
+    def wait(self, after: int, timeout: float) -> list[Event]:
+        """Wait for events newer than the given ID.
+
+        Args:
+            after: ID of the last event the stream delivered.
+            timeout: Seconds to wait for a new event.
+
+        Returns:
+            Events after the given ID, in order; empty on timeout. A single
+            'reset' event is returned if some are no longer buffered or the
+            ID is from before a server restart, as the stream must then
+            reload its state.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._last_id > after or (not self.shared and self._last_id < after),
+                timeout,
+            )
+            oldest = self._events[0].id if self._events else self._last_id + 1
+            if after < oldest - 1 or (not self.shared and after > self._last_id):
+                return [Event(self._last_id, "reset", {})]
+            return [event for event in self._events if event.id > after]
+
+
+def publish_host_updates(
+    session: Session, host_ids: list[int] | Select[tuple[int]], change_id: int | None = None
+) -> None:
+    """Publish 'updated' host events for hosts changed through the web app.
+
+    Call after the change commits. The hosts are read before publishing,
+    since a shared bus writes through its own session. Above
+    HOST_EVENT_LIMIT hosts, a single 'hosts' event with the count is
+    published instead, so a bulk change costs one event rather than one
+    per host.
+
+    Args:
+        session: DB session that made the change.
+        host_ids: IDs of the changed hosts, or a query selecting them.
+        change_id: ID of the bulk change, if the hosts changed in one.
+    """
+    if isinstance(host_ids, list):
+        count = len(host_ids)
+    else:
+        count = session.execute(select(func.count()).select_from(host_ids.subquery())).scalar_one()
+    if count > HOST_EVENT_LIMIT:
+        get_event_bus().publish(
+            "hosts", {"action": "updated", "count": count, "change_id": change_id}
+        )
+        return
+
+    hosts = session.query(Host).filter(Host.id.in_(host_ids)).all()
+    if hosts:
+        get_event_bus().publish_many("host", [host_event(host, "updated") for host in hosts])
+
+
+_bus: EventBus | None = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """Get this process's event bus, starting it on first use.
+
+    The mode follows web.event_bus; 'auto' shares events through the
+    database when serving with gunicorn's worker processes.
+
+    Returns:
+        Running EventBus.
+    """
+    global _bus
+
+    with _bus_lock:
+        if _bus is None:
+            try:
+                web_config = get_config().web
+            except ConfigError:
+                # Same defaults as an app created without a loaded config
+                web_config = WebConfig()
+            mode = web_config.event_bus
+            if mode == "auto":
+                mode = "database" if web_config.server == "gunicorn" else "memory"
+            _bus = EventBus(shared=mode == "database", poll_interval=web_config.event_poll_interval)
+            _bus.start()
+    return _bus
+
+
+def _reset_bus_after_fork() -> None:
+    """Forget the parent's bus; its tail thread does not exist in the child."""
+    global _bus, _bus_lock
+    _bus = None
+    _bus_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_bus_after_fork)
@@ -0,0 +1,206 @@
+"""Streaming CSV and JSONL exports of hosts and reconcile results.
+
+Hosts are read from a yield_per cursor and serialized a chunk at a time,
+so an export of any size runs in constant memory and its first bytes are
+ready as soon as the query starts returning rows. Used by the web export
+endpoints and the `export` CLI command.
+"""
+
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from netbox_auto.models import Host, ReconcileSnapshot
+from netbox_auto.query import HostFilter
+from netbox_auto.reconcile import SNAPSHOT_SECTIONS, snapshot_section
+
+EXPORT_FORMATS = ("csv", "jsonl")
+# Rows fetched from the cursor and serialized per chunk
+EXPORT_CHUNK = 1000
+
+HOST_FIELDS = (
+    "id",
+    "mac",
+    "hostname",
+    "ip_addresses",
+    "source",
+    "switch_port",
+    "status",
+    "host_type",
+    "first_seen",
+    "last_seen",
+    "netbox_id",
+    "drifted",
+)
+RECONCILE_FIELDS = (
+    "section",
+    "host_id",
+    "mac",
+    "hostname",
+    "ip_addresses",
+    "netbox_id",
+    "netbox_name",
+    "netbox_type",
+    "netbox_ip",
+    "netbox_status",
+)
+
+# Response content types by export format
+CONTENT_TYPES = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+
+
+class ExportError(Exception):
+    """Raised when export arguments are invalid."""
+
+    pass
+
+
+def _check_format(fmt: str) -> None:
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"Invalid format: {fmt} (expected {' or '.join(EXPORT_FORMATS)})")
+
+
+def _ips(value: Any) -> list[str]:
+    """List a host's IPs from the list or legacy dict storage format."""
+    if isinstance(value, dict):
+        return [str(ip) for ip in value.values()]
+    return [str(ip) for ip in value or []]
+
+
+def _encode(
+    batches: Iterable[list[dict[str, Any]]], fields: Sequence[str], fmt: str
+) -> Iterator[str]:
+    """Serialize batches of records, yielding one string per batch.
+
+    CSV output starts with a header line; list values are joined with
+    spaces. JSONL output has one JSON object per line.
+    """
+    if fmt == "jsonl":
+        for batch in batches:
+            yield "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in batch)
+        return
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    yield buffer.getvalue()
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        for record in batch:
+            writer.writerow(
+                {
+                    name: " ".join(value) if isinstance(value, list) else value
+                    for name, value in record.items()
+                }
+            )
+        yield buffer.getvalue()
+
+
+def _host_batches(session: Session, statement: Select[Any]) -> Iterator[list[dict[str, Any]]]:
+    for partition in session.execute(statement).partitions():
+        batch = []
+        for row in partition:
+            record = dict(row._mapping)
+            record["ip_addresses"] = _ips(record["ip_addresses"])
+            for name in ("first_seen", "last_seen"):
+                if isinstance(record[name], datetime):
+                    record[name] = record[name].isoformat()
+            batch.append(record)
+        yield batch
+
+
+def export_hosts(
+    session: Session, host_filter: HostFilter | None = None, fmt: str = "csv"
+) -> Iterator[str]:
+    """Export hosts matching a filter, ordered by ID.
+
+    The session must stay open until the returned iterator is exhausted.
+
+    Args:
+        session: DB session.
+        host_filter: Filter to apply, or None for all hosts.
+        fmt: 'csv' or 'jsonl'.
+
+    Returns:
+        Iterator of output chunks.
+
+    Raises:
+        ExportError: If the format is unknown.
+    """
+    _check_format(fmt)
+    statement = (
+        select(*(getattr(Host, name) for name in HOST_FIELDS))
+        .order_by(Host.id)
+        .execution_options(yield_per=EXPORT_CHUNK)
+    )
+    if host_filter is not None:
+        statement = statement.where(*host_filter.clauses())
+    return _encode(_host_batches(session, statement), HOST_FIELDS, fmt)
+
+
+def _reconcile_record(
+    section: str, host: Host | None, item: dict[str, Any] | None
+) -> dict[str, Any]:
+    return {
+        "section": section,
+        "host_id": host.id if host else None,
+        "mac": host.mac if host else None,
+        "hostname": host.hostname if host else None,
+        "ip_addresses": _ips(host.ip_addresses) if host else [],
+        "netbox_id": item.get("id") if item else None,
+        "netbox_name": item.get("name") if item else None,
+        "netbox_type": item.get("_type") if item else None,
+        "netbox_ip": item.get("primary_ip") if item else None,
+        "netbox_status": item.get("status") if item else None,
+    }
+
+
+def _reconcile_batches(
+    session: Session, snapshot: ReconcileSnapshot, sections: Sequence[str]
+) -> Iterator[list[dict[str, Any]]]:
+    for section in sections:
+        total = len((snapshot.result or {}).get(section, []))
+        for offset in range(0, total, EXPORT_CHUNK):
+            entries = snapshot_section(session, snapshot, section, offset, EXPORT_CHUNK)
+            if section == "new":
+                yield [_reconcile_record(section, host, None) for host in entries]
+            elif section == "matched":
+                yield [_reconcile_record(section, host, item) for host, item in entries]
+            else:
+                yield [_reconcile_record(section, None, item) for item in entries]
+
+
+def export_reconcile(
+    session: Session,
+    snapshot: ReconcileSnapshot,
+    section: str | None = None,
+    fmt: str = "csv",
+) -> Iterator[str]:
+    """Export a reconcile snapshot, one row per new host, match or stale item.
+
+    The session must stay open until the returned iterator is exhausted.
+
+    Args:
+        session: DB session.
+        snapshot: Completed snapshot.
+        section: 'new', 'matched' or 'stale', or None for all sections.
+        fmt: 'csv' or 'jsonl'.
+
+    Returns:
+        Iterator of output chunks.
+
+    Raises:
+        ExportError: If the format or section is unknown.
+    """
+    _check_format(fmt)
+    if section is not None and section not in SNAPSHOT_SECTIONS:
+        raise ExportError(f"Invalid section: {section}")
+    sections = SNAPSHOT_SECTIONS if section is None else (section,)
+    return _encode(_reconcile_batches(session, snapshot, sections), RECONCILE_FIELDS, fmt)
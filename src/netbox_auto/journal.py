@@ -0,0 +1,153 @@
+"""Push journal for resumable NetBox pushes.
+
+Records, per host and push step, the intent to call NetBox and the outcome
+of that call (including the IDs NetBox returned). Intents are committed
+before the call is made, so after a crash every step is either known done,
+known failed, or in doubt, and `push --resume` can continue without
+repeating completed calls.
+"""
+
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from sqlalchemy.orm import Session
+
+from netbox_auto.models import PushJournalEntry, PushRun, PushRunStatus, StepStatus
+from netbox_auto.plan import PushPlan
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StepRecord:
+    """Intent or outcome of one push step, as reported by a push worker."""
+
+    host_id: int
+    step: str
+    status: StepStatus
+    netbox_id: int | None = None
+    error: str | None = None
+
+
+class PushJournal:
+    """Journal of one push run, written through the caller's DB session.
+
+    Not thread-safe: only the thread owning the session may write to it.
+    """
+
+    def __init__(self, session: Session, run: PushRun):
+        """Wrap an existing push run.
+
+        Args:
+            session: Session the run is attached to.
+            run: Push run to journal.
+        """
+        self._session = session
+        self.run = run
+        self._entries: dict[tuple[int, str], PushJournalEntry] = {
+            (entry.host_id, entry.step): entry for entry in run.entries
+        }
+
+    @classmethod
+    def start(cls, session: Session, plan: PushPlan) -> "PushJournal":
+        """Create and commit a new push run for a plan.
+
+        Args:
+            session: DB session.
+            plan: Plan the run will apply.
+
+        Returns:
+            Journal for the new run.
+        """
+        run = PushRun(plan=plan.to_dict(), status=PushRunStatus.RUNNING.value)
+        session.add(run)
+        session.commit()
+        logger.info(f"Started push run {run.id}")
+        return cls(session, run)
+
+    @classmethod
+    def latest_incomplete(cls, session: Session) -> "PushJournal | None":
+        """Find the most recent push run that did not complete.
+
+        Args:
+            session: DB session.
+
+        Returns:
+            Journal for that run, or None if the latest run completed.
+        """
+        run = session.query(PushRun).order_by(PushRun.id.desc()).first()
+        if run is None or run.status == PushRunStatus.COMPLETED.value:
+            return None
+        return cls(session, run)
+
+    @property
+    def plan(self) -> PushPlan:
+        """The plan this run applies."""
+        return PushPlan.from_dict(self.run.plan)
+
+    def completed(self) -> dict[tuple[int, str], int]:
+        """Get the steps known to have succeeded.
+
+        Returns:
+            Mapping of (host ID, step) to the NetBox ID the step returned.
+        """
+        return {
+            key: entry.netbox_id
+            for key, entry in self._entries.items()
+            if entry.status == StepStatus.DONE.value and entry.netbox_id is not None
+        }
+
+    def in_doubt(self) -> list[tuple[int, str]]:
+        """Get steps whose NetBox call started but whose outcome was never recorded.
+
+        Returns:
+            (host ID, step) pairs, in recording order.
+        """
+        return [
+            key for key, entry in self._entries.items() if entry.status == StepStatus.PENDING.value
+        ]
+
+    def record(self, records: Iterable[StepRecord]) -> None:
+        """Add or update journal entries. Changes are written on commit().
+
+        Args:
+            records: Step intents or outcomes.
+        """
+        for record in records:
+            key = (record.host_id, record.step)
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = PushJournalEntry(run=self.run, host_id=record.host_id, step=record.step)
+                self._session.add(entry)
+                self._entries[key] = entry
+            entry.status = record.status.value
+            entry.netbox_id = record.netbox_id
+            entry.error = record.error
+
+    def forget(self, keys: Iterable[tuple[int, str]]) -> None:
+        """Drop entries so their steps are attempted again.
+
+        Args:
+            keys: (host ID, step) pairs to drop.
+        """
+        for key in keys:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._session.delete(entry)
+
+    def commit(self) -> None:
+        """Commit recorded entries together with pending host status changes."""
+        self._session.commit()
+
+    def finish(self, status: PushRunStatus) -> None:
+        """Close the run with a final status and commit.
+
+        Args:
+            status: COMPLETED, or FAILED if the push aborted.
+        """
+        self.run.status = status.value
+        self.run.completed_at = datetime.now(UTC)
+        self._session.commit()
+        logger.info(f"Push run {self.run.id} {status.value}")
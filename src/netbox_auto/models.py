@@ -4,11 +4,24 @@ Provides ORM models for tracking discovered hosts and discovery runs.
 Uses SQLAlchemy 2.0 style with Mapped and mapped_column.
 """
 
+import hashlib
+import json
 from datetime import datetime
 from enum import Enum
 from typing import Any
 
-from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    UniqueConstraint,
+    event,
+    func,
+    text,
+)
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.types import JSON
 
@@ -58,6 +71,30 @@ class HostType(str, Enum):
     UNKNOWN = "unknown"
 
 
+class PushRunStatus(str, Enum):
+    """Status of a journaled NetBox push."""
+
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ReconcileStatus(str, Enum):
+    """Status of a background reconciliation."""
+
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class StepStatus(str, Enum):
+    """State of one journaled push step."""
+
+    PENDING = "pending"  # Intent recorded; NetBox call not known to have finished
+    DONE = "done"
+    FAILED = "failed"
+
+
 class DiscoveryRun(Base):
     """A single discovery run capturing hosts at a point in time."""
 
@@ -82,15 +119,17 @@ class Host(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     mac: Mapped[str] = mapped_column(String(17), unique=True, index=True)
-    hostname: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    hostname: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
     ip_addresses: Mapped[list[str]] = mapped_column(JSON, default=list)
-    source: Mapped[str] = mapped_column(String(20), default=HostSource.MANUAL.value)
+    source: Mapped[str] = mapped_column(String(20), default=HostSource.MANUAL.value, index=True)
     switch_port: Mapped[str | None] = mapped_column(String(100), nullable=True)
-    status: Mapped[str] = mapped_column(String(20), default=HostStatus.PENDING.value)
-    host_type: Mapped[str] = mapped_column(String(20), default=HostType.UNKNOWN.value)
+    status: Mapped[str] = mapped_column(String(20), default=HostStatus.PENDING.value, index=True)
+    host_type: Mapped[str] = mapped_column(String(20), default=HostType.UNKNOWN.value, index=True)
     first_seen: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Indexed, like the other sortable columns, for keyset pagination of the
+    # hosts view (SQLite appends the rowid id to every index)
     last_seen: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True
     )
     discovery_run_id: Mapped[int | None] = mapped_column(
         ForeignKey("discovery_run.id"), nullable=True
@@ -98,6 +137,13 @@ class Host(Base):
     netbox_id: Mapped[int | None] = mapped_column(nullable=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # Push state: fingerprint of the fields last pushed, the NetBox objects
+    # created for them (see push.py), and whether discovery has since seen
+    # the host change
+    push_fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    netbox_objects: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    drifted: Mapped[bool] = mapped_column(default=False)
+
     # Relationship to discovery run
     discovery_run: Mapped["DiscoveryRun | None"] = relationship(
         "DiscoveryRun", back_populates="hosts"
@@ -106,7 +152,227 @@ class Host(Base):
     # Add index on MAC for fast lookups
     __table_args__ = (Index("ix_host_mac_lookup", "mac"),)
 
+    def fingerprint(self) -> str:
+        """Hash the fields that are pushed to NetBox.
+
+        Returns:
+            Hex SHA-256 of hostname, IP addresses (order-insensitive) and switch port.
+        """
+        state = {
+            "hostname": self.hostname,
+            "ip_addresses": sorted(self.ip_addresses or []),
+            "switch_port": self.switch_port,
+        }
+        return hashlib.sha256(json.dumps(state, sort_keys=True).encode()).hexdigest()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary.
+
+        Returns:
+            Host fields, with timestamps in ISO 8601 format.
+        """
+        return {
+            "id": self.id,
+            "mac": self.mac,
+            "hostname": self.hostname,
+            "ip_addresses": self.ip_addresses,
+            "source": self.source,
+            "switch_port": self.switch_port,
+            "status": self.status,
+            "host_type": self.host_type,
+            "first_seen": self.first_seen.isoformat() if self.first_seen else None,
+            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
+            "netbox_id": self.netbox_id,
+            "notes": self.notes,
+            "drifted": self.drifted,
+        }
+
     def __repr__(self) -> str:
         return (
             f"<Host(id={self.id}, mac={self.mac}, hostname={self.hostname}, status={self.status})>"
         )
+
+
+class PushRun(Base):
+    """A NetBox push with the plan it applies, journaled for resumption."""
+
+    __tablename__ = "push_run"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    status: Mapped[str] = mapped_column(String(20), default=PushRunStatus.RUNNING.value)
+    plan: Mapped[dict[str, Any]] = mapped_column(JSON)
+
+    # Journal entries recorded during this push
+    entries: Mapped[list["PushJournalEntry"]] = relationship(
+        "PushJournalEntry", back_populates="run"
+    )
+
+    def __repr__(self) -> str:
+        return f"<PushRun(id={self.id}, status={self.status}, started_at={self.started_at})>"
+
+
+class PushJournalEntry(Base):
+    """Intent and outcome of one push step for one host."""
+
+    __tablename__ = "push_journal"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    run_id: Mapped[int] = mapped_column(ForeignKey("push_run.id"), index=True)
+    host_id: Mapped[int] = mapped_column(ForeignKey("host.id"))
+    # 'create', 'interface', 'ip:<address>', 'primary_ip', 'cable' or 'update'
+    step: Mapped[str] = mapped_column(String(64))
+    status: Mapped[str] = mapped_column(String(20), default=StepStatus.PENDING.value)
+    netbox_id: Mapped[int | None] = mapped_column(nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    # Relationship to push run
+    run: Mapped["PushRun"] = relationship("PushRun", back_populates="entries")
+
+    __table_args__ = (UniqueConstraint("run_id", "host_id", "step", name="uq_push_journal_step"),)
+
+    def __repr__(self) -> str:
+        return (
+            f"<PushJournalEntry(run_id={self.run_id}, host_id={self.host_id}, "
+            f"step={self.step}, status={self.status})>"
+        )
+
+
+class DnsPushState(Base):
+    """Digest of the Unbound config last pushed to one server and path."""
+
+    __tablename__ = "dns_push_state"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    server: Mapped[str] = mapped_column(String(255))
+    config_path: Mapped[str] = mapped_column(String(255))
+    # sha256 hex digest of the pushed config
+    digest: Mapped[str] = mapped_column(String(64))
+    # local-data records in the pushed config, the base for delta updates
+    records: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
+    pushed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (UniqueConstraint("server", "config_path", name="uq_dns_push_state_target"),)
+
+    def __repr__(self) -> str:
+        return f"<DnsPushState(server={self.server}, config_path={self.config_path})>"
+
+
+class BulkChange(Base):
+    """A filter-based bulk change of one host field, kept for undo."""
+
+    __tablename__ = "bulk_change"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Host column changed ('status' or 'host_type') and the value it was set to
+    field: Mapped[str] = mapped_column(String(20))
+    value: Mapped[str] = mapped_column(String(20))
+    # Filter arguments (HostFilter.to_args()) that selected the hosts
+    filter: Mapped[dict[str, Any]] = mapped_column(JSON)
+    host_count: Mapped[int] = mapped_column(default=0)
+    undone_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<BulkChange(id={self.id}, field={self.field}, value={self.value})>"
+
+
+class BulkChangeHost(Base):
+    """Previous field value of one host changed by a bulk change."""
+
+    __tablename__ = "bulk_change_host"
+
+    change_id: Mapped[int] = mapped_column(ForeignKey("bulk_change.id"), primary_key=True)
+    host_id: Mapped[int] = mapped_column(ForeignKey("host.id"), primary_key=True)
+    previous: Mapped[str] = mapped_column(String(20))
+
+    def __repr__(self) -> str:
+        return f"<BulkChangeHost(change_id={self.change_id}, host_id={self.host_id})>"
+
+
+class ReconcileSnapshot(Base):
+    """A reconciliation computed in the background, cached for the web view.
+
+    The result is valid while the host table is at host_version; external
+    NetBox changes are picked up when the snapshot ages out.
+    """
+
+    __tablename__ = "reconcile_snapshot"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    status: Mapped[str] = mapped_column(String(20), default=ReconcileStatus.RUNNING.value)
+    progress: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # TableVersion of the host table the result was computed from
+    host_version: Mapped[int] = mapped_column(default=0)
+    # {"new": [host IDs], "matched": [[host ID, NetBox item]], "stale": [NetBox items]}
+    result: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ReconcileSnapshot(id={self.id}, status={self.status})>"
+
+
+class EventLog(Base):
+    """An event for live web UI updates, shared between processes.
+
+    Discovery records its progress and host changes here; web server
+    processes tail the table and stream new rows to browsers (see events.py).
+    """
+
+    __tablename__ = "event_log"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), index=True
+    )
+    # 'discovery' (run progress) or 'host' (host created or updated)
+    kind: Mapped[str] = mapped_column(String(20))
+    data: Mapped[dict[str, Any]] = mapped_column(JSON)
+
+    def __repr__(self) -> str:
+        return f"<EventLog(id={self.id}, kind={self.kind})>"
+
+
+class TableVersion(Base):
+    """Change counter of a table, bumped by triggers on every row written.
+
+    Writes from any process or statement (ORM, bulk UPDATE, another CLI run)
+    move the counter, so it can back HTTP validators such as ETags.
+    """
+
+    __tablename__ = "table_version"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(default=0)
+
+    def __repr__(self) -> str:
+        return f"<TableVersion(name={self.name}, version={self.version})>"
+
+
+# Tables whose writes bump their TableVersion row
+VERSIONED_TABLES = ("host",)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_version_triggers(target: Any, connection: Connection, **kw: Any) -> None:
+    """Create the TableVersion triggers; runs after every create_all()."""
+    if connection.dialect.name != "sqlite":
+        return
+    for table in VERSIONED_TABLES:
+        for operation in ("INSERT", "UPDATE", "DELETE"):
+            connection.execute(
+                text(
+                    f"CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{operation.lower()} "
+                    f"AFTER {operation} ON {table} BEGIN "
+                    f"INSERT INTO table_version (name, version) VALUES ('{table}', 1) "
+                    "ON CONFLICT(name) DO UPDATE SET version = version + 1; END"
+                )
+            )
@@ -2,19 +2,320 @@
 
 Provides a client wrapper for the pynetbox library to fetch
 existing devices and VMs from NetBox for comparison with discovered hosts.
+Inventory is read through GraphQL when available, with a REST fallback.
 """
 
 import logging
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from threading import Lock
 from typing import TYPE_CHECKING, Any
 
 import pynetbox
+import requests
 from pynetbox.core.api import Api as NetBoxApi
+from pynetbox.core.query import RequestError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 if TYPE_CHECKING:
     pass
 
 logger = logging.getLogger(__name__)
 
+# Default number of objects requested per page when listing inventory
+DEFAULT_PAGE_SIZE = 1000
+
+# Default number of objects sent per bulk create/update request
+DEFAULT_BATCH_SIZE = 100
+
+# Default lifetime of cached reference object IDs, in seconds
+DEFAULT_CACHE_TTL = 300.0
+
+# Reference kinds fetched in full by prefetch_references()
+PREFETCH_KINDS = ("site", "device_role", "device_type", "cluster")
+
+# Reference object lookups: kind -> (app, endpoint, lookup fields tried in order)
+REFERENCE_ENDPOINTS: dict[str, tuple[str, str, tuple[str, ...]]] = {
+    "site": ("dcim", "sites", ("slug", "name")),
+    "device_role": ("dcim", "device_roles", ("slug", "name")),
+    "device_type": ("dcim", "device_types", ("slug", "model")),
+    "cluster": ("virtualization", "clusters", ("name",)),
+    "device": ("dcim", "devices", ("name",)),
+    "vm": ("virtualization", "virtual_machines", ("name",)),
+}
+
+# Fields requested when listing inventory. NetBox 4.0+ omits everything
+# else from the response; older versions ignore the parameter.
+DEVICE_FIELDS = ("id", "name", "primary_ip", "device_type", "status")
+VM_FIELDS = ("id", "name", "primary_ip", "status")
+
+# Labels of the device and VM status values built into NetBox
+STATUS_LABELS = {
+    "offline": "Offline",
+    "active": "Active",
+    "planned": "Planned",
+    "staged": "Staged",
+    "failed": "Failed",
+    "inventory": "Inventory",
+    "decommissioning": "Decommissioning",
+}
+
+# Single GraphQL request returning the same inventory as the two REST listings
+INVENTORY_GRAPHQL_QUERY = """
+query Inventory {
+  device_list {
+    id
+    name
+    status
+    primary_ip4 { address }
+    primary_ip6 { address }
+    device_type { model }
+  }
+  virtual_machine_list {
+    id
+    name
+    status
+    primary_ip4 { address }
+    primary_ip6 { address }
+  }
+}
+"""
+
+
+class NetBoxFetchError(Exception):
+    """Raised when NetBox inventory could not be fetched.
+
+    Distinguishes a failed fetch from a NetBox instance that is simply empty.
+    """
+
+    pass
+
+
+class GraphQLUnavailableError(Exception):
+    """Raised when the NetBox GraphQL endpoint is disabled, unreachable or errors."""
+
+    pass
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to every request."""
+
+    def __init__(self, timeout: tuple[float, float], **kwargs: Any) -> None:
+        self._timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: float | tuple[float | None, float | None] | None = None,
+        verify: bool | str = True,
+        cert: str | tuple[str, str] | None = None,
+        proxies: dict[str, str] | None = None,
+    ) -> requests.Response:
+        return super().send(
+            request,
+            stream=stream,
+            timeout=self._timeout if timeout is None else timeout,
+            verify=verify,
+            cert=cert,
+            proxies=proxies,
+        )
+
+
+@dataclass
+class NetBoxTransport:
+    """HTTP transport settings for the NetBox API session.
+
+    Attributes:
+        timeout: Read timeout in seconds for each request
+        connect_timeout: Connection timeout in seconds
+        pool_size: Maximum pooled keep-alive connections; extra concurrent
+            requests wait for a free connection instead of opening new sockets
+        max_retries: Retries for idempotent requests (GET, PUT, DELETE, ...)
+            on connection errors and 429/502/503/504 responses
+        backoff_factor: Base delay in seconds for exponential retry backoff;
+            up to the same amount of random jitter is added to each delay
+    """
+
+    timeout: float = 30.0
+    connect_timeout: float = 5.0
+    pool_size: int = 10
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+
+    def build_session(self) -> requests.Session:
+        """Create a requests session with pooling, retries, timeouts and compression.
+
+        Returns:
+            Configured session for pynetbox to use.
+        """
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            backoff_jitter=self.backoff_factor,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = _TimeoutHTTPAdapter(
+            timeout=(self.connect_timeout, self.timeout),
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            pool_block=True,
+            max_retries=retry,
+        )
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["Accept-Encoding"] = "gzip, deflate"
+        return session
+
+
+class ReferenceCache:
+    """Thread-safe TTL cache of NetBox reference object IDs.
+
+    Holds name -> ID lookups for reference objects (sites, roles, device
+    types, clusters, devices) and per-device interface name -> ID maps.
+    Missing objects are cached as None so repeated misses don't re-query.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL, clock: Callable[[], float] = time.monotonic):
+        """Initialize an empty cache.
+
+        Args:
+            ttl: Seconds an entry stays valid after it is stored.
+            clock: Monotonic time source (overridable for tests).
+        """
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = Lock()
+        self._ids: dict[tuple[str, str], tuple[int | None, float]] = {}
+        self._interfaces: dict[int, tuple[dict[str, int], float]] = {}
+
+    def get(self, kind: str, name: str) -> tuple[bool, int | None]:
+        """Look up a cached reference ID.
+
+        Args:
+            kind: Reference kind (e.g., 'site').
+            name: Slug, name or model used for the lookup.
+
+        Returns:
+            Tuple of (hit, id). id may be None for a cached miss.
+        """
+        with self._lock:
+            entry = self._ids.get((kind, name))
+            if entry is None or entry[1] <= self._clock():
+                return False, None
+            return True, entry[0]
+
+    def set(self, kind: str, name: str, ref_id: int | None) -> None:
+        """Store a reference ID (or a miss) for the configured TTL."""
+        with self._lock:
+            self._ids[(kind, name)] = (ref_id, self._clock() + self._ttl)
+
+    def get_interfaces(self, device_id: int) -> dict[str, int] | None:
+        """Get the cached interface name -> ID map for a device, if fresh."""
+        with self._lock:
+            entry = self._interfaces.get(device_id)
+            if entry is None or entry[1] <= self._clock():
+                return None
+            return entry[0]
+
+    def set_interfaces(self, device_id: int, interfaces: dict[str, int]) -> None:
+        """Store a device's interface name -> ID map for the configured TTL."""
+        with self._lock:
+            self._interfaces[device_id] = (interfaces, self._clock() + self._ttl)
+
+    def add_interface(self, device_id: int, name: str, interface_id: int) -> None:
+        """Record a newly created interface in a device's cached map."""
+        with self._lock:
+            entry = self._interfaces.get(device_id)
+            if entry is not None:
+                entry[0][name] = interface_id
+
+    def invalidate(self, kind: str | None = None) -> None:
+        """Drop cached entries.
+
+        Args:
+            kind: Reference kind to drop, 'interface' for interface maps,
+                or None to clear everything.
+        """
+        with self._lock:
+            if kind is None or kind == "interface":
+                self._interfaces.clear()
+            if kind != "interface":
+                self._ids = {
+                    key: value
+                    for key, value in self._ids.items()
+                    if kind is not None and key[0] != kind
+                }
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting NetBox write requests per second.
+
+    Callers reserve a token and sleep outside the lock until it is due, so
+    concurrent writers are spaced out evenly instead of bursting together.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initialize a full bucket.
+
+        Args:
+            rate: Requests allowed per second; 0 disables limiting.
+            burst: Requests allowed back to back before limiting applies.
+            clock: Monotonic time source (overridable for tests).
+            sleep: Sleep function (overridable for tests).
+        """
+        self._rate = rate
+        self._burst = max(burst, 1)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = Lock()
+        self._tokens = float(self._burst)
+        self._updated = clock()
+
+    def acquire(self) -> None:
+        """Block until the next request may be sent."""
+        if self._rate <= 0:
+            return
+
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._updated
+            self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            self._sleep(wait)
+
+
+@dataclass
+class BulkResult:
+    """Outcome of a batched write, keyed by position in the input list.
+
+    Attributes:
+        ids: Input index -> NetBox ID for items that were written
+        errors: Input index -> error message for items that were rejected
+    """
+
+    ids: dict[int, int] = field(default_factory=dict)
+    errors: dict[int, str] = field(default_factory=dict)
+
 
 class NetBoxClient:
     """Client for interacting with NetBox API.
@@ -24,16 +325,46 @@ class NetBoxClient:
     until first use.
     """
 
-    def __init__(self, url: str | None = None, token: str | None = None) -> None:
+    def __init__(
+        self,
+        url: str | None = None,
+        token: str | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        threading: bool = True,
+        inventory_backend: str = "auto",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        transport: NetBoxTransport | None = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        write_rate: float = 0.0,
+    ) -> None:
         """Initialize the NetBox client.
 
         Args:
             url: NetBox API URL. If not provided, will use config.
             token: NetBox API token. If not provided, will use config.
+            page_size: Objects per page when listing devices and VMs.
+            threading: Fetch result pages in parallel once the total count is known.
+            inventory_backend: 'auto' to try GraphQL before REST, 'rest' for REST only.
+            batch_size: Objects sent per request by the bulk create/update methods.
+            transport: HTTP session settings; defaults to NetBoxTransport().
+            cache_ttl: Seconds reference object and interface IDs stay cached.
+            write_rate: Maximum NetBox write requests per second across all
+                threads using this client; 0 for unlimited.
         """
         self._url = url
         self._token = token
+        self._page_size = page_size
+        self._threading = threading
+        self._inventory_backend = inventory_backend
+        self._batch_size = batch_size
+        self._transport = transport or NetBoxTransport()
+        self.reference_cache = ReferenceCache(ttl=cache_ttl)
+        self._write_limiter = RateLimiter(write_rate, burst=max(int(write_rate), 1))
+        self._graphql_available: bool | None = None
         self._api: NetBoxApi | None = None
+        # Guards lazy connection and switch interface creation across push workers
+        self._connect_lock = Lock()
+        self._interface_lock = Lock()
 
     def _connect(self) -> NetBoxApi:
         """Establish connection to NetBox API.
@@ -47,6 +378,20 @@ class NetBoxClient:
         if self._api is not None:
             return self._api
 
+        with self._connect_lock:
+            if self._api is None:
+                self._api = self._create_api()
+        return self._api
+
+    def _create_api(self) -> NetBoxApi:
+        """Create the pynetbox API instance with the tuned HTTP session.
+
+        Returns:
+            Connected pynetbox API instance.
+
+        Raises:
+            ValueError: If URL or token not provided and not in config.
+        """
         url = self._url
         token = self._token
 
@@ -63,12 +408,16 @@ class NetBoxClient:
             url = url or config.netbox.url
             token = token or config.netbox.token
 
-        self._api = pynetbox.api(url, token=token)
-        return self._api
+        api = pynetbox.api(url, token=token, threading=self._threading)
+        api.http_session = self._transport.build_session()
+        return api
 
-    def get_devices(self) -> list[dict[str, Any]]:
+    def get_devices(self, strict: bool = False) -> list[dict[str, Any]]:
         """Fetch all devices from NetBox.
 
+        Args:
+            strict: If True, raise instead of returning an empty list on failure.
+
         Returns:
             List of device dictionaries with fields:
             - id: NetBox device ID
@@ -77,37 +426,41 @@ class NetBoxClient:
             - device_type: Device type model name
             - status: Device status (active, planned, etc.)
 
-        Returns empty list if connection fails.
+        Returns empty list if connection fails, unless strict is set.
+
+        Raises:
+            NetBoxFetchError: If strict and the fetch fails.
         """
         devices: list[dict[str, Any]] = []
 
         try:
             api = self._connect()
-            for device in api.dcim.devices.all():
-                primary_ip = None
-                if device.primary_ip:
-                    # Extract IP without prefix length
-                    primary_ip = str(device.primary_ip).split("/")[0]
-
+            records = api.dcim.devices.filter(fields=",".join(DEVICE_FIELDS), limit=self._page_size)
+            for device in records:
                 devices.append(
                     {
                         "id": device.id,
                         "name": device.name,
-                        "primary_ip": primary_ip,
+                        "primary_ip": _primary_ip_address(device),
                         "device_type": str(device.device_type) if device.device_type else None,
-                        "status": str(device.status) if device.status else None,
+                        "status": _status_label(device.status),
                     }
                 )
         except Exception as e:
+            if strict:
+                raise NetBoxFetchError(f"Failed to fetch devices from NetBox: {e}") from e
             logger.warning(f"Failed to fetch devices from NetBox: {e}")
             return []
 
         logger.info(f"Fetched {len(devices)} devices from NetBox")
         return devices
 
-    def get_vms(self) -> list[dict[str, Any]]:
+    def get_vms(self, strict: bool = False) -> list[dict[str, Any]]:
         """Fetch all virtual machines from NetBox.
 
+        Args:
+            strict: If True, raise instead of returning an empty list on failure.
+
         Returns:
             List of VM dictionaries with fields:
             - id: NetBox VM ID
@@ -115,33 +468,147 @@ class NetBoxClient:
             - primary_ip: Primary IP address (if assigned)
             - status: VM status (active, offline, etc.)
 
-        Returns empty list if connection fails.
+        Returns empty list if connection fails, unless strict is set.
+
+        Raises:
+            NetBoxFetchError: If strict and the fetch fails.
         """
         vms: list[dict[str, Any]] = []
 
         try:
             api = self._connect()
-            for vm in api.virtualization.virtual_machines.all():
-                primary_ip = None
-                if vm.primary_ip:
-                    # Extract IP without prefix length
-                    primary_ip = str(vm.primary_ip).split("/")[0]
-
+            records = api.virtualization.virtual_machines.filter(
+                fields=",".join(VM_FIELDS), limit=self._page_size
+            )
+            for vm in records:
                 vms.append(
                     {
                         "id": vm.id,
                         "name": vm.name,
-                        "primary_ip": primary_ip,
-                        "status": str(vm.status) if vm.status else None,
+                        "primary_ip": _primary_ip_address(vm),
+                        "status": _status_label(vm.status),
                     }
                 )
         except Exception as e:
+            if strict:
+                raise NetBoxFetchError(f"Failed to fetch VMs from NetBox: {e}") from e
             logger.warning(f"Failed to fetch VMs from NetBox: {e}")
             return []
 
         logger.info(f"Fetched {len(vms)} VMs from NetBox")
         return vms
 
+    def get_inventory(self) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Fetch all devices and VMs from NetBox.
+
+        Uses a single GraphQL query when the endpoint is available, and falls
+        back to concurrent REST listings otherwise. A failed GraphQL attempt
+        is remembered, so later calls on this client go straight to REST.
+
+        Returns:
+            Tuple of (devices, vms) in the same shape as get_devices()
+            and get_vms(). Empty lists mean NetBox has no such objects.
+
+        Raises:
+            NetBoxFetchError: If either listing could not be fetched.
+        """
+        try:
+            # Connect up front so REST workers share a single API instance
+            self._connect()
+        except Exception as e:
+            raise NetBoxFetchError(f"Failed to connect to NetBox: {e}") from e
+
+        if self._inventory_backend == "auto" and self._graphql_available is not False:
+            try:
+                inventory = self._get_inventory_graphql()
+            except GraphQLUnavailableError as e:
+                logger.info(f"NetBox GraphQL unavailable, falling back to REST: {e}")
+                self._graphql_available = False
+            else:
+                self._graphql_available = True
+                return inventory
+
+        return self._get_inventory_rest()
+
+    def _get_inventory_rest(self) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Fetch devices and VMs over REST, running both listings in parallel.
+
+        Returns:
+            Tuple of (devices, vms).
+
+        Raises:
+            NetBoxFetchError: If either listing fails.
+        """
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            devices = pool.submit(self.get_devices, strict=True)
+            vms = pool.submit(self.get_vms, strict=True)
+            return devices.result(), vms.result()
+
+    def _get_inventory_graphql(self) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Fetch devices and VMs with one GraphQL query.
+
+        Returns:
+            Tuple of (devices, vms), normalized to the REST dict shape.
+
+        Raises:
+            GraphQLUnavailableError: If the endpoint is missing, fails or returns errors.
+        """
+        api = self._connect()
+        graphql_url = api.base_url.removesuffix("/api") + "/graphql/"
+        headers = {"Accept": "application/json"}
+        if api.token:
+            scheme = "Bearer" if str(api.token).startswith("nbt_") else "Token"
+            headers["Authorization"] = f"{scheme} {api.token}"
+
+        try:
+            response = api.http_session.post(
+                graphql_url, json={"query": INVENTORY_GRAPHQL_QUERY}, headers=headers
+            )
+        except Exception as e:
+            raise GraphQLUnavailableError(str(e)) from e
+
+        if response.status_code != 200:
+            raise GraphQLUnavailableError(f"HTTP {response.status_code} from {graphql_url}")
+
+        try:
+            payload = response.json()
+        except ValueError as e:
+            raise GraphQLUnavailableError(f"Invalid JSON from {graphql_url}") from e
+
+        if not isinstance(payload, dict):
+            raise GraphQLUnavailableError(f"Unexpected response from {graphql_url}")
+        if payload.get("errors"):
+            raise GraphQLUnavailableError(f"GraphQL errors: {payload['errors']}")
+
+        data = payload.get("data")
+        if not isinstance(data, dict) or not isinstance(data.get("device_list"), list):
+            raise GraphQLUnavailableError("GraphQL response missing device_list")
+        if not isinstance(data.get("virtual_machine_list"), list):
+            raise GraphQLUnavailableError("GraphQL response missing virtual_machine_list")
+
+        devices = [
+            {
+                "id": int(item["id"]),
+                "name": item.get("name"),
+                "primary_ip": _graphql_primary_ip(item),
+                "device_type": (item.get("device_type") or {}).get("model"),
+                "status": _status_label(item.get("status")),
+            }
+            for item in data["device_list"]
+        ]
+        vms = [
+            {
+                "id": int(item["id"]),
+                "name": item.get("name"),
+                "primary_ip": _graphql_primary_ip(item),
+                "status": _status_label(item.get("status")),
+            }
+            for item in data["virtual_machine_list"]
+        ]
+
+        logger.info(f"Fetched {len(devices)} devices and {len(vms)} VMs from NetBox GraphQL")
+        return devices, vms
+
     def create_device(
         self,
         name: str,
@@ -311,6 +778,597 @@ class NetBoxClient:
         )
         return {"id": cable.id}
 
+    def prefetch_references(self, kinds: Iterable[str] = PREFETCH_KINDS) -> None:
+        """Load all objects of the given reference kinds into the cache.
+
+        One listing per kind replaces a lookup per name. Every lookup field
+        (slug, name, model) of each object is cached, so later lookup_id()
+        calls by any of them are served without an API call.
+
+        Args:
+            kinds: Keys of REFERENCE_ENDPOINTS to prefetch.
+        """
+        api = self._connect()
+        for kind in kinds:
+            app, endpoint_name, lookup_fields = REFERENCE_ENDPOINTS[kind]
+            endpoint = getattr(getattr(api, app), endpoint_name)
+            records = endpoint.filter(
+                fields=",".join(("id", *lookup_fields)), limit=self._page_size
+            )
+            count = 0
+            for record in records:
+                count += 1
+                for lookup_field in lookup_fields:
+                    value = getattr(record, lookup_field, None)
+                    if value:
+                        self.reference_cache.set(kind, str(value), int(record.id))
+            logger.debug(f"Prefetched {count} NetBox {kind} objects")
+
+    def lookup_id(self, kind: str, name: str) -> int | None:
+        """Resolve a reference object (site, role, device type, ...) to its ID.
+
+        Served from the reference cache when possible; misses query NetBox
+        and are cached, including objects that don't exist.
+
+        Args:
+            kind: Key of REFERENCE_ENDPOINTS (e.g., 'site', 'device_type').
+            name: Slug, name or model identifying the object.
+
+        Returns:
+            NetBox ID, or None if no object matches.
+        """
+        hit, cached_id = self.reference_cache.get(kind, name)
+        if hit:
+            return cached_id
+
+        app, endpoint_name, lookup_fields = REFERENCE_ENDPOINTS[kind]
+        endpoint = getattr(getattr(self._connect(), app), endpoint_name)
+
+        for lookup_field in lookup_fields:
+            matches = list(endpoint.filter(**{lookup_field: name}))
+            if matches:
+                ref_id = int(matches[0].id)
+                self.reference_cache.set(kind, name, ref_id)
+                return ref_id
+
+        logger.warning(f"No NetBox {kind} found matching '{name}'")
+        self.reference_cache.set(kind, name, None)
+        return None
+
+    def prefetch_interfaces(self, device_id: int) -> dict[str, int]:
+        """Load all interfaces of a device into the cache with one filtered call.
+
+        Args:
+            device_id: ID of the device (e.g., a switch).
+
+        Returns:
+            Mapping of interface name to interface ID.
+        """
+        api = self._connect()
+        records = api.dcim.interfaces.filter(
+            device_id=device_id, fields="id,name", limit=self._page_size
+        )
+        interfaces = {str(record.name): int(record.id) for record in records}
+        self.reference_cache.set_interfaces(device_id, interfaces)
+        logger.debug(f"Prefetched {len(interfaces)} interfaces of device {device_id}")
+        return interfaces
+
+    def get_interface_id(
+        self,
+        device_id: int,
+        name: str,
+        interface_type: str = "1000base-t",
+    ) -> int:
+        """Find or create an interface using the cached interface map.
+
+        The device's interfaces are prefetched on first use, so cabling many
+        hosts to one switch costs one listing instead of one query per port.
+
+        Args:
+            device_id: ID of the device.
+            name: Interface name (e.g., 'ether5').
+            interface_type: Interface type for creation (default '1000base-t').
+
+        Returns:
+            ID of the existing or newly created interface.
+        """
+        # Serialized so concurrent push workers never create the same port twice
+        with self._interface_lock:
+            interfaces = self.reference_cache.get_interfaces(device_id)
+            if interfaces is None:
+                interfaces = self.prefetch_interfaces(device_id)
+
+            if name in interfaces:
+                return interfaces[name]
+
+            api = self._connect()
+            self._write_limiter.acquire()
+            interface = api.dcim.interfaces.create(device=device_id, name=name, type=interface_type)
+            logger.info(f"Created interface '{name}' on device {device_id} with ID {interface.id}")
+            self.reference_cache.add_interface(device_id, name, int(interface.id))
+            return int(interface.id)
+
+    def find_interface(self, kind: str, object_id: int, name: str) -> int | None:
+        """Find an interface of a device or VM by name.
+
+        Args:
+            kind: 'device' or 'vm'.
+            object_id: ID of the device or VM.
+            name: Interface name.
+
+        Returns:
+            Interface ID, or None if the object has no such interface.
+        """
+        api = self._connect()
+        if kind == "vm":
+            records = api.virtualization.interfaces.filter(
+                virtual_machine_id=object_id, name=name, fields="id"
+            )
+        else:
+            records = api.dcim.interfaces.filter(device_id=object_id, name=name, fields="id")
+        for record in records:
+            return int(record.id)
+        return None
+
+    def find_ip(
+        self, ip_address: str, interface_id: int, interface_type: str = "dcim.interface"
+    ) -> int | None:
+        """Find an IP address assigned to an interface.
+
+        Args:
+            ip_address: Address as passed to assign_ips(), with or without
+                prefix length.
+            interface_id: ID of the interface it is assigned to.
+            interface_type: 'dcim.interface' or 'virtualization.vminterface'.
+
+        Returns:
+            IP address ID, or None if the address is not assigned there.
+        """
+        api = self._connect()
+        address = ip_address if "/" in ip_address else _host_prefix({"ip_address": ip_address})
+        assigned = (
+            "vminterface_id" if interface_type == "virtualization.vminterface" else "interface_id"
+        )
+        records = api.ipam.ip_addresses.filter(
+            address=address, fields="id", **{assigned: interface_id}
+        )
+        for record in records:
+            return int(record.id)
+        return None
+
+    def get_primary_ips(self, kind: str, object_id: int) -> dict[str, int]:
+        """Read the primary IPs currently set on a device or VM.
+
+        Args:
+            kind: 'device' or 'vm'.
+            object_id: ID of the device or VM.
+
+        Returns:
+            Mapping of 'primary_ip4'/'primary_ip6' to IP address ID, for
+            the families that are set.
+        """
+        api = self._connect()
+        endpoint = api.virtualization.virtual_machines if kind == "vm" else api.dcim.devices
+        record = endpoint.get(object_id)
+        if record is None:
+            return {}
+        return {
+            key: int(getattr(record, key).id)
+            for key in ("primary_ip4", "primary_ip6")
+            if getattr(record, key, None)
+        }
+
+    def get_interface_cable(self, interface_id: int) -> int | None:
+        """Read the cable attached to a device interface.
+
+        Args:
+            interface_id: ID of the interface.
+
+        Returns:
+            Cable ID, or None if the interface is not cabled.
+        """
+        record = self._connect().dcim.interfaces.get(interface_id)
+        if record is None or not record.cable:
+            return None
+        return int(record.cable.id)
+
+    def create_devices(self, devices: list[dict[str, Any]]) -> BulkResult:
+        """Create devices in batches.
+
+        Args:
+            devices: Dicts with the create_device() arguments: name,
+                device_type_id, device_role_id and site_id.
+
+        Returns:
+            BulkResult mapping input positions to device IDs or errors.
+        """
+        api = self._connect()
+        payloads = [
+            {
+                "name": device["name"],
+                "device_type": device["device_type_id"],
+                "role": device["device_role_id"],
+                "site": device["site_id"],
+                "status": "active",
+            }
+            for device in devices
+        ]
+        return self._bulk_write(api.dcim.devices.create, payloads, "devices")
+
+    def create_vms(self, vms: list[dict[str, Any]]) -> BulkResult:
+        """Create virtual machines in batches.
+
+        Args:
+            vms: Dicts with the create_vm() arguments: name and cluster_id.
+
+        Returns:
+            BulkResult mapping input positions to VM IDs or errors.
+        """
+        api = self._connect()
+        payloads = [
+            {"name": vm["name"], "cluster": vm["cluster_id"], "status": "active"} for vm in vms
+        ]
+        return self._bulk_write(api.virtualization.virtual_machines.create, payloads, "VMs")
+
+    def create_interfaces(self, interfaces: list[dict[str, Any]]) -> BulkResult:
+        """Create device interfaces in batches.
+
+        Unlike get_or_create_interface(), existing interfaces are not looked
+        up first; callers create interfaces only on devices they just created.
+
+        Args:
+            interfaces: Dicts with device_id, name and optional interface_type
+                (default '1000base-t').
+
+        Returns:
+            BulkResult mapping input positions to interface IDs or errors.
+        """
+        api = self._connect()
+        payloads = [
+            {
+                "device": interface["device_id"],
+                "name": interface["name"],
+                "type": interface.get("interface_type", "1000base-t"),
+            }
+            for interface in interfaces
+        ]
+        return self._bulk_write(api.dcim.interfaces.create, payloads, "interfaces")
+
+    def create_vm_interfaces(self, interfaces: list[dict[str, Any]]) -> BulkResult:
+        """Create VM interfaces in batches.
+
+        Args:
+            interfaces: Dicts with vm_id and name.
+
+        Returns:
+            BulkResult mapping input positions to VM interface IDs or errors.
+        """
+        api = self._connect()
+        payloads = [
+            {"virtual_machine": interface["vm_id"], "name": interface["name"]}
+            for interface in interfaces
+        ]
+        return self._bulk_write(api.virtualization.interfaces.create, payloads, "VM interfaces")
+
+    def assign_ips(self, ips: list[dict[str, Any]]) -> BulkResult:
+        """Create IP addresses assigned to interfaces in batches.
+
+        Args:
+            ips: Dicts with the assign_ip() arguments: ip_address,
+                interface_id and optional interface_type (default 'dcim.interface').
+
+        Returns:
+            BulkResult mapping input positions to IP address IDs or errors.
+        """
+        api = self._connect()
+        payloads = [
+            {
+                # Ensure IP has prefix length
+                "address": ip["ip_address"] if "/" in ip["ip_address"] else _host_prefix(ip),
+                "assigned_object_type": ip.get("interface_type", "dcim.interface"),
+                "assigned_object_id": ip["interface_id"],
+            }
+            for ip in ips
+        ]
+        return self._bulk_write(api.ipam.ip_addresses.create, payloads, "IP addresses")
+
+    def create_cables(self, cables: list[dict[str, Any]]) -> BulkResult:
+        """Create cables in batches.
+
+        Args:
+            cables: Dicts with the create_cable() arguments: a_termination_type,
+                a_termination_id, b_termination_type and b_termination_id.
+
+        Returns:
+            BulkResult mapping input positions to cable IDs or errors.
+        """
+        api = self._connect()
+        payloads = [
+            {
+                "a_terminations": [
+                    {
+                        "object_type": cable["a_termination_type"],
+                        "object_id": cable["a_termination_id"],
+                    }
+                ],
+                "b_terminations": [
+                    {
+                        "object_type": cable["b_termination_type"],
+                        "object_id": cable["b_termination_id"],
+                    }
+                ],
+            }
+            for cable in cables
+        ]
+        return self._bulk_write(api.dcim.cables.create, payloads, "cables")
+
+    def update_devices(self, updates: list[dict[str, Any]]) -> BulkResult:
+        """Update devices in batches (bulk PATCH).
+
+        Args:
+            updates: Dicts with the device 'id' plus the fields to change
+                (e.g., {'id': 5, 'primary_ip4': 12}).
+
+        Returns:
+            BulkResult mapping input positions to device IDs or errors.
+        """
+        api = self._connect()
+        return self._bulk_write(api.dcim.devices.update, updates, "device updates")
+
+    def update_vms(self, updates: list[dict[str, Any]]) -> BulkResult:
+        """Update virtual machines in batches (bulk PATCH).
+
+        Args:
+            updates: Dicts with the VM 'id' plus the fields to change.
+
+        Returns:
+            BulkResult mapping input positions to VM IDs or errors.
+        """
+        api = self._connect()
+        return self._bulk_write(api.virtualization.virtual_machines.update, updates, "VM updates")
+
+    def delete_ips(self, ip_ids: list[int]) -> BulkResult:
+        """Delete IP addresses in batches (bulk DELETE).
+
+        Args:
+            ip_ids: IDs of the IP addresses to delete.
+
+        Returns:
+            BulkResult mapping input positions to deleted IDs or errors.
+        """
+        api = self._connect()
+        return self._bulk_delete(api.ipam.ip_addresses.delete, ip_ids, "IP addresses")
+
+    def delete_cables(self, cable_ids: list[int]) -> BulkResult:
+        """Delete cables in batches (bulk DELETE).
+
+        Args:
+            cable_ids: IDs of the cables to delete.
+
+        Returns:
+            BulkResult mapping input positions to deleted IDs or errors.
+        """
+        api = self._connect()
+        return self._bulk_delete(api.dcim.cables.delete, cable_ids, "cables")
+
+    def _bulk_delete(
+        self,
+        delete: Callable[[list[int]], Any],
+        object_ids: list[int],
+        label: str,
+    ) -> BulkResult:
+        """Delete objects in batches of batch_size.
+
+        A failed request marks every object in its batch as failed; NetBox
+        bulk deletes don't report per-object errors.
+
+        Args:
+            delete: Bound pynetbox endpoint delete method.
+            object_ids: IDs of the objects to delete.
+            label: Object description for log messages.
+
+        Returns:
+            BulkResult keyed by position in object_ids.
+        """
+        result = BulkResult()
+        for start in range(0, len(object_ids), self._batch_size):
+            batch = object_ids[start : start + self._batch_size]
+            self._write_limiter.acquire()
+            try:
+                delete(batch)
+            except Exception as e:
+                for index in range(start, start + len(batch)):
+                    result.errors[index] = str(e)
+                continue
+            for index, object_id in enumerate(batch, start=start):
+                result.ids[index] = object_id
+
+        logger.info(
+            f"Bulk deleted {len(result.ids)} {label} from NetBox ({len(result.errors)} failed)"
+        )
+        return result
+
+    def _bulk_write(
+        self,
+        write: Callable[[list[dict[str, Any]]], Any],
+        payloads: list[dict[str, Any]],
+        label: str,
+    ) -> BulkResult:
+        """Send payloads in batches of batch_size and collect per-item results.
+
+        Args:
+            write: Bound pynetbox endpoint create or update method.
+            payloads: Request bodies, one per object.
+            label: Object description for log messages.
+
+        Returns:
+            BulkResult keyed by position in payloads.
+        """
+        result = BulkResult()
+        for start in range(0, len(payloads), self._batch_size):
+            batch = list(enumerate(payloads[start : start + self._batch_size], start=start))
+            self._write_batch(write, batch, result)
+
+        logger.info(f"Bulk wrote {len(result.ids)} {label} to NetBox ({len(result.errors)} failed)")
+        return result
+
+    def _write_batch(
+        self,
+        write: Callable[[list[dict[str, Any]]], Any],
+        batch: list[tuple[int, dict[str, Any]]],
+        result: BulkResult,
+    ) -> None:
+        """Write one batch, retrying without the items NetBox rejected.
+
+        NetBox bulk writes are atomic: one invalid object fails the whole
+        request, with a list of per-object errors in the response body.
+        Rejected items are recorded and the remainder is resent.
+
+        Args:
+            write: Bound pynetbox endpoint create or update method.
+            batch: (input index, payload) pairs.
+            result: BulkResult to update in place.
+        """
+        pending = batch
+        while pending:
+            self._write_limiter.acquire()
+            try:
+                records = write([payload for _, payload in pending])
+            except RequestError as e:
+                item_errors = _bulk_item_errors(e, len(pending))
+                if item_errors is None:
+                    for index, _ in pending:
+                        result.errors[index] = str(e)
+                    return
+
+                remaining = []
+                for (index, payload), error in zip(pending, item_errors, strict=True):
+                    if error:
+                        result.errors[index] = _format_item_error(error)
+                    else:
+                        remaining.append((index, payload))
+
+                if len(remaining) == len(pending):
+                    # Request failed without blaming any item; don't loop forever
+                    for index, _ in pending:
+                        result.errors[index] = str(e)
+                    return
+                pending = remaining
+                continue
+            except Exception as e:
+                for index, _ in pending:
+                    result.errors[index] = str(e)
+                return
+
+            if not isinstance(records, list):
+                records = [records]
+            for (index, _), record in zip(pending, records, strict=True):
+                result.ids[index] = int(record.id)
+            return
+
+
+def _primary_ip_address(record: Any) -> str | None:
+    """Extract a record's primary IP address without prefix length.
+
+    Args:
+        record: pynetbox device or VM record.
+
+    Returns:
+        Primary IP (e.g., '192.168.1.10'), or None if not assigned.
+    """
+    if not record.primary_ip:
+        return None
+    return str(record.primary_ip).split("/")[0]
+
+
+def _host_prefix(ip: dict[str, Any]) -> str:
+    """Add a host prefix length to a bare IP address.
+
+    Args:
+        ip: assign_ips() item with an 'ip_address' key.
+
+    Returns:
+        Address with /32 (IPv4) or /128 (IPv6) appended.
+    """
+    address = str(ip["ip_address"])
+    return f"{address}/128" if ":" in address else f"{address}/32"
+
+
+def _bulk_item_errors(error: RequestError, count: int) -> list[Any] | None:
+    """Extract per-object errors from a failed bulk request.
+
+    Args:
+        error: Exception raised by pynetbox.
+        count: Number of objects in the failed request.
+
+    Returns:
+        One entry per object (empty for objects that were valid), or None
+        if the response does not carry per-object errors.
+    """
+    try:
+        body = error.req.json()
+    except Exception:
+        return None
+
+    if isinstance(body, list) and len(body) == count:
+        return body
+    return None
+
+
+def _format_item_error(error: Any) -> str:
+    """Render a NetBox per-object validation error as one line.
+
+    Args:
+        error: Error entry, usually {'field': ['message', ...]}.
+
+    Returns:
+        Human-readable error message.
+    """
+    if isinstance(error, dict):
+        parts = []
+        for key, messages in error.items():
+            if isinstance(messages, list):
+                messages = "; ".join(str(m) for m in messages)
+            parts.append(f"{key}: {messages}")
+        return ", ".join(parts)
+    return str(error)
+
+
+def _graphql_primary_ip(item: dict[str, Any]) -> str | None:
+    """Extract the primary IP from a GraphQL device/VM, preferring IPv4.
+
+    Args:
+        item: GraphQL device or VM object.
+
+    Returns:
+        Primary IP without prefix length, or None if not assigned.
+    """
+    for key in ("primary_ip4", "primary_ip6"):
+        ip = item.get(key)
+        if ip and ip.get("address"):
+            return str(ip["address"]).split("/")[0]
+    return None
+
+
+def _status_label(status: Any) -> str | None:
+    """Render a device or VM status as its label, the same way for REST and GraphQL.
+
+    REST records carry the choice value and label, GraphQL only the value
+    ('active' or 'ACTIVE'). Both are mapped from the value through
+    STATUS_LABELS, so the two inventory backends agree; values without a
+    built-in label (custom choices) are returned in lower case.
+
+    Args:
+        status: REST choice (with a value attribute) or GraphQL value.
+
+    Returns:
+        Status label, or None if not set.
+    """
+    if not status:
+        return None
+    value = str(getattr(status, "value", status)).lower()
+    return STATUS_LABELS.get(value, value)
+
 
 def get_netbox_client() -> NetBoxClient:
     """Create a NetBox client from configuration.
@@ -322,7 +1380,31 @@ def get_netbox_client() -> NetBoxClient:
         The client uses lazy connection, so actual connection
         errors will occur on first API call, not here.
     """
-    return NetBoxClient()
+    from netbox_auto.config import ConfigError, get_config
+
+    try:
+        netbox_config = get_config().netbox
+    except ConfigError:
+        netbox_config = None
+
+    if netbox_config is None:
+        return NetBoxClient()
+
+    return NetBoxClient(
+        page_size=netbox_config.page_size,
+        threading=netbox_config.threading,
+        inventory_backend=netbox_config.inventory_backend,
+        batch_size=netbox_config.batch_size,
+        transport=NetBoxTransport(
+            timeout=netbox_config.timeout,
+            connect_timeout=netbox_config.connect_timeout,
+            pool_size=netbox_config.pool_size,
+            max_retries=netbox_config.max_retries,
+            backoff_factor=netbox_config.backoff_factor,
+        ),
+        cache_ttl=netbox_config.cache_ttl,
+        write_rate=netbox_config.write_rate,
+    )
 
 
 def get_netbox_devices() -> list[dict[str, Any]]:
@@ -345,3 +1427,16 @@ def get_netbox_vms() -> list[dict[str, Any]]:
     """
     client = get_netbox_client()
     return client.get_vms()
+
+
+def get_netbox_inventory() -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Convenience function to get devices and VMs from NetBox.
+
+    Returns:
+        Tuple of (devices, vms) from NetBox.
+
+    Raises:
+        NetBoxFetchError: If the inventory could not be fetched.
+    """
+    client = get_netbox_client()
+    return client.get_inventory()
@@ -0,0 +1,157 @@
+"""Push changeset model for plan/apply pushes.
+
+A PushPlan records, per approved host, whether its NetBox object must be
+created, updated or left alone, as diffed against NetBox at planning time.
+Plans serialize to JSON so a dry-run can be reviewed and later applied
+exactly as planned.
+"""
+
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+# Bumped whenever the plan file layout changes incompatibly
+PLAN_VERSION = 1
+
+
+class PlanError(Exception):
+    """Raised when a plan file cannot be read."""
+
+    pass
+
+
+class PlanAction(str, Enum):
+    """What applying a plan does for one host."""
+
+    CREATE = "create"
+    UPDATE = "update"
+    NOOP = "noop"
+
+
+@dataclass
+class HostChange:
+    """Planned NetBox change for one host.
+
+    The host fields the change was computed from (name, kind, IPs and switch
+    port) are recorded so apply can refuse hosts edited since planning.
+    """
+
+    host_id: int
+    mac: str
+    name: str
+    kind: str  # 'device' or 'vm'
+    action: PlanAction
+    ip_addresses: list[str] = field(default_factory=list)
+    switch_port: str | None = None
+    netbox_id: int | None = None
+    # Field name -> [current NetBox value, planned value], for updates
+    changes: dict[str, list[Any]] = field(default_factory=dict)
+    # Field name -> [current NetBox value, host value] for differences that
+    # applying the plan does not write (only renames are applied to
+    # existing objects)
+    unsynced: dict[str, list[Any]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        data = asdict(self)
+        data["action"] = self.action.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "HostChange":
+        """Create a HostChange from its dictionary form.
+
+        Args:
+            data: Dictionary produced by to_dict().
+
+        Returns:
+            Parsed HostChange.
+        """
+        return cls(**{**data, "action": PlanAction(data["action"])})
+
+
+@dataclass
+class PushPlan:
+    """Changeset for pushing approved hosts to NetBox."""
+
+    changes: list[HostChange] = field(default_factory=list)
+    created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+    def by_action(self, action: PlanAction) -> list[HostChange]:
+        """Get the changes with the given action, in plan order."""
+        return [change for change in self.changes if change.action == action]
+
+    def summary(self) -> dict[str, int]:
+        """Count changes per action.
+
+        Returns:
+            Mapping of action value to number of hosts.
+        """
+        return {action.value: len(self.by_action(action)) for action in PlanAction}
+
+    def unsynced(self) -> list[HostChange]:
+        """Get the changes of existing objects that still differ after apply."""
+        return [change for change in self.changes if change.unsynced]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "version": PLAN_VERSION,
+            "created_at": self.created_at.isoformat(),
+            "changes": [change.to_dict() for change in self.changes],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PushPlan":
+        """Create a PushPlan from its dictionary form.
+
+        Args:
+            data: Dictionary produced by to_dict().
+
+        Returns:
+            Parsed PushPlan.
+
+        Raises:
+            PlanError: If the data is not a plan of a supported version.
+        """
+        if data.get("version") != PLAN_VERSION:
+            raise PlanError(f"Unsupported plan version: {data.get('version')!r}")
+        try:
+            return cls(
+                changes=[HostChange.from_dict(change) for change in data["changes"]],
+                created_at=datetime.fromisoformat(data["created_at"]),
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise PlanError(f"Malformed plan: {e}") from e
+
+    def save(self, path: Path) -> None:
+        """Write the plan to a JSON file.
+
+        Args:
+            path: Destination file path.
+        """
+        path.write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+
+    @classmethod
+    def load(cls, path: Path) -> "PushPlan":
+        """Read a plan from a JSON file.
+
+        Args:
+            path: Plan file written by save().
+
+        Returns:
+            Loaded PushPlan.
+
+        Raises:
+            PlanError: If the file cannot be read or is not a valid plan.
+        """
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            raise PlanError(f"Cannot read plan file {path}: {e}") from e
+        if not isinstance(data, dict):
+            raise PlanError(f"Plan file {path} does not contain a plan")
+        return cls.from_dict(data)
@@ -1,17 +1,30 @@
 """Push orchestration module for NetBox and DNS updates.
 
 Orchestrates the push workflow from approved hosts to NetBox and DNS.
+NetBox pushes are planned first (see netbox_auto.plan) and then applied.
 """
 
 import logging
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
+from pathlib import Path
+from queue import Empty, Queue
+from threading import Event, Lock
+from typing import Any
 
-from sqlalchemy.orm import Session
-
+from netbox_auto.config import NetBoxConfig, get_config
 from netbox_auto.database import get_session
-from netbox_auto.dns import generate_unbound_config, push_dns_config
-from netbox_auto.models import Host, HostSource, HostStatus
-from netbox_auto.netbox import NetBoxClient, get_netbox_client
+from netbox_auto.dns import push_dns_config, reverse_zones, stream_unbound_zones
+from netbox_auto.journal import PushJournal, StepRecord
+from netbox_auto.models import Host, HostSource, HostStatus, PushRunStatus, StepStatus
+from netbox_auto.netbox import (
+    DEFAULT_BATCH_SIZE,
+    BulkResult,
+    NetBoxClient,
+    get_netbox_client,
+)
+from netbox_auto.plan import HostChange, PlanAction, PushPlan
 
 logger = logging.getLogger(__name__)
 
@@ -21,23 +34,42 @@ class PushResult:
     """Result of a push operation."""
 
     netbox_created: int = 0
+    netbox_updated: int = 0
+    netbox_unchanged: int = 0
     cables_created: int = 0
     dns_updated: list[str] = field(default_factory=list)
+    dns_skipped: list[str] = field(default_factory=list)
     errors: list[str] = field(default_factory=list)
     dry_run: bool = False
+    plan: PushPlan | None = None
 
 
 def push_approved_hosts(
     dry_run: bool = False,
     skip_netbox: bool = False,
     skip_dns: bool = False,
+    plan: PushPlan | None = None,
+    plan_out: Path | None = None,
+    resume: bool = False,
+    changed: bool = False,
 ) -> PushResult:
     """Push approved hosts to NetBox and DNS.
 
+    The NetBox push runs in two phases: a plan is computed by diffing the
+    approved hosts against NetBox, then applied (or, in dry-run mode, only
+    reported). A previously saved plan can be applied instead of planning.
+    Applied pushes are journaled step by step and committed as they go, so
+    an interrupted push can be resumed. In changed mode, only pushed hosts
+    that drifted since their last push are synced, with minimal updates.
+
     Args:
         dry_run: If True, preview changes without pushing.
         skip_netbox: If True, skip NetBox push.
         skip_dns: If True, skip DNS push.
+        plan: Saved plan to apply instead of computing a new one.
+        plan_out: If set, write the plan to this file before applying it.
+        resume: If True, continue the latest interrupted push from its journal.
+        changed: If True, sync drifted pushed hosts instead of pushing approved ones.
 
     Returns:
         PushResult with counts of created/updated resources.
@@ -46,38 +78,95 @@ def push_approved_hosts(
     session = get_session()
 
     try:
-        # Query approved hosts
-        approved_hosts = session.query(Host).filter(Host.status == HostStatus.APPROVED.value).all()
+        journal: PushJournal | None = None
+        if changed:
+            hosts = (
+                session.query(Host)
+                .filter(Host.status == HostStatus.PUSHED.value, Host.drifted.is_(True))
+                .all()
+            )
+            if not hosts:
+                logger.info("No drifted hosts to push")
+                return result
+            logger.info(f"Found {len(hosts)} drifted hosts to sync")
+        elif resume:
+            journal = PushJournal.latest_incomplete(session)
+            if journal is None:
+                logger.info("No interrupted push to resume")
+                result.errors.append("No interrupted push to resume")
+                return result
+
+            plan = journal.plan
+            # Hosts created before the interruption are already marked PUSHED
+            hosts = (
+                session.query(Host)
+                .filter(
+                    Host.id.in_([change.host_id for change in plan.changes]),
+                    Host.status.in_([HostStatus.APPROVED.value, HostStatus.PUSHED.value]),
+                )
+                .all()
+            )
+            logger.info(f"Resuming push run {journal.run.id} for {len(hosts)} hosts")
+        else:
+            # Query approved hosts
+            hosts = session.query(Host).filter(Host.status == HostStatus.APPROVED.value).all()
 
-        if not approved_hosts:
-            logger.info("No approved hosts to push")
-            return result
+            if not hosts:
+                logger.info("No approved hosts to push")
+                return result
 
-        logger.info(f"Found {len(approved_hosts)} approved hosts to push")
+            logger.info(f"Found {len(hosts)} approved hosts to push")
 
         # Push to NetBox if not skipped
         if not skip_netbox:
             netbox_client = get_netbox_client()
-
-            for host in approved_hosts:
-                try:
-                    _push_host_to_netbox(host, netbox_client, result, dry_run, session)
-                except Exception as e:
-                    error_msg = f"Failed to push {host.hostname or host.mac}: {e}"
-                    logger.error(error_msg)
-                    result.errors.append(error_msg)
-                    # Continue with other hosts
+            try:
+                if changed:
+                    _sync_drifted_hosts(hosts, netbox_client, result, dry_run)
+                else:
+                    if plan is None:
+                        plan = plan_push(hosts, netbox_client)
+                    result.plan = plan
+                    if plan_out is not None:
+                        plan.save(plan_out)
+                        logger.info(f"Wrote push plan to {plan_out}")
+                    if journal is None and not dry_run:
+                        journal = PushJournal.start(session, plan)
+                    apply_push_plan(plan, hosts, netbox_client, result, dry_run, journal)
+            except Exception as e:
+                error_msg = f"NetBox push failed: {e}"
+                logger.error(error_msg)
+                result.errors.append(error_msg)
+                if journal is not None:
+                    # Completed steps are already committed; keep the run resumable
+                    session.rollback()
+                    journal.finish(PushRunStatus.FAILED)
+                    journal = None
+            if journal is not None:
+                journal.finish(PushRunStatus.COMPLETED)
 
         # Generate and push DNS config if not skipped
         if not skip_dns:
-            # Get all pushed hosts (including newly pushed) for DNS
-            pushed_hosts = session.query(Host).filter(Host.status == HostStatus.PUSHED.value).all()
+            # Records come from all pushed hosts (including newly pushed)
+            has_pushed = (
+                session.query(Host.id).filter(Host.status == HostStatus.PUSHED.value).first()
+            )
 
-            if pushed_hosts:
-                config = generate_unbound_config(pushed_hosts)
+            if has_pushed is not None:
                 try:
-                    updated = push_dns_config(config, dry_run=dry_run)
-                    result.dns_updated = updated
+                    unbound_config = get_config().unbound
+                    zones = reverse_zones(
+                        unbound_config.reverse_zones, unbound_config.reverse_zone_type
+                    )
+                    dns_result = push_dns_config(
+                        stream_unbound_zones(session, unbound_config.domain, zones=zones),
+                        dry_run=dry_run,
+                        session=session,
+                    )
+                    result.dns_updated = dns_result.updated
+                    result.dns_skipped = dns_result.skipped
+                    for server, error in dns_result.failed.items():
+                        result.errors.append(f"DNS push to {server} failed: {error}")
                 except Exception as e:
                     error_msg = f"DNS push failed: {e}"
                     logger.error(error_msg)
@@ -93,59 +182,1327 @@ def push_approved_hosts(
         session.close()
 
 
-def _push_host_to_netbox(
-    host: Host,
+def plan_push(hosts: list[Host], netbox_client: NetBoxClient) -> PushPlan:
+    """Diff approved hosts against NetBox and compute the push changeset.
+
+    NetBox devices and VMs are fetched in one bulk inventory read. A host
+    matches an existing object of its kind by stored netbox_id, then by
+    name. Matched hosts whose NetBox name differs are planned as updates;
+    the rest are no-ops, so repeat pushes make no writes for them. Other
+    differences in the fields the drift fingerprint covers (primary IP,
+    switch port cable) are not written to existing objects; they are
+    recorded in the change's unsynced fields and logged.
+
+    Args:
+        hosts: Approved hosts to plan.
+        netbox_client: NetBox client instance.
+
+    Returns:
+        PushPlan with one change per host, in input order.
+
+    Raises:
+        NetBoxFetchError: If the NetBox inventory could not be fetched.
+    """
+    devices, vms = netbox_client.get_inventory()
+    inventory = {"device": devices, "vm": vms}
+    by_id = {kind: {item["id"]: item for item in items} for kind, items in inventory.items()}
+    by_name = {kind: {item["name"]: item for item in items} for kind, items in inventory.items()}
+
+    plan = PushPlan()
+    for host in hosts:
+        kind = "vm" if _is_vm(host) else "device"
+        name = _get_hostname(host)
+        change = HostChange(
+            host_id=host.id,
+            mac=host.mac,
+            name=name,
+            kind=kind,
+            action=PlanAction.CREATE,
+            ip_addresses=list(host.ip_addresses or []),
+            switch_port=host.switch_port,
+        )
+
+        existing = None
+        if host.netbox_id is not None:
+            existing = by_id[kind].get(host.netbox_id)
+        if existing is None:
+            existing = by_name[kind].get(name)
+
+        if existing is not None:
+            change.netbox_id = existing["id"]
+            if existing["name"] != name:
+                change.action = PlanAction.UPDATE
+                change.changes["name"] = [existing["name"], name]
+            else:
+                change.action = PlanAction.NOOP
+            change.unsynced = _unsynced_fields(host, existing)
+
+        plan.changes.append(change)
+
+    summary = plan.summary()
+    logger.info(
+        f"Push plan: {summary['create']} to create, {summary['update']} to update, "
+        f"{summary['noop']} unchanged"
+    )
+    for change in plan.unsynced():
+        logger.warning(
+            f"{change.kind} {change.name} differs from NetBox in fields push does not "
+            f"update: {_describe(change.unsynced)}"
+        )
+    return plan
+
+
+def _unsynced_fields(host: Host, existing: dict[str, Any]) -> dict[str, list[Any]]:
+    """Find differences from an existing NetBox object that a push leaves in place.
+
+    Args:
+        host: Host matched to the object.
+        existing: Inventory item of the object.
+
+    Returns:
+        Field name -> [NetBox value, host value] for the primary IP and, when
+        the host was pushed with a cable, its switch port.
+    """
+    unsynced: dict[str, list[Any]] = {}
+    ips = [str(ip).split("/")[0] for ip in host.ip_addresses or []]
+    netbox_ip = existing.get("primary_ip")
+    if (netbox_ip or ips) and netbox_ip not in ips:
+        unsynced["primary_ip"] = [netbox_ip, ips[0] if ips else None]
+    pushed = host.netbox_objects or {}
+    if "cable" in pushed and pushed.get("switch_port") != host.switch_port:
+        unsynced["switch_port"] = [pushed.get("switch_port"), host.switch_port]
+    return unsynced
+
+
+def _describe(fields: dict[str, list[Any]]) -> str:
+    """Format field differences as 'name: old -> new' pairs."""
+    return ", ".join(f"{name}: {old} -> {new}" for name, (old, new) in fields.items())
+
+
+def apply_push_plan(
+    plan: PushPlan,
+    hosts: list[Host],
     netbox_client: NetBoxClient,
     result: PushResult,
     dry_run: bool,
-    session: Session,
+    journal: PushJournal | None = None,
 ) -> None:
-    """Push a single host to NetBox.
+    """Apply a push plan to NetBox and the staging DB.
+
+    Hosts that are no longer approved, or whose name, type, IPs or switch
+    port changed since the plan was made, are skipped with an error rather
+    than pushed differently from what was reviewed. Steps the journal
+    records as done are not repeated.
 
     Args:
-        host: Host to push.
+        plan: Plan to apply.
+        hosts: Hosts the plan may be applied to.
         netbox_client: NetBox client instance.
         result: PushResult to update.
-        dry_run: If True, don't actually push.
-        session: Database session for status updates.
+        dry_run: If True, only report what would change.
+        journal: Journal to record steps in (and resume from), if any.
+    """
+    hosts_by_id = {host.id: host for host in hosts}
+    completed: dict[tuple[int, str], int] = {}
+    if journal is not None:
+        completed = journal.completed()
+        _resolve_in_doubt(journal, plan, hosts_by_id, netbox_client, completed)
+
+    creates: list[Host] = []
+    updates: list[tuple[Host, HostChange]] = []
+
+    for change in plan.changes:
+        host = hosts_by_id.get(change.host_id)
+        if host is None:
+            result.errors.append(f"Planned change for {change.name} skipped - no longer approved")
+            continue
+        if not _matches_plan(host, change):
+            result.errors.append(
+                f"Planned change for {change.name} skipped - host changed since the plan was made"
+            )
+            continue
+
+        if change.action == PlanAction.CREATE:
+            creates.append(host)
+        elif change.action == PlanAction.UPDATE:
+            updates.append((host, change))
+        else:
+            if dry_run and change.unsynced:
+                logger.info(
+                    f"[DRY RUN] {change.kind} {change.name} exists; not updated: "
+                    f"{_describe(change.unsynced)}"
+                )
+            elif dry_run:
+                logger.info(f"[DRY RUN] {change.kind} {change.name} is up to date")
+            else:
+                host.netbox_id = change.netbox_id
+                host.status = HostStatus.PUSHED.value
+                _record_linked_state(host, change)
+            result.netbox_unchanged += 1
+
+    if creates:
+        _push_hosts_to_netbox(creates, netbox_client, result, dry_run, journal, completed)
+    if updates:
+        _apply_updates(updates, netbox_client, result, dry_run, journal, completed)
+
+
+def _resolve_in_doubt(
+    journal: PushJournal,
+    plan: PushPlan,
+    hosts_by_id: dict[int, Host],
+    netbox_client: NetBoxClient,
+    completed: dict[tuple[int, str], int],
+) -> None:
+    """Settle journaled steps whose outcome was lost in an interruption.
+
+    NetBox may have applied an in-doubt write before the push stopped, so
+    each one is looked up first (see _find_in_doubt). Steps found count as
+    done with the IDs NetBox holds; the rest are forgotten and attempted
+    again.
+
+    Args:
+        journal: Journal of the resumed run.
+        plan: Plan of the resumed run.
+        hosts_by_id: Hosts being pushed, keyed by host ID.
+        netbox_client: NetBox client instance.
+        completed: Completed steps, updated in place.
+    """
+    in_doubt = journal.in_doubt()
+    if not in_doubt:
+        return
+
+    netbox_config = get_config().netbox
+    interface_name = netbox_config.interface_name if netbox_config else "eth0"
+    changes = {change.host_id: change for change in plan.changes}
+    resolved: list[StepRecord] = []
+    retry: list[tuple[int, str]] = []
+    # Recording order puts each step after the steps it depends on
+    for host_id, step in in_doubt:
+        change = changes.get(host_id)
+        netbox_id = None
+        if change is not None:
+            netbox_id = _find_in_doubt(step, change, completed, netbox_client, interface_name)
+
+        if netbox_id is None:
+            retry.append((host_id, step))
+            continue
+
+        resolved.append(StepRecord(host_id, step, StepStatus.DONE, netbox_id=netbox_id))
+        completed[(host_id, step)] = netbox_id
+        host = hosts_by_id.get(host_id)
+        if step == "create" and host is not None:
+            host.netbox_id = netbox_id
+            host.status = HostStatus.PUSHED.value
+
+    logger.info(f"Resolved {len(resolved)} in-doubt steps; retrying {len(retry)}")
+    journal.forget(retry)
+    journal.record(resolved)
+    journal.commit()
+
+
+def _find_in_doubt(
+    step: str,
+    change: HostChange,
+    completed: dict[tuple[int, str], int],
+    netbox_client: NetBoxClient,
+    interface_name: str,
+) -> int | None:
+    """Look up in NetBox what an in-doubt step would have written.
+
+    A create is found by name, an interface by its object and name, an IP
+    by address and interface, a primary IP by reading the object's primary
+    IPs and a cable through the interface's cable. Steps whose
+    prerequisites are not done are not looked up, as they cannot have run.
+
+    Args:
+        step: Journal step name.
+        change: Planned change of the step's host.
+        completed: Completed steps of the run.
+        netbox_client: NetBox client instance.
+        interface_name: Name of the interface pushes create.
+
+    Returns:
+        The ID the step records when done, or None if it must be retried.
+    """
+    host_id = change.host_id
+    object_id = completed.get((host_id, "create"), change.netbox_id)
+    interface_id = completed.get((host_id, "interface"))
+
+    if step == "create":
+        return netbox_client.lookup_id(change.kind, change.name)
+    if object_id is None:
+        return None
+    if step == "interface":
+        return netbox_client.find_interface(change.kind, object_id, interface_name)
+    if interface_id is None:
+        return None
+    if step.startswith("ip:"):
+        interface_type = "virtualization.vminterface" if change.kind == "vm" else "dcim.interface"
+        return netbox_client.find_ip(step.removeprefix("ip:"), interface_id, interface_type)
+    if step == "primary_ip":
+        ip_ids = {
+            ip: completed[(host_id, f"ip:{ip}")]
+            for ip in change.ip_addresses
+            if (host_id, f"ip:{ip}") in completed
+        }
+        expected = _primary_ips(change.ip_addresses, ip_ids)
+        current = netbox_client.get_primary_ips(change.kind, object_id)
+        if expected and all(current.get(key) == ip_id for key, ip_id in expected.items()):
+            return object_id
+        return None
+    if step == "cable":
+        return netbox_client.get_interface_cable(interface_id)
+    # Updates are plain field writes and safe to repeat
+    return None
+
+
+def _matches_plan(host: Host, change: HostChange) -> bool:
+    """Check that a host still has the fields its planned change was computed from."""
+    return (
+        change.mac == host.mac
+        and change.name == _get_hostname(host)
+        and change.kind == ("vm" if _is_vm(host) else "device")
+        and change.ip_addresses == list(host.ip_addresses or [])
+        and change.switch_port == host.switch_port
+    )
+
+
+def _apply_updates(
+    updates: list[tuple[Host, HostChange]],
+    netbox_client: NetBoxClient,
+    result: PushResult,
+    dry_run: bool,
+    journal: PushJournal | None = None,
+    completed: dict[tuple[int, str], int] | None = None,
+) -> None:
+    """Send planned field updates to NetBox with one bulk PATCH per kind.
+
+    Args:
+        updates: (host, planned change) pairs with action UPDATE.
+        netbox_client: NetBox client instance.
+        result: PushResult to update.
+        dry_run: If True, only log the updates.
+        journal: Journal to record the updates in, if any.
+        completed: Journaled steps already done; those updates are skipped.
+    """
+    completed = completed or {}
+    for kind in ("device", "vm"):
+        batch = [
+            (host, change)
+            for host, change in updates
+            if change.kind == kind and (host.id, "update") not in completed
+        ]
+        if not batch:
+            continue
+
+        if dry_run:
+            for _, change in batch:
+                logger.info(
+                    f"[DRY RUN] Would update {kind} {change.name} ({_describe(change.changes)})"
+                )
+            result.netbox_updated += len(batch)
+            continue
+
+        payloads = [
+            {"id": change.netbox_id, **{k: new for k, (_, new) in change.changes.items()}}
+            for _, change in batch
+        ]
+        keys = [(host.id, "update") for host, _ in batch]
+        if journal is not None:
+            journal.record(_intents(keys))
+            journal.commit()
+        if kind == "vm":
+            updated = netbox_client.update_vms(payloads)
+        else:
+            updated = netbox_client.update_devices(payloads)
+
+        for index, (host, change) in enumerate(batch):
+            if index in updated.errors:
+                result.errors.append(f"Failed to update {change.name}: {updated.errors[index]}")
+                continue
+            host.netbox_id = change.netbox_id
+            host.status = HostStatus.PUSHED.value
+            _record_linked_state(host, change)
+            result.netbox_updated += 1
+        if journal is not None:
+            journal.record(_outcomes(keys, updated))
+            journal.commit()
+
+
+def _record_linked_state(host: Host, change: HostChange) -> None:
+    """Record push state for a host linked to an object that already existed.
+
+    Only the object itself is known; its interfaces, IPs and cables were not
+    created by this tool, so drift sync can rename it but not rewire it.
+    """
+    assert change.netbox_id is not None
+    _record_pushed_state(host, {"kind": change.kind, "id": change.netbox_id, "name": change.name})
+
+
+def _intents(keys: list[tuple[int, str]]) -> list[StepRecord]:
+    """Build PENDING records announcing steps about to be sent to NetBox."""
+    return [StepRecord(host_id, step, StepStatus.PENDING) for host_id, step in keys]
+
+
+def _outcomes(keys: list[tuple[int, str]], written: BulkResult) -> list[StepRecord]:
+    """Build DONE/FAILED records from a bulk write result, matched by position."""
+    return [
+        (
+            StepRecord(host_id, step, StepStatus.FAILED, error=written.errors[index])
+            if index in written.errors
+            else StepRecord(host_id, step, StepStatus.DONE, netbox_id=written.ids[index])
+        )
+        for index, (host_id, step) in enumerate(keys)
+    ]
+
+
+@dataclass(frozen=True)
+class _HostSpec:
+    """Snapshot of the host fields a push worker needs.
+
+    Workers never touch ORM objects; only the main thread writes to the
+    staging DB session.
     """
-    hostname = host.hostname or f"host-{host.mac.replace(':', '')}"
 
+    host_id: int
+    name: str
+    label: str
+    ip_addresses: tuple[str, ...]
+    switch_port: str | None
+    is_vm: bool
+
+
+@dataclass
+class _BatchOutcome:
+    """Result of pushing one batch of hosts, applied by the main thread."""
+
+    netbox_ids: dict[int, int] = field(default_factory=dict)
+    # Host ID -> NetBox objects pushed for it, stored as Host.netbox_objects
+    objects: dict[int, dict[str, Any]] = field(default_factory=dict)
+    cables_created: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+@dataclass
+class _Batch:
+    """State shared by the steps of one batch push on a worker thread."""
+
+    netbox_client: NetBoxClient
+    # Journaled steps already done: (host ID, step) -> NetBox ID
+    completed: dict[tuple[int, str], int]
+    report: Callable[[list[StepRecord]], None]
+    outcome: _BatchOutcome = field(default_factory=_BatchOutcome)
+
+    def done(self, host_id: int, step: str) -> bool:
+        """Check whether the journal records a step as done."""
+        return (host_id, step) in self.completed
+
+    def write(
+        self,
+        keys: list[tuple[int, str]],
+        write: Callable[[list[dict[str, Any]]], BulkResult],
+        payloads: list[dict[str, Any]],
+    ) -> BulkResult:
+        """Run one bulk write bracketed by journal intent and outcome records.
+
+        Args:
+            keys: (host ID, step) per payload, in the same order.
+            write: Bulk client method to call.
+            payloads: Request items.
+
+        Returns:
+            Result of the bulk write.
+        """
+        self.report(_intents(keys))
+        written = write(payloads)
+        self.report(_outcomes(keys, written))
+        return written
+
+
+class _JournalWriter:
+    """Funnels step records from push workers to the thread owning the DB session.
+
+    Workers block in report() until their records are committed, so an
+    intent is durable before the NetBox call it announces is made, and
+    each step's outcome (with host status changes) is committed as it
+    arrives.
+    """
+
+    def __init__(self, journal: PushJournal | None, hosts_by_id: dict[int, Host]):
+        """Initialize the writer.
+
+        Args:
+            journal: Journal to write to; None disables journaling.
+            hosts_by_id: Hosts being pushed, keyed by host ID.
+        """
+        self._journal = journal
+        self._hosts_by_id = hosts_by_id
+        self._queue: Queue[tuple[list[StepRecord], Event]] = Queue()
+        self._lock = Lock()
+        self._closed = False
+
+    def report(self, records: list[StepRecord]) -> None:
+        """Hand records to the writer thread and wait until they are committed.
+
+        Called from push workers.
+        """
+        if self._journal is None or not records:
+            return
+
+        committed = Event()
+        with self._lock:
+            if self._closed:
+                return
+            self._queue.put((records, committed))
+        committed.wait()
+
+    def serve(self, futures: list[Future[_BatchOutcome]]) -> None:
+        """Write reported records until every worker future has finished.
+
+        Args:
+            futures: Futures of the submitted batches.
+        """
+        if self._journal is None:
+            wait(futures)
+            return
+
+        try:
+            while True:
+                try:
+                    records, committed = self._queue.get(timeout=0.05)
+                except Empty:
+                    if all(future.done() for future in futures):
+                        return
+                    continue
+                try:
+                    self._write(self._journal, records)
+                finally:
+                    committed.set()
+        except BaseException:
+            # Release workers still waiting on a commit that will never come
+            with self._lock:
+                self._closed = True
+            while not self._queue.empty():
+                self._queue.get_nowait()[1].set()
+            raise
+
+    def _write(self, journal: PushJournal, records: list[StepRecord]) -> None:
+        for record in records:
+            if record.step == "create" and record.status == StepStatus.DONE:
+                host = self._hosts_by_id[record.host_id]
+                host.netbox_id = record.netbox_id
+                host.status = HostStatus.PUSHED.value
+        journal.record(records)
+        journal.commit()
+
+
+def _push_hosts_to_netbox(
+    hosts: list[Host],
+    netbox_client: NetBoxClient,
+    result: PushResult,
+    dry_run: bool,
+    journal: PushJournal | None = None,
+    completed: dict[tuple[int, str], int] | None = None,
+) -> None:
+    """Push hosts to NetBox through a bounded pipeline of batch workers.
+
+    Hosts are split into batches of batch_size. Each batch runs its
+    dependent steps in order (create objects, interfaces, IP addresses and
+    primary IPs, cables) with one bulk request per step, while up to
+    push_workers batches run concurrently. NetBox writes from all workers
+    share the client's rate limiter. Journal records and host status
+    changes are written by the calling thread only, so the DB session has
+    a single writer.
+
+    Args:
+        hosts: Approved hosts to push.
+        netbox_client: NetBox client instance.
+        result: PushResult to update.
+        dry_run: If True, don't actually push.
+        journal: Journal to record each step in, if any.
+        completed: Journaled steps already done; these are skipped.
+    """
     if dry_run:
-        logger.info(f"[DRY RUN] Would create {_get_host_type(host)}: {hostname}")
-        if host.switch_port:
-            logger.info(f"[DRY RUN] Would create cable for switch port: {host.switch_port}")
-            result.cables_created += 1
-        result.netbox_created += 1
+        for host in hosts:
+            hostname = _get_hostname(host)
+            logger.info(f"[DRY RUN] Would create {_get_host_type(host)}: {hostname}")
+            if host.switch_port:
+                logger.info(f"[DRY RUN] Would create cable for switch port: {host.switch_port}")
+                result.cables_created += 1
+            result.netbox_created += 1
         return
 
-    # Determine if VM or device based on source
-    is_vm = host.source == HostSource.PROXMOX.value
+    netbox_config = get_config().netbox
+    interface_name = netbox_config.interface_name if netbox_config else "eth0"
+    batch_size = netbox_config.batch_size if netbox_config else DEFAULT_BATCH_SIZE
+    workers = netbox_config.push_workers if netbox_config else 1
+
+    devices = [host for host in hosts if not _is_vm(host)]
+    vms = [host for host in hosts if _is_vm(host)]
+
+    # Resolve every configured site/role/type/cluster name from cached listings
+    netbox_client.prefetch_references()
+
+    batches: list[tuple[list[_HostSpec], dict[str, int]]] = []
+
+    if devices:
+        refs = _resolve_references(
+            netbox_client, netbox_config, ["site", "device_role", "device_type"]
+        )
+        if refs is None:
+            for host in devices:
+                hostname = _get_hostname(host)
+                logger.warning(
+                    f"Device creation for {hostname} requires site, device_role "
+                    "and device_type configuration"
+                )
+                result.errors.append(
+                    f"Device creation for {hostname} skipped - NetBox IDs not configured"
+                )
+        else:
+            batches.extend((batch, refs) for batch in _batched(devices, batch_size))
+
+    if vms:
+        refs = _resolve_references(netbox_client, netbox_config, ["cluster"])
+        if refs is None:
+            for host in vms:
+                hostname = _get_hostname(host)
+                logger.warning(f"VM creation for {hostname} requires cluster configuration")
+                result.errors.append(
+                    f"VM creation for {hostname} skipped - cluster_id not configured"
+                )
+        else:
+            batches.extend((batch, refs) for batch in _batched(vms, batch_size))
 
-    if is_vm:
-        # Note: cluster_id would need to come from config in real implementation
-        # For now, log that VM creation needs more config
-        logger.warning(f"VM creation for {hostname} requires cluster_id configuration")
-        result.errors.append(f"VM creation for {hostname} skipped - cluster_id not configured")
+    if not batches:
         return
+
+    hosts_by_id = {host.id: host for host in hosts}
+    writer = _JournalWriter(journal, hosts_by_id)
+    logger.info(f"Pushing {len(hosts)} hosts in {len(batches)} batches ({workers} workers)")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _push_batch,
+                specs,
+                refs,
+                _Batch(netbox_client, completed or {}, writer.report),
+                interface_name,
+            )
+            for specs, refs in batches
+        ]
+        writer.serve(futures)
+
+    for future in futures:
+        _apply_outcome(future.result(), hosts_by_id, result)
+
+
+def _batched(hosts: list[Host], size: int) -> Iterator[list[_HostSpec]]:
+    """Snapshot hosts into worker-safe specs, size at a time.
+
+    Args:
+        hosts: Hosts of one kind (all devices or all VMs).
+        size: Hosts per batch.
+
+    Yields:
+        Lists of host specs.
+    """
+    for start in range(0, len(hosts), size):
+        yield [
+            _HostSpec(
+                host_id=host.id,
+                name=_get_hostname(host),
+                label=host.hostname or host.mac,
+                ip_addresses=tuple(host.ip_addresses or []),
+                switch_port=host.switch_port,
+                is_vm=_is_vm(host),
+            )
+            for host in hosts[start : start + size]
+        ]
+
+
+def _push_batch(
+    specs: list[_HostSpec],
+    refs: dict[str, int],
+    batch: _Batch,
+    interface_name: str,
+) -> _BatchOutcome:
+    """Run every push step for one batch of hosts, in dependency order.
+
+    Args:
+        specs: Hosts in the batch (all devices or all VMs).
+        refs: Resolved reference IDs (site/device_role/device_type or cluster).
+        batch: Client, journal state and outcome for this batch.
+        interface_name: Name of the interface to create on each object.
+
+    Returns:
+        Outcome to apply to the staging DB.
+    """
+    try:
+        pushed = _create_objects(specs, refs, batch)
+        interface_ids = _create_interfaces(pushed, batch, interface_name)
+        _assign_ips(pushed, interface_ids, batch)
+        if not specs[0].is_vm:
+            _create_cables(pushed, interface_ids, batch)
+    except Exception as e:
+        error_msg = f"NetBox push of batch starting at {specs[0].name} failed: {e}"
+        logger.error(error_msg)
+        batch.outcome.errors.append(error_msg)
+    return batch.outcome
+
+
+def _apply_outcome(
+    outcome: _BatchOutcome,
+    hosts_by_id: dict[int, Host],
+    result: PushResult,
+) -> None:
+    """Record a finished batch on its hosts and in the push result.
+
+    Args:
+        outcome: Batch outcome returned by a worker.
+        hosts_by_id: Hosts being pushed, keyed by host ID.
+        result: PushResult to update.
+    """
+    for host_id, netbox_id in outcome.netbox_ids.items():
+        # Mark as pushed after successful creation
+        host = hosts_by_id[host_id]
+        host.netbox_id = netbox_id
+        host.status = HostStatus.PUSHED.value
+        result.netbox_created += 1
+    for host_id, objects in outcome.objects.items():
+        _record_pushed_state(hosts_by_id[host_id], objects)
+    result.cables_created += outcome.cables_created
+    result.errors.extend(outcome.errors)
+
+
+def _record_pushed_state(host: Host, objects: dict[str, Any]) -> None:
+    """Store what was pushed for a host so later drift can be synced minimally.
+
+    Args:
+        host: Host that was pushed.
+        objects: NetBox objects for the host: 'kind', 'id', 'name' and, when
+            created, 'interface', 'ips' (address -> ID), 'primary_ip4',
+            'primary_ip6', 'cable' and 'switch_port'.
+    """
+    host.netbox_objects = objects
+    host.push_fingerprint = host.fingerprint()
+    host.drifted = False
+
+
+def _resolve_references(
+    netbox_client: NetBoxClient,
+    netbox_config: NetBoxConfig | None,
+    kinds: list[str],
+) -> dict[str, int] | None:
+    """Resolve configured reference object names to NetBox IDs.
+
+    Args:
+        netbox_client: NetBox client instance.
+        netbox_config: NetBox configuration holding the reference names.
+        kinds: Reference kinds to resolve (e.g., ['site', 'device_role']).
+
+    Returns:
+        Mapping of kind to NetBox ID, or None if any is unset or not found.
+    """
+    if netbox_config is None:
+        return None
+
+    refs: dict[str, int] = {}
+    for kind in kinds:
+        name = getattr(netbox_config, kind)
+        if not name:
+            return None
+        ref_id = netbox_client.lookup_id(kind, name)
+        if ref_id is None:
+            return None
+        refs[kind] = ref_id
+    return refs
+
+
+def _create_objects(
+    specs: list[_HostSpec],
+    refs: dict[str, int],
+    batch: _Batch,
+) -> list[tuple[_HostSpec, int]]:
+    """Create the devices or VMs of a batch that don't exist yet.
+
+    Args:
+        specs: Hosts in the batch (all devices or all VMs).
+        refs: Resolved reference IDs.
+        batch: Batch state; created IDs and errors go to its outcome.
+
+    Returns:
+        (host, NetBox object ID) for hosts that now exist in NetBox, in input order.
+    """
+    todo = [spec for spec in specs if not batch.done(spec.host_id, "create")]
+    if todo:
+        keys = [(spec.host_id, "create") for spec in todo]
+        if todo[0].is_vm:
+            created = batch.write(
+                keys,
+                batch.netbox_client.create_vms,
+                [{"name": spec.name, "cluster_id": refs["cluster"]} for spec in todo],
+            )
+        else:
+            created = batch.write(
+                keys,
+                batch.netbox_client.create_devices,
+                [
+                    {
+                        "name": spec.name,
+                        "device_type_id": refs["device_type"],
+                        "device_role_id": refs["device_role"],
+                        "site_id": refs["site"],
+                    }
+                    for spec in todo
+                ],
+            )
+
+        for index, spec in enumerate(todo):
+            if index in created.errors:
+                error_msg = f"Failed to push {spec.label}: {created.errors[index]}"
+                logger.error(error_msg)
+                batch.outcome.errors.append(error_msg)
+            else:
+                batch.outcome.netbox_ids[spec.host_id] = created.ids[index]
+
+    pushed: list[tuple[_HostSpec, int]] = []
+    for spec in specs:
+        netbox_id = batch.completed.get((spec.host_id, "create"))
+        if netbox_id is None:
+            netbox_id = batch.outcome.netbox_ids.get(spec.host_id)
+        if netbox_id is not None:
+            pushed.append((spec, netbox_id))
+            batch.outcome.objects[spec.host_id] = {
+                "kind": "vm" if spec.is_vm else "device",
+                "id": netbox_id,
+                "name": spec.name,
+                "ips": {},
+            }
+    return pushed
+
+
+def _create_interfaces(
+    pushed: list[tuple[_HostSpec, int]],
+    batch: _Batch,
+    interface_name: str,
+) -> dict[int, int]:
+    """Create the IP-carrying interface on each newly created device or VM.
+
+    Args:
+        pushed: (host, NetBox object ID) pairs (all devices or all VMs).
+        batch: Batch state; errors go to its outcome.
+        interface_name: Name of the interface to create.
+
+    Returns:
+        Mapping of host ID to interface ID.
+    """
+    interface_ids = {
+        spec.host_id: batch.completed[(spec.host_id, "interface")]
+        for spec, _ in pushed
+        if batch.done(spec.host_id, "interface")
+    }
+    todo = [(spec, netbox_id) for spec, netbox_id in pushed if spec.host_id not in interface_ids]
+    if todo:
+        _create_missing_interfaces(todo, interface_ids, batch, interface_name)
+
+    for host_id, interface_id in interface_ids.items():
+        batch.outcome.objects[host_id]["interface"] = interface_id
+    return interface_ids
+
+
+def _create_missing_interfaces(
+    todo: list[tuple[_HostSpec, int]],
+    interface_ids: dict[int, int],
+    batch: _Batch,
+    interface_name: str,
+) -> None:
+    """Create interfaces for hosts that don't have one yet.
+
+    Args:
+        todo: (host, NetBox object ID) pairs needing an interface.
+        interface_ids: Mapping of host ID to interface ID, updated in place.
+        batch: Batch state; errors go to its outcome.
+        interface_name: Name of the interface to create.
+    """
+
+    keys = [(spec.host_id, "interface") for spec, _ in todo]
+    if todo[0][0].is_vm:
+        created = batch.write(
+            keys,
+            batch.netbox_client.create_vm_interfaces,
+            [{"vm_id": netbox_id, "name": interface_name} for _, netbox_id in todo],
+        )
     else:
-        # Device creation needs device_type_id, role_id, site_id from config
-        # For now, log that device creation needs more config
-        logger.warning(
-            f"Device creation for {hostname} requires device_type_id, role_id, site_id configuration"
+        created = batch.write(
+            keys,
+            batch.netbox_client.create_interfaces,
+            [{"device_id": netbox_id, "name": interface_name} for _, netbox_id in todo],
+        )
+
+    for index, (spec, _) in enumerate(todo):
+        if index in created.errors:
+            batch.outcome.errors.append(
+                f"Interface creation for {spec.name} failed: {created.errors[index]}"
+            )
+        else:
+            interface_ids[spec.host_id] = created.ids[index]
+
+
+def _assign_ips(
+    pushed: list[tuple[_HostSpec, int]],
+    interface_ids: dict[int, int],
+    batch: _Batch,
+) -> None:
+    """Assign each host's IPs to its interface and set the primary IPs.
+
+    Args:
+        pushed: (host, NetBox object ID) pairs (all devices or all VMs).
+        interface_ids: Mapping of host ID to interface ID.
+        batch: Batch state; errors go to its outcome.
+    """
+    ip_ids: dict[tuple[int, str], int] = {}
+    requests: list[dict[str, Any]] = []
+    keys: list[tuple[int, str]] = []
+    owners: list[tuple[_HostSpec, str]] = []
+    for spec, _ in pushed:
+        if spec.host_id not in interface_ids:
+            continue
+        interface_type = "virtualization.vminterface" if spec.is_vm else "dcim.interface"
+        for ip in spec.ip_addresses:
+            key = (spec.host_id, f"ip:{ip}")
+            if key in batch.completed:
+                ip_ids[(spec.host_id, ip)] = batch.completed[key]
+                continue
+            requests.append(
+                {
+                    "ip_address": ip,
+                    "interface_id": interface_ids[spec.host_id],
+                    "interface_type": interface_type,
+                }
+            )
+            keys.append(key)
+            owners.append((spec, ip))
+
+    if requests:
+        assigned = batch.write(keys, batch.netbox_client.assign_ips, requests)
+        for index, (spec, ip) in enumerate(owners):
+            if index in assigned.errors:
+                batch.outcome.errors.append(
+                    f"IP assignment of {ip} to {spec.name} failed: {assigned.errors[index]}"
+                )
+            else:
+                ip_ids[(spec.host_id, ip)] = assigned.ids[index]
+
+    for (host_id, ip), ip_id in ip_ids.items():
+        batch.outcome.objects[host_id]["ips"][ip] = ip_id
+
+    # First assigned address of each family becomes the primary IP
+    primary: dict[int, dict[str, Any]] = {}
+    primary_keys: dict[int, tuple[int, str]] = {}
+    for spec, netbox_id in pushed:
+        host_primary = _primary_ips(spec.ip_addresses, batch.outcome.objects[spec.host_id]["ips"])
+        if batch.done(spec.host_id, "primary_ip"):
+            batch.outcome.objects[spec.host_id].update(host_primary)
+        elif host_primary:
+            primary[netbox_id] = {"id": netbox_id, **host_primary}
+            primary_keys[netbox_id] = (spec.host_id, "primary_ip")
+
+    if not primary:
+        return
+
+    updates = list(primary.values())
+    update = (
+        batch.netbox_client.update_vms if pushed[0][0].is_vm else batch.netbox_client.update_devices
+    )
+    keys = [primary_keys[u["id"]] for u in updates]
+    updated = batch.write(keys, update, updates)
+    for index, (host_id, _) in enumerate(keys):
+        if index in updated.errors:
+            batch.outcome.errors.append(
+                f"Setting primary IP on NetBox object {updates[index]['id']} failed: "
+                f"{updated.errors[index]}"
+            )
+        else:
+            batch.outcome.objects[host_id].update(
+                {k: v for k, v in updates[index].items() if k != "id"}
+            )
+
+
+def _primary_ips(ip_addresses: Iterable[str], ip_ids: dict[str, int]) -> dict[str, int]:
+    """Pick the first assigned address of each family as the primary IP.
+
+    Args:
+        ip_addresses: Host IPs in priority order.
+        ip_ids: Mapping of assigned IP to NetBox IP address ID.
+
+    Returns:
+        Mapping of 'primary_ip4'/'primary_ip6' to IP address ID.
+    """
+    primary: dict[str, int] = {}
+    for ip in ip_addresses:
+        if ip in ip_ids:
+            primary.setdefault("primary_ip6" if ":" in ip else "primary_ip4", ip_ids[ip])
+    return primary
+
+
+def _create_cables(
+    pushed: list[tuple[_HostSpec, int]],
+    interface_ids: dict[int, int],
+    batch: _Batch,
+) -> None:
+    """Cable each device's interface to the switch port it was seen on.
+
+    Args:
+        pushed: (host, NetBox device ID) pairs.
+        interface_ids: Mapping of host ID to device interface ID.
+        batch: Batch state; counts and errors go to its outcome.
+    """
+    cables: list[dict[str, Any]] = []
+    cabled: list[_HostSpec] = []
+    for spec, _ in pushed:
+        if not spec.switch_port or spec.host_id not in interface_ids:
+            continue
+        if batch.done(spec.host_id, "cable"):
+            batch.outcome.objects[spec.host_id].update(
+                cable=batch.completed[(spec.host_id, "cable")], switch_port=spec.switch_port
+            )
+            continue
+
+        switch_interface_id = _get_switch_interface_id(spec.switch_port, batch.netbox_client)
+        if switch_interface_id is None:
+            batch.outcome.errors.append(
+                f"Cable for {spec.name} skipped - switch port "
+                f"{spec.switch_port} not found in NetBox"
+            )
+            continue
+
+        cables.append(
+            {
+                "a_termination_type": "dcim.interface",
+                "a_termination_id": switch_interface_id,
+                "b_termination_type": "dcim.interface",
+                "b_termination_id": interface_ids[spec.host_id],
+            }
         )
-        result.errors.append(f"Device creation for {hostname} skipped - NetBox IDs not configured")
+        cabled.append(spec)
+
+    if not cables:
         return
 
-    # Mark as pushed after successful creation
-    host.status = HostStatus.PUSHED.value
-    result.netbox_created += 1
+    created = batch.write(
+        [(spec.host_id, "cable") for spec in cabled], batch.netbox_client.create_cables, cables
+    )
+    for index, spec in enumerate(cabled):
+        if index in created.errors:
+            batch.outcome.errors.append(
+                f"Cable creation for {spec.name} failed: {created.errors[index]}"
+            )
+        else:
+            batch.outcome.cables_created += 1
+            batch.outcome.objects[spec.host_id].update(
+                cable=created.ids[index], switch_port=spec.switch_port
+            )
+
+
+@dataclass
+class _HostSync:
+    """Minimal NetBox changes bringing one drifted host's objects up to date."""
+
+    host: Host
+    objects: dict[str, Any]
+    rename: str | None = None
+    add_ips: list[str] = field(default_factory=list)
+    remove_ips: list[str] = field(default_factory=list)
+    recable: bool = False
+    failed: bool = False
+
+
+def _sync_drifted_hosts(
+    hosts: list[Host],
+    netbox_client: NetBoxClient,
+    result: PushResult,
+    dry_run: bool,
+) -> None:
+    """Send only what changed for pushed hosts that discovery flagged as drifted.
+
+    Each host's current name, IPs and switch port are diffed against its
+    recorded push state, and the differences go out as one bulk request per
+    kind of change: renames, IP deletions, IP additions, primary IP updates,
+    cable deletions and cable creations.
+
+    Args:
+        hosts: Drifted hosts.
+        netbox_client: NetBox client instance.
+        result: PushResult to update.
+        dry_run: If True, only log the changes.
+    """
+    syncs: list[_HostSync] = []
+    for host in hosts:
+        objects = dict(host.netbox_objects or {})
+        if "id" not in objects:
+            result.errors.append(
+                f"Cannot sync {_get_hostname(host)} - no NetBox objects recorded; push it again"
+            )
+            continue
+
+        sync = _HostSync(host=host, objects=objects)
+        name = _get_hostname(host)
+        if objects.get("name") != name:
+            sync.rename = name
+
+        current_ips = list(host.ip_addresses or [])
+        pushed_ips: dict[str, int] = dict(objects.get("ips", {}))
+        sync.remove_ips = [ip for ip in pushed_ips if ip not in current_ips]
+        sync.add_ips = [ip for ip in current_ips if ip not in pushed_ips]
+        if sync.add_ips and "interface" not in objects:
+            result.errors.append(
+                f"Cannot add IPs to {name} - its NetBox interface was not created by this tool"
+            )
+            sync.add_ips = []
+
+        if objects["kind"] == "device" and host.switch_port != objects.get("switch_port"):
+            sync.recable = True
+        syncs.append(sync)
+
+    if dry_run:
+        for sync in syncs:
+            label = _get_hostname(sync.host)
+            if sync.rename:
+                logger.info(f"[DRY RUN] Would rename {sync.objects['name']} to {sync.rename}")
+            for ip in sync.add_ips:
+                logger.info(f"[DRY RUN] Would assign {ip} to {label}")
+            for ip in sync.remove_ips:
+                logger.info(f"[DRY RUN] Would remove {ip} from {label}")
+            if sync.recable:
+                logger.info(f"[DRY RUN] Would recable {label} to {sync.host.switch_port}")
+        result.netbox_updated += len(syncs)
+        return
+
+    _sync_renames(syncs, netbox_client, result)
+    _sync_removed_ips(syncs, netbox_client, result)
+    _sync_added_ips(syncs, netbox_client, result)
+    _sync_primary_ips(syncs, netbox_client, result)
+    _sync_cables(syncs, netbox_client, result)
+
+    for sync in syncs:
+        if sync.failed:
+            # Keep what did change, but leave the host drifted for another pass
+            sync.host.netbox_objects = sync.objects
+            continue
+        _record_pushed_state(sync.host, sync.objects)
+        result.netbox_updated += 1
+
+
+def _sync_renames(syncs: list[_HostSync], netbox_client: NetBoxClient, result: PushResult) -> None:
+    """Rename NetBox objects whose host name changed."""
+    for kind in ("device", "vm"):
+        todo = [sync for sync in syncs if sync.rename and sync.objects["kind"] == kind]
+        if not todo:
+            continue
+        payloads = [{"id": sync.objects["id"], "name": sync.rename} for sync in todo]
+        update = netbox_client.update_vms if kind == "vm" else netbox_client.update_devices
+        updated = update(payloads)
+        for index, sync in enumerate(todo):
+            if index in updated.errors:
+                result.errors.append(
+                    f"Failed to rename {sync.objects['name']}: {updated.errors[index]}"
+                )
+                sync.failed = True
+            else:
+                sync.objects["name"] = sync.rename
+
 
-    # Create cable if switch port is set
-    if host.switch_port:
-        # Note: Cable creation needs switch interface IDs from NetBox
-        logger.info(f"Cable creation for {hostname} to {host.switch_port}")
-        result.cables_created += 1
+def _sync_removed_ips(
+    syncs: list[_HostSync], netbox_client: NetBoxClient, result: PushResult
+) -> None:
+    """Delete NetBox IP addresses the host no longer has."""
+    owners = [(sync, ip) for sync in syncs for ip in sync.remove_ips]
+    if not owners:
+        return
+    deleted = netbox_client.delete_ips([sync.objects["ips"][ip] for sync, ip in owners])
+    for index, (sync, ip) in enumerate(owners):
+        if index in deleted.errors:
+            result.errors.append(
+                f"Failed to remove {ip} from {_get_hostname(sync.host)}: {deleted.errors[index]}"
+            )
+            sync.failed = True
+            continue
+        ip_id = sync.objects["ips"].pop(ip)
+        # NetBox clears a primary IP when its address is deleted
+        for family in ("primary_ip4", "primary_ip6"):
+            if sync.objects.get(family) == ip_id:
+                del sync.objects[family]
+
+
+def _sync_added_ips(
+    syncs: list[_HostSync], netbox_client: NetBoxClient, result: PushResult
+) -> None:
+    """Assign new host IPs to the host's interface."""
+    owners = [(sync, ip) for sync in syncs for ip in sync.add_ips]
+    if not owners:
+        return
+    assigned = netbox_client.assign_ips(
+        [
+            {
+                "ip_address": ip,
+                "interface_id": sync.objects["interface"],
+                "interface_type": (
+                    "virtualization.vminterface"
+                    if sync.objects["kind"] == "vm"
+                    else "dcim.interface"
+                ),
+            }
+            for sync, ip in owners
+        ]
+    )
+    for index, (sync, ip) in enumerate(owners):
+        if index in assigned.errors:
+            result.errors.append(
+                f"IP assignment of {ip} to {_get_hostname(sync.host)} failed: "
+                f"{assigned.errors[index]}"
+            )
+            sync.failed = True
+        else:
+            sync.objects.setdefault("ips", {})[ip] = assigned.ids[index]
+
+
+def _sync_primary_ips(
+    syncs: list[_HostSync], netbox_client: NetBoxClient, result: PushResult
+) -> None:
+    """Point primary IPs at the host's first address of each family, where changed."""
+    for kind in ("device", "vm"):
+        todo: list[tuple[_HostSync, dict[str, int]]] = []
+        for sync in syncs:
+            if sync.objects["kind"] != kind or not (sync.add_ips or sync.remove_ips):
+                continue
+            wanted = _primary_ips(sync.host.ip_addresses or [], sync.objects.get("ips", {}))
+            changed = {
+                family: ip_id
+                for family, ip_id in wanted.items()
+                if sync.objects.get(family) != ip_id
+            }
+            if changed:
+                todo.append((sync, changed))
+        if not todo:
+            continue
+
+        update = netbox_client.update_vms if kind == "vm" else netbox_client.update_devices
+        updated = update([{"id": sync.objects["id"], **changed} for sync, changed in todo])
+        for index, (sync, changed) in enumerate(todo):
+            if index in updated.errors:
+                result.errors.append(
+                    f"Setting primary IP on NetBox object {sync.objects['id']} failed: "
+                    f"{updated.errors[index]}"
+                )
+                sync.failed = True
+            else:
+                sync.objects.update(changed)
+
+
+def _sync_cables(syncs: list[_HostSync], netbox_client: NetBoxClient, result: PushResult) -> None:
+    """Replace the cable of devices that moved to another switch port."""
+    moved = [sync for sync in syncs if sync.recable]
+
+    old = [sync for sync in moved if "cable" in sync.objects]
+    if old:
+        deleted = netbox_client.delete_cables([sync.objects["cable"] for sync in old])
+        for index, sync in enumerate(old):
+            if index in deleted.errors:
+                result.errors.append(
+                    f"Failed to remove cable of {_get_hostname(sync.host)}: {deleted.errors[index]}"
+                )
+                sync.failed = True
+            else:
+                del sync.objects["cable"]
+                sync.objects["switch_port"] = None
+
+    cables: list[dict[str, Any]] = []
+    cabled: list[_HostSync] = []
+    for sync in moved:
+        if sync.failed:
+            continue
+        if not sync.host.switch_port:
+            sync.objects["switch_port"] = None
+            continue
+        if "interface" not in sync.objects:
+            result.errors.append(
+                f"Cannot cable {_get_hostname(sync.host)} - its NetBox interface was not "
+                "created by this tool"
+            )
+            sync.failed = True
+            continue
+        switch_interface_id = _get_switch_interface_id(sync.host.switch_port, netbox_client)
+        if switch_interface_id is None:
+            result.errors.append(
+                f"Cable for {_get_hostname(sync.host)} skipped - switch port "
+                f"{sync.host.switch_port} not found in NetBox"
+            )
+            sync.failed = True
+            continue
+        cables.append(
+            {
+                "a_termination_type": "dcim.interface",
+                "a_termination_id": switch_interface_id,
+                "b_termination_type": "dcim.interface",
+                "b_termination_id": sync.objects["interface"],
+            }
+        )
+        cabled.append(sync)
+
+    if not cables:
+        return
+
+    created = netbox_client.create_cables(cables)
+    for index, sync in enumerate(cabled):
+        if index in created.errors:
+            result.errors.append(
+                f"Cable creation for {_get_hostname(sync.host)} failed: {created.errors[index]}"
+            )
+            sync.failed = True
+        else:
+            sync.objects.update(cable=created.ids[index], switch_port=sync.host.switch_port)
+            result.cables_created += 1
+
+
+def _get_switch_interface_id(switch_port: str, netbox_client: NetBoxClient) -> int | None:
+    """Find the NetBox interface for a 'switch_name:port_name' identifier.
+
+    Args:
+        switch_port: Switch port as stored on the host.
+        netbox_client: NetBox client instance.
+
+    Returns:
+        Interface ID, or None if the switch device is not in NetBox.
+    """
+    switch_name, _, port_name = switch_port.partition(":")
+    if not switch_name or not port_name:
+        return None
+
+    switch_id = netbox_client.lookup_id("device", switch_name)
+    if switch_id is None:
+        return None
+
+    # Served from the switch's cached interface map after the first port
+    return netbox_client.get_interface_id(switch_id, port_name)
+
+
+def _is_vm(host: Host) -> bool:
+    """Check whether a host is pushed as a VM (discovered via Proxmox)."""
+    return host.source == HostSource.PROXMOX.value
+
+
+def _get_hostname(host: Host) -> str:
+    """Get the NetBox object name for a host.
+
+    Args:
+        host: Host to name.
+
+    Returns:
+        Hostname, or 'host-<mac>' if the host has none.
+    """
+    return host.hostname or f"host-{host.mac.replace(':', '')}"
 
 
 def _get_host_type(host: Host) -> str:
@@ -157,4 +1514,4 @@ def _get_host_type(host: Host) -> str:
     Returns:
         'VM' or 'device' string.
     """
-    return "VM" if host.source == HostSource.PROXMOX.value else "device"
+    return "VM" if _is_vm(host) else "device"
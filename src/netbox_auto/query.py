@@ -0,0 +1,342 @@
+"""Filtered, sorted and keyset-paginated host listings.
+
+Used by the web hosts view. Filters run in SQL, sorting uses indexed
+columns, and pages are addressed by an opaque cursor holding the sort key
+and ID of a boundary row, so fetching a page costs the same wherever it
+is in the table.
+"""
+
+import base64
+import binascii
+import ipaddress
+import json
+import sqlite3
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    String,
+    and_,
+    exists,
+    func,
+    or_,
+    select,
+    type_coerce,
+)
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from netbox_auto.models import Host, HostSource, HostStatus, HostType
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Sort keys accepted by host_page(), each an indexed host column
+SORT_COLUMNS: dict[str, InstrumentedAttribute[Any]] = {
+    "last_seen": Host.last_seen,
+    "hostname": Host.hostname,
+    "mac": Host.mac,
+    "status": Host.status,
+    "source": Host.source,
+    "host_type": Host.host_type,
+}
+DEFAULT_SORT = "last_seen"
+
+
+class HostQueryError(Exception):
+    """Raised when listing arguments are invalid."""
+
+    pass
+
+
+@lru_cache(maxsize=64)
+def _parse_network(cidr: str) -> ipaddress.IPv4Network | ipaddress.IPv6Network:
+    return ipaddress.ip_network(cidr, strict=False)
+
+
+def _ip_in_network(address: Any, cidr: str) -> int:
+    """SQL function ip_in_network(address, cidr) for the subnet filter.
+
+    Args:
+        address: IP address, optionally with a prefix length (e.g. '10.0.0.5/24').
+        cidr: Network in CIDR notation.
+
+    Returns:
+        1 if the address is in the network, else 0 (also for invalid addresses).
+    """
+    if not isinstance(address, str):
+        return 0
+    try:
+        return int(ipaddress.ip_address(address.split("/")[0]) in _parse_network(cidr))
+    except ValueError:
+        return 0
+
+
+def register_sql_functions(dbapi_connection: Any, connection_record: Any) -> None:
+    """Register the Python SQL functions on a new SQLite connection.
+
+    Installed as a connect listener on the engines that run host queries
+    (see database.get_engine).
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_function("ip_in_network", 2, _ip_in_network, deterministic=True)
+
+
+def _wildcard_to_like(pattern: str) -> str:
+    """Translate a '*'/'?' wildcard pattern to a LIKE pattern escaped with '\\'."""
+    escaped = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped.replace("*", "%").replace("?", "_")
+
+
+@dataclass(frozen=True)
+class HostFilter:
+    """Host listing filter. Unset fields match every host."""
+
+    status: str | None = None
+    source: str | None = None
+    host_type: str | None = None
+    subnet: str | None = None  # CIDR; matches hosts with any address inside
+    search: str | None = None  # Substring of MAC, hostname, IP or switch port
+    hostname: str | None = None  # Wildcard pattern ('*' and '?'), case-insensitive
+    min_age: int | None = None  # Last seen at least this many days ago
+    max_age: int | None = None  # Last seen within this many days
+
+    @classmethod
+    def from_args(cls, args: Mapping[str, str]) -> "HostFilter":
+        """Build a filter from request arguments.
+
+        Args:
+            args: Mapping with optional 'status', 'source', 'type', 'subnet',
+                'q', 'hostname', 'min_age' and 'max_age' keys; empty values
+                are ignored.
+
+        Returns:
+            Parsed HostFilter.
+
+        Raises:
+            HostQueryError: If a value is not a known choice, valid subnet
+                or non-negative number of days.
+        """
+        choices: list[tuple[str, type[HostStatus] | type[HostSource] | type[HostType]]] = [
+            ("status", HostStatus),
+            ("source", HostSource),
+            ("type", HostType),
+        ]
+        for name, enum in choices:
+            value = args.get(name)
+            if value and value not in [member.value for member in enum]:
+                raise HostQueryError(f"Invalid {name}: {value}")
+
+        subnet = (args.get("subnet") or "").strip() or None
+        if subnet is not None:
+            try:
+                subnet = str(_parse_network(subnet))
+            except ValueError as e:
+                raise HostQueryError(f"Invalid subnet: {subnet}") from e
+
+        ages: dict[str, int | None] = {}
+        for name in ("min_age", "max_age"):
+            value = (args.get(name) or "").strip()
+            if not value:
+                ages[name] = None
+            elif value.isdigit():
+                ages[name] = int(value)
+            else:
+                raise HostQueryError(f"Invalid {name}: {value} (expected days)")
+
+        return cls(
+            status=args.get("status") or None,
+            source=args.get("source") or None,
+            host_type=args.get("type") or None,
+            subnet=subnet,
+            search=(args.get("q") or "").strip() or None,
+            hostname=(args.get("hostname") or "").strip() or None,
+            **ages,
+        )
+
+    def to_args(self) -> dict[str, str]:
+        """Convert to request arguments, omitting unset fields.
+
+        Returns:
+            Mapping accepted by from_args().
+        """
+        args = {
+            "status": self.status,
+            "source": self.source,
+            "type": self.host_type,
+            "subnet": self.subnet,
+            "q": self.search,
+            "hostname": self.hostname,
+            "min_age": None if self.min_age is None else str(self.min_age),
+            "max_age": None if self.max_age is None else str(self.max_age),
+        }
+        return {name: value for name, value in args.items() if value}
+
+    def clauses(self) -> list[ColumnElement[bool]]:
+        """Build the WHERE clauses selecting the hosts matching this filter.
+
+        Returns:
+            Conditions on the host table, to be combined with AND.
+        """
+        clauses: list[ColumnElement[bool]] = []
+        if self.status:
+            clauses.append(Host.status == self.status)
+        if self.source:
+            clauses.append(Host.source == self.source)
+        if self.host_type:
+            clauses.append(Host.host_type == self.host_type)
+        if self.subnet:
+            # json_each yields the values of both list and legacy dict IP fields
+            addresses = func.json_each(Host.ip_addresses).table_valued("value")
+            clauses.append(exists().where(func.ip_in_network(addresses.c.value, self.subnet) == 1))
+        if self.search:
+            clauses.append(
+                or_(
+                    Host.mac.contains(self.search, autoescape=True),
+                    Host.hostname.contains(self.search, autoescape=True),
+                    Host.switch_port.contains(self.search, autoescape=True),
+                    type_coerce(Host.ip_addresses, String).contains(self.search, autoescape=True),
+                )
+            )
+        if self.hostname:
+            clauses.append(Host.hostname.like(_wildcard_to_like(self.hostname), escape="\\"))
+        now = datetime.now(UTC)
+        if self.min_age is not None:
+            clauses.append(Host.last_seen <= now - timedelta(days=self.min_age))
+        if self.max_age is not None:
+            clauses.append(Host.last_seen >= now - timedelta(days=self.max_age))
+        return clauses
+
+
+@dataclass
+class HostPage:
+    """One page of a host listing."""
+
+    hosts: list[Host]
+    next_cursor: str | None = None  # Pass as 'after' for the following page
+    prev_cursor: str | None = None  # Pass as 'before' for the preceding page
+
+
+def encode_cursor(sort_key: str | None, host_id: int) -> str:
+    """Encode a page boundary as an opaque URL-safe cursor.
+
+    Args:
+        sort_key: Boundary row's sort column value, as stored.
+        host_id: Boundary row's host ID.
+
+    Returns:
+        Cursor string.
+    """
+    raw = json.dumps([sort_key, host_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str | None, int]:
+    """Decode a cursor produced by encode_cursor().
+
+    Args:
+        cursor: Cursor string.
+
+    Returns:
+        (sort key, host ID) of the boundary row.
+
+    Raises:
+        HostQueryError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_key, host_id = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise HostQueryError(f"Invalid cursor: {cursor}") from e
+    if not (sort_key is None or isinstance(sort_key, str)) or not isinstance(host_id, int):
+        raise HostQueryError(f"Invalid cursor: {cursor}")
+    return sort_key, host_id
+
+
+def _beyond(
+    key: ColumnElement[Any], sort_key: str | None, host_id: int, greater: bool
+) -> ColumnElement[bool]:
+    """Condition for rows ordered after (greater) or before a boundary row.
+
+    Rows are ordered by (key, id) ascending, with NULL keys first as SQLite
+    sorts them.
+    """
+    if greater:
+        if sort_key is None:
+            return or_(and_(key.is_(None), Host.id > host_id), key.is_not(None))
+        return or_(key > sort_key, and_(key == sort_key, Host.id > host_id))
+    if sort_key is None:
+        return and_(key.is_(None), Host.id < host_id)
+    return or_(key < sort_key, and_(key == sort_key, Host.id < host_id), key.is_(None))
+
+
+def host_page(
+    session: Session,
+    host_filter: HostFilter | None = None,
+    sort: str = DEFAULT_SORT,
+    descending: bool = True,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: str | None = None,
+    before: str | None = None,
+) -> HostPage:
+    """Fetch one page of hosts using keyset pagination.
+
+    Hosts are ordered by the sort column, then ID, both in the requested
+    direction. Without a cursor the first page is returned.
+
+    Args:
+        session: DB session.
+        host_filter: Filter to apply, or None for all hosts.
+        sort: Key of SORT_COLUMNS to order by.
+        descending: Whether to sort in descending order.
+        limit: Maximum hosts per page, clamped to 1..MAX_PAGE_SIZE.
+        after: Cursor of the row to continue after.
+        before: Cursor of the row to end before; ignored if after is given.
+
+    Returns:
+        The page, with cursors for the adjacent pages that exist.
+
+    Raises:
+        HostQueryError: If the sort key or a cursor is invalid.
+    """
+    if sort not in SORT_COLUMNS:
+        raise HostQueryError(f"Invalid sort column: {sort}")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    # Compare and return sort keys as stored, so cursors round-trip exactly
+    key = type_coerce(SORT_COLUMNS[sort], String)
+    backwards = before is not None and after is None
+    cursor = after if after is not None else before
+
+    statement = select(Host, key.label("sort_key"))
+    if host_filter is not None:
+        statement = statement.where(*host_filter.clauses())
+    if cursor is not None:
+        sort_key, host_id = decode_cursor(cursor)
+        statement = statement.where(_beyond(key, sort_key, host_id, descending == backwards))
+
+    # A backwards page is read in reverse order from its boundary, then flipped
+    reverse = descending != backwards
+    if reverse:
+        statement = statement.order_by(key.desc(), Host.id.desc())
+    else:
+        statement = statement.order_by(key.asc(), Host.id.asc())
+    rows = list(session.execute(statement.limit(limit + 1)).all())
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+
+    page = HostPage(hosts=[row[0] for row in rows])
+    if rows:
+        first, last = rows[0], rows[-1]
+        has_prev = more if backwards else cursor is not None
+        has_next = cursor is not None if backwards else more
+        if has_prev:
+            page.prev_cursor = encode_cursor(first[1], first[0].id)
+        if has_next:
+            page.next_cursor = encode_cursor(last[1], last[0].id)
+    return page
@@ -2,18 +2,44 @@
 
 Provides functions to compare discovered hosts with NetBox devices/VMs and
 import NetBox devices into the staging database for tracking.
+
+For the web view, reconciliation runs in a background thread and its
+result is stored as a ReconcileSnapshot, reused until the host table
+changes or the snapshot ages out.
 """
 
 import logging
+import threading
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import dataclass, field
+from datetime import UTC, datetime
 from typing import Any
 
+from sqlalchemy.orm import Session
+
 from netbox_auto.database import get_session
-from netbox_auto.models import Host, HostSource, HostStatus
-from netbox_auto.netbox import get_netbox_devices, get_netbox_vms
+from netbox_auto.models import (
+    Host,
+    HostSource,
+    HostStatus,
+    ReconcileSnapshot,
+    ReconcileStatus,
+    TableVersion,
+)
+from netbox_auto.netbox import get_netbox_inventory
+from netbox_auto.timing import external_call
 
 logger = logging.getLogger(__name__)
 
+# Seconds after which a running reconciliation is presumed dead (its process exited)
+JOB_TIMEOUT = 600.0
+
+# Hosts matched between progress updates of a background reconciliation
+PROGRESS_INTERVAL = 1000
+
+# Snapshot result keys, in page order
+SNAPSHOT_SECTIONS = ("new", "matched", "stale")
+
 
 @dataclass
 class ReconciliationResult:
@@ -49,17 +75,20 @@ def _get_netbox_inventory() -> list[dict[str, Any]]:
 
     Returns:
         Combined list of devices and VMs with a 'type' field added.
+
+    Raises:
+        NetBoxFetchError: If the inventory could not be fetched.
     """
     inventory: list[dict[str, Any]] = []
 
-    # Get devices
-    devices = get_netbox_devices()
+    # Devices and VMs are fetched in parallel
+    with external_call():
+        devices, vms = get_netbox_inventory()
+
     for device in devices:
         device["_type"] = "device"
         inventory.append(device)
 
-    # Get VMs
-    vms = get_netbox_vms()
     for vm in vms:
         vm["_type"] = "vm"
         inventory.append(vm)
@@ -67,20 +96,15 @@ def _get_netbox_inventory() -> list[dict[str, Any]]:
     return inventory
 
 
-def _match_host_to_netbox(host: Host, netbox_items: list[dict[str, Any]]) -> dict[str, Any] | None:
-    """Try to match a discovered host to a NetBox item.
-
-    Matching is done by:
-    1. IP address comparison (host IPs vs NetBox primary_ip)
+def _host_ips(host: Host) -> set[str]:
+    """Get a host's IP addresses without prefix lengths.
 
     Args:
-        host: Discovered host to match
-        netbox_items: List of NetBox devices/VMs
+        host: Discovered host; IPs may be stored as a list or a legacy dict.
 
     Returns:
-        Matching NetBox item or None if no match found
+        Set of normalized IP addresses.
     """
-    # Get host IPs as a set for fast lookup
     host_ips: set[str] = set()
     if isinstance(host.ip_addresses, list):
         for ip in host.ip_addresses:
@@ -94,58 +118,89 @@ def _match_host_to_netbox(host: Host, netbox_items: list[dict[str, Any]]) -> dic
                 normalized = _normalize_ip(ip)
                 if normalized:
                     host_ips.add(normalized)
+    return host_ips
 
-    # Try to match by IP
-    for item in netbox_items:
-        netbox_ip = _normalize_ip(item.get("primary_ip"))
-        if netbox_ip and netbox_ip in host_ips:
-            return item
 
-    return None
+class _NetBoxIndex:
+    """NetBox items indexed by ID and primary IP for constant-time matching."""
 
+    def __init__(self, netbox_items: list[dict[str, Any]]):
+        """Index items; the first item wins for duplicate IDs or IPs.
 
-def reconcile_hosts() -> ReconciliationResult:
-    """Compare discovered hosts with NetBox inventory.
+        Args:
+            netbox_items: List of NetBox devices/VMs.
+        """
+        self.by_id: dict[int, dict[str, Any]] = {}
+        # Primary IP -> (position in netbox_items, item)
+        self.by_ip: dict[str, tuple[int, dict[str, Any]]] = {}
+        for position, item in enumerate(netbox_items):
+            self.by_id.setdefault(item["id"], item)
+            netbox_ip = _normalize_ip(item.get("primary_ip"))
+            if netbox_ip:
+                self.by_ip.setdefault(netbox_ip, (position, item))
 
-    Fetches all hosts from the staging database and compares them with
-    devices and VMs from NetBox. Categorizes hosts as:
-    - new_hosts: Discovered but not in NetBox
-    - matched_hosts: Found in both (paired with NetBox data)
-    - stale_netbox: In NetBox but not discovered
+    def match_ip(self, host: Host) -> dict[str, Any] | None:
+        """Find the first NetBox item whose primary IP is one of the host's."""
+        candidates = [self.by_ip[ip] for ip in _host_ips(host) if ip in self.by_ip]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda candidate: candidate[0])[1]
+
+
+def _match_host_to_netbox(host: Host, netbox_items: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """Try to match a discovered host to a NetBox item.
+
+    Matching is done by:
+    1. IP address comparison (host IPs vs NetBox primary_ip)
+
+    Args:
+        host: Discovered host to match
+        netbox_items: List of NetBox devices/VMs
 
     Returns:
-        ReconciliationResult with categorized hosts
+        Matching NetBox item or None if no match found
     """
-    result = ReconciliationResult()
+    return _NetBoxIndex(netbox_items).match_ip(host)
 
-    # Get discovered hosts from database
-    session = get_session()
-    try:
-        discovered_hosts = session.query(Host).all()
-    finally:
-        session.close()
 
-    # Get NetBox inventory
-    netbox_items = _get_netbox_inventory()
+def _categorize(
+    hosts: Sequence[Host],
+    netbox_items: list[dict[str, Any]],
+    progress: Callable[[int], None] | None = None,
+) -> ReconciliationResult:
+    """Sort hosts and NetBox items into new, matched and stale.
+
+    Args:
+        hosts: Discovered hosts.
+        netbox_items: NetBox devices and VMs.
+        progress: Called with the number of hosts matched so far, every
+            PROGRESS_INTERVAL hosts.
+
+    Returns:
+        ReconciliationResult with categorized hosts
+    """
+    result = ReconciliationResult()
+    index = _NetBoxIndex(netbox_items)
     matched_netbox_ids: set[int] = set()
 
     # Compare each discovered host with NetBox
-    for host in discovered_hosts:
+    for done, host in enumerate(hosts, 1):
+        if progress is not None and done % PROGRESS_INTERVAL == 0:
+            progress(done)
+
         # Check if already linked to NetBox
         if host.netbox_id is not None:
-            # Find the NetBox item by ID
-            for item in netbox_items:
-                if item["id"] == host.netbox_id:
-                    result.matched_hosts.append((host, item))
-                    matched_netbox_ids.add(item["id"])
-                    break
+            item = index.by_id.get(host.netbox_id)
+            if item is not None:
+                result.matched_hosts.append((host, item))
+                matched_netbox_ids.add(item["id"])
             else:
                 # NetBox item not found - may have been deleted
                 result.new_hosts.append(host)
             continue
 
         # Try to match by IP
-        match = _match_host_to_netbox(host, netbox_items)
+        match = index.match_ip(host)
         if match:
             result.matched_hosts.append((host, match))
             matched_netbox_ids.add(match["id"])
@@ -162,10 +217,223 @@ def reconcile_hosts() -> ReconciliationResult:
         f"{len(result.matched_hosts)} matched, "
         f"{len(result.stale_netbox)} stale"
     )
-
     return result
 
 
+def reconcile_hosts() -> ReconciliationResult:
+    """Compare discovered hosts with NetBox inventory.
+
+    Fetches all hosts from the staging database and compares them with
+    devices and VMs from NetBox. Categorizes hosts as:
+    - new_hosts: Discovered but not in NetBox
+    - matched_hosts: Found in both (paired with NetBox data)
+    - stale_netbox: In NetBox but not discovered
+
+    Returns:
+        ReconciliationResult with categorized hosts
+
+    Raises:
+        NetBoxFetchError: If the NetBox inventory could not be fetched, so
+            hosts are never misreported as new because of a failed fetch.
+    """
+    # Get discovered hosts from database
+    session = get_session()
+    try:
+        discovered_hosts = session.query(Host).all()
+    finally:
+        session.close()
+
+    # Get NetBox inventory
+    netbox_items = _get_netbox_inventory()
+    return _categorize(discovered_hosts, netbox_items)
+
+
+def host_table_version(session: Session) -> int:
+    """Get the host table's change counter.
+
+    Args:
+        session: DB session.
+
+    Returns:
+        Current version; 0 if the table was never written.
+    """
+    version = session.get(TableVersion, "host")
+    return version.version if version else 0
+
+
+def _age_seconds(timestamp: datetime) -> float:
+    """Seconds since a UTC timestamp, which SQLite returns without tzinfo."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=UTC)
+    return (datetime.now(UTC) - timestamp).total_seconds()
+
+
+def latest_snapshot(session: Session) -> ReconcileSnapshot | None:
+    """Get the most recent completed reconciliation.
+
+    Args:
+        session: DB session.
+
+    Returns:
+        The snapshot, or None if none has completed.
+    """
+    return (
+        session.query(ReconcileSnapshot)
+        .filter_by(status=ReconcileStatus.COMPLETED.value)
+        .order_by(ReconcileSnapshot.id.desc())
+        .first()
+    )
+
+
+def running_snapshot(session: Session) -> ReconcileSnapshot | None:
+    """Get the reconciliation currently running, if any.
+
+    Runs older than JOB_TIMEOUT are presumed dead and marked failed.
+
+    Args:
+        session: DB session.
+
+    Returns:
+        The running snapshot, or None.
+    """
+    running = session.query(ReconcileSnapshot).filter_by(status=ReconcileStatus.RUNNING.value)
+    for snapshot in running.order_by(ReconcileSnapshot.id.desc()):
+        if _age_seconds(snapshot.started_at) < JOB_TIMEOUT:
+            return snapshot
+        snapshot.status = ReconcileStatus.FAILED.value
+        snapshot.error = "Reconciliation did not finish"
+        session.commit()
+    return None
+
+
+def snapshot_is_current(session: Session, snapshot: ReconcileSnapshot, max_age: float) -> bool:
+    """Check whether a snapshot still reflects discovery and NetBox data.
+
+    Args:
+        session: DB session.
+        snapshot: Completed snapshot.
+        max_age: Seconds after which NetBox may have changed.
+
+    Returns:
+        True if no host has changed since and the snapshot is younger than max_age.
+    """
+    if snapshot.completed_at is None or snapshot.host_version != host_table_version(session):
+        return False
+    return _age_seconds(snapshot.completed_at) < max_age
+
+
+def start_reconcile(session: Session) -> ReconcileSnapshot:
+    """Start a background reconciliation, unless one is already running.
+
+    Args:
+        session: DB session.
+
+    Returns:
+        The running snapshot, new or existing.
+    """
+    snapshot = running_snapshot(session)
+    if snapshot is not None:
+        return snapshot
+    snapshot = ReconcileSnapshot(status=ReconcileStatus.RUNNING.value, progress="Starting")
+    session.add(snapshot)
+    session.commit()
+    thread = threading.Thread(
+        target=run_reconcile, args=(snapshot.id,), name=f"reconcile-{snapshot.id}", daemon=True
+    )
+    thread.start()
+    logger.info(f"Started background reconciliation {snapshot.id}")
+    return snapshot
+
+
+def _update_snapshot(snapshot_id: int, **values: Any) -> None:
+    """Write snapshot fields in a short transaction of their own."""
+    session = get_session()
+    try:
+        session.query(ReconcileSnapshot).filter_by(id=snapshot_id).update(
+            {getattr(ReconcileSnapshot, name): value for name, value in values.items()}
+        )
+        session.commit()
+    finally:
+        session.close()
+
+
+def run_reconcile(snapshot_id: int) -> None:
+    """Compute a reconciliation into a snapshot, reporting progress on it.
+
+    Hosts are read and the session closed before NetBox is fetched, so no
+    read transaction is held while progress is written.
+
+    Args:
+        snapshot_id: ID of the RUNNING snapshot to fill.
+    """
+    try:
+        session = get_session()
+        try:
+            version = host_table_version(session)
+            hosts = session.query(Host).all()
+        finally:
+            session.close()
+
+        _update_snapshot(snapshot_id, progress="Fetching NetBox inventory")
+        netbox_items = _get_netbox_inventory()
+
+        def report(done: int) -> None:
+            _update_snapshot(snapshot_id, progress=f"Matching hosts: {done}/{len(hosts)}")
+
+        result = _categorize(hosts, netbox_items, report)
+        _update_snapshot(
+            snapshot_id,
+            status=ReconcileStatus.COMPLETED.value,
+            completed_at=datetime.now(UTC),
+            progress=None,
+            host_version=version,
+            result={
+                "new": [host.id for host in result.new_hosts],
+                "matched": [[host.id, item] for host, item in result.matched_hosts],
+                "stale": result.stale_netbox,
+            },
+        )
+    except Exception as e:
+        logger.error(f"Background reconciliation {snapshot_id} failed: {e}")
+        _update_snapshot(
+            snapshot_id,
+            status=ReconcileStatus.FAILED.value,
+            completed_at=datetime.now(UTC),
+            progress=None,
+            error=str(e),
+        )
+
+
+def snapshot_section(
+    session: Session, snapshot: ReconcileSnapshot, section: str, offset: int, limit: int
+) -> list[Any]:
+    """Load one page of a snapshot section for display.
+
+    Args:
+        session: DB session.
+        snapshot: Completed snapshot.
+        section: 'new', 'matched' or 'stale'.
+        offset: Index of the first entry.
+        limit: Maximum entries.
+
+    Returns:
+        Hosts for 'new', (host, NetBox item) pairs for 'matched' and NetBox
+        items for 'stale'. Hosts deleted since the snapshot are left out.
+    """
+    entries = (snapshot.result or {}).get(section, [])[offset : offset + limit]
+    if section == "stale":
+        return list(entries)
+    host_ids = entries if section == "new" else [host_id for host_id, _ in entries]
+    hosts = {host.id: host for host in _hosts_by_id(session, host_ids)}
+    if section == "new":
+        return [hosts[host_id] for host_id in entries if host_id in hosts]
+    return [(hosts[host_id], item) for host_id, item in entries if host_id in hosts]
+
+
+def _hosts_by_id(session: Session, host_ids: Iterable[int]) -> list[Host]:
+    return session.query(Host).filter(Host.id.in_(list(host_ids))).all()
+
+
 def import_netbox_devices() -> int:
     """Import devices and VMs from NetBox into the staging database.
 
@@ -0,0 +1,98 @@
+"""Timing of database queries and external calls within a web request.
+
+A Timings object is made current for the duration of a request (see
+web/timing.py). While one is current, SQL statements run on any engine
+and blocks wrapped in external_call() add their durations to it. Outside
+requests (CLI commands, background threads) nothing is recorded and the
+hooks cost a context variable lookup.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Engine, event
+
+# Statements kept per request for the slow request log
+MAX_RECORDED_QUERIES = 200
+
+
+@dataclass
+class Timings:
+    """Time spent by one request, in seconds, by kind of work."""
+
+    record_queries: bool = False  # Keep each statement for the slow request log
+    db_time: float = 0.0
+    query_count: int = 0
+    template_time: float = 0.0
+    external_time: float = 0.0
+    external_count: int = 0
+    queries: list[tuple[str, float]] = field(default_factory=list)
+
+
+_current: ContextVar[Timings | None] = ContextVar("timings", default=None)
+
+
+def current_timings() -> Timings | None:
+    """Get the Timings of the current request, if one is being timed."""
+    return _current.get()
+
+
+def start_timings(record_queries: bool = False) -> Timings:
+    """Start timing the current request.
+
+    Args:
+        record_queries: Whether to keep the statements executed.
+
+    Returns:
+        The new current Timings.
+    """
+    timings = Timings(record_queries=record_queries)
+    _current.set(timings)
+    return timings
+
+
+def stop_timings() -> None:
+    """Stop timing the current request."""
+    _current.set(None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("timing_starts", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    timings = _current.get()
+    starts = conn.info.get("timing_starts")
+    if timings is None or not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    timings.db_time += elapsed
+    timings.query_count += 1
+    if timings.record_queries and len(timings.queries) < MAX_RECORDED_QUERIES:
+        timings.queries.append((statement, elapsed))
+
+
+@contextmanager
+def external_call() -> Iterator[None]:
+    """Count the enclosed block as a call to an external service (e.g. NetBox)."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.external_time += time.perf_counter() - start
+        timings.external_count += 1
@@ -0,0 +1,391 @@
+"""JSON API for reviewing hosts.
+
+Lists, reads and partially updates hosts, applies and undoes filter-based
+bulk changes, reports background reconciliation progress, and streams
+live discovery and host events. Responses carry an ETag derived
+from the host table's version counter, so clients can revalidate with
+If-None-Match (304 without touching the host table) and make updates
+conditional with If-Match.
+"""
+
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from flask import Blueprint, Response, current_app, jsonify, request
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from netbox_auto.bulk import (
+    EDITABLE_FIELDS,
+    BulkChangeError,
+    apply_bulk_change,
+    preview_bulk_change,
+    undo_bulk_change,
+)
+from netbox_auto.database import get_session
+from netbox_auto.events import EventBus, get_event_bus, publish_host_updates
+from netbox_auto.models import (
+    BulkChange,
+    BulkChangeHost,
+    Host,
+    ReconcileSnapshot,
+    TableVersion,
+)
+from netbox_auto.query import DEFAULT_PAGE_SIZE, DEFAULT_SORT, HostFilter, HostQueryError, host_page
+from netbox_auto.reconcile import SNAPSHOT_SECTIONS, latest_snapshot, running_snapshot
+
+api = Blueprint("api", __name__, url_prefix="/api")
+
+# Seconds between comments sent on an idle event stream to keep it open
+KEEPALIVE_INTERVAL = 15.0
+# Milliseconds a browser waits before reconnecting a closed event stream
+RECONNECT_DELAY = 2000
+
+
+class APIError(Exception):
+    """Raised to answer an API request with a JSON error."""
+
+    def __init__(self, message: str, status: int = 400):
+        """Initialize with a message and HTTP status.
+
+        Args:
+            message: Error description returned to the client.
+            status: HTTP status code.
+        """
+        super().__init__(message)
+        self.status = status
+
+
+@api.errorhandler(APIError)
+def _api_error(error: APIError) -> tuple[Response, int]:
+    return jsonify({"error": str(error)}), error.status
+
+
+def _hosts_etag(session: Session) -> str:
+    """Build the ETag for host representations from the table version."""
+    version = session.get(TableVersion, "host")
+    return f"hosts-{version.version if version else 0}"
+
+
+def _not_modified(etag: str) -> Response | None:
+    """Answer 304 if the client's cached representation is current."""
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+
+def _check_if_match(etag: str) -> None:
+    """Refuse a write if the client's If-Match names an outdated version.
+
+    Raises:
+        APIError: 412 if If-Match is given and does not match.
+    """
+    if request.if_match and not request.if_match.contains(etag):
+        raise APIError("Hosts changed since they were read", 412)
+
+
+def _json_response(data: Any, etag: str) -> Response:
+    response = jsonify(data)
+    response.set_etag(etag)
+    return response
+
+
+def _parse_changes(data: Any) -> dict[str, str]:
+    """Validate the fields of a PATCH body.
+
+    Args:
+        data: Decoded JSON object with fields to change.
+
+    Returns:
+        Mapping of host field name to new value.
+
+    Raises:
+        APIError: If a field is not editable or a value is invalid.
+    """
+    if not isinstance(data, dict):
+        raise APIError("Request body must be a JSON object")
+    changes = {}
+    for name, value in data.items():
+        if name not in EDITABLE_FIELDS:
+            raise APIError(f"Field cannot be changed: {name}")
+        if value not in EDITABLE_FIELDS[name]:
+            raise APIError(f"Invalid {name}: {value}")
+        changes[name] = value
+    if not changes:
+        raise APIError("No fields to change")
+    return changes
+
+
+@api.route("/hosts")
+def list_hosts() -> Response:
+    """List one page of hosts.
+
+    Accepts the same filter, sort and cursor arguments as the hosts view.
+    """
+    session = get_session()
+    try:
+        etag = _hosts_etag(session)
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+        try:
+            page = host_page(
+                session,
+                HostFilter.from_args(request.args),
+                sort=request.args.get("sort", DEFAULT_SORT),
+                descending=request.args.get("dir", "desc") != "asc",
+                limit=request.args.get("per_page", DEFAULT_PAGE_SIZE, type=int),
+                after=request.args.get("after"),
+                before=request.args.get("before"),
+            )
+        except HostQueryError as e:
+            raise APIError(str(e)) from e
+        data = {
+            "hosts": [host.to_dict() for host in page.hosts],
+            "next": page.next_cursor,
+            "prev": page.prev_cursor,
+        }
+        return _json_response(data, etag)
+    finally:
+        session.close()
+
+
+@api.route("/hosts/<int:host_id>")
+def get_host(host_id: int) -> Response:
+    """Get one host."""
+    session = get_session()
+    try:
+        etag = _hosts_etag(session)
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+        host = session.get(Host, host_id)
+        if host is None:
+            raise APIError("Host not found", 404)
+        return _json_response(host.to_dict(), etag)
+    finally:
+        session.close()
+
+
+@api.route("/hosts/<int:host_id>", methods=["PATCH"])
+def patch_host(host_id: int) -> Response:
+    """Change a host's status or type.
+
+    Body: JSON object with 'status' and/or 'host_type'.
+    """
+    changes = _parse_changes(request.get_json(silent=True))
+    session = get_session()
+    try:
+        _check_if_match(_hosts_etag(session))
+        host = session.get(Host, host_id)
+        if host is None:
+            raise APIError("Host not found", 404)
+        for name, value in changes.items():
+            setattr(host, name, value)
+        session.commit()
+        publish_host_updates(session, [host.id])
+        return _json_response(host.to_dict(), _hosts_etag(session))
+    finally:
+        session.close()
+
+
+@api.route("/hosts", methods=["PATCH"])
+def patch_hosts() -> Response:
+    """Change the status or type of several hosts in one UPDATE.
+
+    Body: JSON object with 'ids' (list of host IDs) and the fields to change.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        raise APIError("Request body must be a JSON object")
+    ids = data.pop("ids", None)
+    if not isinstance(ids, list) or not ids or not all(isinstance(i, int) for i in ids):
+        raise APIError("'ids' must be a non-empty list of host IDs")
+    changes = _parse_changes(data)
+
+    session = get_session()
+    try:
+        _check_if_match(_hosts_etag(session))
+        updated = (
+            session.query(Host)
+            .filter(Host.id.in_(ids))
+            .update(
+                {getattr(Host, name): value for name, value in changes.items()},
+                synchronize_session=False,
+            )
+        )
+        session.commit()
+        publish_host_updates(session, ids)
+        return _json_response({"updated": updated}, _hosts_etag(session))
+    finally:
+        session.close()
+
+
+@api.route("/hosts/bulk", methods=["POST"])
+def bulk_change_hosts() -> Response:
+    """Preview or apply a filter-based bulk change of one host field.
+
+    Body: JSON object with 'filter' (listing filter arguments, e.g.
+    {"status": "pending", "source": "dhcp", "subnet": "10.20.0.0/16"}),
+    exactly one of 'status' or 'host_type', and optional 'preview'. A
+    preview returns the number of hosts that would change; otherwise the
+    change is applied and returned with its ID for undo.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get("filter", {}), dict):
+        raise APIError("Request body must be a JSON object with a 'filter' object")
+    fields = [name for name in EDITABLE_FIELDS if name in data]
+    if len(fields) != 1:
+        raise APIError(f"Give exactly one of: {', '.join(EDITABLE_FIELDS)}")
+    field, value = fields[0], data[fields[0]]
+    try:
+        host_filter = HostFilter.from_args(
+            {name: str(arg) for name, arg in data.get("filter", {}).items()}
+        )
+    except HostQueryError as e:
+        raise APIError(str(e)) from e
+
+    session = get_session()
+    try:
+        if data.get("preview"):
+            return jsonify(
+                {"matched": preview_bulk_change(session, host_filter, field, str(value))}
+            )
+        change = apply_bulk_change(session, host_filter, field, str(value))
+        session.commit()
+        publish_host_updates(session, _changed_host_ids(change.id), change.id)
+        return jsonify({"change_id": change.id, "updated": change.host_count})
+    except BulkChangeError as e:
+        raise APIError(str(e)) from e
+    finally:
+        session.close()
+
+
+def _changed_host_ids(change_id: int) -> Any:
+    """Select the IDs of the hosts a bulk change modified."""
+    return select(BulkChangeHost.host_id).where(BulkChangeHost.change_id == change_id)
+
+
+@api.route("/bulk-changes")
+def list_bulk_changes() -> Response:
+    """List the most recent bulk changes, newest first."""
+    session = get_session()
+    try:
+        changes = session.query(BulkChange).order_by(BulkChange.id.desc()).limit(20).all()
+        return jsonify(
+            [
+                {
+                    "id": change.id,
+                    "created_at": change.created_at.isoformat(),
+                    "field": change.field,
+                    "value": change.value,
+                    "filter": change.filter,
+                    "host_count": change.host_count,
+                    "undone_at": change.undone_at.isoformat() if change.undone_at else None,
+                }
+                for change in changes
+            ]
+        )
+    finally:
+        session.close()
+
+
+@api.route("/bulk-changes/<int:change_id>/undo", methods=["POST"])
+def undo_bulk_change_hosts(change_id: int) -> Response:
+    """Undo a bulk change, restoring the hosts it modified."""
+    session = get_session()
+    try:
+        if session.get(BulkChange, change_id) is None:
+            raise APIError("Bulk change not found", 404)
+        restored = undo_bulk_change(session, change_id)
+        session.commit()
+        publish_host_updates(session, _changed_host_ids(change_id), change_id)
+        return jsonify({"restored": restored})
+    except BulkChangeError as e:
+        raise APIError(str(e), 409) from e
+    finally:
+        session.close()
+
+
+def _snapshot_dict(snapshot: ReconcileSnapshot) -> dict[str, Any]:
+    result = snapshot.result or {}
+    return {
+        "id": snapshot.id,
+        "status": snapshot.status,
+        "progress": snapshot.progress,
+        "error": snapshot.error,
+        "started_at": snapshot.started_at.isoformat(),
+        "completed_at": snapshot.completed_at.isoformat() if snapshot.completed_at else None,
+        "counts": {name: len(result.get(name, [])) for name in SNAPSHOT_SECTIONS},
+    }
+
+
+@api.route("/reconcile")
+def reconcile_status() -> Response:
+    """Report the running and latest reconciliations, for progress polling.
+
+    Query arg 'id' additionally reports that reconciliation, so a client
+    can see how a run it watched ended.
+    """
+    session = get_session()
+    try:
+        running = running_snapshot(session)
+        latest = latest_snapshot(session)
+        data: dict[str, Any] = {
+            "running": _snapshot_dict(running) if running else None,
+            "latest": _snapshot_dict(latest) if latest else None,
+        }
+        watched_id = request.args.get("id", type=int)
+        if watched_id is not None:
+            watched = session.get(ReconcileSnapshot, watched_id)
+            if watched is None:
+                raise APIError("Reconciliation not found", 404)
+            data["watched"] = _snapshot_dict(watched)
+        return jsonify(data)
+    finally:
+        session.close()
+
+
+def _event_stream(bus: EventBus, after: int, duration: float) -> Iterator[str]:
+    """Yield server-sent event messages until the duration has passed.
+
+    Args:
+        bus: Event bus to read from.
+        after: ID of the last event the client has seen.
+        duration: Seconds to keep the stream open.
+    """
+    deadline = time.monotonic() + duration
+    # Tell the browser where it is, so a reconnect resumes from here
+    yield f"retry: {RECONNECT_DELAY}\nid: {after}\n\n"
+    while (remaining := deadline - time.monotonic()) > 0:
+        events = bus.wait(after, min(KEEPALIVE_INTERVAL, remaining))
+        if not events:
+            yield ": keepalive\n\n"
+        for event in events:
+            yield event.to_sse()
+            after = event.id
+
+
+@api.route("/events")
+def events() -> Response:
+    """Stream discovery progress and host changes as server-sent events.
+
+    Event types: 'discovery' (run started, collector finished, run
+    completed), 'host' (host created or updated) and 'reset' (events were
+    missed; reload the page). A reconnecting browser resumes after its
+    Last-Event-ID. Streams close after web.event_stream_timeout so they do
+    not hold a server thread indefinitely; EventSource reconnects itself.
+    """
+    bus = get_event_bus()
+    last_id = request.headers.get("Last-Event-ID", type=int)
+    if last_id is None:
+        last_id = request.args.get("last_id", bus.last_id, type=int)
+    duration = current_app.config["WEB_CONFIG"].event_stream_timeout
+    response = Response(_event_stream(bus, last_id, duration), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    # Keep reverse proxies from buffering the stream
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
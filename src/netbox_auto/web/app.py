@@ -6,18 +6,112 @@ Provides create_app() factory function following Flask best practices.
 import logging
 import os
 import secrets
+from collections.abc import Iterable, Iterator
 from pathlib import Path
-
-from flask import Blueprint, Flask, flash, redirect, render_template, request, url_for
+from typing import NamedTuple
+
+from flask import (
+    Blueprint,
+    Flask,
+    current_app,
+    flash,
+    get_flashed_messages,
+    redirect,
+    render_template,
+    request,
+    stream_template,
+    url_for,
+)
+from sqlalchemy.orm import Session
 from werkzeug.wrappers import Response
 
+from netbox_auto.config import ConfigError, WebConfig, get_config
 from netbox_auto.database import get_session
-from netbox_auto.models import Host, HostStatus, HostType
-from netbox_auto.reconcile import import_netbox_devices, reconcile_hosts
+from netbox_auto.events import publish_host_updates
+from netbox_auto.export import CONTENT_TYPES, ExportError, export_hosts, export_reconcile
+from netbox_auto.models import (
+    Host,
+    HostSource,
+    HostStatus,
+    HostType,
+    ReconcileSnapshot,
+    ReconcileStatus,
+)
+from netbox_auto.query import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_SORT,
+    MAX_PAGE_SIZE,
+    HostFilter,
+    HostQueryError,
+    host_page,
+)
+from netbox_auto.reconcile import (
+    SNAPSHOT_SECTIONS,
+    import_netbox_devices,
+    latest_snapshot,
+    running_snapshot,
+    snapshot_is_current,
+    snapshot_section,
+    start_reconcile,
+)
+from netbox_auto.web.api import api
+from netbox_auto.web.timing import init_request_timing, log_after_stream
 
 # Create blueprint for main routes
 bp = Blueprint("main", __name__)
 
+# Entries per reconcile section page
+RECONCILE_PAGE_SIZE = 100
+# Characters of rendered HTML collected before each write of a streamed page
+STREAM_BUFFER_SIZE = 16384
+
+
+class HostRow(NamedTuple):
+    """Display values of one hosts table row, formatted for the template."""
+
+    id: int
+    mac: str
+    hostname: str
+    ips: str
+    source: str
+    switch_port: str
+    status: str
+    host_type: str
+    last_seen: str
+
+
+def _host_rows(hosts: Iterable[Host]) -> Iterator[HostRow]:
+    """Format hosts for the hosts table as the template consumes them."""
+    for host in hosts:
+        ips = host.ip_addresses
+        if isinstance(ips, dict):
+            ips = list(ips.values())
+        yield HostRow(
+            id=host.id,
+            mac=host.mac,
+            hostname=host.hostname or "-",
+            ips=", ".join(ips) if ips else "-",
+            source=host.source,
+            switch_port=host.switch_port or "-",
+            status=host.status,
+            host_type=host.host_type,
+            last_seen=host.last_seen.strftime("%Y-%m-%d %H:%M") if host.last_seen else "-",
+        )
+
+
+def _buffered(chunks: Iterable[str], size: int = STREAM_BUFFER_SIZE) -> Iterator[str]:
+    """Join the small pieces a streamed template yields into larger writes."""
+    buffer: list[str] = []
+    length = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield "".join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer)
+
 
 @bp.route("/")
 def index() -> Response:
@@ -26,16 +120,57 @@ def index() -> Response:
 
 
 @bp.route("/hosts")
-def hosts() -> str:
-    """Display all discovered hosts in a table."""
+def hosts() -> Response:
+    """Display one page of discovered hosts, filtered and sorted in SQL.
+
+    Query args: status, source, type, subnet and q filter the hosts; sort
+    and dir (asc/desc) order them; per_page sets the page size; after and
+    before are cursors from the previous page's navigation links.
+
+    The page is streamed while the rows render, so the first bytes do not
+    wait for the whole table.
+    """
+    sort = request.args.get("sort", DEFAULT_SORT)
+    descending = request.args.get("dir", "desc") != "asc"
+    per_page = request.args.get("per_page", DEFAULT_PAGE_SIZE, type=int)
     session = get_session()
     try:
-        hosts_list = session.query(Host).order_by(Host.last_seen.desc()).all()
-        return render_template(
+        host_filter = HostFilter.from_args(request.args)
+        page = host_page(
+            session,
+            host_filter,
+            sort=sort,
+            descending=descending,
+            limit=per_page,
+            after=request.args.get("after"),
+            before=request.args.get("before"),
+        )
+        filter_args = host_filter.to_args()
+        # Take flashed messages now: the session cookie is sent before the body
+        get_flashed_messages(with_categories=True)
+        log_after_stream()
+        stream = stream_template(
             "hosts.html",
-            hosts=hosts_list,
+            hosts=_host_rows(page.hosts),
+            page=page,
+            filters=filter_args,
+            sort=sort,
+            descending=descending,
+            # Arguments that carry the current listing to navigation links
+            list_args={
+                **filter_args,
+                "sort": sort,
+                "dir": "desc" if descending else "asc",
+                "per_page": min(max(per_page, 1), MAX_PAGE_SIZE),
+            },
+            host_statuses=[s.value for s in HostStatus],
+            host_sources=[s.value for s in HostSource],
             host_types=[t.value for t in HostType],
         )
+        return Response(_buffered(stream), mimetype="text/html")
+    except HostQueryError as e:
+        flash(str(e), "error")
+        return redirect(url_for("main.hosts"))
     finally:
         session.close()
 
@@ -57,6 +192,7 @@ def update_host_status(host_id: int) -> Response:
 
         host.status = new_status
         session.commit()
+        publish_host_updates(session, [host.id])
         flash(f"Host {host.mac} status updated to {new_status}", "success")
     finally:
         session.close()
@@ -81,6 +217,7 @@ def update_host_type(host_id: int) -> Response:
 
         host.host_type = new_type
         session.commit()
+        publish_host_updates(session, [host.id])
         flash(f"Host {host.mac} type updated to {new_type}", "success")
     finally:
         session.close()
@@ -125,6 +262,7 @@ def bulk_update_hosts() -> Response:
             .update({Host.status: new_status}, synchronize_session="fetch")
         )
         session.commit()
+        publish_host_updates(session, host_id_ints)
         flash(f"Updated {updated} hosts to {new_status}", "success")
     finally:
         session.close()
@@ -132,16 +270,123 @@ def bulk_update_hosts() -> Response:
     return redirect(url_for("main.hosts"))
 
 
+def _export_response(session: Session, chunks: Iterator[str], name: str, fmt: str) -> Response:
+    """Stream an export as a download, closing the session when it ends.
+
+    Without a Content-Length the server sends the body with chunked
+    transfer encoding as the chunks are produced.
+    """
+
+    def stream() -> Iterator[str]:
+        try:
+            yield from chunks
+        finally:
+            session.close()
+
+    response = Response(stream(), mimetype=CONTENT_TYPES[fmt])
+    response.headers["Content-Disposition"] = f"attachment; filename={name}.{fmt}"
+    return response
+
+
+def _export_error(error: Exception) -> Response:
+    return Response(f"{error}\n", status=400, mimetype="text/plain")
+
+
+@bp.route("/hosts/export")
+def hosts_export() -> Response:
+    """Download hosts as CSV or JSONL ('format' query arg).
+
+    Takes the same filter arguments as the hosts view.
+    """
+    fmt = request.args.get("format", "csv")
+    try:
+        host_filter = HostFilter.from_args(request.args)
+    except HostQueryError as e:
+        return _export_error(e)
+    session = get_session()
+    try:
+        chunks = export_hosts(session, host_filter, fmt)
+    except ExportError as e:
+        session.close()
+        return _export_error(e)
+    return _export_response(session, chunks, "hosts", fmt)
+
+
 @bp.route("/reconcile")
 def reconcile() -> str:
-    """Display reconciliation comparison between discovered hosts and NetBox."""
-    result = reconcile_hosts()
-    return render_template(
-        "reconcile.html",
-        new_hosts=result.new_hosts,
-        matched_hosts=result.matched_hosts,
-        stale_netbox=result.stale_netbox,
-    )
+    """Display the latest reconciliation between discovered hosts and NetBox.
+
+    Results come from a background reconciliation, started here when none
+    has completed yet or the latest no longer reflects the hosts or has
+    aged out; the older result is shown meanwhile. Each section is paged
+    with its own <section>_page query arg.
+    """
+    session = get_session()
+    try:
+        snapshot = latest_snapshot(session)
+        job = running_snapshot(session)
+        max_age = current_app.config["WEB_CONFIG"].reconcile_max_age
+        current = snapshot is not None and snapshot_is_current(session, snapshot, max_age)
+        if job is None and not current:
+            job = start_reconcile(session)
+
+        last = session.query(ReconcileSnapshot).order_by(ReconcileSnapshot.id.desc()).first()
+        if last is not None and last.status == ReconcileStatus.FAILED.value:
+            flash(f"Could not reconcile with NetBox: {last.error}", "error")
+
+        sections = {}
+        for name in SNAPSHOT_SECTIONS:
+            total = len((snapshot.result or {}).get(name, [])) if snapshot else 0
+            pages = max(1, -(-total // RECONCILE_PAGE_SIZE))
+            page = min(max(request.args.get(f"{name}_page", 1, type=int), 1), pages)
+            entries = []
+            if snapshot is not None:
+                offset = (page - 1) * RECONCILE_PAGE_SIZE
+                entries = snapshot_section(session, snapshot, name, offset, RECONCILE_PAGE_SIZE)
+            sections[name] = {"entries": entries, "total": total, "page": page, "pages": pages}
+
+        return render_template(
+            "reconcile.html",
+            snapshot=snapshot,
+            current=current,
+            job=job,
+            sections=sections,
+            page_args={f"{name}_page": sections[name]["page"] for name in SNAPSHOT_SECTIONS},
+        )
+    finally:
+        session.close()
+
+
+@bp.route("/reconcile/refresh", methods=["POST"])
+def reconcile_refresh() -> Response:
+    """Start a background reconciliation now."""
+    session = get_session()
+    try:
+        start_reconcile(session)
+    finally:
+        session.close()
+    flash("Reconciliation started", "success")
+    return redirect(url_for("main.reconcile"))
+
+
+@bp.route("/reconcile/export")
+def reconcile_export() -> Response:
+    """Download the latest reconciliation as CSV or JSONL.
+
+    Query args: 'format' and an optional 'section' (new, matched or stale).
+    """
+    fmt = request.args.get("format", "csv")
+    session = get_session()
+    try:
+        snapshot = latest_snapshot(session)
+        if snapshot is None:
+            session.close()
+            return Response("No reconciliation has completed yet\n", 404, mimetype="text/plain")
+        chunks = export_reconcile(session, snapshot, request.args.get("section") or None, fmt)
+    except ExportError as e:
+        session.close()
+        return _export_error(e)
+    return _export_response(session, chunks, "reconcile", fmt)
 
 
 @bp.route("/reconcile/import", methods=["POST"])
@@ -190,7 +435,18 @@ def create_app() -> Flask:
         # Production: log to werkzeug logger at INFO level
         logging.getLogger("werkzeug").setLevel(logging.INFO)
 
-    # Register blueprint
+    # Server-Timing headers, per-request timing logs and the slow request log
+    try:
+        web_config = get_config().web
+    except ConfigError:
+        # Apps created without a loaded config (e.g. in tests) use the defaults
+        web_config = WebConfig()
+    # Views read web settings from here rather than the global config
+    app.config["WEB_CONFIG"] = web_config
+    init_request_timing(app, web_config)
+
+    # Register blueprints
     app.register_blueprint(bp)
+    app.register_blueprint(api)
 
     return app
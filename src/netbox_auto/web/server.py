@@ -0,0 +1,119 @@
+"""WSGI servers for `netbox-auto serve`.
+
+The Werkzeug development server handles one request at a time and is only
+meant for debugging. For shared use the app is served by waitress (one
+process, a pool of request threads) or gunicorn (forked worker processes,
+each with request threads). Both are optional dependencies, installed with
+the `serve` extra, and imported only when selected.
+
+Forked workers must not reuse the parent's SQLite connections; the engine
+drops inherited connections after fork (see database.py).
+"""
+
+import logging
+import signal
+import sys
+from collections.abc import Callable
+from types import FrameType
+from typing import Any
+
+from flask import Flask
+
+from netbox_auto.config import WebConfig
+
+logger = logging.getLogger(__name__)
+
+
+class ServerError(Exception):
+    """Raised when the selected WSGI server cannot be started."""
+
+    pass
+
+
+def _exit_on_sigterm() -> None:
+    """Turn SIGTERM into SystemExit so servers shut down as on Ctrl+C."""
+
+    def handler(signum: int, frame: FrameType | None) -> None:
+        logger.info("Received SIGTERM, shutting down")
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, handler)
+
+
+def run_waitress(app: Flask, host: str, port: int, web_config: WebConfig) -> None:
+    """Serve the app with waitress until interrupted.
+
+    On SIGINT or SIGTERM waitress stops accepting connections and waits
+    for in-flight requests before returning.
+
+    Args:
+        app: Flask application.
+        host: Address to bind.
+        port: Port to bind.
+        web_config: Thread count and shutdown settings.
+
+    Raises:
+        ServerError: If waitress is not installed.
+    """
+    try:
+        from waitress import serve
+    except ImportError as e:
+        raise ServerError(
+            "waitress is not installed; install it with: pip install 'netbox-auto[serve]'"
+        ) from e
+
+    _exit_on_sigterm()
+    serve(
+        app,
+        host=host,
+        port=port,
+        threads=web_config.threads,
+        channel_timeout=web_config.request_timeout,
+        ident="netbox-auto",
+    )
+
+
+def run_gunicorn(
+    app_factory: Callable[[], Flask], host: str, port: int, web_config: WebConfig
+) -> None:
+    """Serve the app with gunicorn worker processes until interrupted.
+
+    Each worker builds its own app and runs web_config.threads request
+    threads (gthread worker). SIGTERM stops workers gracefully, giving
+    in-flight requests web_config.graceful_timeout seconds to finish.
+
+    Args:
+        app_factory: Called once per worker process to create the app.
+        host: Address to bind.
+        port: Port to bind.
+        web_config: Worker, thread and timeout settings.
+
+    Raises:
+        ServerError: If gunicorn is not installed (it does not run on Windows).
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError as e:
+        raise ServerError(
+            "gunicorn is not installed; install it with: pip install 'netbox-auto[serve]'"
+        ) from e
+
+    options: dict[str, Any] = {
+        "bind": f"{host}:{port}",
+        "workers": web_config.workers,
+        "threads": web_config.threads,
+        "worker_class": "gthread",
+        "timeout": web_config.request_timeout,
+        "graceful_timeout": web_config.graceful_timeout,
+        "accesslog": "-",
+    }
+
+    class _Application(BaseApplication):  # type: ignore[misc]
+        def load_config(self) -> None:
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self) -> Flask:
+            return app_factory()
+
+    _Application().run()
@@ -0,0 +1,123 @@
+"""Request timing for the web app.
+
+Times each request's database queries, template rendering and external
+calls, reports them in a Server-Timing header (shown by browser developer
+tools) and a log line per request, and optionally logs the statements of
+slow requests.
+
+The header is sent before a streamed body renders, so for streamed pages
+it covers the work done up to then; the log line is written when the
+request ends and covers all of it.
+"""
+
+import logging
+import time
+from typing import Any
+
+from flask import Flask, Response, g, request
+from flask.signals import before_render_template, template_rendered
+
+from netbox_auto.config import WebConfig
+from netbox_auto.timing import Timings, current_timings, start_timings, stop_timings
+
+logger = logging.getLogger(__name__)
+
+
+def server_timing_header(timings: Timings, total: float) -> str:
+    """Format timings as a Server-Timing header value.
+
+    Args:
+        timings: Timings of the request.
+        total: Total request time in seconds.
+
+    Returns:
+        Header value with db, tpl, ext and total metrics in milliseconds.
+    """
+    return ", ".join(
+        [
+            f'db;dur={timings.db_time * 1000:.1f};desc="{timings.query_count} queries"',
+            f"tpl;dur={timings.template_time * 1000:.1f}",
+            f'ext;dur={timings.external_time * 1000:.1f};desc="{timings.external_count} calls"',
+            f"total;dur={total * 1000:.1f}",
+        ]
+    )
+
+
+# The request's Timings are also kept in g: a streamed template finishes
+# rendering in stream_with_context, outside the context the request's
+# Timings were made current in.
+
+
+def _template_started(sender: Flask, template: Any, context: Any, **extra: Any) -> None:
+    if g.get("timings") is not None:
+        g.setdefault("template_starts", []).append(time.perf_counter())
+
+
+def _template_finished(sender: Flask, template: Any, context: Any, **extra: Any) -> None:
+    timings = g.get("timings")
+    starts = g.get("template_starts")
+    if timings is not None and starts:
+        timings.template_time += time.perf_counter() - starts.pop()
+
+
+def log_after_stream() -> None:
+    """Defer the current request's log line until its streamed body ends.
+
+    Call from views that return a stream_with_context body (such as
+    stream_template). Flask runs teardown once when the view returns and
+    again when the stream finishes; the log line is written on the second.
+    """
+    g.timing_log_deferred = True
+
+
+def init_request_timing(app: Flask, web_config: WebConfig) -> None:
+    """Install the request timing hooks on an app.
+
+    Args:
+        app: Flask application.
+        web_config: Settings for the Server-Timing header and slow request log.
+    """
+    slow_request_ms = web_config.slow_request_ms
+
+    @app.before_request
+    def _start_timing() -> None:
+        g.request_start = time.perf_counter()
+        g.timings = start_timings(record_queries=slow_request_ms is not None)
+
+    @app.after_request
+    def _add_header(response: Response) -> Response:
+        timings = current_timings()
+        g.response_status = response.status_code
+        if timings is not None and web_config.server_timing:
+            total = time.perf_counter() - g.request_start
+            response.headers["Server-Timing"] = server_timing_header(timings, total)
+        return response
+
+    @app.teardown_request
+    def _log_timing(exc: BaseException | None) -> None:
+        timings = g.get("timings")
+        stop_timings()
+        if timings is None or g.pop("timing_log_deferred", False):
+            return
+        total = time.perf_counter() - g.request_start
+        status = g.get("response_status", 500)
+        logger.info(
+            f"request method={request.method} path={request.path} "
+            f"status={status} total_ms={total * 1000:.1f} "
+            f"db_ms={timings.db_time * 1000:.1f} queries={timings.query_count} "
+            f"template_ms={timings.template_time * 1000:.1f} "
+            f"external_ms={timings.external_time * 1000:.1f} "
+            f"external_calls={timings.external_count}"
+        )
+        if slow_request_ms is not None and total * 1000 >= slow_request_ms:
+            statements = "".join(
+                f"\n  {elapsed * 1000:8.1f} ms  {' '.join(statement.split())}"
+                for statement, elapsed in timings.queries
+            )
+            logger.warning(
+                f"slow request method={request.method} path={request.path} "
+                f"total_ms={total * 1000:.1f} queries={timings.query_count}{statements}"
+            )
+
+    before_render_template.connect(_template_started, app)
+    template_rendered.connect(_template_finished, app)
@@ -6,11 +6,14 @@ Provides factory functions and database fixtures used across test modules.
 from collections.abc import Iterator
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
 
 from netbox_auto.collectors.base import DiscoveredHost
+from netbox_auto.events import EventBus
 from netbox_auto.models import Base, HostSource
+from netbox_auto.query import register_sql_functions
+from netbox_auto.web.app import create_app
 
 
 @pytest.fixture
@@ -52,6 +55,7 @@ def in_memory_engine():
     Tables are created once at session start.
     """
     engine = create_engine("sqlite:///:memory:", echo=False)
+    event.listen(engine, "connect", register_sql_functions)
     Base.metadata.create_all(engine)
     yield engine
     engine.dispose()
@@ -81,3 +85,15 @@ def in_memory_db(in_memory_engine) -> Iterator[Session]:
     session.close()
     transaction.rollback()
     connection.close()
+
+
+@pytest.fixture
+def web_client(in_memory_db, mocker):
+    """Flask test client whose routes use the in-memory database session."""
+    mocker.patch("netbox_auto.web.app.get_session", return_value=in_memory_db)
+    mocker.patch("netbox_auto.web.api.get_session", return_value=in_memory_db)
+    # An unstarted in-process bus, so routes publish without a tail thread
+    mocker.patch("netbox_auto.events._bus", EventBus(shared=False, poll_interval=1.0))
+    app = create_app()
+    app.config["TESTING"] = True
+    return app.test_client()
@@ -366,6 +366,76 @@ class TestPushCommand:
         assert result.exit_code == 0
         assert "No approved hosts to push" in result.output
 
+    def test_push_rejects_invalid_plan_file(self, runner, temp_config, reset_config, tmp_path):
+        """push --plan with an unreadable plan file exits with an error."""
+        plan_file = tmp_path / "plan.json"
+        plan_file.write_text("{}")
+
+        result = runner.invoke(
+            app, ["--config", str(temp_config), "push", "--plan", str(plan_file)]
+        )
+
+        assert result.exit_code == 1
+        assert "Unsupported plan version" in result.output
+
+    def test_push_resume_without_interrupted_run(self, runner, temp_config, reset_config):
+        """push --resume with nothing to resume reports it and makes no changes."""
+        result = runner.invoke(app, ["--config", str(temp_config), "push", "--resume"])
+
+        assert result.exit_code == 0
+        assert "No interrupted push to resume" in result.output
+
+
+class TestExportCommand:
+    """Tests for 'export' command."""
+
+    def test_export_hosts_jsonl_to_file(self, runner, temp_config, reset_config, tmp_path):
+        """export writes filtered hosts to the output file."""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+
+        from netbox_auto.config import get_config, load_config
+
+        load_config(temp_config)
+        engine = create_engine(f"sqlite:///{get_config().database.path}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        session.add_all(
+            [
+                Host(mac="aa:bb:cc:dd:ee:01", status=HostStatus.APPROVED.value),
+                Host(mac="aa:bb:cc:dd:ee:02", status=HostStatus.PENDING.value),
+            ]
+        )
+        session.commit()
+        session.close()
+        output = tmp_path / "hosts.jsonl"
+
+        result = runner.invoke(
+            app,
+            [
+                "--config",
+                str(temp_config),
+                "export",
+                "--format",
+                "jsonl",
+                "--status",
+                "approved",
+                "-o",
+                str(output),
+            ],
+        )
+
+        assert result.exit_code == 0
+        lines = output.read_text().splitlines()
+        assert len(lines) == 1
+        assert '"mac":"aa:bb:cc:dd:ee:01"' in lines[0]
+
+    def test_export_rejects_invalid_filter(self, runner, temp_config, reset_config):
+        """export exits with an error for an invalid filter value."""
+        result = runner.invoke(app, ["--config", str(temp_config), "export", "--status", "x"])
+
+        assert result.exit_code == 1
+
 
 class TestServeCommand:
     """Tests for 'serve' command (E2E-04)."""
@@ -389,3 +459,27 @@ class TestServeCommand:
         assert call_kwargs.get("port") == 5000
         assert call_kwargs.get("debug") is False
         assert result.exit_code == 0
+
+    def test_serve_uses_configured_server(self, runner, temp_config, reset_config):
+        """serve --server waitress hands the app to waitress instead of app.run()."""
+        mock_app = MagicMock()
+
+        with (
+            patch("netbox_auto.web.app.create_app", return_value=mock_app),
+            patch("netbox_auto.web.server.run_waitress") as mock_waitress,
+        ):
+            result = runner.invoke(
+                app, ["--config", str(temp_config), "serve", "--server", "waitress", "-t", "4"]
+            )
+
+        assert result.exit_code == 0
+        mock_app.run.assert_not_called()
+        web_config = mock_waitress.call_args.args[3]
+        assert web_config.server == "waitress"
+        assert web_config.threads == 4
+
+    def test_serve_rejects_unknown_server(self, runner, temp_config, reset_config):
+        """serve exits with an error for an unknown server name."""
+        result = runner.invoke(app, ["--config", str(temp_config), "serve", "--server", "nginx"])
+
+        assert result.exit_code == 1
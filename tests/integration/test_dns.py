@@ -4,12 +4,27 @@ Tests config generation and SSH push with mocked paramiko.
 Covers INTG-06 requirement.
 """
 
+import io
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from netbox_auto.dns import generate_unbound_config, push_dns_config
-from netbox_auto.models import Host
+from netbox_auto.dns import (
+    BACKUP_SUFFIX,
+    TEMP_SUFFIX,
+    SSHConnectionPool,
+    config_digest,
+    generate_unbound_config,
+    generate_unbound_zones,
+    push_dns_config,
+    record_delta,
+    reverse_zones,
+    stream_unbound_config,
+    stream_unbound_zones,
+    unbound_records,
+)
+from netbox_auto.models import DnsPushState, Host, HostStatus
 
 
 @pytest.fixture
@@ -114,6 +129,67 @@ class TestGenerateUnboundConfig:
         assert 'local-data: "multi-ip.lan. A 192.168.1.11"' in config
         assert 'local-data: "multi-ip.lan. A 10.0.0.50"' in config
 
+    def test_output_is_sorted_and_deterministic(self, host_factory):
+        """Same records in any order produce identical config bytes."""
+        host_b = host_factory(
+            mac="aa:bb:cc:dd:ee:07", hostname="beta", ip_addresses=["10.0.0.10", "10.0.0.9"]
+        )
+        host_a = host_factory(mac="aa:bb:cc:dd:ee:08", hostname="alpha", ip_addresses=["10.0.0.1"])
+
+        config = generate_unbound_config([host_b, host_a])
+
+        assert config == generate_unbound_config([host_a, host_b])
+        records = [line for line in config.splitlines() if line.startswith("local-data")]
+        assert records == [
+            'local-data: "alpha.lan. A 10.0.0.1"',
+            'local-data: "beta.lan. A 10.0.0.9"',
+            'local-data: "beta.lan. A 10.0.0.10"',
+        ]
+        assert "Generated by netbox-auto at" not in config
+
+
+class TestStreamUnboundConfig:
+    """Tests for chunked config generation from the database."""
+
+    def test_matches_in_memory_generation(self, in_memory_db, host_factory):
+        """Streamed chunks join to the same config generate_unbound_config builds."""
+        hosts = [
+            host_factory(mac="aa:bb:cc:dd:ee:11", hostname="web", ip_addresses=["10.0.0.5"]),
+            host_factory(mac="aa:bb:cc:dd:ee:12", hostname="db", ip_addresses=["10.0.0.3/24"]),
+            host_factory(mac="aa:bb:cc:dd:ee:13", hostname=None, ip_addresses=["10.0.0.4"]),
+            host_factory(mac="aa:bb:cc:dd:ee:14", hostname="app", ip_addresses=["10.0.0.2"]),
+        ]
+        for host in hosts:
+            host.status = HostStatus.PUSHED.value
+        host_factory(mac="aa:bb:cc:dd:ee:15", hostname="pending", ip_addresses=["10.0.0.9"])
+        in_memory_db.commit()
+
+        chunks = list(stream_unbound_config(in_memory_db, chunk_size=2))
+
+        assert "".join(chunks) == generate_unbound_config(hosts)
+        assert all(chunk.endswith("\n") for chunk in chunks)
+        assert len(chunks) == 4  # 4 header lines + 3 records, 2 lines per chunk
+        assert "pending" not in "".join(chunks)
+
+    def test_push_writes_chunks_to_sftp(self, in_memory_db):
+        """Chunked configs are spooled, hashed and uploaded piecewise."""
+        from netbox_auto.config import Config, UnboundConfig, UnboundHostConfig
+
+        config = Config(unbound=UnboundConfig(hosts=[UnboundHostConfig(host="dns1", user="a")]))
+        servers = FakeUnboundServers()
+        chunks = ["# header\n", 'local-data: "a.lan. A 10.0.0.1"\n']
+
+        with (
+            patch("netbox_auto.dns.get_config", return_value=config),
+            patch("netbox_auto.dns.paramiko.SSHClient", side_effect=servers.client_class),
+            patch("netbox_auto.dns.UPLOAD_CHUNK_SIZE", 8),
+        ):
+            result = push_dns_config(iter(chunks), session=in_memory_db)
+
+        assert result.updated == ["dns1"]
+        assert servers.files["dns1"] == {"/etc/unbound/local.d/local.conf": "".join(chunks)}
+        assert in_memory_db.query(DnsPushState).one().digest == config_digest("".join(chunks))
+
 
 # =============================================================================
 # SSH Push Tests (mocked paramiko)
@@ -160,7 +236,12 @@ class TestPushDnsConfig:
             push_dns_config("# test config")
 
             mock_client.connect.assert_called_once_with(
-                hostname="dns1.example.com", username="admin"
+                hostname="dns1.example.com",
+                username="admin",
+                timeout=10.0,
+                banner_timeout=10.0,
+                auth_timeout=10.0,
+                compress=False,
             )
 
     def test_writes_config_via_sftp(self, mock_unbound_config):
@@ -184,8 +265,20 @@ class TestPushDnsConfig:
 
             push_dns_config(test_config)
 
-            mock_sftp.file.assert_called_once_with("/etc/unbound/local.d/local.conf", "w")
+            mock_sftp.file.assert_called_once_with(
+                "/etc/unbound/local.d/local.conf.netbox-auto.tmp", "w"
+            )
             mock_file.write.assert_called_once_with(test_config)
+            # Synced, validated, backed up and renamed into place in one command
+            install_command = mock_client.exec_command.call_args_list[0].args[0]
+            assert install_command.startswith(
+                "sync -- /etc/unbound/local.d/local.conf.netbox-auto.tmp && "
+                "unbound-checkconf /dev/stdin && "
+            )
+            assert install_command.endswith(
+                "mv -f -- /etc/unbound/local.d/local.conf.netbox-auto.tmp "
+                "/etc/unbound/local.d/local.conf"
+            )
 
     def test_reloads_unbound(self, mock_unbound_config):
         """Mock exec_command, verify 'sudo unbound-control reload' called."""
@@ -206,7 +299,8 @@ class TestPushDnsConfig:
 
             push_dns_config("# config")
 
-            mock_client.exec_command.assert_called_once_with("sudo unbound-control reload")
+            assert mock_client.exec_command.call_count == 2
+            mock_client.exec_command.assert_called_with("sudo unbound-control reload", timeout=30.0)
 
     def test_returns_updated_hosts(self, mock_unbound_config):
         """Verify list of successfully updated hostnames returned."""
@@ -227,7 +321,7 @@ class TestPushDnsConfig:
 
             result = push_dns_config("# config")
 
-            assert result == ["dns1.example.com"]
+            assert result.updated == ["dns1.example.com"]
 
     def test_dry_run_skips_connection(self, mock_unbound_config):
         """dry_run=True, verify SSHClient.connect NOT called."""
@@ -243,4 +337,598 @@ class TestPushDnsConfig:
             # Should NOT call connect in dry run mode
             mock_client.connect.assert_not_called()
             # Should still return the hosts that would have been updated
-            assert result == ["dns1.example.com"]
+            assert result.updated == ["dns1.example.com"]
+
+
+class TestIncrementalDnsPush:
+    """Tests for skipping servers that already serve the current config."""
+
+    @pytest.fixture
+    def unbound_config(self):
+        """Create config with one Unbound host."""
+        from netbox_auto.config import Config, UnboundConfig, UnboundHostConfig
+
+        return Config(unbound=UnboundConfig(hosts=[UnboundHostConfig(host="dns1", user="admin")]))
+
+    @pytest.fixture
+    def mock_client(self):
+        """Patch paramiko.SSHClient with a client whose commands succeed."""
+        with patch("netbox_auto.dns.paramiko.SSHClient") as mock_ssh_class:
+            client = MagicMock()
+            mock_ssh_class.return_value = client
+            stdout = MagicMock()
+            stdout.channel.recv_exit_status.return_value = 0
+            client.exec_command.return_value = (MagicMock(), stdout, MagicMock())
+            yield client
+
+    def test_records_digest_after_push(self, in_memory_db, unbound_config, mock_client):
+        """A successful push records the digest of the config sent."""
+        with patch("netbox_auto.dns.get_config", return_value=unbound_config):
+            result = push_dns_config("# config", session=in_memory_db)
+
+        assert result.updated == ["dns1"]
+        state = in_memory_db.query(DnsPushState).one()
+        assert state.server == "dns1"
+        assert state.config_path == "/etc/unbound/local.d/local.conf"
+        assert state.digest == config_digest("# config")
+
+    def test_skips_unchanged_config(self, in_memory_db, unbound_config, mock_client):
+        """Matching recorded digest skips the connection, upload and reload."""
+        in_memory_db.add(
+            DnsPushState(
+                server="dns1",
+                config_path="/etc/unbound/local.d/local.conf",
+                digest=config_digest("# config"),
+            )
+        )
+        in_memory_db.flush()
+
+        with patch("netbox_auto.dns.get_config", return_value=unbound_config):
+            result = push_dns_config("# config", session=in_memory_db)
+
+        assert result.skipped == ["dns1"]
+        assert result.updated == []
+        mock_client.connect.assert_not_called()
+
+    def test_pushes_changed_config(self, in_memory_db, unbound_config, mock_client):
+        """A different recorded digest pushes and updates the record."""
+        in_memory_db.add(
+            DnsPushState(
+                server="dns1",
+                config_path="/etc/unbound/local.d/local.conf",
+                digest=config_digest("# old"),
+            )
+        )
+        in_memory_db.flush()
+
+        with patch("netbox_auto.dns.get_config", return_value=unbound_config):
+            result = push_dns_config("# new", session=in_memory_db)
+
+        assert result.updated == ["dns1"]
+        mock_client.exec_command.assert_called_with("sudo unbound-control reload", timeout=30.0)
+        assert in_memory_db.query(DnsPushState).one().digest == config_digest("# new")
+
+    def test_verify_remote_skips_matching_checksum(self, unbound_config, mock_client):
+        """With verify_remote, a matching remote checksum skips upload and reload."""
+        unbound_config.unbound.verify_remote = True
+        stdout = mock_client.exec_command.return_value[1]
+        stdout.read.return_value = f"{config_digest('# config')}  local.conf\n".encode()
+
+        with patch("netbox_auto.dns.get_config", return_value=unbound_config):
+            result = push_dns_config("# config")
+
+        assert result.skipped == ["dns1"]
+        mock_client.exec_command.assert_called_once_with(
+            "sha256sum -- /etc/unbound/local.d/local.conf", timeout=30.0
+        )
+        mock_client.open_sftp.assert_not_called()
+
+
+# =============================================================================
+# Concurrent Push Tests (in-process SSH stand-in)
+# =============================================================================
+
+
+class FakeUnboundServers:
+    """In-process stand-in for a set of Unbound servers reachable over SSH.
+
+    Each server keeps its files in memory and answers `unbound-control reload`
+    and delta updates, whose stdin is captured in `deltas`.
+    Patching paramiko.SSHClient with `client_class` routes connections here.
+    """
+
+    def __init__(self, barrier: threading.Barrier | None = None):
+        self.files: dict[str, dict[str, str]] = {}
+        self.reloads: dict[str, int] = {}
+        self.deltas: dict[str, str] = {}
+        self.connects: list[str] = []
+        self.unreachable: set[str] = set()
+        self.failing_reload: set[str] = set()
+        self.failing_check: set[str] = set()
+        self.failing_delta: set[str] = set()
+        self.barrier = barrier
+        self._lock = threading.Lock()
+
+    def client_class(self) -> "FakeSSHClient":
+        return FakeSSHClient(self)
+
+
+class FakeSSHClient:
+    """Minimal paramiko.SSHClient replacement backed by FakeUnboundServers."""
+
+    def __init__(self, servers: FakeUnboundServers):
+        self.servers = servers
+        self.host: str | None = None
+        self.transport = MagicMock()
+
+    def set_missing_host_key_policy(self, policy):
+        pass
+
+    def connect(self, hostname, username, **kwargs):
+        if self.servers.barrier is not None:
+            # Every server must be connecting at the same time to pass
+            self.servers.barrier.wait(timeout=5)
+        if hostname in self.servers.unreachable:
+            raise OSError(f"Unable to connect to {hostname}")
+        with self.servers._lock:
+            self.servers.connects.append(hostname)
+        self.host = hostname
+        self.transport.is_active.return_value = True
+
+    def get_transport(self):
+        return self.transport
+
+    def open_sftp(self):
+        sftp = MagicMock()
+        files = self.servers.files.setdefault(self.host, {})
+
+        def _open(path, mode):
+            handle = MagicMock()
+            handle.__enter__.return_value = handle
+            files[path] = ""
+            handle.write.side_effect = lambda data: files.__setitem__(path, files[path] + data)
+            return handle
+
+        sftp.file.side_effect = _open
+        sftp.posix_rename.side_effect = lambda old, new: files.__setitem__(new, files.pop(old))
+        return sftp
+
+    def exec_command(self, command, timeout=None):
+        status = 0
+        stderr = b""
+        files = self.servers.files.setdefault(self.host, {})
+        if command.startswith("sync -- "):
+            # Install: keep the live file as backup, rename the upload into place
+            temp = next(path for path in files if path.endswith(TEMP_SUFFIX))
+            live = temp.removesuffix(TEMP_SUFFIX)
+            if self.host in self.servers.failing_check:
+                status, stderr = 1, b"error: syntax error"
+            else:
+                if live in files:
+                    files[live + BACKUP_SUFFIX] = files[live]
+                files[live] = files.pop(temp)
+        elif command.startswith("rm -f -- "):
+            files.pop(command.removeprefix("rm -f -- "), None)
+        elif command.startswith("if [ -e "):
+            # Rollback: restore the backup
+            live = next(path for path in files if path.endswith(BACKUP_SUFFIX))
+            files[live.removesuffix(BACKUP_SUFFIX)] = files.pop(live)
+        elif command == "sudo unbound-control reload":
+            if self.host in self.servers.failing_reload:
+                status, stderr = 1, b"error: reload failed"
+            else:
+                with self.servers._lock:
+                    self.servers.reloads[self.host] = self.servers.reloads.get(self.host, 0) + 1
+        stdin = MagicMock()
+        if command.startswith("sudo awk"):
+            stdin.write.side_effect = lambda data: self.servers.deltas.__setitem__(self.host, data)
+            if self.host in self.servers.failing_delta:
+                # local_datas_remove succeeded, local_datas failed
+                status, stderr = 1, b"error: local_datas failed"
+        stdout = MagicMock()
+        stdout.channel.status_event.wait.return_value = True
+        stdout.channel.recv_exit_status.return_value = status
+        stdout.read.return_value = b""
+        return stdin, stdout, io.BytesIO(stderr)
+
+    def close(self):
+        self.transport.is_active.return_value = False
+
+
+class TestConcurrentDnsPush:
+    """Tests for parallel fan-out to Unbound servers."""
+
+    @pytest.fixture
+    def three_servers_config(self):
+        """Create config with three Unbound servers and three workers."""
+        from netbox_auto.config import Config, UnboundConfig, UnboundHostConfig
+
+        return Config(
+            unbound=UnboundConfig(
+                hosts=[UnboundHostConfig(host=f"dns{i}", user="admin") for i in (1, 2, 3)],
+                workers=3,
+            )
+        )
+
+    def test_pushes_servers_concurrently(self, three_servers_config):
+        """All servers are connected to at once, up to the worker limit."""
+        servers = FakeUnboundServers(barrier=threading.Barrier(3))
+
+        with (
+            patch("netbox_auto.dns.get_config", return_value=three_servers_config),
+            patch("netbox_auto.dns.paramiko.SSHClient", side_effect=servers.client_class),
+        ):
+            result = push_dns_config("# config")
+
+        assert result.updated == ["dns1", "dns2", "dns3"]
+        assert result.failed == {}
+        assert servers.reloads == {"dns1": 1, "dns2": 1, "dns3": 1}
+        assert servers.files["dns2"] == {"/etc/unbound/local.d/local.conf": "# config"}
+
+    def test_failure_does_not_stop_other_servers(self, in_memory_db, three_servers_config):
+        """One unreachable and one failing server; the third is still updated."""
+        servers = FakeUnboundServers()
+        servers.unreachable.add("dns1")
+        servers.failing_reload.add("dns2")
+
+        with (
+            patch("netbox_auto.dns.get_config", return_value=three_servers_config),
+            patch("netbox_auto.dns.paramiko.SSHClient", side_effect=servers.client_class),
+        ):
+            result = push_dns_config("# config", session=in_memory_db)
+
+        assert result.updated == ["dns3"]
+        assert set(result.failed) == {"dns1", "dns2"}
+        assert "reload failed" in result.failed["dns2"]
+        # Only the updated server's digest is recorded, so the others retry next push
+        assert [state.server for state in in_memory_db.query(DnsPushState).all()] == ["dns3"]
+
+    def test_pool_reuses_connections_across_pushes(self, three_servers_config):
+        """A caller-owned pool keeps connections open between pushes."""
+        servers = FakeUnboundServers()
+        pool = SSHConnectionPool()
+
+        with (
+            patch("netbox_auto.dns.get_config", return_value=three_servers_config),
+            patch("netbox_auto.dns.paramiko.SSHClient", side_effect=servers.client_class),
+        ):
+            push_dns_config("# first", pool=pool)
+            push_dns_config("# second", pool=pool)
+        pool.close()
+
+        assert sorted(servers.connects) == ["dns1", "dns2", "dns3"]
+        assert servers.reloads == {"dns1": 2, "dns2": 2, "dns3": 2}
+
+    def test_command_timeout_fails_server(self, three_servers_config):
+        """A reload that never exits fails that server with a timeout."""
+        three_servers_config.unbound.hosts = three_servers_config.unbound.hosts[:1]
+        three_servers_config.unbound.command_timeout = 0.01
+
+        with (
+            patch("netbox_auto.dns.get_config", return_value=three_servers_config),
+            patch("netbox_auto.dns.paramiko.SSHClient") as mock_ssh_class,
+        ):
+            mock_client = MagicMock()
+            mock_ssh_class.return_value = mock_client
+            stdout = MagicMock()
+            stdout.channel.status_event.wait.return_value = False
+            mock_client.exec_command.return_value = (MagicMock(), stdout, MagicMock())
+
+            result = push_dns_config("# config")
+
+        assert result.updated == []
+        assert "timed out" in result.failed["dns1"]
+
+
+class TestAtomicConfigReplacement:
+    """Tests for validated, atomic config replacement with rollback."""
+
+    LIVE = "/etc/unbound/local.d/local.conf"
+
+    @pytest.fixture
+    def one_server_config(self):
+        """Create config with one Unbound server."""
+        from netbox_auto.config import Config, UnboundConfig, UnboundHostConfig
+
+        return Config(unbound=UnboundConfig(hosts=[UnboundHostConfig(host="dns1", user="admin")]))
+
+    def test_invalid_config_leaves_live_file(self, one_server_config):
+        """A config failing unbound-checkconf is discarded before replacing anything."""
+        servers = FakeUnboundServers()
+        servers.files["dns1"] = {self.LIVE: "# old"}
+        servers.failing_check.add("dns1")
+
+        with (
+            patch("netbox_auto.dns.get_config", return_value=one_server_config),
+            patch("netbox_auto.dns.paramiko.SSHClient", side_effect=servers.client_class),
+        ):
+            result = push_dns_config("# new")
+
+        assert "syntax error" in result.failed["dns1"]
+        assert servers.files["dns1"] == {self.LIVE: "# old"}
+        assert servers.reloads == {}
+
+    def test_failed_reload_restores_previous_config(self, one_server_config):
+        """The backed-up config is restored when the reload fails."""
+        servers = FakeUnboundServers()
+        servers.files["dns1"] = {self.LIVE: "# old"}
+        servers.failing_reload.add("dns1")
+
+        with (
+            patch("netbox_auto.dns.get_config", return_value=one_server_config),
+            patch("netbox_auto.dns.paramiko.SSHClient", side_effect=servers.client_class),
+        ):
+            result = push_dns_config("# new")
+
+        assert "reload failed" in result.failed["dns1"]
+        assert servers.files["dns1"] == {self.LIVE: "# old"}
+
+
+# =============================================================================
+# Delta Update Tests
+# =============================================================================
+
+
+class TestRecordDelta:
+    """Tests for computing live record changes."""
+
+    def test_extracts_records_from_config(self):
+        """unbound_records returns the quoted local-data records."""
+        config = '# header\nlocal-data: "a.lan. A 10.0.0.1"\nlocal-data: "b.lan. A 10.0.0.2"\n'
+
+        assert unbound_records(config) == ["a.lan. A 10.0.0.1", "b.lan. A 10.0.0.2"]
+
+    def test_added_records_only(self):
+        """New records are added without removing anything."""
+        names, records = record_delta(
+            ["a.lan. A 10.0.0.1"], ["a.lan. A 10.0.0.1", "b.lan. A 1.1.1.1"]
+        )
+
+        assert names == []
+        assert records == ["b.lan. A 1.1.1.1"]
+
+    def test_removed_record_re_adds_kept_records_of_name(self):
+        """Removing one of a name's records re-adds the ones it keeps."""
+        previous = ["a.lan. A 10.0.0.1", "a.lan. A 10.0.0.2", "gone.lan. A 10.0.0.3"]
+        current = ["a.lan. A 10.0.0.1"]
+
+        names, records = record_delta(previous, current)
+
+        assert names == ["a.lan.", "gone.lan."]
+        assert records == ["a.lan. A 10.0.0.1"]
+
+
+class TestDeltaDnsPush:
+    """Tests for update_mode 'delta'."""
+
+    @pytest.fixture
+    def delta_config(self):
+        """Create config with one Unbound server in delta mode."""
+        from netbox_auto.config import Config, UnboundConfig, UnboundHostConfig
+
+        return Config(
+            unbound=UnboundConfig(
+                hosts=[UnboundHostConfig(host="dns1", user="admin")], update_mode="delta"
+            )
+        )
+
+    def test_applies_delta_without_reload(self, in_memory_db, delta_config):
+        """Known previous records are diffed and applied live over stdin."""
+        in_memory_db.add(
+            DnsPushState(
+                server="dns1",
+                config_path="/etc/unbound/local.d/local.conf",
+                digest="old",
+                records=["old.lan. A 10.0.0.9", "keep.lan. A 10.0.0.1"],
+            )
+        )
+        in_memory_db.flush()
+        config = 'local-data: "keep.lan. A 10.0.0.1"\nlocal-data: "new.lan. A 10.0.0.2"\n'
+        servers = FakeUnboundServers()
+
+        with (
+            patch("netbox_auto.dns.get_config", return_value=delta_config),
+            patch("netbox_auto.dns.paramiko.SSHClient", side_effect=servers.client_class),
+        ):
+            result = push_dns_config(config, session=in_memory_db)
+
+        assert result.updated == ["dns1"]
+        assert servers.reloads == {}
+        assert servers.deltas["dns1"] == "old.lan.\nnew.lan. A 10.0.0.2\n"
+        # The on-disk config is still replaced for the next restart
+        assert servers.files["dns1"] == {"/etc/unbound/local.d/local.conf": config}
+        state = in_memory_db.query(DnsPushState).one()
+        assert state.records == ["keep.lan. A 10.0.0.1", "new.lan. A 10.0.0.2"]
+
+    def test_failed_delta_reloads_restored_config(self, in_memory_db, delta_config):
+        """When adding records fails after removing names, the old config is reloaded."""
+        previous = 'local-data: "old.lan. A 10.0.0.9"\n'
+        in_memory_db.add(
+            DnsPushState(
+                server="dns1",
+                config_path="/etc/unbound/local.d/local.conf",
+                digest="old",
+                records=["old.lan. A 10.0.0.9"],
+            )
+        )
+        in_memory_db.flush()
+        servers = FakeUnboundServers()
+        servers.files["dns1"] = {"/etc/unbound/local.d/local.conf": previous}
+        servers.failing_delta.add("dns1")
+
+        with (
+            patch("netbox_auto.dns.get_config", return_value=delta_config),
+            patch("netbox_auto.dns.paramiko.SSHClient", side_effect=servers.client_class),
+        ):
+            result = push_dns_config('local-data: "new.lan. A 10.0.0.2"\n', session=in_memory_db)
+
+        assert "dns1" in result.failed
+        assert servers.deltas["dns1"] == "old.lan.\nnew.lan. A 10.0.0.2\n"
+        assert servers.files["dns1"] == {"/etc/unbound/local.d/local.conf": previous}
+        assert servers.reloads == {"dns1": 1}
+        state = in_memory_db.query(DnsPushState).one()
+        assert state.records == ["old.lan. A 10.0.0.9"]
+
+    def test_reloads_without_previous_records(self, in_memory_db, delta_config):
+        """A first push has nothing to diff against, so Unbound is reloaded."""
+        servers = FakeUnboundServers()
+
+        with (
+            patch("netbox_auto.dns.get_config", return_value=delta_config),
+            patch("netbox_auto.dns.paramiko.SSHClient", side_effect=servers.client_class),
+        ):
+            result = push_dns_config('local-data: "a.lan. A 10.0.0.1"\n', session=in_memory_db)
+
+        assert result.updated == ["dns1"]
+        assert servers.reloads == {"dns1": 1}
+        assert servers.deltas == {}
+
+
+# =============================================================================
+# Reverse Zone Tests
+# =============================================================================
+
+
+class TestReverseZones:
+    """Tests for AAAA/PTR records and reverse zone generation."""
+
+    def test_ipv6_addresses_get_aaaa_records(self, host_factory):
+        """IPv6 addresses produce AAAA, not A, records."""
+        host = host_factory(hostname="dual", ip_addresses=["10.0.0.1", "fd00::1/64"])
+
+        config = generate_unbound_config([host])
+
+        assert 'local-data: "dual.lan. A 10.0.0.1"' in config
+        assert 'local-data: "dual.lan. AAAA fd00::1"' in config
+
+    def test_zones_cut_on_label_boundaries(self):
+        """Networks map to octet/nibble-aligned zones; shared zones are grouped."""
+        zones = reverse_zones(["10.0.0.0/24", "10.1.4.0/22", "10.1.8.0/22", "fd00:1::/32"])
+
+        assert [zone.name for zone in zones] == [
+            "0.0.10.in-addr.arpa",
+            "1.10.in-addr.arpa",
+            "1.0.0.0.0.0.d.f.ip6.arpa",
+        ]
+        assert len(zones[1].networks) == 2
+
+    def test_ptr_records_grouped_by_zone(self, host_factory):
+        """Each zone declares a local-zone and holds PTRs for its networks only."""
+        host_a = host_factory(
+            mac="aa:bb:cc:dd:ee:21", hostname="a", ip_addresses=["10.0.0.5", "192.168.9.9"]
+        )
+        host_b = host_factory(mac="aa:bb:cc:dd:ee:22", hostname="b", ip_addresses=["fd00::2"])
+        zones = reverse_zones(["10.0.0.0/24", "fd00::/16"], zone_type="transparent")
+
+        config = generate_unbound_zones([host_a, host_b], zones=zones)
+
+        assert list(config) == ["", "0.0.10.in-addr.arpa", "0.0.d.f.ip6.arpa"]
+        assert 'local-zone: "0.0.10.in-addr.arpa." transparent' in config["0.0.10.in-addr.arpa"]
+        assert 'local-data-ptr: "10.0.0.5 a.lan"' in config["0.0.10.in-addr.arpa"]
+        assert 'local-data-ptr: "fd00::2 b.lan"' in config["0.0.d.f.ip6.arpa"]
+        # Addresses outside every configured network get no PTR
+        assert "192.168.9.9" not in config["0.0.10.in-addr.arpa"] + config["0.0.d.f.ip6.arpa"]
+        assert generate_unbound_config([host_a, host_b], zones=zones) == "".join(config.values())
+
+    def test_stream_matches_in_memory_zones(self, in_memory_db, host_factory):
+        """Streamed zones equal generated ones."""
+        host = host_factory(hostname="web", ip_addresses=["10.0.0.7"])
+        host.status = HostStatus.PUSHED.value
+        in_memory_db.commit()
+        zones = reverse_zones(["10.0.0.0/24"])
+
+        streamed = stream_unbound_zones(in_memory_db, zones=zones)
+
+        assert {zone: "".join(chunks) for zone, chunks in streamed.items()} == (
+            generate_unbound_zones([host], zones=zones)
+        )
+        assert "".join(stream_unbound_config(in_memory_db, zones=zones)) == (
+            generate_unbound_config([host], zones=zones)
+        )
+
+    def test_ptr_lines_become_ptr_records(self):
+        """unbound_records turns local-data-ptr into the PTR record it defines."""
+        config = 'local-zone: "0.0.10.in-addr.arpa." static\nlocal-data-ptr: "10.0.0.5 a.lan"\n'
+
+        assert unbound_records(config) == ["5.0.0.10.in-addr.arpa. PTR a.lan."]
+
+
+class TestSplitZonePush:
+    """Tests for pushing one file per zone."""
+
+    LIVE = "/etc/unbound/local.d/local.conf"
+    ZONE = "/etc/unbound/local.d/local.0.0.10.in-addr.arpa.conf"
+
+    @pytest.fixture
+    def split_config(self):
+        """Create config with one Unbound server and split zones."""
+        from netbox_auto.config import Config, UnboundConfig, UnboundHostConfig
+
+        return Config(
+            unbound=UnboundConfig(
+                hosts=[UnboundHostConfig(host="dns1", user="admin")], split_zones=True
+            )
+        )
+
+    def _push(self, config, servers, split_config, session):
+        with (
+            patch("netbox_auto.dns.get_config", return_value=split_config),
+            patch("netbox_auto.dns.paramiko.SSHClient", side_effect=servers.client_class),
+        ):
+            return push_dns_config(config, session=session)
+
+    def test_writes_each_zone_to_its_own_file(self, in_memory_db, split_config):
+        """Forward records go to config_path and each zone to a sibling file."""
+        servers = FakeUnboundServers()
+
+        result = self._push(
+            {"": "# forward\n", "0.0.10.in-addr.arpa": "# zone\n"},
+            servers,
+            split_config,
+            in_memory_db,
+        )
+
+        assert result.updated == ["dns1"]
+        assert servers.files["dns1"] == {self.LIVE: "# forward\n", self.ZONE: "# zone\n"}
+        assert servers.reloads == {"dns1": 1}
+        assert in_memory_db.query(DnsPushState).count() == 2
+
+    def test_transfers_only_changed_zones(self, in_memory_db, split_config):
+        """An unchanged forward file is not uploaded again."""
+        servers = FakeUnboundServers()
+        self._push(
+            {"": "# forward\n", "0.0.10.in-addr.arpa": "# zone\n"},
+            servers,
+            split_config,
+            in_memory_db,
+        )
+        servers.files["dns1"][self.LIVE] = "# untouched"
+
+        self._push(
+            {"": "# forward\n", "0.0.10.in-addr.arpa": "# zone v2\n"},
+            servers,
+            split_config,
+            in_memory_db,
+        )
+
+        assert servers.files["dns1"][self.LIVE] == "# untouched"
+        assert servers.files["dns1"][self.ZONE] == "# zone v2\n"
+        assert servers.reloads == {"dns1": 2}
+
+    def test_removes_zone_files_no_longer_generated(self, in_memory_db, split_config):
+        """A zone dropped from the config has its file removed and state forgotten."""
+        servers = FakeUnboundServers()
+        self._push(
+            {"": "# forward\n", "0.0.10.in-addr.arpa": "# zone\n"},
+            servers,
+            split_config,
+            in_memory_db,
+        )
+
+        result = self._push({"": "# forward\n"}, servers, split_config, in_memory_db)
+
+        assert result.updated == ["dns1"]
+        assert self.ZONE not in servers.files["dns1"]
+        assert [state.config_path for state in in_memory_db.query(DnsPushState).all()] == [
+            self.LIVE
+        ]
@@ -6,9 +6,156 @@ correct API calls without requiring a real NetBox instance.
 Covers INTG-03 (device creation), INTG-04 (IP assignment), INTG-05 (cable creation).
 """
 
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
 from unittest.mock import MagicMock, patch
 
-from netbox_auto.netbox import NetBoxClient
+import pytest
+from pynetbox.core.query import RequestError
+
+from netbox_auto.netbox import (
+    NetBoxClient,
+    NetBoxFetchError,
+    NetBoxTransport,
+    RateLimiter,
+    ReferenceCache,
+)
+
+
+class _FakeNetBoxServer(ThreadingHTTPServer):
+    """Local HTTP server standing in for NetBox's GraphQL and REST endpoints."""
+
+    graphql_enabled: bool = True
+    requests_seen: list[tuple[str, str, Any]]
+    # Number of REST GETs answered with 502 before serving normally
+    rest_failures: int = 0
+    # Serve an empty NetBox from the REST listings
+    rest_empty: bool = False
+    # Status (value, label) of switch1; GraphQL serves the value upper-cased
+    switch_status: tuple[str, str] = ("active", "Active")
+
+
+class _FakeNetBoxHandler(BaseHTTPRequestHandler):
+    """Serves /graphql/ plus the device and VM REST listings."""
+
+    server: _FakeNetBoxServer
+
+    def _send_json(self, status: int, body: Any) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        self.server.requests_seen.append(("POST", self.path, body))
+
+        if self.path != "/graphql/" or not self.server.graphql_enabled:
+            self._send_json(404, {"detail": "Not found."})
+            return
+        if self.headers.get("Authorization") != "Token test-token":
+            self._send_json(403, {"detail": "Invalid token"})
+            return
+
+        self._send_json(
+            200,
+            {
+                "data": {
+                    "device_list": [
+                        {
+                            "id": "1",
+                            "name": "switch1",
+                            "status": self.server.switch_status[0].upper(),
+                            "primary_ip4": {"address": "192.168.1.2/24"},
+                            "primary_ip6": None,
+                            "device_type": {"model": "CRS326"},
+                        },
+                        {
+                            "id": "2",
+                            "name": "spare",
+                            "status": "planned",
+                            "primary_ip4": None,
+                            "primary_ip6": None,
+                            "device_type": None,
+                        },
+                    ],
+                    "virtual_machine_list": [
+                        {
+                            "id": "10",
+                            "name": "vm1",
+                            "status": "active",
+                            "primary_ip4": None,
+                            "primary_ip6": {"address": "fd00::10/64"},
+                        }
+                    ],
+                }
+            },
+        )
+
+    def do_GET(self) -> None:
+        self.server.requests_seen.append(("GET", self.path, None))
+        if self.server.rest_failures > 0:
+            self.server.rest_failures -= 1
+            self._send_json(502, {"detail": "Bad Gateway"})
+            return
+        if self.server.rest_empty:
+            self._send_json(200, {"count": 0, "next": None, "results": []})
+            return
+        if self.path.startswith("/api/dcim/devices/"):
+            results = [
+                {
+                    "id": 1,
+                    "name": "switch1",
+                    "primary_ip": {"id": 5, "address": "192.168.1.2/24"},
+                    "device_type": {"id": 3, "model": "CRS326"},
+                    "status": dict(zip(("value", "label"), self.server.switch_status, strict=True)),
+                }
+            ]
+        elif self.path.startswith("/api/virtualization/virtual-machines/"):
+            results = []
+        else:
+            self._send_json(404, {"detail": "Not found."})
+            return
+        self._send_json(200, {"count": len(results), "next": None, "results": results})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_netbox() -> Iterator[_FakeNetBoxServer]:
+    """Run a fake NetBox HTTP server on a free local port."""
+    server = _FakeNetBoxServer(("127.0.0.1", 0), _FakeNetBoxHandler)
+    server.requests_seen = []
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _fake_url(server: _FakeNetBoxServer) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _bulk_request_error(item_errors: list[dict[str, Any]]) -> RequestError:
+    """Build the pynetbox error NetBox returns when a bulk write has invalid items."""
+    req = MagicMock()
+    req.status_code = 400
+    req.reason = "Bad Request"
+    req.json.return_value = item_errors
+    req.text = json.dumps(item_errors)
+    return RequestError(req)
+
+
+def _records(*ids: int) -> list[MagicMock]:
+    return [MagicMock(id=record_id) for record_id in ids]
 
 
 class TestDeviceCreation:
@@ -227,6 +374,547 @@ class TestCableCreation:
             assert result == {"id": 456}
 
 
+class TestInventoryFetch:
+    """Test field-limited, paged and concurrent inventory listing."""
+
+    def test_get_devices_requests_only_needed_fields(self) -> None:
+        """Verify devices are listed with a field restriction and large pages."""
+        mock_device = MagicMock()
+        mock_device.id = 7
+        mock_device.name = "server1"
+        mock_device.primary_ip = "192.168.1.10/24"
+        mock_device.device_type = "Generic"
+        mock_device.status = "Active"
+
+        with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
+            mock_api = MagicMock()
+            mock_pynetbox.api.return_value = mock_api
+            mock_api.dcim.devices.filter.return_value = [mock_device]
+
+            client = NetBoxClient(url="http://netbox.local", token="test-token", page_size=500)
+            devices = client.get_devices()
+
+            mock_api.dcim.devices.filter.assert_called_once_with(
+                fields="id,name,primary_ip,device_type,status", limit=500
+            )
+            mock_api.dcim.devices.all.assert_not_called()
+            assert devices == [
+                {
+                    "id": 7,
+                    "name": "server1",
+                    "primary_ip": "192.168.1.10",
+                    "device_type": "Generic",
+                    "status": "Active",
+                }
+            ]
+
+    def test_get_vms_requests_only_needed_fields(self) -> None:
+        """Verify VMs are listed with a field restriction and the default page size."""
+        with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
+            mock_api = MagicMock()
+            mock_pynetbox.api.return_value = mock_api
+            mock_api.virtualization.virtual_machines.filter.return_value = []
+
+            client = NetBoxClient(url="http://netbox.local", token="test-token")
+            client.get_vms()
+
+            mock_api.virtualization.virtual_machines.filter.assert_called_once_with(
+                fields="id,name,primary_ip,status", limit=1000
+            )
+
+    def test_get_inventory_returns_devices_and_vms(self) -> None:
+        """Verify get_inventory returns both listings over a single connection."""
+        mock_device = MagicMock(id=1, primary_ip=None, device_type=None, status=None)
+        mock_device.name = "switch1"
+        mock_vm = MagicMock(id=2, primary_ip="10.0.0.5/24", status=None)
+        mock_vm.name = "vm1"
+
+        with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
+            mock_api = MagicMock()
+            mock_pynetbox.api.return_value = mock_api
+            mock_api.dcim.devices.filter.return_value = [mock_device]
+            mock_api.virtualization.virtual_machines.filter.return_value = [mock_vm]
+
+            client = NetBoxClient(
+                url="http://netbox.local", token="test-token", inventory_backend="rest"
+            )
+            devices, vms = client.get_inventory()
+
+            assert mock_pynetbox.api.call_count == 1
+            assert [d["name"] for d in devices] == ["switch1"]
+            assert vms == [{"id": 2, "name": "vm1", "primary_ip": "10.0.0.5", "status": None}]
+
+    def test_get_inventory_threading_can_be_disabled(self) -> None:
+        """Verify threading=False is passed through to pynetbox."""
+        with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
+            mock_api = MagicMock()
+            mock_pynetbox.api.return_value = mock_api
+            mock_api.dcim.devices.filter.return_value = []
+            mock_api.virtualization.virtual_machines.filter.return_value = []
+
+            client = NetBoxClient(
+                url="http://netbox.local",
+                token="test-token",
+                threading=False,
+                inventory_backend="rest",
+            )
+            assert client.get_inventory() == ([], [])
+
+            mock_pynetbox.api.assert_called_once_with(
+                "http://netbox.local", token="test-token", threading=False
+            )
+
+
+class TestGraphQLInventory:
+    """Test the GraphQL inventory backend against a local fake endpoint."""
+
+    def test_graphql_fetches_inventory_in_one_request(self, fake_netbox) -> None:
+        """Devices and VMs come from a single POST to /graphql/."""
+        client = NetBoxClient(url=_fake_url(fake_netbox), token="test-token")
+
+        devices, vms = client.get_inventory()
+
+        assert [(method, path) for method, path, _ in fake_netbox.requests_seen] == [
+            ("POST", "/graphql/")
+        ]
+        assert "device_list" in fake_netbox.requests_seen[0][2]["query"]
+        assert devices == [
+            {
+                "id": 1,
+                "name": "switch1",
+                "primary_ip": "192.168.1.2",
+                "device_type": "CRS326",
+                "status": "Active",
+            },
+            {
+                "id": 2,
+                "name": "spare",
+                "primary_ip": None,
+                "device_type": None,
+                "status": "Planned",
+            },
+        ]
+        assert vms == [{"id": 10, "name": "vm1", "primary_ip": "fd00::10", "status": "Active"}]
+
+    def test_falls_back_to_rest_when_graphql_disabled(self, fake_netbox) -> None:
+        """A 404 from /graphql/ falls back to the REST listings with the same shape."""
+        fake_netbox.graphql_enabled = False
+        client = NetBoxClient(url=_fake_url(fake_netbox), token="test-token")
+
+        devices, vms = client.get_inventory()
+
+        paths = [path for _, path, _ in fake_netbox.requests_seen]
+        assert paths[0] == "/graphql/"
+        assert any(p.startswith("/api/dcim/devices/") for p in paths)
+        assert devices == [
+            {
+                "id": 1,
+                "name": "switch1",
+                "primary_ip": "192.168.1.2",
+                "device_type": "CRS326",
+                "status": "Active",
+            }
+        ]
+        assert vms == []
+
+    @pytest.mark.parametrize(
+        "status", [("decommissioning", "Decommissioning"), ("retiring", "Being Retired")]
+    )
+    def test_backends_agree_on_status(self, fake_netbox, status) -> None:
+        """GraphQL and REST report the same status for the same device."""
+        fake_netbox.switch_status = status
+        graphql_devices, _ = NetBoxClient(
+            url=_fake_url(fake_netbox), token="test-token"
+        ).get_inventory()
+        rest_client = NetBoxClient(
+            url=_fake_url(fake_netbox), token="test-token", inventory_backend="rest"
+        )
+
+        rest_devices, _ = rest_client.get_inventory()
+
+        assert graphql_devices[0]["status"] == rest_devices[0]["status"]
+
+    def test_failed_graphql_is_not_retried(self, fake_netbox) -> None:
+        """After GraphQL fails once, the same client goes straight to REST."""
+        fake_netbox.graphql_enabled = False
+        client = NetBoxClient(url=_fake_url(fake_netbox), token="test-token")
+
+        client.get_inventory()
+        client.get_inventory()
+
+        graphql_calls = [p for _, p, _ in fake_netbox.requests_seen if p == "/graphql/"]
+        assert len(graphql_calls) == 1
+
+    def test_rest_backend_skips_graphql(self, fake_netbox) -> None:
+        """inventory_backend='rest' never calls the GraphQL endpoint."""
+        client = NetBoxClient(
+            url=_fake_url(fake_netbox), token="test-token", inventory_backend="rest"
+        )
+
+        devices, _vms = client.get_inventory()
+
+        assert all(path != "/graphql/" for _, path, _ in fake_netbox.requests_seen)
+        assert devices[0]["name"] == "switch1"
+
+
+class TestTransport:
+    """Test HTTP session pooling, retries and failure reporting."""
+
+    def test_session_configured_from_transport(self) -> None:
+        """The pynetbox API uses a pooled, compressed session from the transport."""
+        transport = NetBoxTransport(pool_size=25, timeout=12.0, connect_timeout=2.0)
+        client = NetBoxClient(url="http://netbox.local", token="test-token", transport=transport)
+
+        session = client._connect().http_session
+        adapter = session.get_adapter("https://netbox.local/api/")
+
+        assert adapter._pool_maxsize == 25
+        assert adapter._pool_block is True
+        assert adapter._timeout == (2.0, 12.0)
+        assert adapter.max_retries.total == 3
+        assert "POST" not in adapter.max_retries.allowed_methods
+        assert "gzip" in session.headers["Accept-Encoding"]
+
+    def test_transient_502_is_retried(self, fake_netbox) -> None:
+        """A 502 from the load balancer is retried instead of aborting the fetch."""
+        fake_netbox.graphql_enabled = False
+        fake_netbox.rest_failures = 2
+        client = NetBoxClient(
+            url=_fake_url(fake_netbox),
+            token="test-token",
+            transport=NetBoxTransport(backoff_factor=0),
+        )
+
+        devices, _vms = client.get_inventory()
+
+        assert [d["name"] for d in devices] == ["switch1"]
+
+    def test_failed_fetch_raises_instead_of_returning_empty(self, fake_netbox) -> None:
+        """Exhausted retries raise NetBoxFetchError rather than looking like an empty NetBox."""
+        fake_netbox.graphql_enabled = False
+        fake_netbox.rest_failures = 100
+        client = NetBoxClient(
+            url=_fake_url(fake_netbox),
+            token="test-token",
+            transport=NetBoxTransport(max_retries=1, backoff_factor=0),
+        )
+
+        with pytest.raises(NetBoxFetchError):
+            client.get_inventory()
+
+    def test_empty_netbox_is_not_an_error(self, fake_netbox) -> None:
+        """An empty NetBox returns empty lists without raising."""
+        fake_netbox.graphql_enabled = False
+        fake_netbox.rest_empty = True
+        client = NetBoxClient(url=_fake_url(fake_netbox), token="test-token")
+
+        assert client.get_inventory() == ([], [])
+
+    def test_get_devices_stays_lenient_by_default(self, fake_netbox) -> None:
+        """get_devices() without strict keeps returning [] on failure."""
+        fake_netbox.rest_failures = 100
+        client = NetBoxClient(
+            url=_fake_url(fake_netbox),
+            token="test-token",
+            transport=NetBoxTransport(max_retries=0),
+        )
+
+        assert client.get_devices() == []
+        with pytest.raises(NetBoxFetchError):
+            client.get_devices(strict=True)
+
+
+class TestBulkWrites:
+    """Test batched create/update operations and per-item error handling."""
+
+    def test_create_devices_batches_and_maps_ids(self) -> None:
+        """Devices are sent batch_size at a time and IDs map back to input positions."""
+        with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
+            mock_api = MagicMock()
+            mock_pynetbox.api.return_value = mock_api
+            mock_api.dcim.devices.create.side_effect = [_records(11, 12), _records(13)]
+
+            client = NetBoxClient(url="http://netbox.local", token="test-token", batch_size=2)
+            result = client.create_devices(
+                [
+                    {"name": f"dev{i}", "device_type_id": 1, "device_role_id": 2, "site_id": 3}
+                    for i in range(3)
+                ]
+            )
+
+            assert mock_api.dcim.devices.create.call_count == 2
+            first_batch = mock_api.dcim.devices.create.call_args_list[0].args[0]
+            assert first_batch[0] == {
+                "name": "dev0",
+                "device_type": 1,
+                "role": 2,
+                "site": 3,
+                "status": "active",
+            }
+            assert result.ids == {0: 11, 1: 12, 2: 13}
+            assert result.errors == {}
+
+    def test_rejected_items_reported_and_rest_retried(self) -> None:
+        """Invalid items are reported per position; valid items are resent and created."""
+        with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
+            mock_api = MagicMock()
+            mock_pynetbox.api.return_value = mock_api
+            mock_api.ipam.ip_addresses.create.side_effect = [
+                _bulk_request_error([{}, {"address": ["Duplicate IP address"]}, {}]),
+                _records(21, 23),
+            ]
+
+            client = NetBoxClient(url="http://netbox.local", token="test-token")
+            result = client.assign_ips(
+                [
+                    {"ip_address": "10.0.0.1", "interface_id": 1},
+                    {"ip_address": "10.0.0.2/24", "interface_id": 2},
+                    {"ip_address": "fd00::3", "interface_id": 3},
+                ]
+            )
+
+            retry = mock_api.ipam.ip_addresses.create.call_args_list[1].args[0]
+            assert [ip["address"] for ip in retry] == ["10.0.0.1/32", "fd00::3/128"]
+            assert result.ids == {0: 21, 2: 23}
+            assert result.errors == {1: "address: Duplicate IP address"}
+
+    def test_failed_batch_does_not_fail_other_batches(self) -> None:
+        """A batch failing without per-item detail only fails its own items."""
+        with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
+            mock_api = MagicMock()
+            mock_pynetbox.api.return_value = mock_api
+            mock_api.virtualization.virtual_machines.create.side_effect = [
+                ConnectionError("connection reset"),
+                _records(31),
+            ]
+
+            client = NetBoxClient(url="http://netbox.local", token="test-token", batch_size=1)
+            result = client.create_vms(
+                [{"name": "vm1", "cluster_id": 1}, {"name": "vm2", "cluster_id": 1}]
+            )
+
+            assert result.ids == {1: 31}
+            assert result.errors == {0: "connection reset"}
+
+    def test_create_cables_uses_termination_lists(self) -> None:
+        """Bulk cables use the same termination format as create_cable()."""
+        with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
+            mock_api = MagicMock()
+            mock_pynetbox.api.return_value = mock_api
+            mock_api.dcim.cables.create.return_value = _records(40)
+
+            client = NetBoxClient(url="http://netbox.local", token="test-token")
+            result = client.create_cables(
+                [
+                    {
+                        "a_termination_type": "dcim.interface",
+                        "a_termination_id": 10,
+                        "b_termination_type": "dcim.interface",
+                        "b_termination_id": 20,
+                    }
+                ]
+            )
+
+            mock_api.dcim.cables.create.assert_called_once_with(
+                [
+                    {
+                        "a_terminations": [{"object_type": "dcim.interface", "object_id": 10}],
+                        "b_terminations": [{"object_type": "dcim.interface", "object_id": 20}],
+                    }
+                ]
+            )
+            assert result.ids == {0: 40}
+
+    def test_update_devices_sends_bulk_patch(self) -> None:
+        """update_devices passes id-keyed dicts to the endpoint's bulk update."""
+        with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
+            mock_api = MagicMock()
+            mock_pynetbox.api.return_value = mock_api
+            mock_api.dcim.devices.update.return_value = _records(5)
+
+            client = NetBoxClient(url="http://netbox.local", token="test-token")
+            result = client.update_devices([{"id": 5, "primary_ip4": 12}])
+
+            mock_api.dcim.devices.update.assert_called_once_with([{"id": 5, "primary_ip4": 12}])
+            assert result.ids == {0: 5}
+
+    def test_lookup_id_tries_slug_then_name(self) -> None:
+        """lookup_id falls through the configured lookup fields."""
+        with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
+            mock_api = MagicMock()
+            mock_pynetbox.api.return_value = mock_api
+            mock_api.dcim.sites.filter.side_effect = [[], _records(3)]
+
+            client = NetBoxClient(url="http://netbox.local", token="test-token")
+
+            assert client.lookup_id("site", "Main Site") == 3
+            assert mock_api.dcim.sites.filter.call_args_list[0].kwargs == {"slug": "Main Site"}
+            assert mock_api.dcim.sites.filter.call_args_list[1].kwargs == {"name": "Main Site"}
+
+    def test_find_ip_filters_by_address_and_vm_interface(self) -> None:
+        """find_ip looks up the prefixed address on the assigned VM interface."""
+        with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
+            mock_api = MagicMock()
+            mock_pynetbox.api.return_value = mock_api
+            mock_api.ipam.ip_addresses.filter.return_value = _records(9)
+
+            client = NetBoxClient(url="http://netbox.local", token="test-token")
+
+            assert client.find_ip("10.0.0.1", 30, "virtualization.vminterface") == 9
+            mock_api.ipam.ip_addresses.filter.assert_called_once_with(
+                address="10.0.0.1/32", fields="id", vminterface_id=30
+            )
+
+    def test_primary_ips_and_cable_read_from_records(self) -> None:
+        """Primary IPs and an interface's cable are read back as IDs."""
+        with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
+            mock_api = MagicMock()
+            mock_pynetbox.api.return_value = mock_api
+            device = MagicMock(primary_ip4=MagicMock(id=12), primary_ip6=None)
+            mock_api.dcim.devices.get.return_value = device
+            mock_api.dcim.interfaces.get.return_value = MagicMock(cable=None)
+
+            client = NetBoxClient(url="http://netbox.local", token="test-token")
+
+            assert client.get_primary_ips("device", 5) == {"primary_ip4": 12}
+            assert client.get_interface_cable(7) is None
+
+
+class TestReferenceCache:
+    """Test cached reference object and interface lookups."""
+
+    def test_lookup_id_cached_until_ttl_expires(self) -> None:
+        """Repeated lookups hit NetBox once until the entry expires."""
+        now = [0.0]
+        cache = ReferenceCache(ttl=60, clock=lambda: now[0])
+        cache.set("site", "main", 1)
+
+        assert cache.get("site", "main") == (True, 1)
+        now[0] = 61.0
+        assert cache.get("site", "main") == (False, None)
+
+    def test_lookup_id_caches_hits_and_misses(self) -> None:
+        """Both found and missing objects are served from the cache on repeat."""
+        with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
+            mock_api = MagicMock()
+            mock_pynetbox.api.return_value = mock_api
+            mock_api.dcim.sites.filter.side_effect = lambda **kw: (
+                [MagicMock(id=7)] if kw == {"slug": "main"} else []
+            )
+
+            client = NetBoxClient(url="http://netbox.local", token="test-token")
+            assert client.lookup_id("site", "main") == 7
+            assert client.lookup_id("site", "main") == 7
+            assert client.lookup_id("site", "missing") is None
+            assert client.lookup_id("site", "missing") is None
+
+            # main: slug hit; missing: slug + name misses, then cached
+            assert mock_api.dcim.sites.filter.call_count == 3
+
+    def test_prefetch_references_serves_all_lookup_fields(self) -> None:
+        """One listing per kind caches every slug/name so lookups make no calls."""
+        with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
+            mock_api = MagicMock()
+            mock_pynetbox.api.return_value = mock_api
+            site = MagicMock(id=1, slug="main", spec=["id", "slug", "name"])
+            site.name = "Main Site"
+            mock_api.dcim.sites.filter.return_value = [site]
+
+            client = NetBoxClient(url="http://netbox.local", token="test-token", page_size=250)
+            client.prefetch_references(["site"])
+
+            mock_api.dcim.sites.filter.assert_called_once_with(fields="id,slug,name", limit=250)
+            assert client.lookup_id("site", "main") == 1
+            assert client.lookup_id("site", "Main Site") == 1
+            mock_api.dcim.sites.filter.assert_called_once()
+
+    def test_get_interface_id_prefetches_once_per_device(self) -> None:
+        """A device's interfaces are listed once; unknown ports are created and cached."""
+        with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
+            mock_api = MagicMock()
+            mock_pynetbox.api.return_value = mock_api
+            ether1 = MagicMock(id=501)
+            ether1.name = "ether1"
+            mock_api.dcim.interfaces.filter.return_value = [ether1]
+            mock_api.dcim.interfaces.create.return_value = MagicMock(id=502)
+
+            client = NetBoxClient(url="http://netbox.local", token="test-token")
+            assert client.get_interface_id(50, "ether1") == 501
+            assert client.get_interface_id(50, "ether2") == 502
+            assert client.get_interface_id(50, "ether2") == 502
+
+            mock_api.dcim.interfaces.filter.assert_called_once_with(
+                device_id=50, fields="id,name", limit=1000
+            )
+            mock_api.dcim.interfaces.create.assert_called_once_with(
+                device=50, name="ether2", type="1000base-t"
+            )
+
+    def test_invalidate_drops_one_kind(self) -> None:
+        """Invalidating a kind leaves other kinds cached."""
+        cache = ReferenceCache()
+        cache.set("site", "main", 1)
+        cache.set("cluster", "pve", 4)
+        cache.set_interfaces(50, {"ether1": 501})
+
+        cache.invalidate("site")
+
+        assert cache.get("site", "main") == (False, None)
+        assert cache.get("cluster", "pve") == (True, 4)
+        assert cache.get_interfaces(50) == {"ether1": 501}
+
+        cache.invalidate()
+        assert cache.get("cluster", "pve") == (False, None)
+        assert cache.get_interfaces(50) is None
+
+
+class TestRateLimiter:
+    """Test the shared NetBox write rate limiter."""
+
+    def test_requests_spaced_after_burst(self) -> None:
+        """Once the burst is spent, each request waits 1/rate seconds more."""
+        sleeps: list[float] = []
+        limiter = RateLimiter(rate=10, burst=2, clock=lambda: 0.0, sleep=sleeps.append)
+
+        for _ in range(4):
+            limiter.acquire()
+
+        assert sleeps == pytest.approx([0.1, 0.2])
+
+    def test_zero_rate_is_unlimited(self) -> None:
+        """A rate of 0 never sleeps."""
+        sleeps: list[float] = []
+        limiter = RateLimiter(rate=0, sleep=sleeps.append)
+
+        for _ in range(100):
+            limiter.acquire()
+
+        assert sleeps == []
+
+    def test_bulk_writes_acquire_limiter(self) -> None:
+        """Every bulk write request takes a token from the client's limiter."""
+        with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
+            mock_api = MagicMock()
+            mock_pynetbox.api.return_value = mock_api
+            mock_api.dcim.cables.create.side_effect = [_records(1, 2), _records(3)]
+
+            client = NetBoxClient(url="http://netbox.local", token="test-token", batch_size=2)
+            with patch.object(RateLimiter, "acquire") as mock_acquire:
+                client.create_cables(
+                    [
+                        {
+                            "a_termination_type": "dcim.interface",
+                            "a_termination_id": i,
+                            "b_termination_type": "dcim.interface",
+                            "b_termination_id": 100 + i,
+                        }
+                        for i in range(3)
+                    ]
+                )
+
+            assert mock_acquire.call_count == 2
+
+
 class TestClientConnection:
     """Test lazy connection and caching behavior."""
 
@@ -241,19 +929,21 @@ class TestClientConnection:
             # Trigger connection via API call
             mock_api = MagicMock()
             mock_pynetbox.api.return_value = mock_api
-            mock_api.dcim.devices.all.return_value = []
+            mock_api.dcim.devices.filter.return_value = []
             client.get_devices()
 
             # Now connected
-            mock_pynetbox.api.assert_called_once_with("http://netbox.local", token="test-token")
+            mock_pynetbox.api.assert_called_once_with(
+                "http://netbox.local", token="test-token", threading=True
+            )
 
     def test_connection_caches_api(self) -> None:
         """Verify second call reuses existing connection."""
         with patch("netbox_auto.netbox.pynetbox") as mock_pynetbox:
             mock_api = MagicMock()
             mock_pynetbox.api.return_value = mock_api
-            mock_api.dcim.devices.all.return_value = []
-            mock_api.virtualization.virtual_machines.all.return_value = []
+            mock_api.dcim.devices.filter.return_value = []
+            mock_api.virtualization.virtual_machines.filter.return_value = []
 
             client = NetBoxClient(url="http://netbox.local", token="test-token")
 
@@ -0,0 +1,176 @@
+"""Unit tests for the hosts JSON API.
+
+Tests listing, conditional GET and partial updates.
+"""
+
+import pytest
+
+from netbox_auto.models import Host, HostStatus, HostType, TableVersion
+
+
+@pytest.fixture
+def host_ids(in_memory_db):
+    """IDs of three pending hosts (routes close the session, detaching objects)."""
+    hosts = [Host(mac=f"aa:bb:cc:dd:ee:0{i}", hostname=f"host-{i}") for i in range(3)]
+    in_memory_db.add_all(hosts)
+    in_memory_db.commit()
+    return [host.id for host in hosts]
+
+
+def test_host_writes_bump_table_version(in_memory_db):
+    """Inserts and updates of hosts, including bulk UPDATEs, move the version."""
+    host = Host(mac="aa:bb:cc:dd:ee:ff")
+    in_memory_db.add(host)
+    in_memory_db.commit()
+    first = in_memory_db.get(TableVersion, "host").version
+
+    in_memory_db.query(Host).update({Host.status: HostStatus.APPROVED.value})
+    in_memory_db.commit()
+
+    assert in_memory_db.get(TableVersion, "host").version > first
+
+
+def test_list_hosts(web_client, host_ids):
+    """Listing returns host dictionaries and pagination cursors."""
+    response = web_client.get("/api/hosts?sort=mac&dir=asc&per_page=2")
+
+    data = response.get_json()
+    assert response.status_code == 200
+    assert [host["mac"] for host in data["hosts"]] == ["aa:bb:cc:dd:ee:00", "aa:bb:cc:dd:ee:01"]
+    assert data["next"] is not None
+    assert data["prev"] is None
+    assert response.headers["ETag"]
+
+
+def test_list_hosts_rejects_invalid_filter(web_client):
+    """Invalid listing arguments answer 400 with a JSON error."""
+    response = web_client.get("/api/hosts?status=bogus")
+
+    assert response.status_code == 400
+    assert "Invalid status" in response.get_json()["error"]
+
+
+def test_conditional_get_until_hosts_change(web_client, in_memory_db, host_ids):
+    """If-None-Match with the current ETag gets 304 until a host changes."""
+    etag = web_client.get("/api/hosts").headers["ETag"]
+
+    cached = web_client.get("/api/hosts", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    in_memory_db.get(Host, host_ids[0]).hostname = "renamed"
+    in_memory_db.commit()
+    changed = web_client.get("/api/hosts", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_get_host(web_client, host_ids):
+    """A single host is returned by ID, or 404."""
+    response = web_client.get(f"/api/hosts/{host_ids[1]}")
+
+    assert response.get_json()["hostname"] == "host-1"
+    assert web_client.get("/api/hosts/9999").status_code == 404
+
+
+def test_patch_host(web_client, in_memory_db, host_ids):
+    """PATCH changes status and type and returns the updated host."""
+    etag = web_client.get("/api/hosts").headers["ETag"]
+
+    response = web_client.patch(
+        f"/api/hosts/{host_ids[0]}",
+        json={"status": HostStatus.APPROVED.value, "host_type": HostType.SERVER.value},
+    )
+
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data["status"] == HostStatus.APPROVED.value
+    assert data["host_type"] == HostType.SERVER.value
+    assert response.headers["ETag"] != etag
+    assert in_memory_db.get(Host, host_ids[0]).status == HostStatus.APPROVED.value
+
+
+@pytest.mark.parametrize("body", [{"status": "bogus"}, {"hostname": "x"}, {}, ["approved"], None])
+def test_patch_host_rejects_invalid_body(web_client, host_ids, body):
+    """Unknown fields, invalid values and empty bodies answer 400."""
+    response = web_client.patch(f"/api/hosts/{host_ids[0]}", json=body)
+
+    assert response.status_code == 400
+
+
+def test_patch_with_stale_if_match_is_refused(web_client, in_memory_db, host_ids):
+    """A write conditioned on an outdated ETag answers 412 and changes nothing."""
+    etag = web_client.get("/api/hosts").headers["ETag"]
+    in_memory_db.get(Host, host_ids[1]).hostname = "changed-elsewhere"
+    in_memory_db.commit()
+
+    response = web_client.patch(
+        f"/api/hosts/{host_ids[0]}",
+        json={"status": HostStatus.REJECTED.value},
+        headers={"If-Match": etag},
+    )
+
+    assert response.status_code == 412
+    assert in_memory_db.get(Host, host_ids[0]).status == HostStatus.PENDING.value
+
+
+def test_bulk_patch(web_client, in_memory_db, host_ids):
+    """Bulk PATCH updates the listed hosts only."""
+    response = web_client.patch(
+        "/api/hosts",
+        json={"ids": [host_ids[0], host_ids[2]], "status": HostStatus.REJECTED.value},
+    )
+
+    assert response.status_code == 200
+    assert response.get_json() == {"updated": 2}
+    statuses = [in_memory_db.get(Host, host_id).status for host_id in host_ids]
+    assert statuses == ["rejected", "pending", "rejected"]
+
+
+def test_bulk_patch_requires_ids(web_client, host_ids):
+    """Bulk PATCH without a list of IDs answers 400."""
+    response = web_client.patch("/api/hosts", json={"status": HostStatus.APPROVED.value})
+
+    assert response.status_code == 400
+
+
+def test_bulk_change_preview_apply_and_undo(web_client, in_memory_db, host_ids):
+    """Filter-based bulk changes preview, apply and undo over the API."""
+    body = {"filter": {"hostname": "host-[01]*"}, "status": HostStatus.APPROVED.value}
+    in_memory_db.get(Host, host_ids[2]).hostname = "other"
+    in_memory_db.commit()
+
+    preview = web_client.post("/api/hosts/bulk", json={**body, "preview": True})
+    assert preview.get_json() == {"matched": 0}
+
+    body["filter"] = {"hostname": "host-*"}
+    preview = web_client.post("/api/hosts/bulk", json={**body, "preview": True})
+    assert preview.get_json() == {"matched": 2}
+
+    applied = web_client.post("/api/hosts/bulk", json=body).get_json()
+    assert applied["updated"] == 2
+    statuses = [in_memory_db.get(Host, host_id).status for host_id in host_ids]
+    assert statuses == ["approved", "approved", "pending"]
+    assert web_client.get("/api/bulk-changes").get_json()[0]["id"] == applied["change_id"]
+
+    undo = web_client.post(f"/api/bulk-changes/{applied['change_id']}/undo")
+    assert undo.get_json() == {"restored": 2}
+    statuses = [in_memory_db.get(Host, host_id).status for host_id in host_ids]
+    assert statuses == ["pending", "pending", "pending"]
+    repeat = web_client.post(f"/api/bulk-changes/{applied['change_id']}/undo")
+    assert repeat.status_code == 409
+    assert web_client.post("/api/bulk-changes/9999/undo").status_code == 404
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"filter": {}, "status": "approved", "host_type": "server"},
+        {"filter": {}},
+        {"filter": {"subnet": "bogus"}, "status": "approved"},
+        {"filter": {}, "status": "bogus"},
+        {"filter": "status=pending", "status": "approved"},
+    ],
+)
+def test_bulk_change_rejects_invalid_body(web_client, body):
+    """Bulk changes need one valid field and a valid filter."""
+    assert web_client.post("/api/hosts/bulk", json=body).status_code == 400
@@ -0,0 +1,100 @@
+"""Unit tests for filter-based bulk changes.
+
+Tests preview counts, applying changes in SQL and undoing them.
+"""
+
+import pytest
+
+from netbox_auto.bulk import (
+    BulkChangeError,
+    apply_bulk_change,
+    preview_bulk_change,
+    undo_bulk_change,
+)
+from netbox_auto.models import BulkChangeHost, Host, HostSource, HostStatus, HostType
+from netbox_auto.query import HostFilter
+
+PENDING_DHCP = HostFilter(status=HostStatus.PENDING.value, source=HostSource.DHCP.value)
+
+
+@pytest.fixture
+def host_ids(in_memory_db):
+    """IDs of hosts: two pending DHCP, one approved DHCP, one pending scan."""
+    hosts = [
+        Host(mac="aa:00:00:00:00:01", source="dhcp", status="pending", ip_addresses=["10.20.0.1"]),
+        Host(mac="aa:00:00:00:00:02", source="dhcp", status="pending", ip_addresses=["10.30.0.2"]),
+        Host(mac="aa:00:00:00:00:03", source="dhcp", status="approved"),
+        Host(mac="aa:00:00:00:00:04", source="scan", status="pending"),
+    ]
+    in_memory_db.add_all(hosts)
+    in_memory_db.commit()
+    return [host.id for host in hosts]
+
+
+def _statuses(session, host_ids):
+    return [session.get(Host, host_id).status for host_id in host_ids]
+
+
+def test_preview_counts_hosts_that_would_change(in_memory_db, host_ids):
+    """Preview counts matching hosts not already set to the value."""
+    assert preview_bulk_change(in_memory_db, PENDING_DHCP, "status", "approved") == 2
+    assert preview_bulk_change(in_memory_db, HostFilter(source="dhcp"), "status", "approved") == 2
+    assert preview_bulk_change(in_memory_db, HostFilter(), "host_type", "server") == 4
+
+
+def test_apply_updates_matching_hosts_and_records_previous(in_memory_db, host_ids):
+    """Applying a change updates matching hosts and records their old values."""
+    change = apply_bulk_change(in_memory_db, PENDING_DHCP, "status", "approved")
+    in_memory_db.commit()
+
+    assert change.host_count == 2
+    assert change.filter == {"status": "pending", "source": "dhcp"}
+    assert _statuses(in_memory_db, host_ids) == ["approved", "approved", "approved", "pending"]
+    recorded = in_memory_db.query(BulkChangeHost).filter_by(change_id=change.id).all()
+    assert {(row.host_id, row.previous) for row in recorded} == {
+        (host_ids[0], "pending"),
+        (host_ids[1], "pending"),
+    }
+
+
+def test_apply_with_subnet_filter(in_memory_db, host_ids):
+    """Subnet filters select hosts for bulk changes like for listings."""
+    host_filter = HostFilter(subnet="10.20.0.0/16")
+
+    change = apply_bulk_change(in_memory_db, host_filter, "host_type", HostType.SERVER.value)
+
+    assert change.host_count == 1
+    assert in_memory_db.get(Host, host_ids[0]).host_type == HostType.SERVER.value
+
+
+def test_undo_restores_previous_values(in_memory_db, host_ids):
+    """Undo restores the recorded values, skipping hosts changed again since."""
+    change = apply_bulk_change(in_memory_db, HostFilter(source="dhcp"), "status", "rejected")
+    in_memory_db.get(Host, host_ids[1]).status = HostStatus.APPROVED.value
+    in_memory_db.commit()
+
+    restored = undo_bulk_change(in_memory_db, change.id)
+
+    assert restored == 2
+    assert _statuses(in_memory_db, host_ids) == ["pending", "approved", "approved", "pending"]
+    assert change.undone_at is not None
+
+
+def test_undo_twice_or_unknown_change_fails(in_memory_db, host_ids):
+    """A change can only be undone once, and must exist."""
+    change = apply_bulk_change(in_memory_db, PENDING_DHCP, "status", "approved")
+    undo_bulk_change(in_memory_db, change.id)
+
+    with pytest.raises(BulkChangeError):
+        undo_bulk_change(in_memory_db, change.id)
+    with pytest.raises(BulkChangeError):
+        undo_bulk_change(in_memory_db, 9999)
+
+
+@pytest.mark.parametrize("field, value", [("hostname", "x"), ("status", "bogus")])
+def test_invalid_field_or_value_rejected(in_memory_db, field, value):
+    """Only status and type can be bulk changed, to valid values."""
+    with pytest.raises(BulkChangeError):
+        preview_bulk_change(in_memory_db, HostFilter(), field, value)
+    with pytest.raises(BulkChangeError):
+        apply_bulk_change(in_memory_db, HostFilter(), field, value)
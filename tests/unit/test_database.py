@@ -0,0 +1,218 @@
+"""Unit tests for database initialization.
+
+Tests upgrading databases created by earlier versions.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+from sqlalchemy import create_engine, func, inspect, select
+from sqlalchemy.exc import OperationalError
+
+import netbox_auto.database as db_module
+from netbox_auto.config import Config, DatabaseConfig
+from netbox_auto.discovery import _merge_and_persist
+from netbox_auto.models import DiscoveryRun, Host
+
+
+def test_init_db_adds_push_state_columns(tmp_path, mocker):
+    """A host table from an older release gains the push state columns."""
+    db_path = tmp_path / "old.db"
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            "CREATE TABLE host (id INTEGER PRIMARY KEY, mac VARCHAR(17) NOT NULL, "
+            "hostname VARCHAR(255), status VARCHAR(20))"
+        )
+        connection.execute("INSERT INTO host (mac, status) VALUES ('aa:bb:cc:dd:ee:ff', 'pushed')")
+
+    mocker.patch(
+        "netbox_auto.database.get_config",
+        return_value=Config(database=DatabaseConfig(path=str(db_path))),
+    )
+    mocker.patch.object(db_module, "_engine", None)
+
+    db_module.init_db()
+
+    engine = db_module.get_engine()
+    columns = {column["name"] for column in inspect(engine).get_columns("host")}
+    assert {"push_fingerprint", "netbox_objects", "drifted"} <= columns
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT drifted FROM host").scalar() == 0
+    engine.dispose()
+
+
+def test_init_db_adds_dns_push_records_column(tmp_path, mocker):
+    """A dns_push_state table from an earlier build gains the records column."""
+    db_path = tmp_path / "old.db"
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            "CREATE TABLE dns_push_state (id INTEGER PRIMARY KEY, server VARCHAR(255), "
+            "config_path VARCHAR(255), digest VARCHAR(64), pushed_at DATETIME)"
+        )
+
+    mocker.patch(
+        "netbox_auto.database.get_config",
+        return_value=Config(database=DatabaseConfig(path=str(db_path))),
+    )
+    mocker.patch.object(db_module, "_engine", None)
+
+    db_module.init_db()
+
+    engine = db_module.get_engine()
+    columns = {column["name"] for column in inspect(engine).get_columns("dns_push_state")}
+    assert "records" in columns
+    engine.dispose()
+
+
+def test_init_db_adds_host_sort_indexes(tmp_path, mocker):
+    """An existing host table gains the indexes used to sort the hosts view."""
+    db_path = tmp_path / "old.db"
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            "CREATE TABLE host (id INTEGER PRIMARY KEY, mac VARCHAR(17) NOT NULL, "
+            "hostname VARCHAR(255), status VARCHAR(20), last_seen DATETIME)"
+        )
+
+    mocker.patch(
+        "netbox_auto.database.get_config",
+        return_value=Config(database=DatabaseConfig(path=str(db_path))),
+    )
+    mocker.patch.object(db_module, "_engine", None)
+
+    db_module.init_db()
+
+    engine = db_module.get_engine()
+    indexes = {index["name"] for index in inspect(engine).get_indexes("host")}
+    assert {"ix_host_hostname", "ix_host_status", "ix_host_last_seen"} <= indexes
+    # Columns the old table lacks are not indexed
+    assert "ix_host_source" not in indexes
+    engine.dispose()
+
+
+def test_forked_child_drops_inherited_connections(mocker):
+    """After fork the engine discards the parent's pool without closing it."""
+    engine = mocker.MagicMock()
+    mocker.patch.object(db_module, "_engine", engine)
+
+    db_module._reset_engine_after_fork()
+
+    engine.dispose.assert_called_once_with(close=False)
+
+
+def _use_database(mocker, database_config):
+    config = Config(database=database_config)
+    mocker.patch("netbox_auto.database.get_config", return_value=config)
+    mocker.patch("netbox_auto.discovery.get_config", return_value=config)
+    mocker.patch.object(db_module, "_engine", None)
+    mocker.patch.object(db_module, "_session_factory", None)
+
+
+def test_engine_tunes_sqlite_connections(tmp_path, mocker):
+    """Every connection gets the configured journal mode and PRAGMAs."""
+    _use_database(
+        mocker, DatabaseConfig(path=str(tmp_path / "tuned.db"), cache_size=2048, busy_timeout=2.5)
+    )
+
+    engine = db_module.get_engine()
+
+    with engine.connect() as connection:
+        pragma = connection.exec_driver_sql
+        assert pragma("PRAGMA journal_mode").scalar() == "wal"
+        assert pragma("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert pragma("PRAGMA cache_size").scalar() == -2048
+        assert pragma("PRAGMA busy_timeout").scalar() == 2500
+        assert pragma("PRAGMA foreign_keys").scalar() == 1
+    engine.dispose()
+
+
+def test_sql_functions_registered_on_app_engine_only(tmp_path, mocker):
+    """ip_in_network is available on the app's engine, not on unrelated engines."""
+    _use_database(mocker, DatabaseConfig(path=str(tmp_path / "funcs.db")))
+
+    engine = db_module.get_engine()
+
+    query = "SELECT ip_in_network('10.0.0.5/24', '10.0.0.0/24')"
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql(query).scalar() == 1
+    engine.dispose()
+    other = create_engine("sqlite:///:memory:")
+    with other.connect() as connection, pytest.raises(OperationalError):
+        connection.exec_driver_sql(query)
+    other.dispose()
+
+
+def test_engine_honours_rollback_journal(tmp_path, mocker):
+    """The journal mode and foreign key enforcement can be configured."""
+    _use_database(
+        mocker,
+        DatabaseConfig(path=str(tmp_path / "plain.db"), journal_mode="delete", foreign_keys=False),
+    )
+
+    engine = db_module.get_engine()
+
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "delete"
+        assert connection.exec_driver_sql("PRAGMA foreign_keys").scalar() == 0
+    engine.dispose()
+
+
+def test_discovery_writes_do_not_block_reads(tmp_path, mocker, discovered_host_factory):
+    """UI reads keep succeeding while discovery commits batches of hosts."""
+    _use_database(mocker, DatabaseConfig(path=str(tmp_path / "busy.db"), busy_timeout=5.0))
+    db_module.init_db()
+    rounds, batch = 5, 100
+    writing = threading.Event()
+    writing.set()
+    errors: list[Exception] = []
+    counts: list[int] = []
+
+    def discover() -> None:
+        try:
+            for round_number in range(rounds):
+                session = db_module.get_session()
+                try:
+                    run = DiscoveryRun()
+                    session.add(run)
+                    session.flush()
+                    hosts = [
+                        discovered_host_factory(
+                            mac=f"aa:bb:cc:{round_number:02x}:{i >> 8:02x}:{i & 0xFF:02x}",
+                            hostname=f"host-{round_number}-{i}",
+                        )
+                        for i in range(batch)
+                    ]
+                    _merge_and_persist(session, hosts, {}, run)
+                finally:
+                    session.close()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            writing.clear()
+
+    def browse() -> None:
+        while writing.is_set():
+            session = db_module.get_session()
+            try:
+                counts.append(session.execute(select(func.count(Host.id))).scalar_one())
+                session.query(Host).order_by(Host.last_seen.desc()).limit(50).all()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                session.close()
+
+    readers = [threading.Thread(target=browse) for _ in range(3)]
+    writer = threading.Thread(target=discover)
+    for thread in [*readers, writer]:
+        thread.start()
+    for thread in [writer, *readers]:
+        thread.join()
+
+    assert errors == []
+    assert counts
+    # Readers only ever see whole committed batches
+    assert all(count % batch == 0 for count in counts)
+    session = db_module.get_session()
+    assert session.query(Host).count() == rounds * batch
+    session.close()
+    db_module.get_engine().dispose()
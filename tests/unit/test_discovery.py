@@ -4,8 +4,9 @@ Tests MAC correlation logic and source priority for hostname selection.
 Covers requirements UNIT-01 and UNIT-02.
 """
 
-from netbox_auto.discovery import _pick_hostname, _pick_primary_source
-from netbox_auto.models import HostSource
+from netbox_auto.config import Config
+from netbox_auto.discovery import _merge_and_persist, _pick_hostname, _pick_primary_source
+from netbox_auto.models import DiscoveryRun, EventLog, Host, HostSource, HostStatus
 
 
 class TestMACCorrelation:
@@ -159,3 +160,85 @@ class TestSourcePriority:
         # MANUAL is not in the priority list, so returns the first host's source
         result = _pick_primary_source([manual_host])
         assert result == HostSource.MANUAL
+
+
+class TestDriftDetection:
+    """Tests for flagging pushed hosts whose pushed fields changed."""
+
+    def _pushed_host(self, session) -> Host:
+        host = Host(
+            mac="aa:bb:cc:dd:ee:ff",
+            hostname="web1",
+            ip_addresses=["10.0.0.1"],
+            status=HostStatus.PUSHED.value,
+        )
+        host.push_fingerprint = host.fingerprint()
+        session.add(host)
+        session.flush()
+        return host
+
+    def test_changed_ip_marks_pushed_host_drifted(
+        self, in_memory_db, discovered_host_factory, mocker
+    ):
+        """A pushed host rediscovered with a new IP is flagged as drifted."""
+        mocker.patch("netbox_auto.discovery.get_config", return_value=Config())
+        host = self._pushed_host(in_memory_db)
+        run = DiscoveryRun()
+        in_memory_db.add(run)
+        in_memory_db.flush()
+
+        _merge_and_persist(
+            in_memory_db,
+            [discovered_host_factory(hostname="web1", ip_addresses=["10.0.0.2"])],
+            {},
+            run,
+        )
+
+        assert host.drifted is True
+
+    def test_unchanged_host_not_drifted(self, in_memory_db, discovered_host_factory, mocker):
+        """Rediscovering a pushed host with the same fields leaves it clean."""
+        mocker.patch("netbox_auto.discovery.get_config", return_value=Config())
+        host = self._pushed_host(in_memory_db)
+        run = DiscoveryRun()
+        in_memory_db.add(run)
+        in_memory_db.flush()
+
+        _merge_and_persist(
+            in_memory_db,
+            [discovered_host_factory(hostname="web1", ip_addresses=["10.0.0.1"])],
+            {},
+            run,
+        )
+
+        assert host.drifted is False
+
+
+class TestHostEvents:
+    """Tests for the host events recorded by discovery."""
+
+    def test_persist_records_host_events(self, in_memory_db, discovered_host_factory, mocker):
+        """Each created or updated host is recorded as a host event."""
+        mocker.patch("netbox_auto.discovery.get_config", return_value=Config())
+        in_memory_db.add(Host(mac="aa:bb:cc:dd:ee:ff", hostname="web1"))
+        in_memory_db.flush()
+        run = DiscoveryRun()
+        in_memory_db.add(run)
+        in_memory_db.flush()
+
+        _merge_and_persist(
+            in_memory_db,
+            [
+                discovered_host_factory(hostname="web1", ip_addresses=["10.0.0.1"]),
+                discovered_host_factory(mac="aa:bb:cc:dd:ee:01", hostname="new"),
+            ],
+            {},
+            run,
+        )
+
+        events = in_memory_db.query(EventLog).order_by(EventLog.id).all()
+        assert [(e.kind, e.data["action"], e.data["host"]["mac"]) for e in events] == [
+            ("host", "updated", "aa:bb:cc:dd:ee:ff"),
+            ("host", "created", "aa:bb:cc:dd:ee:01"),
+        ]
+        assert all(e.data["host"]["last_seen"] for e in events)
@@ -0,0 +1,128 @@
+"""Unit tests for live web UI events.
+
+Tests the event bus buffer, event_log tailing and the SSE stream.
+"""
+
+import pytest
+
+from netbox_auto.config import WebConfig
+from netbox_auto.events import HOST_EVENT_LIMIT, EventBus, get_event_bus, record_event
+from netbox_auto.models import EventLog, Host
+
+
+@pytest.fixture
+def db_bus(in_memory_db, mocker):
+    """Patch the bus's sessions to use the in-memory database."""
+    mocker.patch("netbox_auto.events.get_session", return_value=in_memory_db)
+
+
+def test_wait_returns_events_after_id():
+    """Streams receive the events published after the ID they last saw."""
+    bus = EventBus(shared=False, poll_interval=1.0)
+    for i in range(3):
+        bus.publish("host", {"n": i})
+
+    events = bus.wait(1, timeout=0)
+
+    assert [(event.id, event.data["n"]) for event in events] == [(2, 1), (3, 2)]
+    assert bus.wait(3, timeout=0.01) == []
+
+
+def test_wait_resets_streams_that_missed_events():
+    """Streams behind the buffer, or from before a restart, get a reset event."""
+    bus = EventBus(shared=False, poll_interval=1.0, buffer_size=2)
+    for i in range(5):
+        bus.publish("host", {"n": i})
+
+    assert [event.kind for event in bus.wait(1, timeout=0)] == ["reset"]
+    assert [event.kind for event in bus.wait(3, timeout=0)] == ["host", "host"]
+    assert bus.wait(99, timeout=0)[0].kind == "reset"
+
+
+def test_poll_delivers_recorded_events(in_memory_db, db_bus):
+    """Events recorded by another process are picked up from event_log."""
+    bus = EventBus(shared=False, poll_interval=1.0)
+    record_event(in_memory_db, "discovery", {"stage": "old"})
+    in_memory_db.commit()
+    bus.start()
+    bus.stop()
+
+    record_event(in_memory_db, "discovery", {"stage": "started"})
+    in_memory_db.commit()
+
+    assert bus.poll() == 1
+    assert [event.data["stage"] for event in bus.wait(0, timeout=0)] == ["started"]
+
+
+def test_shared_bus_publishes_through_database(in_memory_db, db_bus):
+    """A shared bus writes events to event_log and uses the row IDs."""
+    bus = EventBus(shared=True, poll_interval=1.0)
+
+    bus.publish_many("host", [{"n": 1}, {"n": 2}])
+
+    rows = in_memory_db.query(EventLog).order_by(EventLog.id).all()
+    assert [row.data["n"] for row in rows] == [1, 2]
+    assert [event.id for event in bus.wait(0, timeout=0)] == [row.id for row in rows]
+
+
+def test_event_stream(web_client, mocker):
+    """The SSE endpoint streams events after Last-Event-ID, then closes."""
+    web_client.application.config["WEB_CONFIG"] = WebConfig(event_stream_timeout=0.05)
+    bus = EventBus(shared=False, poll_interval=1.0)
+    bus.publish("discovery", {"stage": "started"})
+    bus.publish("host", {"action": "created"})
+    mocker.patch("netbox_auto.web.api.get_event_bus", return_value=bus)
+
+    response = web_client.get("/api/events", headers={"Last-Event-ID": "1"})
+
+    body = response.get_data(as_text=True)
+    assert response.mimetype == "text/event-stream"
+    assert 'id: 2\nevent: host\ndata: {"action":"created"}\n\n' in body
+    assert "event: discovery" not in body
+
+
+def test_event_stream_without_loaded_config(web_client, mocker):
+    """Apps created without a loaded config serve events with default settings."""
+    mocker.patch("netbox_auto.config._config", None)
+    mocker.patch("netbox_auto.events._bus", None)
+    mocker.patch.object(EventBus, "start")
+    web_client.application.config["WEB_CONFIG"] = WebConfig(event_stream_timeout=0.05)
+
+    response = web_client.get("/api/events")
+
+    assert response.status_code == 200
+    assert get_event_bus().shared is False
+
+
+def test_host_patch_publishes_event(web_client, in_memory_db, mocker):
+    """Changing a host through the API publishes a host event."""
+    host = Host(mac="aa:bb:cc:dd:ee:ff")
+    in_memory_db.add(host)
+    in_memory_db.commit()
+    host_id = host.id
+
+    web_client.patch(f"/api/hosts/{host_id}", json={"status": "approved"})
+
+    events = get_event_bus().wait(0, timeout=0)
+    assert [(e.kind, e.data["host"]["id"], e.data["host"]["status"]) for e in events] == [
+        ("host", host_id, "approved")
+    ]
+
+
+def test_large_bulk_change_publishes_one_event(web_client, in_memory_db):
+    """A bulk change and its undo each publish one summary, however many hosts change."""
+    count = HOST_EVENT_LIMIT + 50
+    in_memory_db.add_all(
+        [Host(mac=f"aa:bb:cc:dd:{i >> 8:02x}:{i & 0xFF:02x}") for i in range(count)]
+    )
+    in_memory_db.commit()
+
+    change = web_client.post("/api/hosts/bulk", json={"filter": {}, "status": "approved"})
+    change_id = change.get_json()["change_id"]
+    web_client.post(f"/api/bulk-changes/{change_id}/undo")
+
+    events = get_event_bus().wait(0, timeout=0)
+    assert [(e.kind, e.data) for e in events] == [
+        ("hosts", {"action": "updated", "count": count, "change_id": change_id}),
+        ("hosts", {"action": "updated", "count": count, "change_id": change_id}),
+    ]
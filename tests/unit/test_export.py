@@ -0,0 +1,98 @@
+"""Unit tests for host and reconcile exports.
+
+Tests CSV and JSONL output, filtering and chunked streaming.
+"""
+
+import csv
+import io
+import json
+from datetime import UTC, datetime
+
+import pytest
+
+from netbox_auto.export import ExportError, export_hosts, export_reconcile
+from netbox_auto.models import Host, HostStatus, ReconcileSnapshot, ReconcileStatus
+from netbox_auto.query import HostFilter
+
+
+@pytest.fixture
+def hosts(in_memory_db):
+    hosts = [
+        Host(mac="aa:00:00:00:00:01", hostname="web-1", ip_addresses=["10.0.0.1", "10.0.0.2"]),
+        Host(mac="aa:00:00:00:00:02", ip_addresses={"eth0": "10.0.1.5"}),
+        Host(mac="aa:00:00:00:00:03", hostname="db", status=HostStatus.APPROVED.value),
+    ]
+    in_memory_db.add_all(hosts)
+    in_memory_db.commit()
+    return hosts
+
+
+def test_export_hosts_csv(in_memory_db, hosts):
+    """CSV export has a header and one row per host, IPs space-separated."""
+    output = "".join(export_hosts(in_memory_db))
+
+    rows = list(csv.DictReader(io.StringIO(output)))
+    assert [row["mac"] for row in rows] == [host.mac for host in hosts]
+    assert rows[0]["ip_addresses"] == "10.0.0.1 10.0.0.2"
+    assert rows[1]["ip_addresses"] == "10.0.1.5"
+    assert rows[1]["hostname"] == ""
+    assert rows[0]["last_seen"]
+
+
+def test_export_hosts_jsonl_with_filter(in_memory_db, hosts):
+    """JSONL export writes one object per matching host."""
+    output = "".join(
+        export_hosts(in_memory_db, HostFilter(status=HostStatus.PENDING.value), "jsonl")
+    )
+
+    records = [json.loads(line) for line in output.splitlines()]
+    assert [record["mac"] for record in records] == ["aa:00:00:00:00:01", "aa:00:00:00:00:02"]
+    assert records[0]["ip_addresses"] == ["10.0.0.1", "10.0.0.2"]
+
+
+def test_export_hosts_streams_in_chunks(in_memory_db, hosts, mocker):
+    """Rows are fetched and serialized one cursor chunk at a time."""
+    mocker.patch("netbox_auto.export.EXPORT_CHUNK", 2)
+
+    chunks = list(export_hosts(in_memory_db))
+
+    # Header, then chunks of two rows and one row
+    assert len(chunks) == 3
+    assert chunks[0].startswith("id,mac,hostname")
+    assert chunks[1].count("\n") == 2
+
+
+def test_export_rejects_unknown_format(in_memory_db):
+    """Unknown formats raise before any output is produced."""
+    with pytest.raises(ExportError):
+        export_hosts(in_memory_db, fmt="xml")
+
+
+def test_export_reconcile(in_memory_db, hosts):
+    """Reconcile export lists new hosts, matches and stale NetBox items."""
+    snapshot = ReconcileSnapshot(
+        status=ReconcileStatus.COMPLETED.value,
+        completed_at=datetime.now(UTC),
+        result={
+            "new": [hosts[0].id],
+            "matched": [[hosts[2].id, {"id": 4, "name": "db", "_type": "device"}]],
+            "stale": [{"id": 7, "name": "gone", "_type": "vm", "primary_ip": "10.9.9.9"}],
+        },
+    )
+    in_memory_db.add(snapshot)
+    in_memory_db.commit()
+
+    records = [
+        json.loads(line)
+        for line in "".join(export_reconcile(in_memory_db, snapshot, fmt="jsonl")).splitlines()
+    ]
+
+    assert [(r["section"], r["mac"], r["netbox_name"]) for r in records] == [
+        ("new", "aa:00:00:00:00:01", None),
+        ("matched", "aa:00:00:00:00:03", "db"),
+        ("stale", None, "gone"),
+    ]
+    stale_only = "".join(export_reconcile(in_memory_db, snapshot, section="stale"))
+    assert stale_only.count("\n") == 2
+    with pytest.raises(ExportError):
+        export_reconcile(in_memory_db, snapshot, section="bogus")
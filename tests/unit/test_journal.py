@@ -0,0 +1,241 @@
+"""Unit tests for the resumable push journal.
+
+Tests step journaling during a push and resumption after an interruption.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from netbox_auto.config import Config, NetBoxConfig
+from netbox_auto.journal import PushJournal, StepRecord
+from netbox_auto.models import Host, HostStatus, PushJournalEntry, PushRunStatus, StepStatus
+from netbox_auto.netbox import BulkResult, NetBoxClient
+from netbox_auto.push import PushResult, apply_push_plan, plan_push
+
+
+@pytest.fixture
+def push_config(mocker):
+    """Patch push config with device reference names."""
+    config = Config(
+        netbox=NetBoxConfig(
+            url="http://netbox.local",
+            token="test-token",
+            site="main",
+            device_role="server",
+            device_type="generic",
+        )
+    )
+    mocker.patch("netbox_auto.push.get_config", return_value=config)
+    return config
+
+
+@pytest.fixture
+def netbox_client():
+    """NetBox client mock with an empty inventory that creates everything."""
+    client = MagicMock(spec=NetBoxClient)
+    client.get_inventory.return_value = ([], [])
+    client.lookup_id.side_effect = lambda kind, name: {
+        "site": 1,
+        "device_role": 2,
+        "device_type": 3,
+        "device": 50,
+    }.get(kind)
+    client.get_interface_id.return_value = 500
+    client.find_interface.return_value = None
+    client.find_ip.return_value = None
+    client.get_primary_ips.return_value = {}
+    client.get_interface_cable.return_value = None
+
+    def _created(start: int):
+        def _bulk(items):
+            return BulkResult(ids={i: start + i for i in range(len(items))})
+
+        return _bulk
+
+    client.create_devices.side_effect = _created(100)
+    client.create_interfaces.side_effect = _created(300)
+    client.assign_ips.side_effect = _created(600)
+    client.update_devices.side_effect = lambda items: BulkResult(
+        ids={i: item["id"] for i, item in enumerate(items)}
+    )
+    client.create_cables.side_effect = _created(700)
+    return client
+
+
+@pytest.fixture
+def host(in_memory_db) -> Host:
+    """An approved device cabled to a switch port."""
+    host = Host(
+        mac="aa:bb:cc:dd:ee:01",
+        hostname="web1",
+        ip_addresses=["10.0.0.1"],
+        switch_port="sw1:ether1",
+        status=HostStatus.APPROVED.value,
+    )
+    in_memory_db.add(host)
+    in_memory_db.flush()
+    return host
+
+
+def _steps(session) -> dict[str, tuple[str, int | None]]:
+    return {
+        entry.step: (entry.status, entry.netbox_id) for entry in session.query(PushJournalEntry)
+    }
+
+
+def test_push_journals_every_step(in_memory_db, push_config, netbox_client, host):
+    """Each step is journaled as done with the ID NetBox returned."""
+    plan = plan_push([host], netbox_client)
+    journal = PushJournal.start(in_memory_db, plan)
+
+    apply_push_plan(plan, [host], netbox_client, PushResult(), False, journal)
+
+    assert _steps(in_memory_db) == {
+        "create": ("done", 100),
+        "interface": ("done", 300),
+        "ip:10.0.0.1": ("done", 600),
+        "primary_ip": ("done", 100),
+        "cable": ("done", 700),
+    }
+    assert host.status == HostStatus.PUSHED.value
+
+
+def test_resume_skips_completed_steps(in_memory_db, push_config, netbox_client, host):
+    """A resumed push continues after the last completed step."""
+    plan = plan_push([host], netbox_client)
+    journal = PushJournal.start(in_memory_db, plan)
+    journal.record(
+        [
+            StepRecord(host.id, "create", StepStatus.DONE, netbox_id=100),
+            StepRecord(host.id, "interface", StepStatus.DONE, netbox_id=300),
+        ]
+    )
+    journal.commit()
+
+    resumed = PushJournal.latest_incomplete(in_memory_db)
+    assert resumed is not None
+    result = PushResult()
+    apply_push_plan(resumed.plan, [host], netbox_client, result, False, resumed)
+
+    netbox_client.create_devices.assert_not_called()
+    netbox_client.create_interfaces.assert_not_called()
+    assert netbox_client.assign_ips.call_args.args[0][0]["interface_id"] == 300
+    netbox_client.create_cables.assert_called_once()
+    assert result.errors == []
+
+
+def test_in_doubt_create_resolved_by_lookup(in_memory_db, push_config, netbox_client, host):
+    """A create whose outcome was lost is found by name instead of created again."""
+    plan = plan_push([host], netbox_client)
+    journal = PushJournal.start(in_memory_db, plan)
+    journal.record([StepRecord(host.id, "create", StepStatus.PENDING)])
+    journal.commit()
+
+    apply_push_plan(plan, [host], netbox_client, PushResult(), False, journal)
+
+    netbox_client.lookup_id.assert_any_call("device", "web1")
+    netbox_client.create_devices.assert_not_called()
+    assert host.netbox_id == 50
+    assert netbox_client.create_interfaces.call_args.args[0] == [{"device_id": 50, "name": "eth0"}]
+
+
+def test_in_doubt_interface_resolved_by_lookup(in_memory_db, push_config, netbox_client, host):
+    """An interface NetBox already created is found on the device, not created again."""
+    netbox_client.find_interface.return_value = 301
+    plan = plan_push([host], netbox_client)
+    journal = PushJournal.start(in_memory_db, plan)
+    journal.record(
+        [
+            StepRecord(host.id, "create", StepStatus.DONE, netbox_id=100),
+            StepRecord(host.id, "interface", StepStatus.PENDING),
+        ]
+    )
+    journal.commit()
+
+    result = PushResult()
+    apply_push_plan(plan, [host], netbox_client, result, False, journal)
+
+    netbox_client.find_interface.assert_called_once_with("device", 100, "eth0")
+    netbox_client.create_interfaces.assert_not_called()
+    assert netbox_client.assign_ips.call_args.args[0][0]["interface_id"] == 301
+    assert _steps(in_memory_db)["interface"] == ("done", 301)
+    assert result.errors == []
+
+
+def test_in_doubt_ip_resolved_by_lookup(in_memory_db, push_config, netbox_client, host):
+    """An IP NetBox already assigned is not created again; the push carries on."""
+    netbox_client.find_ip.return_value = 601
+    plan = plan_push([host], netbox_client)
+    journal = PushJournal.start(in_memory_db, plan)
+    journal.record(
+        [
+            StepRecord(host.id, "create", StepStatus.DONE, netbox_id=100),
+            StepRecord(host.id, "interface", StepStatus.DONE, netbox_id=300),
+            StepRecord(host.id, "ip:10.0.0.1", StepStatus.PENDING),
+        ]
+    )
+    journal.commit()
+
+    result = PushResult()
+    apply_push_plan(plan, [host], netbox_client, result, False, journal)
+
+    netbox_client.find_ip.assert_called_once_with("10.0.0.1", 300, "dcim.interface")
+    netbox_client.assign_ips.assert_not_called()
+    assert netbox_client.update_devices.call_args.args[0] == [{"id": 100, "primary_ip4": 601}]
+    assert _steps(in_memory_db)["ip:10.0.0.1"] == ("done", 601)
+    assert result.errors == []
+
+
+def test_missing_in_doubt_ip_is_retried(in_memory_db, push_config, netbox_client, host):
+    """An in-doubt IP that NetBox does not hold is assigned again."""
+    plan = plan_push([host], netbox_client)
+    journal = PushJournal.start(in_memory_db, plan)
+    journal.record(
+        [
+            StepRecord(host.id, "create", StepStatus.DONE, netbox_id=100),
+            StepRecord(host.id, "interface", StepStatus.DONE, netbox_id=300),
+            StepRecord(host.id, "ip:10.0.0.1", StepStatus.PENDING),
+        ]
+    )
+    journal.commit()
+
+    apply_push_plan(plan, [host], netbox_client, PushResult(), False, journal)
+
+    netbox_client.assign_ips.assert_called_once()
+    assert _steps(in_memory_db)["ip:10.0.0.1"] == ("done", 600)
+
+
+def test_in_doubt_primary_ip_and_cable_resolved(in_memory_db, push_config, netbox_client, host):
+    """A primary IP already set and a cable already attached count as done."""
+    netbox_client.get_primary_ips.return_value = {"primary_ip4": 600}
+    netbox_client.get_interface_cable.return_value = 700
+    plan = plan_push([host], netbox_client)
+    journal = PushJournal.start(in_memory_db, plan)
+    journal.record(
+        [
+            StepRecord(host.id, "create", StepStatus.DONE, netbox_id=100),
+            StepRecord(host.id, "interface", StepStatus.DONE, netbox_id=300),
+            StepRecord(host.id, "ip:10.0.0.1", StepStatus.DONE, netbox_id=600),
+            StepRecord(host.id, "primary_ip", StepStatus.PENDING),
+            StepRecord(host.id, "cable", StepStatus.PENDING),
+        ]
+    )
+    journal.commit()
+
+    apply_push_plan(plan, [host], netbox_client, PushResult(), False, journal)
+
+    netbox_client.update_devices.assert_not_called()
+    netbox_client.create_cables.assert_not_called()
+    netbox_client.get_interface_cable.assert_called_once_with(300)
+    assert _steps(in_memory_db)["cable"] == ("done", 700)
+
+
+def test_latest_incomplete_ignores_completed_runs(in_memory_db, netbox_client, host):
+    """Only an unfinished latest run is resumable."""
+    journal = PushJournal.start(in_memory_db, plan_push([host], netbox_client))
+    assert PushJournal.latest_incomplete(in_memory_db) is not None
+
+    journal.finish(PushRunStatus.COMPLETED)
+
+    assert PushJournal.latest_incomplete(in_memory_db) is None
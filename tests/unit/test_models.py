@@ -153,3 +153,28 @@ class TestHostConstraints:
         assert "test-host" in repr_str
         assert "approved" in repr_str
         assert str(host.id) in repr_str
+
+
+class TestPushFingerprint:
+    """Tests for the host push fingerprint used for drift detection."""
+
+    def test_fingerprint_ignores_ip_order(self):
+        """IP order from discovery doesn't count as a change."""
+        a = Host(mac="aa:bb:cc:dd:ee:01", hostname="web1", ip_addresses=["10.0.0.1", "10.0.0.2"])
+        b = Host(mac="aa:bb:cc:dd:ee:01", hostname="web1", ip_addresses=["10.0.0.2", "10.0.0.1"])
+
+        assert a.fingerprint() == b.fingerprint()
+
+    def test_fingerprint_changes_with_pushed_fields(self):
+        """Hostname, IP and switch port changes all change the fingerprint."""
+        host = Host(mac="aa:bb:cc:dd:ee:01", hostname="web1", ip_addresses=["10.0.0.1"])
+        original = host.fingerprint()
+
+        for field, value in [
+            ("hostname", "web2"),
+            ("ip_addresses", ["10.0.0.9"]),
+            ("switch_port", "sw1:ether1"),
+        ]:
+            changed = Host(mac=host.mac, hostname="web1", ip_addresses=["10.0.0.1"])
+            setattr(changed, field, value)
+            assert changed.fingerprint() != original
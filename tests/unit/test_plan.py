@@ -0,0 +1,72 @@
+"""Unit tests for the push plan model.
+
+Tests plan serialization and validation of plan files.
+"""
+
+import json
+
+import pytest
+
+from netbox_auto.plan import HostChange, PlanAction, PlanError, PushPlan
+
+
+def _sample_plan() -> PushPlan:
+    return PushPlan(
+        changes=[
+            HostChange(
+                host_id=1,
+                mac="aa:bb:cc:dd:ee:01",
+                name="web1",
+                kind="device",
+                action=PlanAction.CREATE,
+                ip_addresses=["10.0.0.1"],
+                switch_port="sw1:ether1",
+            ),
+            HostChange(
+                host_id=2,
+                mac="aa:bb:cc:dd:ee:02",
+                name="web2",
+                kind="device",
+                action=PlanAction.UPDATE,
+                netbox_id=12,
+                changes={"name": ["old", "web2"]},
+            ),
+        ]
+    )
+
+
+def test_plan_round_trips_through_file(tmp_path):
+    """A saved plan loads back identical."""
+    plan = _sample_plan()
+    path = tmp_path / "plan.json"
+
+    plan.save(path)
+
+    assert PushPlan.load(path) == plan
+
+
+def test_plan_summary_counts_actions():
+    """Summary counts every action, including ones with no hosts."""
+    assert _sample_plan().summary() == {"create": 1, "update": 1, "noop": 0}
+
+
+def test_load_rejects_unknown_version(tmp_path):
+    """Plans from an incompatible version are refused."""
+    path = tmp_path / "plan.json"
+    path.write_text(json.dumps({"version": 99, "created_at": "", "changes": []}))
+
+    with pytest.raises(PlanError, match="Unsupported plan version"):
+        PushPlan.load(path)
+
+
+def test_load_rejects_malformed_file(tmp_path):
+    """Unreadable or malformed files raise PlanError."""
+    path = tmp_path / "plan.json"
+    path.write_text("not json")
+
+    with pytest.raises(PlanError, match="Cannot read plan file"):
+        PushPlan.load(path)
+
+    path.write_text(json.dumps({"version": 1, "created_at": "now", "changes": []}))
+    with pytest.raises(PlanError, match="Malformed plan"):
+        PushPlan.load(path)
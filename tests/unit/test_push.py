@@ -0,0 +1,495 @@
+"""Unit tests for push orchestration.
+
+Tests the batched NetBox push path with a mocked NetBox client.
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from netbox_auto.config import Config, NetBoxConfig
+from netbox_auto.dns import DnsPushResult
+from netbox_auto.models import Host, HostSource, HostStatus
+from netbox_auto.netbox import BulkResult, NetBoxClient
+from netbox_auto.plan import PlanAction, PushPlan
+from netbox_auto.push import (
+    PushResult,
+    _push_hosts_to_netbox,
+    _sync_drifted_hosts,
+    apply_push_plan,
+    plan_push,
+    push_approved_hosts,
+)
+
+
+@pytest.fixture
+def push_config(mocker):
+    """Patch push config with reference names for devices and VMs."""
+    config = Config(
+        netbox=NetBoxConfig(
+            url="http://netbox.local",
+            token="test-token",
+            site="main",
+            device_role="server",
+            device_type="generic",
+            cluster="pve",
+        )
+    )
+    mocker.patch("netbox_auto.push.get_config", return_value=config)
+    return config
+
+
+@pytest.fixture
+def netbox_client():
+    """NetBox client mock that creates every object it is given."""
+    client = MagicMock(spec=NetBoxClient)
+    client.lookup_id.side_effect = lambda kind, name: {
+        "site": 1,
+        "device_role": 2,
+        "device_type": 3,
+        "cluster": 4,
+        "device": 50,
+    }[kind]
+    client.get_interface_id.return_value = 500
+    client.get_inventory.return_value = ([], [])
+
+    def _created(start: int):
+        def _bulk(items):
+            return BulkResult(ids={i: start + i for i in range(len(items))})
+
+        return _bulk
+
+    client.create_devices.side_effect = _created(100)
+    client.create_vms.side_effect = _created(200)
+    client.create_interfaces.side_effect = _created(300)
+    client.create_vm_interfaces.side_effect = _created(400)
+    client.assign_ips.side_effect = _created(600)
+    client.update_devices.side_effect = _created(0)
+    client.update_vms.side_effect = _created(0)
+    client.create_cables.side_effect = _created(700)
+    return client
+
+
+def _use_batches(push_config, batch_size: int, push_workers: int) -> None:
+    assert push_config.netbox is not None
+    push_config.netbox.batch_size = batch_size
+    push_config.netbox.push_workers = push_workers
+
+
+def _add_hosts(session, *hosts: Host) -> list[Host]:
+    session.add_all(hosts)
+    session.flush()
+    return list(hosts)
+
+
+def test_devices_created_in_one_bulk_call(in_memory_db, push_config, netbox_client):
+    """All devices go out in one create_devices call and are marked pushed."""
+    hosts = _add_hosts(
+        in_memory_db,
+        Host(mac="aa:bb:cc:dd:ee:01", hostname="web1", ip_addresses=["10.0.0.1"]),
+        Host(mac="aa:bb:cc:dd:ee:02", hostname="web2", ip_addresses=["10.0.0.2"]),
+    )
+    result = PushResult()
+
+    _push_hosts_to_netbox(hosts, netbox_client, result, dry_run=False)
+
+    netbox_client.create_devices.assert_called_once()
+    assert [d["name"] for d in netbox_client.create_devices.call_args.args[0]] == [
+        "web1",
+        "web2",
+    ]
+    assert [h.netbox_id for h in hosts] == [100, 101]
+    assert all(h.status == HostStatus.PUSHED.value for h in hosts)
+    assert result.netbox_created == 2
+    assert result.errors == []
+
+
+def test_ips_assigned_and_primary_set(in_memory_db, push_config, netbox_client):
+    """Each IP is assigned to the new interface and the first per family is primary."""
+    (host,) = _add_hosts(
+        in_memory_db,
+        Host(
+            mac="aa:bb:cc:dd:ee:01",
+            hostname="dual",
+            ip_addresses=["10.0.0.1", "10.0.0.2", "fd00::1"],
+        ),
+    )
+
+    _push_hosts_to_netbox([host], netbox_client, PushResult(), dry_run=False)
+
+    interfaces = netbox_client.create_interfaces.call_args.args[0]
+    assert interfaces == [{"device_id": 100, "name": "eth0"}]
+    ips = netbox_client.assign_ips.call_args.args[0]
+    assert [ip["ip_address"] for ip in ips] == ["10.0.0.1", "10.0.0.2", "fd00::1"]
+    assert {ip["interface_id"] for ip in ips} == {300}
+    netbox_client.update_devices.assert_called_once_with(
+        [{"id": 100, "primary_ip4": 600, "primary_ip6": 602}]
+    )
+
+
+def test_failed_items_reported_without_failing_batch(in_memory_db, push_config, netbox_client):
+    """A device rejected by NetBox is reported; the others are still pushed."""
+    hosts = _add_hosts(
+        in_memory_db,
+        Host(mac="aa:bb:cc:dd:ee:01", hostname="dup"),
+        Host(mac="aa:bb:cc:dd:ee:02", hostname="fresh"),
+    )
+    netbox_client.create_devices.side_effect = None
+    netbox_client.create_devices.return_value = BulkResult(
+        ids={1: 101}, errors={0: "name: Device name must be unique"}
+    )
+    result = PushResult()
+
+    _push_hosts_to_netbox(hosts, netbox_client, result, dry_run=False)
+
+    assert hosts[0].status == HostStatus.PENDING.value
+    assert hosts[1].status == HostStatus.PUSHED.value
+    assert result.netbox_created == 1
+    assert result.errors == ["Failed to push dup: name: Device name must be unique"]
+
+
+def test_vms_use_cluster_and_vm_interfaces(in_memory_db, push_config, netbox_client):
+    """Proxmox hosts become VMs with VM interfaces and no cables."""
+    (host,) = _add_hosts(
+        in_memory_db,
+        Host(
+            mac="aa:bb:cc:dd:ee:01",
+            hostname="vm1",
+            ip_addresses=["10.0.0.5"],
+            source=HostSource.PROXMOX.value,
+            switch_port="sw1:ether1",
+        ),
+    )
+
+    _push_hosts_to_netbox([host], netbox_client, PushResult(), dry_run=False)
+
+    netbox_client.create_vms.assert_called_once_with([{"name": "vm1", "cluster_id": 4}])
+    netbox_client.create_vm_interfaces.assert_called_once_with([{"vm_id": 200, "name": "eth0"}])
+    assert netbox_client.assign_ips.call_args.args[0][0]["interface_type"] == (
+        "virtualization.vminterface"
+    )
+    netbox_client.create_cables.assert_not_called()
+
+
+def test_cable_created_to_switch_port(in_memory_db, push_config, netbox_client):
+    """Devices seen on a switch port are cabled to that switch interface."""
+    (host,) = _add_hosts(
+        in_memory_db,
+        Host(mac="aa:bb:cc:dd:ee:01", hostname="web1", switch_port="sw1:ether5"),
+    )
+    result = PushResult()
+
+    _push_hosts_to_netbox([host], netbox_client, result, dry_run=False)
+
+    netbox_client.lookup_id.assert_any_call("device", "sw1")
+    netbox_client.get_interface_id.assert_called_once_with(50, "ether5")
+    netbox_client.create_cables.assert_called_once_with(
+        [
+            {
+                "a_termination_type": "dcim.interface",
+                "a_termination_id": 500,
+                "b_termination_type": "dcim.interface",
+                "b_termination_id": 300,
+            }
+        ]
+    )
+    assert result.cables_created == 1
+
+
+def test_references_prefetched_once(in_memory_db, push_config, netbox_client):
+    """Reference objects are listed once up front rather than per host."""
+    hosts = _add_hosts(
+        in_memory_db,
+        Host(mac="aa:bb:cc:dd:ee:01", hostname="web1"),
+        Host(mac="aa:bb:cc:dd:ee:02", hostname="vm1", source=HostSource.PROXMOX.value),
+    )
+
+    _push_hosts_to_netbox(hosts, netbox_client, PushResult(), dry_run=False)
+
+    netbox_client.prefetch_references.assert_called_once_with()
+
+
+def test_missing_references_skip_creation(in_memory_db, mocker, netbox_client):
+    """Without site/role/type configuration, devices are skipped with an error."""
+    mocker.patch(
+        "netbox_auto.push.get_config",
+        return_value=Config(netbox=NetBoxConfig(url="http://netbox.local", token="t")),
+    )
+    (host,) = _add_hosts(in_memory_db, Host(mac="aa:bb:cc:dd:ee:01", hostname="web1"))
+    result = PushResult()
+
+    _push_hosts_to_netbox([host], netbox_client, result, dry_run=False)
+
+    netbox_client.create_devices.assert_not_called()
+    assert result.errors == ["Device creation for web1 skipped - NetBox IDs not configured"]
+
+
+def test_batches_pushed_concurrently(in_memory_db, push_config, netbox_client):
+    """Host batches run on separate workers and every host is marked pushed."""
+    _use_batches(push_config, batch_size=2, push_workers=3)
+    hosts = _add_hosts(
+        in_memory_db,
+        *(
+            Host(mac=f"aa:bb:cc:dd:ee:{i:02x}", hostname=f"web{i}", ip_addresses=[f"10.0.0.{i}"])
+            for i in range(6)
+        ),
+    )
+    # Each batch waits until all three are in flight at once
+    barrier = threading.Barrier(3, timeout=5)
+
+    def _create(items):
+        barrier.wait()
+        return BulkResult(ids={i: 100 + i for i in range(len(items))})
+
+    netbox_client.create_devices.side_effect = _create
+    result = PushResult()
+
+    _push_hosts_to_netbox(hosts, netbox_client, result, dry_run=False)
+
+    assert netbox_client.create_devices.call_count == 3
+    assert netbox_client.assign_ips.call_count == 3
+    assert all(h.status == HostStatus.PUSHED.value for h in hosts)
+    assert result.netbox_created == 6
+    assert result.errors == []
+
+
+def test_failed_batch_does_not_stop_others(in_memory_db, push_config, netbox_client):
+    """An exception in one batch is reported while the other batches complete."""
+    _use_batches(push_config, batch_size=1, push_workers=2)
+    hosts = _add_hosts(
+        in_memory_db,
+        Host(mac="aa:bb:cc:dd:ee:01", hostname="broken"),
+        Host(mac="aa:bb:cc:dd:ee:02", hostname="fine"),
+    )
+
+    def _create(items):
+        if items[0]["name"] == "broken":
+            raise ConnectionError("connection reset")
+        return BulkResult(ids={0: 101})
+
+    netbox_client.create_devices.side_effect = _create
+    result = PushResult()
+
+    _push_hosts_to_netbox(hosts, netbox_client, result, dry_run=False)
+
+    assert hosts[0].status == HostStatus.PENDING.value
+    assert hosts[1].status == HostStatus.PUSHED.value
+    assert result.netbox_created == 1
+    assert result.errors == ["NetBox push of batch starting at broken failed: connection reset"]
+
+
+def test_plan_diffs_against_netbox_inventory(in_memory_db, netbox_client):
+    """Hosts are planned as create, update (renamed) or no-op against NetBox."""
+    hosts = _add_hosts(
+        in_memory_db,
+        Host(mac="aa:bb:cc:dd:ee:01", hostname="new1"),
+        Host(mac="aa:bb:cc:dd:ee:02", hostname="renamed", netbox_id=11),
+        Host(mac="aa:bb:cc:dd:ee:03", hostname="same"),
+        Host(mac="aa:bb:cc:dd:ee:04", hostname="same", source=HostSource.PROXMOX.value),
+    )
+    netbox_client.get_inventory.return_value = (
+        [{"id": 11, "name": "old-name"}, {"id": 12, "name": "same"}],
+        [],
+    )
+
+    plan = plan_push(hosts, netbox_client)
+
+    assert [c.action for c in plan.changes] == [
+        PlanAction.CREATE,
+        PlanAction.UPDATE,
+        PlanAction.NOOP,
+        PlanAction.CREATE,  # a device named 'same' doesn't match a VM
+    ]
+    assert plan.changes[1].changes == {"name": ["old-name", "renamed"]}
+    assert plan.changes[2].netbox_id == 12
+    netbox_client.get_inventory.assert_called_once_with()
+
+
+def test_plan_lists_differences_push_does_not_write(in_memory_db, netbox_client):
+    """IP and cable differences on existing objects are recorded as unsynced."""
+    hosts = _add_hosts(
+        in_memory_db,
+        Host(mac="aa:bb:cc:dd:ee:01", hostname="moved", ip_addresses=["10.0.0.2"]),
+        Host(
+            mac="aa:bb:cc:dd:ee:02",
+            hostname="recabled",
+            ip_addresses=["10.0.0.3"],
+            switch_port="sw1:ether2",
+            netbox_objects={"kind": "device", "id": 13, "cable": 70, "switch_port": "sw1:ether1"},
+        ),
+    )
+    netbox_client.get_inventory.return_value = (
+        [
+            {"id": 12, "name": "moved", "primary_ip": "10.0.0.1"},
+            {"id": 13, "name": "recabled", "primary_ip": "10.0.0.3"},
+        ],
+        [],
+    )
+
+    plan = plan_push(hosts, netbox_client)
+
+    assert [c.action for c in plan.changes] == [PlanAction.NOOP, PlanAction.NOOP]
+    assert plan.changes[0].unsynced == {"primary_ip": ["10.0.0.1", "10.0.0.2"]}
+    assert plan.changes[1].unsynced == {"switch_port": ["sw1:ether1", "sw1:ether2"]}
+    assert plan.unsynced() == plan.changes
+
+
+def test_apply_makes_no_writes_for_noops(in_memory_db, push_config, netbox_client):
+    """Repeat pushes of hosts already in NetBox only link them locally."""
+    (host,) = _add_hosts(in_memory_db, Host(mac="aa:bb:cc:dd:ee:01", hostname="web1"))
+    netbox_client.get_inventory.return_value = ([{"id": 12, "name": "web1"}], [])
+    result = PushResult()
+
+    apply_push_plan(plan_push([host], netbox_client), [host], netbox_client, result, False)
+
+    netbox_client.create_devices.assert_not_called()
+    netbox_client.update_devices.assert_not_called()
+    assert host.netbox_id == 12
+    assert host.status == HostStatus.PUSHED.value
+    assert result.netbox_unchanged == 1
+
+
+def test_apply_sends_updates_in_bulk(in_memory_db, push_config, netbox_client):
+    """Planned renames go out as one bulk PATCH."""
+    (host,) = _add_hosts(in_memory_db, Host(mac="aa:bb:cc:dd:ee:01", hostname="web1", netbox_id=12))
+    netbox_client.get_inventory.return_value = ([{"id": 12, "name": "old"}], [])
+    result = PushResult()
+
+    apply_push_plan(plan_push([host], netbox_client), [host], netbox_client, result, False)
+
+    netbox_client.update_devices.assert_called_once_with([{"id": 12, "name": "web1"}])
+    assert host.status == HostStatus.PUSHED.value
+    assert result.netbox_updated == 1
+
+
+def test_saved_plan_applied_exactly(in_memory_db, push_config, netbox_client, tmp_path):
+    """A saved plan is applied without replanning; hosts edited since are skipped."""
+    hosts = _add_hosts(
+        in_memory_db,
+        Host(mac="aa:bb:cc:dd:ee:01", hostname="web1"),
+        Host(mac="aa:bb:cc:dd:ee:02", hostname="web2"),
+    )
+    plan_path = tmp_path / "plan.json"
+    plan_push(hosts, netbox_client).save(plan_path)
+    hosts[1].ip_addresses = ["10.0.0.99"]
+    netbox_client.get_inventory.reset_mock()
+    result = PushResult()
+
+    apply_push_plan(PushPlan.load(plan_path), hosts, netbox_client, result, False)
+
+    netbox_client.get_inventory.assert_not_called()
+    assert [d["name"] for d in netbox_client.create_devices.call_args.args[0]] == ["web1"]
+    assert hosts[1].status == HostStatus.PENDING.value
+    assert result.errors == [
+        "Planned change for web2 skipped - host changed since the plan was made"
+    ]
+
+
+def test_push_records_state_for_drift_sync(in_memory_db, push_config, netbox_client):
+    """Pushed hosts remember their fingerprint and the NetBox objects created."""
+    (host,) = _add_hosts(
+        in_memory_db,
+        Host(
+            mac="aa:bb:cc:dd:ee:01",
+            hostname="web1",
+            ip_addresses=["10.0.0.1"],
+            switch_port="sw1:ether5",
+            drifted=True,
+        ),
+    )
+
+    _push_hosts_to_netbox([host], netbox_client, PushResult(), dry_run=False)
+
+    assert host.netbox_objects == {
+        "kind": "device",
+        "id": 100,
+        "name": "web1",
+        "interface": 300,
+        "ips": {"10.0.0.1": 600},
+        "primary_ip4": 600,
+        "cable": 700,
+        "switch_port": "sw1:ether5",
+    }
+    assert host.push_fingerprint == host.fingerprint()
+    assert host.drifted is False
+
+
+def test_drifted_host_synced_minimally(in_memory_db, push_config, netbox_client):
+    """Only the changed IP and switch port are sent for a drifted host."""
+    (host,) = _add_hosts(
+        in_memory_db,
+        Host(
+            mac="aa:bb:cc:dd:ee:01",
+            hostname="web1",
+            ip_addresses=["10.0.0.2"],
+            switch_port="sw1:ether6",
+            status=HostStatus.PUSHED.value,
+            netbox_objects={
+                "kind": "device",
+                "id": 100,
+                "name": "web1",
+                "interface": 300,
+                "ips": {"10.0.0.1": 600},
+                "primary_ip4": 600,
+                "cable": 700,
+                "switch_port": "sw1:ether5",
+            },
+            drifted=True,
+        ),
+    )
+    netbox_client.delete_ips.side_effect = lambda ids: BulkResult(ids=dict(enumerate(ids)))
+    netbox_client.delete_cables.side_effect = lambda ids: BulkResult(ids=dict(enumerate(ids)))
+    netbox_client.assign_ips.side_effect = lambda items: BulkResult(ids={0: 601})
+    netbox_client.create_cables.side_effect = lambda items: BulkResult(ids={0: 701})
+    result = PushResult()
+
+    _sync_drifted_hosts([host], netbox_client, result, dry_run=False)
+
+    netbox_client.create_devices.assert_not_called()
+    netbox_client.delete_ips.assert_called_once_with([600])
+    assert netbox_client.assign_ips.call_args.args[0] == [
+        {"ip_address": "10.0.0.2", "interface_id": 300, "interface_type": "dcim.interface"}
+    ]
+    netbox_client.update_devices.assert_called_once_with([{"id": 100, "primary_ip4": 601}])
+    netbox_client.delete_cables.assert_called_once_with([700])
+    netbox_client.get_interface_id.assert_called_once_with(50, "ether6")
+    assert host.netbox_objects["ips"] == {"10.0.0.2": 601}
+    assert host.netbox_objects["cable"] == 701
+    assert host.drifted is False
+    assert host.push_fingerprint == host.fingerprint()
+    assert result.netbox_updated == 1
+    assert result.errors == []
+
+
+def test_dns_config_streamed_from_pushed_hosts(in_memory_db, push_config, mocker):
+    """DNS push receives per-zone config chunks generated from pushed hosts."""
+    _add_hosts(
+        in_memory_db,
+        Host(
+            mac="aa:bb:cc:00:00:01",
+            hostname="web",
+            ip_addresses=["10.0.0.5"],
+            source=HostSource.DHCP.value,
+            status=HostStatus.PUSHED.value,
+        ),
+        Host(
+            mac="aa:bb:cc:00:00:02",
+            hostname="new",
+            source=HostSource.DHCP.value,
+            status=HostStatus.APPROVED.value,
+        ),
+    )
+    mocker.patch("netbox_auto.push.get_session", return_value=in_memory_db)
+    received: list[str] = []
+
+    def _push(config, dry_run, session):
+        received.append("".join("".join(chunks) for chunks in config.values()))
+        return DnsPushResult(updated=["dns1"])
+
+    mocker.patch("netbox_auto.push.push_dns_config", side_effect=_push)
+
+    result = push_approved_hosts(skip_netbox=True)
+
+    assert result.dns_updated == ["dns1"]
+    assert 'local-data: "web.lan. A 10.0.0.5"' in received[0]
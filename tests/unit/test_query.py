@@ -0,0 +1,226 @@
+"""Unit tests for host listing queries.
+
+Tests filtering, sorting and keyset pagination of hosts.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from netbox_auto.models import Host, HostSource, HostStatus, HostType
+from netbox_auto.query import (
+    HostFilter,
+    HostQueryError,
+    decode_cursor,
+    encode_cursor,
+    host_page,
+)
+
+
+def _add_hosts(session, count):
+    hosts = [
+        Host(
+            mac=f"aa:bb:cc:dd:ee:{i:02x}",
+            hostname=f"host-{i:02d}" if i % 3 else None,
+            ip_addresses=[f"10.0.{i % 2}.{i}"],
+            source=HostSource.DHCP.value if i % 2 else HostSource.SCAN.value,
+            status=HostStatus.PENDING.value,
+        )
+        for i in range(count)
+    ]
+    session.add_all(hosts)
+    session.commit()
+    return hosts
+
+
+def _walk(session, **kwargs):
+    """Follow next cursors from the first page, returning all host IDs."""
+    ids = []
+    after = None
+    while True:
+        page = host_page(session, after=after, **kwargs)
+        ids.extend(host.id for host in page.hosts)
+        if page.next_cursor is None:
+            return ids
+        after = page.next_cursor
+
+
+@pytest.mark.parametrize("sort", ["last_seen", "hostname", "mac", "source"])
+@pytest.mark.parametrize("descending", [True, False])
+def test_pages_cover_every_host_once(in_memory_db, sort, descending):
+    """Walking pages yields each host exactly once, in sort order."""
+    _add_hosts(in_memory_db, 11)
+
+    ids = _walk(in_memory_db, sort=sort, descending=descending, limit=4)
+
+    assert len(ids) == 11
+    assert len(set(ids)) == 11
+    assert ids == _walk(in_memory_db, sort=sort, descending=descending, limit=100)
+
+
+def test_hostname_sort_places_unnamed_hosts_first(in_memory_db):
+    """Ascending hostname order lists hosts without a hostname first, by ID."""
+    hosts = _add_hosts(in_memory_db, 6)
+
+    page = host_page(in_memory_db, sort="hostname", descending=False)
+
+    unnamed = [host.id for host in hosts if host.hostname is None]
+    assert [host.id for host in page.hosts][: len(unnamed)] == sorted(unnamed)
+    named = [host.hostname for host in page.hosts[len(unnamed) :]]
+    assert named == sorted(named)
+
+
+def test_previous_cursor_returns_preceding_page(in_memory_db):
+    """Paging back from the second page returns the first page."""
+    _add_hosts(in_memory_db, 7)
+    first = host_page(in_memory_db, sort="mac", limit=3)
+    second = host_page(in_memory_db, sort="mac", limit=3, after=first.next_cursor)
+
+    back = host_page(in_memory_db, sort="mac", limit=3, before=second.prev_cursor)
+
+    assert [host.id for host in back.hosts] == [host.id for host in first.hosts]
+    assert back.prev_cursor is None
+    assert back.next_cursor is not None
+    assert first.prev_cursor is None
+
+
+def test_last_page_has_no_next_cursor(in_memory_db):
+    """The final page links back but not forward."""
+    _add_hosts(in_memory_db, 5)
+    first = host_page(in_memory_db, limit=3)
+
+    last = host_page(in_memory_db, limit=3, after=first.next_cursor)
+
+    assert len(last.hosts) == 2
+    assert last.next_cursor is None
+    assert last.prev_cursor is not None
+
+
+def test_filter_by_status_source_and_type(in_memory_db):
+    """Choice filters match their columns exactly."""
+    hosts = _add_hosts(in_memory_db, 6)
+    hosts[1].status = HostStatus.APPROVED.value
+    hosts[1].host_type = HostType.SERVER.value
+    hosts[3].status = HostStatus.APPROVED.value
+    in_memory_db.commit()
+
+    host_filter = HostFilter(
+        status=HostStatus.APPROVED.value,
+        source=HostSource.DHCP.value,
+        host_type=HostType.SERVER.value,
+    )
+    page = host_page(in_memory_db, host_filter)
+
+    assert [host.id for host in page.hosts] == [hosts[1].id]
+
+
+def test_filter_by_subnet(in_memory_db):
+    """Subnet filter matches hosts with any address in the network."""
+    in_memory_db.add_all(
+        [
+            Host(mac="aa:00:00:00:00:01", ip_addresses=["192.168.1.5", "10.20.3.4"]),
+            Host(mac="aa:00:00:00:00:02", ip_addresses=["10.21.0.1"]),
+            Host(mac="aa:00:00:00:00:03", ip_addresses={"eth0": "10.20.9.9/24"}),
+            Host(mac="aa:00:00:00:00:04", ip_addresses=["not-an-ip"]),
+            Host(mac="aa:00:00:00:00:05", ip_addresses=[]),
+        ]
+    )
+    in_memory_db.commit()
+
+    page = host_page(in_memory_db, HostFilter(subnet="10.20.0.0/16"), sort="mac", descending=False)
+
+    assert [host.mac for host in page.hosts] == ["aa:00:00:00:00:01", "aa:00:00:00:00:03"]
+
+
+def test_search_matches_mac_hostname_ip_and_port(in_memory_db):
+    """Text search is a case-insensitive substring match over several fields."""
+    in_memory_db.add_all(
+        [
+            Host(mac="aa:00:00:00:00:01", hostname="Web-Server"),
+            Host(mac="aa:00:00:00:00:02", ip_addresses=["10.9.8.7"]),
+            Host(mac="aa:00:00:00:00:03", switch_port="sw1:ether5"),
+            Host(mac="bb:00:00:00:00:04", hostname="db"),
+        ]
+    )
+    in_memory_db.commit()
+
+    def macs(search):
+        page = host_page(in_memory_db, HostFilter(search=search), sort="mac")
+        return [host.mac for host in page.hosts]
+
+    assert macs("web-") == ["aa:00:00:00:00:01"]
+    assert macs("9.8.7") == ["aa:00:00:00:00:02"]
+    assert macs("ether5") == ["aa:00:00:00:00:03"]
+    assert macs("bb:") == ["bb:00:00:00:00:04"]
+    assert macs("%") == []
+
+
+def test_filter_by_hostname_pattern_and_age(in_memory_db):
+    """Hostname wildcards and last-seen ages select hosts."""
+    now = datetime.now(UTC)
+    in_memory_db.add_all(
+        [
+            Host(mac="aa:00:00:00:00:01", hostname="web-1", last_seen=now - timedelta(days=40)),
+            Host(mac="aa:00:00:00:00:02", hostname="WEB_2", last_seen=now - timedelta(days=2)),
+            Host(mac="aa:00:00:00:00:03", hostname="webserver", last_seen=now),
+        ]
+    )
+    in_memory_db.commit()
+
+    def macs(**kwargs):
+        page = host_page(in_memory_db, HostFilter(**kwargs), sort="mac", descending=False)
+        return [host.mac for host in page.hosts]
+
+    assert macs(hostname="web?1") == ["aa:00:00:00:00:01"]
+    assert len(macs(hostname="WEB*")) == 3
+    assert macs(hostname="web_*") == ["aa:00:00:00:00:02"]
+    assert macs(min_age=30) == ["aa:00:00:00:00:01"]
+    assert macs(max_age=7) == ["aa:00:00:00:00:02", "aa:00:00:00:00:03"]
+
+
+def test_filter_from_args_round_trips():
+    """Request arguments parse into a filter and back, normalizing the subnet."""
+    host_filter = HostFilter.from_args(
+        {"status": "pending", "type": "", "subnet": " 10.0.0.7/24 ", "q": "web", "min_age": "30"}
+    )
+
+    assert host_filter == HostFilter(
+        status="pending", subnet="10.0.0.0/24", search="web", min_age=30
+    )
+    assert host_filter.to_args() == {
+        "status": "pending",
+        "subnet": "10.0.0.0/24",
+        "q": "web",
+        "min_age": "30",
+    }
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        {"status": "bogus"},
+        {"source": "x"},
+        {"type": "y"},
+        {"subnet": "10.0.0.0/99"},
+        {"min_age": "-1"},
+        {"max_age": "week"},
+    ],
+)
+def test_filter_from_args_rejects_invalid_values(args):
+    """Unknown choices and malformed subnets raise HostQueryError."""
+    with pytest.raises(HostQueryError):
+        HostFilter.from_args(args)
+
+
+def test_invalid_sort_and_cursor_rejected(in_memory_db):
+    """Unknown sort columns and malformed cursors raise HostQueryError."""
+    with pytest.raises(HostQueryError):
+        host_page(in_memory_db, sort="notes")
+    with pytest.raises(HostQueryError):
+        host_page(in_memory_db, after="not-a-cursor")
+
+
+def test_cursor_round_trip():
+    """Cursors decode to the sort key and ID they were built from."""
+    assert decode_cursor(encode_cursor("2026-01-01 00:00:00", 42)) == ("2026-01-01 00:00:00", 42)
+    assert decode_cursor(encode_cursor(None, 7)) == (None, 7)
@@ -4,13 +4,21 @@ Tests for host matching and categorization logic:
 - UNIT-08: New hosts identification
 - UNIT-09: Matched hosts identification
 - UNIT-10: Stale hosts identification
+
+And for background reconciliation snapshots used by the web view.
 """
 
-from netbox_auto.models import Host, HostSource, HostStatus
+from netbox_auto.models import Host, HostSource, HostStatus, ReconcileSnapshot, ReconcileStatus
+from netbox_auto.netbox import NetBoxFetchError
 from netbox_auto.reconcile import (
     _match_host_to_netbox,
     _normalize_ip,
+    latest_snapshot,
     reconcile_hosts,
+    run_reconcile,
+    snapshot_is_current,
+    snapshot_section,
+    start_reconcile,
 )
 
 # =============================================================================
@@ -177,8 +185,7 @@ def test_unmatched_host_is_new(in_memory_db, mocker):
     session.commit()
 
     # Mock NetBox returns empty inventory
-    mocker.patch("netbox_auto.reconcile.get_netbox_devices", return_value=[])
-    mocker.patch("netbox_auto.reconcile.get_netbox_vms", return_value=[])
+    mocker.patch("netbox_auto.reconcile.get_netbox_inventory", return_value=([], []))
     mocker.patch("netbox_auto.reconcile.get_session", return_value=session)
 
     result = reconcile_hosts()
@@ -205,10 +212,9 @@ def test_host_with_deleted_netbox_id_is_new(in_memory_db, mocker):
 
     # NetBox has different items (ID 999 doesn't exist)
     mocker.patch(
-        "netbox_auto.reconcile.get_netbox_devices",
-        return_value=[{"id": 1, "name": "other-server", "primary_ip": "10.0.0.1/24"}],
+        "netbox_auto.reconcile.get_netbox_inventory",
+        return_value=([{"id": 1, "name": "other-server", "primary_ip": "10.0.0.1/24"}], []),
     )
-    mocker.patch("netbox_auto.reconcile.get_netbox_vms", return_value=[])
     mocker.patch("netbox_auto.reconcile.get_session", return_value=session)
 
     result = reconcile_hosts()
@@ -233,11 +239,7 @@ def test_host_matched_by_netbox_id(in_memory_db, mocker):
     session.commit()
 
     netbox_device = {"id": 123, "name": "known-server", "primary_ip": "192.168.1.100/24"}
-    mocker.patch(
-        "netbox_auto.reconcile.get_netbox_devices",
-        return_value=[netbox_device],
-    )
-    mocker.patch("netbox_auto.reconcile.get_netbox_vms", return_value=[])
+    mocker.patch("netbox_auto.reconcile.get_netbox_inventory", return_value=([netbox_device], []))
     mocker.patch("netbox_auto.reconcile.get_session", return_value=session)
 
     result = reconcile_hosts()
@@ -264,11 +266,7 @@ def test_host_matched_by_ip(in_memory_db, mocker):
     session.commit()
 
     netbox_device = {"id": 456, "name": "existing-server", "primary_ip": "192.168.1.100/24"}
-    mocker.patch(
-        "netbox_auto.reconcile.get_netbox_devices",
-        return_value=[netbox_device],
-    )
-    mocker.patch("netbox_auto.reconcile.get_netbox_vms", return_value=[])
+    mocker.patch("netbox_auto.reconcile.get_netbox_inventory", return_value=([netbox_device], []))
     mocker.patch("netbox_auto.reconcile.get_session", return_value=session)
 
     result = reconcile_hosts()
@@ -296,11 +294,7 @@ def test_netbox_item_not_in_discovery_is_stale(in_memory_db, mocker):
 
     # NetBox has item with different IP
     stale_device = {"id": 789, "name": "stale-server", "primary_ip": "10.0.0.50/24"}
-    mocker.patch(
-        "netbox_auto.reconcile.get_netbox_devices",
-        return_value=[stale_device],
-    )
-    mocker.patch("netbox_auto.reconcile.get_netbox_vms", return_value=[])
+    mocker.patch("netbox_auto.reconcile.get_netbox_inventory", return_value=([stale_device], []))
     mocker.patch("netbox_auto.reconcile.get_session", return_value=session)
 
     result = reconcile_hosts()
@@ -337,8 +331,7 @@ def test_all_categorization_mutual_exclusive(in_memory_db, mocker):
         {"id": 1, "name": "matched-device", "primary_ip": "192.168.1.100/24"},
         {"id": 2, "name": "stale-device", "primary_ip": "10.0.0.1/24"},
     ]
-    mocker.patch("netbox_auto.reconcile.get_netbox_devices", return_value=netbox_devices)
-    mocker.patch("netbox_auto.reconcile.get_netbox_vms", return_value=[])
+    mocker.patch("netbox_auto.reconcile.get_netbox_inventory", return_value=(netbox_devices, []))
     mocker.patch("netbox_auto.reconcile.get_session", return_value=session)
 
     result = reconcile_hosts()
@@ -364,3 +357,93 @@ def test_all_categorization_mutual_exclusive(in_memory_db, mocker):
     # Stale NetBox device should only appear in stale_netbox
     assert 2 in stale_ids
     assert 1 not in stale_ids  # Matched device should not be stale
+
+
+# =============================================================================
+# Background reconciliation snapshots
+# =============================================================================
+
+
+def _start_snapshot(session):
+    snapshot = ReconcileSnapshot(status=ReconcileStatus.RUNNING.value)
+    session.add(snapshot)
+    session.commit()
+    return snapshot.id
+
+
+def test_run_reconcile_stores_snapshot(in_memory_db, mocker):
+    """A background run stores categorized host IDs and NetBox items."""
+    session = in_memory_db
+    new_host = Host(mac="11:22:33:44:55:66", ip_addresses=["192.168.1.10"])
+    matched_host = Host(mac="aa:bb:cc:dd:ee:ff", ip_addresses=["192.168.1.100"])
+    session.add_all([new_host, matched_host])
+    session.commit()
+    new_id, matched_id = new_host.id, matched_host.id
+    netbox_devices = [
+        {"id": 1, "name": "matched-device", "primary_ip": "192.168.1.100/24"},
+        {"id": 2, "name": "stale-device", "primary_ip": "10.0.0.1/24"},
+    ]
+    mocker.patch("netbox_auto.reconcile.get_netbox_inventory", return_value=(netbox_devices, []))
+    mocker.patch("netbox_auto.reconcile.get_session", return_value=session)
+    snapshot_id = _start_snapshot(session)
+
+    run_reconcile(snapshot_id)
+
+    snapshot = session.get(ReconcileSnapshot, snapshot_id)
+    assert snapshot.status == ReconcileStatus.COMPLETED.value
+    assert snapshot.result["new"] == [new_id]
+    assert [pair[0] for pair in snapshot.result["matched"]] == [matched_id]
+    assert [item["id"] for item in snapshot.result["stale"]] == [2]
+    assert snapshot_is_current(session, snapshot, max_age=60)
+    matched = snapshot_section(session, snapshot, "matched", 0, 10)
+    assert matched[0][0].mac == "aa:bb:cc:dd:ee:ff"
+    assert matched[0][1]["name"] == "matched-device"
+
+
+def test_snapshot_outdated_by_host_change_or_age(in_memory_db, mocker):
+    """Host writes or exceeding max_age make a snapshot out of date."""
+    session = in_memory_db
+    session.add(Host(mac="aa:bb:cc:dd:ee:ff"))
+    session.commit()
+    mocker.patch("netbox_auto.reconcile.get_netbox_inventory", return_value=([], []))
+    mocker.patch("netbox_auto.reconcile.get_session", return_value=session)
+    snapshot_id = _start_snapshot(session)
+    run_reconcile(snapshot_id)
+    snapshot = session.get(ReconcileSnapshot, snapshot_id)
+
+    assert snapshot_is_current(session, snapshot, max_age=60)
+    assert not snapshot_is_current(session, snapshot, max_age=0.000001)
+
+    session.add(Host(mac="11:22:33:44:55:66"))
+    session.commit()
+    assert not snapshot_is_current(session, snapshot, max_age=60)
+
+
+def test_run_reconcile_records_failure(in_memory_db, mocker):
+    """A failed NetBox fetch marks the snapshot failed with the error."""
+    session = in_memory_db
+    mocker.patch(
+        "netbox_auto.reconcile.get_netbox_inventory",
+        side_effect=NetBoxFetchError("connection refused"),
+    )
+    mocker.patch("netbox_auto.reconcile.get_session", return_value=session)
+    snapshot_id = _start_snapshot(session)
+
+    run_reconcile(snapshot_id)
+
+    snapshot = session.get(ReconcileSnapshot, snapshot_id)
+    assert snapshot.status == ReconcileStatus.FAILED.value
+    assert "connection refused" in snapshot.error
+    assert latest_snapshot(session) is None
+
+
+def test_start_reconcile_runs_one_job_at_a_time(in_memory_db, mocker):
+    """Starting while a job runs returns that job instead of a new one."""
+    thread = mocker.patch("netbox_auto.reconcile.threading.Thread")
+
+    first = start_reconcile(in_memory_db)
+    second = start_reconcile(in_memory_db)
+
+    assert second.id == first.id
+    thread.assert_called_once()
+    assert thread.call_args.kwargs["args"] == (first.id,)
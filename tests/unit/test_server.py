@@ -0,0 +1,91 @@
+"""Unit tests for the production WSGI servers.
+
+waitress and gunicorn are optional, so their modules are replaced with mocks.
+"""
+
+import signal
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+from netbox_auto.config import WebConfig
+from netbox_auto.web.server import ServerError, run_gunicorn, run_waitress
+
+
+@pytest.fixture
+def restore_sigterm():
+    """Restore the SIGTERM handler a server installs."""
+    previous = signal.getsignal(signal.SIGTERM)
+    yield
+    signal.signal(signal.SIGTERM, previous)
+
+
+def test_waitress_serves_with_configured_threads(mocker, restore_sigterm):
+    """waitress gets the bind address, thread count and timeout."""
+    waitress = MagicMock()
+    mocker.patch.dict(sys.modules, {"waitress": waitress})
+    app = MagicMock()
+
+    run_waitress(app, "0.0.0.0", 8080, WebConfig(threads=12, request_timeout=60))
+
+    waitress.serve.assert_called_once()
+    args, kwargs = waitress.serve.call_args
+    assert args == (app,)
+    assert kwargs["host"] == "0.0.0.0"
+    assert kwargs["port"] == 8080
+    assert kwargs["threads"] == 12
+    assert kwargs["channel_timeout"] == 60
+
+
+def test_waitress_exits_on_sigterm(mocker, restore_sigterm):
+    """SIGTERM raises SystemExit so waitress shuts down as on Ctrl+C."""
+    mocker.patch.dict(sys.modules, {"waitress": MagicMock()})
+
+    run_waitress(MagicMock(), "127.0.0.1", 5000, WebConfig())
+
+    handler = signal.getsignal(signal.SIGTERM)
+    assert callable(handler)
+    with pytest.raises(SystemExit):
+        handler(signal.SIGTERM, None)
+
+
+def test_gunicorn_configures_threaded_workers(mocker):
+    """gunicorn runs gthread workers built by the app factory."""
+    settings = {}
+
+    class FakeBaseApplication:
+        def __init__(self):
+            self.cfg = MagicMock()
+            self.cfg.set.side_effect = settings.__setitem__
+            self.load_config()
+
+        def run(self):
+            self.loaded = self.load()
+
+    gunicorn_base = MagicMock(BaseApplication=FakeBaseApplication)
+    mocker.patch.dict(
+        sys.modules,
+        {"gunicorn": MagicMock(), "gunicorn.app": MagicMock(), "gunicorn.app.base": gunicorn_base},
+    )
+    app = MagicMock()
+    factory = MagicMock(return_value=app)
+
+    run_gunicorn(factory, "127.0.0.1", 5000, WebConfig(workers=3, threads=4, graceful_timeout=10))
+
+    assert settings["bind"] == "127.0.0.1:5000"
+    assert settings["workers"] == 3
+    assert settings["threads"] == 4
+    assert settings["worker_class"] == "gthread"
+    assert settings["graceful_timeout"] == 10
+    factory.assert_called_once_with()
+
+
+def test_missing_server_package_raises(mocker):
+    """Selecting a server that is not installed raises ServerError."""
+    mocker.patch.dict(sys.modules, {"waitress": None, "gunicorn.app.base": None})
+
+    with pytest.raises(ServerError, match="waitress"):
+        run_waitress(MagicMock(), "127.0.0.1", 5000, WebConfig())
+    with pytest.raises(ServerError, match="gunicorn"):
+        run_gunicorn(MagicMock(), "127.0.0.1", 5000, WebConfig())
@@ -0,0 +1,83 @@
+"""Unit tests for request timing.
+
+Tests query and external-call timing and the web app's Server-Timing
+header and slow request log.
+"""
+
+import logging
+import time
+
+from netbox_auto.config import Config, WebConfig
+from netbox_auto.models import Host
+from netbox_auto.timing import current_timings, external_call, start_timings, stop_timings
+from netbox_auto.web.app import create_app
+
+
+def test_queries_timed_only_while_active(in_memory_db):
+    """Statements are counted while timings are current, and kept on request."""
+    in_memory_db.query(Host).count()
+    assert current_timings() is None
+
+    timings = start_timings(record_queries=True)
+    try:
+        in_memory_db.query(Host).count()
+        in_memory_db.query(Host).all()
+    finally:
+        stop_timings()
+    in_memory_db.query(Host).count()
+
+    assert timings.query_count == 2
+    assert timings.db_time > 0
+    assert [statement.split()[0] for statement, _ in timings.queries] == ["SELECT", "SELECT"]
+
+
+def test_external_call_timed():
+    """External calls add their duration and count."""
+    with external_call():
+        pass  # Outside a request nothing is recorded
+
+    timings = start_timings()
+    try:
+        with external_call():
+            time.sleep(0.01)
+    finally:
+        stop_timings()
+
+    assert timings.external_count == 1
+    assert timings.external_time >= 0.01
+
+
+def test_server_timing_header(web_client, in_memory_db):
+    """Responses report DB, template, external and total time."""
+    in_memory_db.add(Host(mac="aa:bb:cc:dd:ee:ff"))
+    in_memory_db.commit()
+
+    response = web_client.get("/api/hosts")
+
+    metrics = {part.split(";")[0]: part for part in response.headers["Server-Timing"].split(", ")}
+    assert set(metrics) == {"db", "tpl", "ext", "total"}
+    assert 'desc="0 queries"' not in metrics["db"]
+
+
+def test_slow_request_log_lists_queries(in_memory_db, mocker, caplog):
+    """Requests over the threshold are logged with their statements."""
+    mocker.patch("netbox_auto.web.app.get_session", return_value=in_memory_db)
+    mocker.patch(
+        "netbox_auto.web.app.get_config",
+        return_value=Config(web=WebConfig(slow_request_ms=0.001, server_timing=False)),
+    )
+    client = create_app().test_client()
+
+    with caplog.at_level(logging.INFO, logger="netbox_auto.web.timing"):
+        response = client.get("/hosts")
+
+    assert "Server-Timing" not in response.headers
+    messages = [record.getMessage() for record in caplog.records]
+    # Logged when the streamed page has rendered, so template time is included
+    request_lines = [m for m in messages if m.startswith("request method=GET path=/hosts")]
+    assert len(request_lines) == 1
+    assert "status=200" in request_lines[0]
+    assert "template_ms=0.0 " not in request_lines[0]
+    slow = [m for m in messages if m.startswith("slow request")]
+    assert len(slow) == 1
+    assert "SELECT" in slow[0]
@@ -0,0 +1,124 @@
+"""Unit tests for the web interface routes."""
+
+from datetime import UTC, datetime
+
+from netbox_auto.models import Host, HostStatus, ReconcileSnapshot, ReconcileStatus, TableVersion
+
+
+def test_hosts_page_is_paginated(web_client, in_memory_db):
+    """The hosts view renders one page and links to the next."""
+    in_memory_db.add_all(
+        [Host(mac=f"aa:bb:cc:dd:ee:{i:02x}", hostname=f"host-{i:02d}") for i in range(5)]
+    )
+    in_memory_db.commit()
+
+    response = web_client.get("/hosts?sort=hostname&dir=asc&per_page=2")
+
+    html = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert "host-00" in html and "host-01" in html
+    assert "host-02" not in html
+    assert "after=" in html
+
+
+def test_hosts_page_streams_lean_rows(web_client, in_memory_db):
+    """Rows carry their status for CSS and share one type picker."""
+    in_memory_db.add_all([Host(mac=f"aa:bb:cc:dd:ee:{i:02x}") for i in range(3)])
+    in_memory_db.commit()
+
+    response = web_client.get("/hosts")
+
+    html = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert "Content-Length" not in response.headers
+    assert html.count('data-status="pending"') == 3 + 3  # Row attribute and Reset button
+    assert html.count('id="type-picker"') == 1
+    assert html.count('value="server"') == 2  # Type filter and picker
+    assert html.count("onclick=") == 2  # Toolbar only, none per row
+
+
+def test_hosts_page_applies_filters(web_client, in_memory_db):
+    """Filter arguments restrict the listed hosts."""
+    in_memory_db.add_all(
+        [
+            Host(mac="aa:00:00:00:00:01", hostname="keep", status=HostStatus.APPROVED.value),
+            Host(mac="aa:00:00:00:00:02", hostname="drop", status=HostStatus.PENDING.value),
+        ]
+    )
+    in_memory_db.commit()
+
+    html = web_client.get("/hosts?status=approved").get_data(as_text=True)
+
+    assert "keep" in html
+    assert "drop" not in html
+
+
+def test_hosts_page_rejects_invalid_filter(web_client):
+    """An invalid filter redirects to the unfiltered view with an error."""
+    response = web_client.get("/hosts?subnet=not-a-subnet")
+
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith("/hosts")
+
+
+def test_reconcile_page_starts_background_job(web_client, in_memory_db, mocker):
+    """Without a current snapshot, the reconcile view starts a job and shows progress."""
+    thread = mocker.patch("netbox_auto.reconcile.threading.Thread")
+
+    response = web_client.get("/reconcile")
+
+    assert response.status_code == 200
+    assert "Reconciling" in response.get_data(as_text=True)
+    thread.return_value.start.assert_called_once()
+
+
+def test_reconcile_page_shows_current_snapshot(web_client, in_memory_db, mocker):
+    """A current snapshot is rendered without starting another job."""
+    thread = mocker.patch("netbox_auto.reconcile.threading.Thread")
+    host = Host(mac="aa:bb:cc:dd:ee:ff", hostname="fresh-host")
+    in_memory_db.add(host)
+    in_memory_db.commit()
+    in_memory_db.add(
+        ReconcileSnapshot(
+            status=ReconcileStatus.COMPLETED.value,
+            completed_at=datetime.now(UTC),
+            host_version=in_memory_db.get(TableVersion, "host").version,
+            result={"new": [host.id], "matched": [], "stale": [{"id": 7, "name": "gone"}]},
+        )
+    )
+    in_memory_db.commit()
+
+    html = web_client.get("/reconcile").get_data(as_text=True)
+
+    assert "fresh-host" in html
+    assert "gone" in html
+    thread.assert_not_called()
+
+
+def test_hosts_export_streams_filtered_csv(web_client, in_memory_db):
+    """The export endpoint streams matching hosts as a CSV download."""
+    in_memory_db.add_all(
+        [
+            Host(mac="aa:00:00:00:00:01", hostname="web-1"),
+            Host(mac="aa:00:00:00:00:02", hostname="db-1"),
+        ]
+    )
+    in_memory_db.commit()
+
+    response = web_client.get("/hosts/export?format=csv&hostname=web-*")
+
+    body = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    # Streamed without a length, so servers use chunked transfer encoding
+    assert "Content-Length" not in response.headers
+    assert response.headers["Content-Disposition"] == "attachment; filename=hosts.csv"
+    assert "aa:00:00:00:00:01" in body
+    assert "aa:00:00:00:00:02" not in body
+
+
+def test_hosts_export_rejects_bad_arguments(web_client):
+    """Invalid formats and filters are answered with 400."""
+    assert web_client.get("/hosts/export?format=xml").status_code == 400
+    assert web_client.get("/hosts/export?subnet=nope").status_code == 400
+    assert web_client.get("/reconcile/export").status_code == 404